@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+ActionQueue Timeline Benchmark
+
+Queues thousands of actions across many units, then measures timeline
+previews, incremental edits (queue, remove, reorder, initiative change)
+and draining the timeline. A full rebuild-and-sort of the same queues is
+timed alongside for reference. Prints results as JSON.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from game.actions.action_system import Action, ActionType
+from game.queue.action_queue import ActionPriority, ActionQueue
+
+
+class BenchmarkAction(Action):
+    """Action whose execution does nothing, so only queue costs are timed"""
+
+    def execute(self, unit, targets, game_state):
+        return {'action': self.id}
+
+
+def rebuild_and_sort(queue: ActionQueue, unit_stats: dict) -> list:
+    """Reference: rebuild the timeline from every unit queue and sort it"""
+    events = []
+    for unit_id, actions in queue.unit_queues.items():
+        initiative = unit_stats.get(unit_id, {}).get('initiative', 50)
+        for queued_action in actions:
+            events.append((queued_action.get_execution_order(initiative), queued_action))
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+def timed(operations: int, func) -> dict:
+    start = time.perf_counter()
+    for i in range(operations):
+        func(i)
+    elapsed = time.perf_counter() - start
+    return {'ops': operations, 'us_per_op': round(elapsed / operations * 1e6, 2)}
+
+
+def run(units: int, actions: int, operations: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    unit_ids = [f"unit_{i}" for i in range(units)]
+    pool = []
+    for i in range(64):
+        action = BenchmarkAction(f"action_{i}", f"Action {i}", ActionType.ATTACK)
+        action.cast_time = rng.randint(0, 10)
+        pool.append(action)
+    priorities = list(ActionPriority)
+    unit_stats = {unit_id: {'initiative': rng.randint(1, 100)} for unit_id in unit_ids}
+
+    queue = ActionQueue()
+    start = time.perf_counter()
+    for _ in range(actions):
+        queue.queue_action(rng.choice(unit_ids), rng.choice(pool), [], rng.choice(priorities))
+    fill_seconds = time.perf_counter() - start
+    queue.resolve_timeline(unit_stats)
+
+    results = {
+        'units': units,
+        'queued_actions': actions,
+        'fill_us_per_action': round(fill_seconds / actions * 1e6, 2),
+        'preview_unchanged': timed(operations, lambda i: queue.preview_timeline(unit_stats)),
+        'rebuild_and_sort_reference': timed(operations, lambda i: rebuild_and_sort(queue, unit_stats)),
+    }
+
+    def queue_and_remove(i):
+        unit_id = unit_ids[i % units]
+        queue.queue_action(unit_id, pool[i % len(pool)], [], priorities[i % len(priorities)])
+        queue.remove_action(unit_id, len(queue.unit_queues[unit_id]) - 1)
+
+    def change_initiative(i):
+        unit_id = unit_ids[i % units]
+        unit_stats[unit_id] = {'initiative': (unit_stats[unit_id]['initiative'] + 7) % 100}
+        queue.set_unit_initiative(unit_id, unit_stats[unit_id]['initiative'])
+
+    def reorder(i):
+        unit_id = unit_ids[i % units]
+        order = list(range(len(queue.unit_queues[unit_id])))
+        order.reverse()
+        queue.reorder_unit_actions(unit_id, order)
+
+    def edit_then_preview(i):
+        queue_and_remove(i)
+        queue.preview_timeline(unit_stats)
+
+    results['queue_and_remove'] = timed(operations, queue_and_remove)
+    results['initiative_change'] = timed(operations, change_initiative)
+    results['reorder_unit'] = timed(operations, reorder)
+    results['edit_then_preview'] = timed(max(operations // 10, 1), edit_then_preview)
+
+    game_state = {'units': {unit_id: object() for unit_id in unit_ids}}
+    start = time.perf_counter()
+    executed = len(queue.execute_all_queued(game_state))
+    results['drain'] = {
+        'executed': executed,
+        'us_per_action': round((time.perf_counter() - start) / max(executed, 1) * 1e6, 2)
+    }
+    return results
+
+
+def main():
+    """Main entry point for the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the ActionQueue timeline")
+    parser.add_argument("--units", type=int, default=200, help="Units with queued actions (default: 200)")
+    parser.add_argument("--actions", type=int, default=5000, help="Actions to queue (default: 5000)")
+    parser.add_argument("--operations", type=int, default=1000, help="Operations per measurement (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.units, args.actions, args.operations, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
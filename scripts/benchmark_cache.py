@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+CacheManager Benchmark
+
+Measures put/get throughput for each eviction strategy with a full cache,
+so every put past warm-up also evicts. Prints results as JSON.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Load the module directly; the performance package imports optional modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src" / "performance"))
+
+from cache_manager import CacheManager, CacheStrategy, estimate_size, pickled_size
+
+
+SIZERS = {"estimate": estimate_size, "pickle": pickled_size, "none": None}
+
+
+def benchmark_strategy(strategy: CacheStrategy, entries: int, operations: int,
+                       sizer: str, seed: int) -> dict:
+    """Fill a cache to ``entries`` then run a mixed get/put workload"""
+    rng = random.Random(seed)
+    cache = CacheManager(
+        strategy=strategy,
+        max_size=entries,
+        max_memory_mb=1024,
+        default_ttl=300.0 if strategy == CacheStrategy.TTL else None,
+        size_estimator=SIZERS[sizer]
+    )
+    cache._stop_cleanup = True
+    value = {"hp": 100, "mp": 50, "stats": list(range(16))}
+
+    start = time.perf_counter()
+    for i in range(entries):
+        cache.put(f"unit:{i}", value)
+    fill_seconds = time.perf_counter() - start
+
+    # 80% gets over a skewed key range, 20% puts of new keys (forcing eviction)
+    keys = [f"unit:{int(rng.paretovariate(1.2)) % (entries * 2)}" for _ in range(operations)]
+    is_put = [rng.random() < 0.2 for _ in range(operations)]
+    next_key = entries
+
+    start = time.perf_counter()
+    for key, put in zip(keys, is_put):
+        if put:
+            cache.put(f"unit:{next_key}", value)
+            next_key += 1
+        else:
+            cache.get(key)
+    mixed_seconds = time.perf_counter() - start
+
+    stats = cache.get_stats()
+    cache.shutdown()
+    return {
+        "strategy": strategy.value,
+        "fill_ops_per_sec": round(entries / fill_seconds),
+        "mixed_ops_per_sec": round(operations / mixed_seconds),
+        "hit_ratio": round(stats.hit_ratio, 3),
+        "evictions": stats.evictions
+    }
+
+
+def main():
+    """Main entry point for the cache benchmark"""
+    parser = argparse.ArgumentParser(description="CacheManager eviction benchmark")
+    parser.add_argument("--entries", type=int, default=100_000,
+                       help="Cache capacity and fill size (default: 100000)")
+    parser.add_argument("--operations", type=int, default=200_000,
+                       help="Mixed get/put operations after fill (default: 200000)")
+    parser.add_argument("--sizer", default="estimate", choices=list(SIZERS),
+                       help="Value size estimator (default: estimate)")
+    parser.add_argument("--strategy", default=None, choices=[s.value for s in CacheStrategy],
+                       help="Run a single strategy (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    strategies = [CacheStrategy(args.strategy)] if args.strategy else list(CacheStrategy)
+    results = [
+        benchmark_strategy(strategy, args.entries, args.operations, args.sizer, args.seed)
+        for strategy in strategies
+    ]
+    print(json.dumps({"entries": args.entries, "sizer": args.sizer, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Particle Emitter Benchmark
+
+Runs a ParticleEmitter up to a target number of live particles, then times
+per-frame updates (integration, gravity, fade and compaction). The previous
+per-particle dict update is timed on the same particle count for reference.
+Also checks that an emitter rebuilt from its wire form reproduces the
+server's particles. Prints results as JSON.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from core.math.particles import EmitterParams, ParticleEmitter
+
+
+def dict_particles(emitter: ParticleEmitter) -> list:
+    """The emitter's live particles in the old one-dict-per-particle layout"""
+    lifetime = emitter.params.particle_lifetime
+    return [
+        {'position': list(map(float, p)), 'velocity': list(map(float, v)),
+         'life': float(life), 'max_life': lifetime, 'size': emitter.params.particle_size}
+        for p, v, life in zip(emitter.positions[:emitter.count], emitter.velocities[:emitter.count],
+                              emitter.life[:emitter.count])
+    ]
+
+
+def dict_update(particles: list, delta_time: float, gravity: float, particle_size: float) -> list:
+    """Reference: the previous per-particle Python update"""
+    active = []
+    for particle in particles:
+        particle['life'] -= delta_time
+        if particle['life'] <= 0:
+            continue
+        position, velocity = particle['position'], particle['velocity']
+        position[0] += velocity[0] * delta_time
+        position[1] += velocity[1] * delta_time
+        position[2] += velocity[2] * delta_time
+        velocity[1] += gravity * delta_time
+        particle['size'] = particle_size * particle['life'] / particle['max_life']
+        active.append(particle)
+    return active
+
+
+def run(particles: int, frames: int, seed: int) -> dict:
+    lifetime = 2.0
+    params = EmitterParams(
+        position=(5.0, 0.5, 5.0),
+        emission_rate=particles / lifetime,
+        particle_lifetime=lifetime,
+        duration=60.0,
+        seed=seed
+    )
+    delta_time = 1.0 / 60.0
+    emitter = ParticleEmitter(params)
+    emitter.fast_forward(lifetime + 1.0, delta_time)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        emitter.update(delta_time)
+    update_seconds = (time.perf_counter() - start) / frames
+
+    reference = dict_particles(emitter)
+    reference_frames = max(frames // 20, 1)
+    start = time.perf_counter()
+    for _ in range(reference_frames):
+        reference = dict_update(reference, delta_time, params.gravity, params.particle_size)
+    reference_seconds = (time.perf_counter() - start) / reference_frames
+
+    # A client rebuilding the emitter from its wire form sees the same particles
+    client = ParticleEmitter.from_wire(json.loads(json.dumps(emitter.to_wire())))
+    server = ParticleEmitter(params)
+    server.fast_forward(client.elapsed)
+    deterministic = (client.emitted == server.emitted
+                     and np.allclose(client.live_positions(), server.live_positions(), atol=1e-4))
+
+    return {
+        'live_particles': emitter.count,
+        'capacity': emitter.capacity,
+        'frames': frames,
+        'update_ms_per_frame': round(update_seconds * 1e3, 4),
+        'dict_reference_ms_per_frame': round(reference_seconds * 1e3, 4),
+        'speedup': round(reference_seconds / update_seconds, 1),
+        'wire_bytes': len(json.dumps(emitter.to_wire())),
+        'client_regeneration_matches': bool(deterministic)
+    }
+
+
+def main():
+    """Main entry point for the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the particle emitter")
+    parser.add_argument("--particles", type=int, default=10000, help="Live particles to sustain (default: 10000)")
+    parser.add_argument("--frames", type=int, default=600, help="Frames to time (default: 600)")
+    parser.add_argument("--seed", type=int, default=0, help="Emitter seed (default: 0)")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.particles, args.frames, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Asset Bundle Builder
+
+Validates every JSON file under assets/ and compiles them into the
+memory-mapped bundle read at startup (see src/core/assets/asset_bundle.py).
+Exits non-zero without writing anything if validation fails.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from core.assets.asset_bundle import BundleError, build_bundle
+
+
+def main():
+    """Main entry point for the bundle builder"""
+    parser = argparse.ArgumentParser(description="Build the Apex Tactics asset bundle")
+    parser.add_argument("--assets", type=Path, default=project_root / "assets",
+                       help="Assets directory (default: ./assets)")
+    parser.add_argument("--output", type=Path, default=None,
+                       help="Bundle path (default: <assets>/assets.bundle)")
+    args = parser.parse_args()
+
+    try:
+        summary = build_bundle(args.assets, args.output)
+    except BundleError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
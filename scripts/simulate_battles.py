@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Headless Battle Simulation Runner
+
+Runs batches of seeded AI-vs-AI battles without the real-time loop and
+prints aggregate win-rate and turn-count statistics as JSON.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))  # The AI package imports relative to src
+
+from src.engine.headless_simulator import SimulationConfig, TeamSetup, run_batch
+from src.ai.adaptive_difficulty import AdaptiveDifficultySystem, DifficultyLevel
+
+
+def main():
+    """Main entry point for the simulation runner"""
+    levels = [level.value for level in DifficultyLevel]
+
+    parser = argparse.ArgumentParser(description="Apex Tactics headless battle simulator")
+    parser.add_argument("--battles", type=int, default=1000,
+                       help="Number of battles to simulate (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0,
+                       help="First seed; battles use consecutive seeds (default: 0)")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Worker processes (default: CPU count)")
+    parser.add_argument("--units", type=int, default=4,
+                       help="Units per team (default: 4)")
+    parser.add_argument("--size", type=int, nargs=2, default=[10, 10],
+                       help="Battlefield width and height (default: 10 10)")
+    parser.add_argument("--max-turns", type=int, default=50,
+                       help="Turn limit before a draw (default: 50)")
+    parser.add_argument("--team-a", default="normal", choices=levels,
+                       help="Difficulty parameters for team A (default: normal)")
+    parser.add_argument("--team-b", default="normal", choices=levels,
+                       help="Difficulty parameters for team B (default: normal)")
+
+    args = parser.parse_args()
+
+    difficulty_parameters = AdaptiveDifficultySystem().difficulty_parameters
+    config = SimulationConfig(
+        teams=[
+            TeamSetup(team="team_a", unit_count=args.units,
+                      ai_parameters=dict(difficulty_parameters[DifficultyLevel(args.team_a)])),
+            TeamSetup(team="team_b", unit_count=args.units,
+                      ai_parameters=dict(difficulty_parameters[DifficultyLevel(args.team_b)]))
+        ],
+        battlefield_size=tuple(args.size),
+        max_turns=args.max_turns
+    )
+
+    seeds = list(range(args.seed, args.seed + args.battles))
+    _, stats = run_batch(config, seeds, workers=args.workers)
+    print(json.dumps(stats.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -380,6 +380,11 @@ class AdaptiveDifficultySystem:
         
         return adjustment
     
+    def cleanup_session(self, session_id: str):
+        """Release per-session tracking data (player profiles are kept)"""
+        self.session_data.pop(session_id, None)
+        self.active_sessions.pop(session_id, None)
+    
     def _update_player_profile(self, profile: PlayerProfile, session: GameSessionData):
         """Update player profile based on session data"""
         profile.total_games += 1
@@ -552,6 +552,16 @@ class DecisionExplainer:
         
         logger.info("Cleared old explanations", count=len(to_remove))
     
+    def cleanup_session(self, session_id: str):
+        """Drop cached explanations belonging to a session"""
+        to_remove = [
+            decision_id for decision_id, explanation in self.explanation_cache.items()
+            if explanation.session_id == session_id
+        ]
+        
+        for decision_id in to_remove:
+            del self.explanation_cache[decision_id]
+    
     def get_explanation_stats(self) -> Dict[str, Any]:
         """Get statistics about explanations"""
         total_explanations = len(self.explanation_cache)
@@ -514,15 +514,7 @@ class TacticalMCPServer:
                 
                 from ...core.assets.data_manager import get_data_manager
                 
-                data_manager = get_data_manager()
-                all_talents = data_manager.get_all_talents()
-                
-                # Find the specific talent
-                target_talent = None
-                for talent in all_talents:
-                    if talent.id == talent_id:
-                        target_talent = talent
-                        break
+                target_talent = get_data_manager().get_talent(talent_id)
                 
                 if not target_talent:
                     return json.dumps({"error": f"Talent '{talent_id}' not found"})
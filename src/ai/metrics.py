@@ -0,0 +1,47 @@
+"""
+AI Service Metrics
+
+Prometheus histograms and counters for AI decisions and LLM calls,
+exposed on ``/metrics``.
+"""
+
+from prometheus_client import Counter, Histogram
+
+from ..core.metrics import LATENCY_BUCKETS, get_or_create, bounded_label
+
+DIFFICULTY_LEVELS = ("easy", "normal", "hard", "expert")
+LLM_ENDPOINTS = ("generate", "chat", "embeddings")
+
+# LLM calls run far longer than engine actions
+LLM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+DECISION_LATENCY = get_or_create(
+    Histogram, "apex_ai_decision_seconds",
+    "AI decision latency", ["difficulty", "result"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_LATENCY = get_or_create(
+    Histogram, "apex_ai_llm_call_seconds",
+    "LLM call latency", ["endpoint", "outcome"],
+    buckets=LLM_BUCKETS
+)
+LLM_TIMEOUTS = get_or_create(
+    Counter, "apex_ai_llm_timeouts",
+    "LLM calls that timed out", ["endpoint"]
+)
+
+
+def observe_decision(difficulty, result: str, seconds: float):
+    """Record one AI decision"""
+    DECISION_LATENCY.labels(
+        difficulty=bounded_label(difficulty, DIFFICULTY_LEVELS),
+        result=result
+    ).observe(seconds)
+
+
+def observe_llm_call(endpoint: str, outcome: str, seconds: float):
+    """Record one LLM call; outcome is ok, timeout or error"""
+    endpoint = bounded_label(endpoint, LLM_ENDPOINTS)
+    LLM_LATENCY.labels(endpoint=endpoint, outcome=outcome).observe(seconds)
+    if outcome == "timeout":
+        LLM_TIMEOUTS.labels(endpoint=endpoint).inc()
@@ -14,6 +14,7 @@ import structlog
 import ollama
 
 from .models import ChatMessage, ModelPerformanceMetrics
+from . import metrics
 
 logger = structlog.get_logger()
 
@@ -181,32 +182,10 @@ class OllamaClient:
                 **final_params
             }
             
-            # Log comprehensive Ollama model call details
-            logger.info("🤖 OLLAMA MODEL CALL",
-                       model_name=model,
-                       prompt=prompt[:200] + "..." if len(prompt) > 200 else prompt,
-                       prompt_length=len(prompt),
-                       temperature=final_params.get("temperature"),
-                       max_tokens=kwargs.get("max_tokens"),
-                       num_predict=final_params.get("num_predict"),
-                       top_p=final_params.get("top_p"),
-                       top_k=final_params.get("top_k"),
-                       repeat_penalty=final_params.get("repeat_penalty"),
-                       num_ctx=final_params.get("num_ctx"),
-                       mirostat=final_params.get("mirostat"),
-                       mirostat_eta=final_params.get("mirostat_eta"),
-                       mirostat_tau=final_params.get("mirostat_tau"),
-                       seed=final_params.get("seed"),
-                       stop=final_params.get("stop"),
-                       tfs_z=final_params.get("tfs_z"),
-                       typical_p=final_params.get("typical_p"),
-                       repeat_last_n=final_params.get("repeat_last_n"),
-                       presence_penalty=final_params.get("presence_penalty"),
-                       frequency_penalty=final_params.get("frequency_penalty"),
-                       stream=final_params.get("stream"),
-                       provided_args=list(kwargs.keys()),
-                       default_args=[k for k in defaults.keys() if k not in kwargs],
-                       api_endpoint="generate")
+            logger.debug("Ollama generate call",
+                        model=model,
+                        prompt_length=len(prompt),
+                        parameters=final_params)
             
             response = await self.client.post(
                 f"{self.base_url}/api/generate",
@@ -220,17 +199,17 @@ class OllamaClient:
             # Update performance stats
             execution_time = time.time() - start_time
             self._update_performance_stats(model, execution_time, len(generated_text))
+            metrics.observe_llm_call("generate", "ok", execution_time)
             
-            logger.info("✅ OLLAMA RESPONSE COMPLETED",
-                       model=model,
-                       prompt_length=len(prompt),
-                       response_length=len(generated_text),
-                       execution_time=execution_time,
-                       tokens_generated=len(generated_text.split()) if generated_text else 0)
+            logger.debug("Ollama generate completed",
+                        model=model,
+                        response_length=len(generated_text),
+                        execution_time=execution_time)
             
             return generated_text
             
         except httpx.HTTPStatusError as e:
+            metrics.observe_llm_call("generate", "error", time.time() - start_time)
             logger.error("❌ OLLAMA HTTP ERROR", 
                         model=model, 
                         prompt_length=len(prompt),
@@ -239,6 +218,7 @@ class OllamaClient:
                         parameters=final_params)
             raise
         except httpx.TimeoutException as e:
+            metrics.observe_llm_call("generate", "timeout", time.time() - start_time)
             logger.error("❌ OLLAMA TIMEOUT", 
                         model=model, 
                         prompt_length=len(prompt),
@@ -247,6 +227,7 @@ class OllamaClient:
                         parameters=final_params)
             raise
         except Exception as e:
+            metrics.observe_llm_call("generate", "error", time.time() - start_time)
             logger.error("❌ OLLAMA GENERATE FAILED", 
                         model=model, 
                         prompt_length=len(prompt),
@@ -282,7 +263,6 @@ class OllamaClient:
         
         # Calculate total message length for logging
         total_message_length = sum(len(msg.get("content", "")) for msg in messages)
-        messages_summary = [{"role": msg.get("role", "unknown"), "content_length": len(msg.get("content", ""))} for msg in messages]
         
         try:
             # Build request with all parameters
@@ -292,33 +272,11 @@ class OllamaClient:
                 **final_params
             }
             
-            # Log comprehensive Ollama chat call details
-            logger.info("🤖 OLLAMA CHAT CALL",
-                       model_name=model,
-                       messages_count=len(messages),
-                       total_message_length=total_message_length,
-                       messages_summary=messages_summary,
-                       temperature=final_params.get("temperature"),
-                       max_tokens=kwargs.get("max_tokens"),
-                       num_predict=final_params.get("num_predict"),
-                       top_p=final_params.get("top_p"),
-                       top_k=final_params.get("top_k"),
-                       repeat_penalty=final_params.get("repeat_penalty"),
-                       num_ctx=final_params.get("num_ctx"),
-                       mirostat=final_params.get("mirostat"),
-                       mirostat_eta=final_params.get("mirostat_eta"),
-                       mirostat_tau=final_params.get("mirostat_tau"),
-                       seed=final_params.get("seed"),
-                       stop=final_params.get("stop"),
-                       tfs_z=final_params.get("tfs_z"),
-                       typical_p=final_params.get("typical_p"),
-                       repeat_last_n=final_params.get("repeat_last_n"),
-                       presence_penalty=final_params.get("presence_penalty"),
-                       frequency_penalty=final_params.get("frequency_penalty"),
-                       stream=final_params.get("stream"),
-                       provided_args=list(kwargs.keys()),
-                       default_args=[k for k in defaults.keys() if k not in kwargs],
-                       api_endpoint="chat")
+            logger.debug("Ollama chat call",
+                        model=model,
+                        messages_count=len(messages),
+                        total_message_length=total_message_length,
+                        parameters=final_params)
             
             response = await self.client.post(
                 f"{self.base_url}/api/chat",
@@ -332,18 +290,18 @@ class OllamaClient:
             # Update performance stats
             execution_time = time.time() - start_time
             self._update_performance_stats(model, execution_time, len(message_content))
+            metrics.observe_llm_call("chat", "ok", execution_time)
             
-            logger.info("✅ OLLAMA CHAT COMPLETED",
-                       model=model,
-                       messages_count=len(messages),
-                       total_input_length=total_message_length,
-                       response_length=len(message_content),
-                       execution_time=execution_time,
-                       tokens_generated=len(message_content.split()) if message_content else 0)
+            logger.debug("Ollama chat completed",
+                        model=model,
+                        response_length=len(message_content),
+                        execution_time=execution_time)
             
             return message_content
             
         except Exception as e:
+            outcome = "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+            metrics.observe_llm_call("chat", outcome, time.time() - start_time)
             logger.error("❌ OLLAMA CHAT FAILED", 
                         model=model, 
                         messages_count=len(messages),
@@ -354,6 +312,7 @@ class OllamaClient:
     
     async def embeddings(self, model: str, prompt: str) -> List[float]:
         """Generate embeddings for text"""
+        start_time = time.time()
         try:
             response = await self.client.post(
                 f"{self.base_url}/api/embeddings",
@@ -365,9 +324,12 @@ class OllamaClient:
             response.raise_for_status()
             
             data = response.json()
+            metrics.observe_llm_call("embeddings", "ok", time.time() - start_time)
             return data.get("embedding", [])
             
         except Exception as e:
+            outcome = "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+            metrics.observe_llm_call("embeddings", outcome, time.time() - start_time)
             logger.error("Embeddings generation failed", model=model, error=str(e))
             raise
     
@@ -410,10 +372,7 @@ class OllamaClient:
     
     async def tactical_analysis_prompt(self, game_state: Dict[str, Any], unit_id: str) -> str:
         """Generate a tactical analysis using LLM"""
-        logger.info("🎯 GENERATING TACTICAL ANALYSIS", 
-                   unit_id=unit_id, 
-                   game_state_keys=list(game_state.keys()),
-                   prompt_type="tactical_analysis")
+        logger.debug("Generating tactical analysis", unit_id=unit_id)
         
         # ULTRA-short prompt for maximum speed
         prompt = f"{unit_id}: Move"
@@ -422,9 +381,7 @@ class OllamaClient:
     
     async def strategic_analysis_prompt(self, game_state: Dict[str, Any]) -> str:
         """Generate a strategic analysis using LLM"""
-        logger.info("🧠 GENERATING STRATEGIC ANALYSIS", 
-                   game_state_keys=list(game_state.keys()),
-                   prompt_type="strategic_analysis")
+        logger.debug("Generating strategic analysis")
         
         # ULTRA-short prompt for maximum speed  
         prompt = "Good"
@@ -434,12 +391,7 @@ class OllamaClient:
     async def decision_making_prompt(self, game_state: Dict[str, Any], unit_id: str, 
                                    available_actions: List[str], difficulty: str) -> str:
         """Generate a decision using LLM reasoning"""
-        logger.info("🎲 GENERATING DECISION", 
-                   unit_id=unit_id, 
-                   difficulty=difficulty,
-                   available_actions=available_actions,
-                   game_state_keys=list(game_state.keys()),
-                   prompt_type="decision_making")
+        logger.debug("Generating decision", unit_id=unit_id, difficulty=difficulty)
         
         difficulty_context = {
             "easy": "Make conservative, safe decisions that minimize risk.",
@@ -456,10 +408,7 @@ class OllamaClient:
     
     async def evaluate_unit_prompt(self, unit_data: Dict[str, Any], battlefield_context: Dict[str, Any]) -> str:
         """Generate a unit evaluation using LLM"""
-        logger.info("📊 GENERATING UNIT EVALUATION", 
-                   unit_data_keys=list(unit_data.keys()),
-                   battlefield_context_keys=list(battlefield_context.keys()),
-                   prompt_type="unit_evaluation")
+        logger.debug("Generating unit evaluation")
         
         # ULTRA-short prompt for maximum speed
         prompt = "0.7"
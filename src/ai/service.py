@@ -32,6 +32,9 @@ from .adaptive_difficulty import AdaptiveDifficultySystem
 from .decision_explainer import DecisionExplainer, ExplanationLevel
 from .performance_optimizer import PerformanceOptimizer, OptimizationType
 from .test_ai_behaviors import AIBehaviorTester
+from ..core.session_registry import SessionRegistry, SessionRegistryConfig
+from ..core.metrics import metrics_response, register_cache_source, install_cache_collector
+from . import metrics
 
 # Configure structured logging
 structlog.configure(
@@ -63,11 +66,12 @@ difficulty_system: Optional[AdaptiveDifficultySystem] = None
 decision_explainer: Optional[DecisionExplainer] = None
 performance_optimizer: Optional[PerformanceOptimizer] = None
 behavior_tester: Optional[AIBehaviorTester] = None
+session_registry: Optional[SessionRegistry] = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
-    global ollama_client, tactical_ai, strategic_ai, websocket_handler, difficulty_system, decision_explainer, performance_optimizer, behavior_tester
+    global ollama_client, tactical_ai, strategic_ai, websocket_handler, difficulty_system, decision_explainer, performance_optimizer, behavior_tester, session_registry
     
     logger.info("Starting AI Service with Ollama")
     
@@ -85,6 +89,13 @@ async def lifespan(app: FastAPI):
     # Initialize decision explainer
     decision_explainer = DecisionExplainer()
     
+    # Per-session AI state is released on idle eviction; nothing here is
+    # pageable and decisions never page sessions back in, so don't page out
+    session_registry = SessionRegistry(SessionRegistryConfig(page_out_idle=False))
+    session_registry.register_subsystem("adaptive_difficulty", difficulty_system.cleanup_session)
+    session_registry.register_subsystem("decision_explainer", decision_explainer.cleanup_session)
+    session_registry.start()
+    
     # Initialize performance optimizer
     performance_optimizer = PerformanceOptimizer({
         "cache_size": 1000,
@@ -93,6 +104,12 @@ async def lifespan(app: FastAPI):
         "batch_size": 10
     })
     
+    # Decision cache hit ratio is read at scrape time
+    register_cache_source("ai_decisions", lambda: (
+        performance_optimizer.metrics.cache_hits, performance_optimizer.metrics.cache_misses
+    ))
+    install_cache_collector()
+    
     # Initialize behavior tester
     behavior_tester = AIBehaviorTester()
     
@@ -110,6 +127,8 @@ async def lifespan(app: FastAPI):
     
     # Cleanup
     logger.info("Shutting down AI Service")
+    if session_registry:
+        await session_registry.stop()
     if performance_optimizer:
         await performance_optimizer.shutdown()
     if websocket_handler:
@@ -155,6 +174,11 @@ async def health_check():
         "ollama_status": ollama_status
     }
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics"""
+    return metrics_response()
+
 # AI decision-making endpoints
 @app.post("/ai/decide", response_model=AIDecisionResponse)
 async def make_ai_decision(request: AIDecisionRequest) -> AIDecisionResponse:
@@ -170,7 +194,19 @@ async def make_ai_decision(request: AIDecisionRequest) -> AIDecisionResponse:
                    unit_id=request.unit_id,
                    difficulty=request.difficulty_level)
         
-        decision = await tactical_ai.make_decision(request)
+        if session_registry:
+            session_registry.track(request.session_id)
+            session_registry.touch(request.session_id)
+        
+        decision_start = time.perf_counter()
+        try:
+            decision = await tactical_ai.make_decision(request)
+        except Exception:
+            metrics.observe_decision(request.difficulty_level, "error",
+                                     time.perf_counter() - decision_start)
+            raise
+        metrics.observe_decision(request.difficulty_level, "success",
+                                 time.perf_counter() - decision_start)
         
         logger.info("AI decision completed",
                    session_id=request.session_id,
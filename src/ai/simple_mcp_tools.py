@@ -6,9 +6,11 @@ the full action management system. This allows AI agents to control units using
 only MCP tools.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 from dataclasses import dataclass
 
+from core.assets.catalog import Catalog, TalentEntry, get_catalog
+
 
 @dataclass
 class ToolResult:
@@ -25,6 +27,11 @@ class SimpleMCPToolRegistry:
     def __init__(self, game_controller):
         """Initialize with game controller reference."""
         self.game_controller = game_controller
+        
+        # Catalog talent IDs reaching each distance, read off the catalog's range index
+        self._reach_catalog: Optional[Catalog] = None
+        self._talents_reaching: Dict[int, FrozenSet[str]] = {}
+        
         self.tools = {
             'get_game_state': self._get_game_state,
             'get_unit_details': self._get_unit_details,
@@ -1080,6 +1087,9 @@ class SimpleMCPToolRegistry:
             move_positions = self._get_all_move_positions(unit, current_move_points)
             move_positions.append({'x': unit.x, 'y': unit.y, 'distance': 0})  # Include staying put
             
+            # Hotkey talents don't change between candidate positions
+            talent_profiles = self._get_combat_talent_profiles(unit)
+            
             # For each move position, calculate possible actions
             for move_pos in move_positions:
                 move_distance = move_pos['distance']
@@ -1093,7 +1103,7 @@ class SimpleMCPToolRegistry:
                 
                 # Calculate damage potential from this position
                 damage_options = self._calculate_damage_from_position(
-                    unit, move_pos, enemy_units, ap_after_move
+                    unit, move_pos, enemy_units, ap_after_move, talent_profiles
                 )
                 
                 # Create combination entry
@@ -1153,9 +1163,12 @@ class SimpleMCPToolRegistry:
         
         return positions
     
-    def _calculate_damage_from_position(self, unit, position, enemy_units, available_ap) -> List[Dict[str, Any]]:
+    def _calculate_damage_from_position(self, unit, position, enemy_units, available_ap,
+                                        talent_profiles=None) -> List[Dict[str, Any]]:
         """Calculate damage potential from a specific position."""
         damage_options = []
+        if talent_profiles is None:
+            talent_profiles = self._get_combat_talent_profiles(unit)
         
         try:
             unit_x, unit_y = position['x'], position['y']
@@ -1185,7 +1198,9 @@ class SimpleMCPToolRegistry:
                     })
                 
                 # Get talent options first
-                talent_options = self._get_talent_damage_options(unit, enemy, distance, available_ap)
+                talent_options = self._get_talent_damage_options(
+                    unit, enemy, distance, available_ap, talent_profiles
+                )
                 has_combat_talents = len(talent_options) > 0
                 
                 # Debug talent detection (comment out when not needed)
@@ -1218,9 +1233,9 @@ class SimpleMCPToolRegistry:
         
         return damage_options
     
-    def _get_talent_damage_options(self, unit, enemy, distance, available_ap) -> List[Dict[str, Any]]:
-        """Get talent damage options for a specific enemy."""
-        talent_options = []
+    def _get_combat_talent_profiles(self, unit) -> List[Dict[str, Any]]:
+        """Resolve a unit's offensive hotkey talents once per analysis."""
+        profiles = []
         
         try:
             if hasattr(unit, 'character_instance_id'):
@@ -1230,67 +1245,99 @@ class SimpleMCPToolRegistry:
                     hotkey_abilities = character.hotkey_abilities
                     
                     if isinstance(hotkey_abilities, list):
+                        catalog = get_catalog()
+                        magic_range = getattr(unit, 'magic_range', 2)
                         for slot_index, ability_data in enumerate(hotkey_abilities):
-                            if ability_data is not None:
-                                talent_id = ability_data.get('talent_id', f'talent_{slot_index + 1}')
-                                talent_name = ability_data.get('name', 'Unknown Talent')
-                                
-                                # Get talent costs - handle both old and new format
-                                cost_data = ability_data.get('cost', {})
-                                ap_cost = cost_data.get('ap_cost', cost_data.get('ap', 1))
-                                
-                                # Get talent range (default to magic range)
-                                talent_range = ability_data.get('range', getattr(unit, 'magic_range', 2))
-                                
-                                # Check if we can afford this talent
-                                if ap_cost > available_ap:
-                                    continue
-                                
-                                # Check if enemy is in range
-                                if distance > talent_range:
-                                    continue
-                                
-                                action_type = ability_data.get('action_type', 'attack').lower()
-                                
-                                # Only create damage options for offensive talents
-                                # Combat talents typically have these action types or damage effects
-                                is_combat_talent = (
-                                    action_type in ['attack', 'ability', 'spell', 'magic', 'combat'] or
-                                    'damage' in str(ability_data.get('effects', {})).lower() or
-                                    'attack' in talent_name.lower() or
-                                    'strike' in talent_name.lower() or
-                                    'blast' in talent_name.lower() or
-                                    'bolt' in talent_name.lower()
-                                )
-                                
-                                if is_combat_talent:
-                                    # Calculate talent damage - use the higher of physical or magical attack
-                                    physical_damage = max(1, getattr(unit, 'physical_attack', 10) - enemy['physical_defense'])
-                                    magical_damage = max(1, getattr(unit, 'magical_attack', 8) - enemy['magical_defense'])
-                                    base_talent_damage = max(physical_damage, magical_damage)
-                                    
-                                    # Boost talent damage significantly to make them competitive with basic attacks
-                                    talent_damage = int(base_talent_damage * 1.5)  # 50% bonus for talents
-                                    
-                                    talent_option = {
-                                        'action_type': 'talent',
-                                        'talent_id': talent_id,
-                                        'talent_name': talent_name,
-                                        'slot_index': slot_index,
-                                        'target': enemy['name'],
-                                        'target_position': enemy['position'],
-                                        'ap_cost': ap_cost,
-                                        'damage': talent_damage,
-                                        'total_damage': talent_damage,
-                                        'can_kill': talent_damage >= enemy['hp']
-                                    }
-                                    talent_options.append(talent_option)
+                            if ability_data is None:
+                                continue
+                            
+                            # Catalog entries carry the offensive classification and range;
+                            # talents outside the catalog are classified the same way
+                            talent_id = ability_data.get('talent_id', f'talent_{slot_index + 1}')
+                            entry = catalog.talent(talent_id)
+                            indexed = entry is not None and entry.range > 0
+                            if entry is None:
+                                entry = TalentEntry.from_dict({**ability_data, 'id': talent_id})
+                            
+                            # Only offensive talents produce damage options
+                            if not entry.offensive:
+                                continue
+                            
+                            profiles.append({
+                                'talent_id': talent_id,
+                                'talent_name': ability_data.get('name', entry.name),
+                                'slot_index': slot_index,
+                                'ap_cost': entry.ap_cost,
+                                # None: reach comes from the catalog's range index;
+                                # talents without a range reach as far as the unit's magic
+                                'range': None if indexed else (
+                                    entry.range or ability_data.get('range', magic_range))
+                            })
         
         except Exception as e:
             print(f"⚠️ Error getting talent options: {e}")
         
+        return profiles
+    
+    def _get_talent_damage_options(self, unit, enemy, distance, available_ap,
+                                   talent_profiles=None) -> List[Dict[str, Any]]:
+        """Get talent damage options for a specific enemy."""
+        if talent_profiles is None:
+            talent_profiles = self._get_combat_talent_profiles(unit)
+        
+        talent_options = []
+        base_talent_damage = None
+        reaching = None
+        
+        for profile in talent_profiles:
+            # Check if we can afford this talent and the enemy is in range
+            if profile['ap_cost'] > available_ap:
+                continue
+            if profile['range'] is None:
+                if reaching is None:
+                    reaching = self._catalog_talents_reaching(distance)
+                if profile['talent_id'] not in reaching:
+                    continue
+            elif distance > profile['range']:
+                continue
+            
+            if base_talent_damage is None:
+                # Calculate talent damage - use the higher of physical or magical attack
+                physical_damage = max(1, getattr(unit, 'physical_attack', 10) - enemy['physical_defense'])
+                magical_damage = max(1, getattr(unit, 'magical_attack', 8) - enemy['magical_defense'])
+                base_talent_damage = max(physical_damage, magical_damage)
+            
+            # Boost talent damage significantly to make them competitive with basic attacks
+            talent_damage = int(base_talent_damage * 1.5)  # 50% bonus for talents
+            
+            talent_options.append({
+                'action_type': 'talent',
+                'talent_id': profile['talent_id'],
+                'talent_name': profile['talent_name'],
+                'slot_index': profile['slot_index'],
+                'target': enemy['name'],
+                'target_position': enemy['position'],
+                'ap_cost': profile['ap_cost'],
+                'damage': talent_damage,
+                'total_damage': talent_damage,
+                'can_kill': talent_damage >= enemy['hp']
+            })
+        
         return talent_options
     
+    def _catalog_talents_reaching(self, distance: int) -> FrozenSet[str]:
+        """IDs of catalog talents whose range reaches ``distance``, memoized per catalog."""
+        catalog = get_catalog()
+        if catalog is not self._reach_catalog:
+            self._reach_catalog = catalog
+            self._talents_reaching = {}
+        
+        reaching = self._talents_reaching.get(distance)
+        if reaching is None:
+            reaching = frozenset(entry.id for entry in catalog.talents_in_range(distance))
+            self._talents_reaching[distance] = reaching
+        return reaching
+    
     def _find_optimal_combination(self, combinations) -> Dict[str, Any]:
         """Find the optimal move-action combination."""
         if not combinations:
@@ -12,11 +12,15 @@ from enum import Enum
 import random
 import time
 
+from core.utils.logging import Logger, DEBUG
+
 try:
     from ai.mcp_tools import MCPToolRegistry, ToolResult
 except ImportError:
     from ai.simple_mcp_tools import SimpleMCPToolRegistry as MCPToolRegistry, ToolResult
 
+logger = Logger.get_logger(__name__)
+
 
 class AIPersonality(Enum):
     """AI personality types affecting decision making."""
@@ -150,24 +154,25 @@ class UnitAIController:
         start_time = time.time()
         
         try:
-            print(f"🧠 AI Agent {self.unit_id} making decision...")
+            logger.debug("AI agent making decision", unit_id=self.unit_id)
             
             # Gather decision context
             context = self._gather_decision_context(assignment)
             if not context:
-                print(f"❌ AI Agent {self.unit_id}: Failed to gather decision context")
+                logger.warning("AI agent failed to gather decision context", unit_id=self.unit_id)
                 return None
             
-            print(f"🔍 AI Agent {self.unit_id}: Context gathered - {len(context.available_actions)} actions available")
-            print(f"🔍 Available action types: {[action.get('type', 'undefined_action') for action in context.available_actions]}")
+            if logger.is_enabled(DEBUG):
+                logger.debug("AI agent context gathered", unit_id=self.unit_id,
+                             types=[action.get('type', 'undefined_action') for action in context.available_actions])
             
             # Make decision based on skill level
             decision = self._make_skill_based_decision(context, time_limit_ms)
             
             if decision:
-                print(f"✅ AI Agent {self.unit_id}: Decision made - {decision.action_id}")
+                logger.debug("AI agent decision made", unit_id=self.unit_id, action=decision.action_id)
             else:
-                print(f"❌ AI Agent {self.unit_id}: No valid decision could be made")
+                logger.debug("AI agent found no valid decision", unit_id=self.unit_id)
             
             # Record decision
             if decision:
@@ -177,34 +182,32 @@ class UnitAIController:
             return decision
             
         except Exception as e:
-            print(f"❌ AI decision error for {self.unit_id}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("AI decision error", unit_id=self.unit_id, error=str(e))
             return None
     
     def _gather_decision_context(self, assignment: Optional[str]) -> Optional[DecisionContext]:
         """Gather all information needed for decision making."""
-        print(f"📊 AI Agent {self.unit_id}: Gathering decision context...")
+        logger.debug("AI agent gathering decision context", unit_id=self.unit_id)
         
         # Get tactical analysis (new comprehensive approach)
         tactical_result = self.tool_registry.execute_tool('get_tactical_analysis', unit_id=self.unit_id)
         if not tactical_result.success:
-            print(f"❌ Failed to get tactical analysis: {tactical_result.error_message}")
+            logger.warning("Failed to get tactical analysis", unit_id=self.unit_id, error=tactical_result.error_message)
             return None
-        print(f"✅ Tactical analysis retrieved successfully")
+        logger.debug("Tactical analysis retrieved", unit_id=self.unit_id)
         
         tactical_data = tactical_result.data
         
         # Get unit details
         unit_result = self.tool_registry.execute_tool('get_unit_details', unit_id=self.unit_id)
         if not unit_result.success:
-            print(f"❌ Failed to get unit details: {unit_result.error_message}")
+            logger.warning("Failed to get unit details", unit_id=self.unit_id, error=unit_result.error_message)
             return None
-        print(f"✅ Unit details retrieved successfully")
+        logger.debug("Unit details retrieved", unit_id=self.unit_id)
         
         # Convert tactical analysis to available actions format
         available_actions = self._convert_tactical_to_actions(tactical_data)
-        print(f"✅ Converted tactical analysis to {len(available_actions)} available actions")
+        logger.debug("Converted tactical analysis to actions", unit_id=self.unit_id, actions=len(available_actions))
         
         # Create simplified battlefield state from tactical data
         battlefield_state = {
@@ -311,7 +314,7 @@ class UnitAIController:
             actions.sort(key=lambda x: x.get('total_damage', 0), reverse=True)
             
         except Exception as e:
-            print(f"⚠️ Error converting tactical to actions: {e}")
+            logger.warning("Error converting tactical analysis to actions", unit_id=self.unit_id, error=str(e))
         
         return actions
     
@@ -428,7 +431,7 @@ class UnitAIController:
             import asyncio
             import json
             
-            print(f"🧠 AI Agent {self.unit_id}: Using Ollama LLM for learning decision...")
+            logger.debug("AI agent using Ollama for learning decision", unit_id=self.unit_id)
             
             # Initialize Ollama client
             ollama_client = OllamaClient()
@@ -462,7 +465,7 @@ class UnitAIController:
                 
                 decision_response = loop.run_until_complete(get_ollama_decision())
                 
-                print(f"🤖 Ollama decision response: {decision_response[:200]}...")
+                logger.debug("Ollama decision response", unit_id=self.unit_id, response=decision_response[:200])
                 
                 # Parse Ollama response and convert to ActionDecision
                 try:
@@ -501,13 +504,13 @@ class UnitAIController:
                         decision.talent_id = selected_action.get('talent_id')
                         decision.talent_name = selected_action.get('talent_name')
                         
-                        print(f"✅ AI Agent {self.unit_id}: Ollama decision successful - {chosen_action}")
+                        logger.debug("Ollama decision successful", unit_id=self.unit_id, action=chosen_action)
                         return decision
                     else:
-                        print(f"⚠️ AI Agent {self.unit_id}: Ollama chose unknown action '{chosen_action}', falling back")
+                        logger.warning("Ollama chose unknown action, falling back", unit_id=self.unit_id, action=chosen_action)
                         
                 except (json.JSONDecodeError, KeyError, ValueError) as e:
-                    print(f"⚠️ AI Agent {self.unit_id}: Failed to parse Ollama response: {e}")
+                    logger.warning("Failed to parse Ollama response", unit_id=self.unit_id, error=str(e))
                     
             finally:
                 # Clean up the event loop
@@ -521,10 +524,10 @@ class UnitAIController:
                 loop.close()
                 
         except Exception as e:
-            print(f"⚠️ AI Agent {self.unit_id}: Ollama integration failed: {e}")
+            logger.warning("Ollama integration failed", unit_id=self.unit_id, error=str(e))
         
         # Fallback to adaptive decision
-        print(f"🔄 AI Agent {self.unit_id}: Falling back to adaptive decision making")
+        logger.debug("Falling back to adaptive decision making", unit_id=self.unit_id)
         decision = self._make_adaptive_decision(context)
         if not decision:
             return None
@@ -667,7 +670,7 @@ class UnitAIController:
         
         if not reachable_enemies:
             # No enemies in range, find closest one for movement
-            print(f"🔍 No enemies in range (attack: {attack_range}, magic: {magic_range}), finding closest")
+            logger.debug("No enemies in range, finding closest", attack_range=attack_range, magic_range=magic_range)
             nearest_enemy = min(enemy_units, 
                               key=lambda u: abs(u['x'] - my_x) + abs(u['y'] - my_y))
             return {'x': nearest_enemy['x'], 'y': nearest_enemy['y']}
@@ -698,7 +701,7 @@ class UnitAIController:
         # Select best target
         if target_scores:
             best_enemy = max(target_scores, key=lambda x: x[1])[0]
-            print(f"🎯 Selected target: ({best_enemy['x']}, {best_enemy['y']}) - {best_enemy['name']}")
+            logger.debug("Selected target", x=best_enemy['x'], y=best_enemy['y'], target=best_enemy['name'])
             return {'x': best_enemy['x'], 'y': best_enemy['y']}
         
         return None
@@ -774,31 +777,33 @@ class UnitAIController:
     def execute_turn(self, unit, game_state):
         """Execute a complete turn for an AI-controlled unit using only MCP tools."""
         try:
-            print(f"🤖 AI Agent {unit.name} starting turn execution...")
+            logger.info("AI agent starting turn", unit=unit.name)
             
             # Log available MCP tools for debugging
-            print(f"🔧 Available MCP tools: {list(self.tool_registry.tools.keys())}")
+            if logger.is_enabled(DEBUG):
+                logger.debug("Available MCP tools", tools=list(self.tool_registry.tools.keys()))
             
             # Test basic tool connectivity
             game_state_result = self.tool_registry.execute_tool('get_game_state')
             if game_state_result.success:
-                print(f"✅ Game state retrieved: {len(game_state_result.data.get('units', []))} units on battlefield")
+                logger.debug("Game state retrieved", units=len(game_state_result.data.get('units', [])))
             else:
-                print(f"❌ Failed to get game state: {game_state_result.error_message}")
+                logger.warning("Failed to get game state", error=game_state_result.error_message)
             
             unit_details_result = self.tool_registry.execute_tool('get_unit_details', unit_id=self.unit_id)
             if unit_details_result.success:
                 unit_data = unit_details_result.data
-                print(f"✅ Unit details retrieved: {unit_data.get('name')} at ({unit_data.get('x')}, {unit_data.get('y')}) with {unit_data.get('ap')} AP")
+                logger.debug("Unit details retrieved", unit=unit_data.get('name'), x=unit_data.get('x'), y=unit_data.get('y'), ap=unit_data.get('ap'))
             else:
-                print(f"❌ Failed to get unit details: {unit_details_result.error_message}")
+                logger.warning("Failed to get unit details", error=unit_details_result.error_message)
             
             available_actions_result = self.tool_registry.execute_tool('get_available_actions', unit_id=self.unit_id)
             if available_actions_result.success:
                 actions = available_actions_result.data.get('actions', [])
-                print(f"✅ Available actions: {[action.get('type') for action in actions]} ({len(actions)} total)")
+                if logger.is_enabled(DEBUG):
+                    logger.debug("Available actions", types=[action.get('type') for action in actions])
             else:
-                print(f"❌ Failed to get available actions: {available_actions_result.error_message}")
+                logger.warning("Failed to get available actions", error=available_actions_result.error_message)
             
             # Continue making decisions and executing actions until we should end turn
             actions_taken = 0
@@ -811,10 +816,10 @@ class UnitAIController:
                 decision = self.make_decision()
                 
                 if not decision:
-                    print(f"🤖 AI Agent {unit.name}: No valid decisions available, ending turn")
+                    logger.debug("No valid decisions available, ending turn", unit=unit.name)
                     break
                 
-                print(f"🤖 AI Agent {unit.name}: Decided to {decision.action_id}")
+                logger.debug("AI agent decided", unit=unit.name, action=decision.action_id)
                 
                 # Execute the decided action using MCP tools
                 actions_taken += 1  # Increment before execution for proper numbering
@@ -822,37 +827,37 @@ class UnitAIController:
                 
                 if action_result:
                     failed_actions = 0  # Reset failed action counter on success
-                    print(f"🤖 AI Agent {unit.name}: Action #{actions_taken} completed successfully")
+                    logger.debug("Action completed", unit=unit.name, action_number=actions_taken)
                     
                     # Check if we should end the turn
                     if self._should_end_turn(unit, actions_taken):
-                        print(f"🤖 AI Agent {unit.name}: Ending turn (insufficient AP or tactical decision)")
+                        logger.debug("Ending turn (insufficient AP or tactical decision)", unit=unit.name)
                         break
                 else:
                     failed_actions += 1  # Increment consecutive failed actions
-                    print(f"🤖 AI Agent {unit.name}: Action #{actions_taken} failed, consuming 1 AP as penalty ({failed_actions} consecutive failures)")
+                    logger.warning("Action failed, consuming 1 AP as penalty", unit=unit.name, action_number=actions_taken, consecutive_failures=failed_actions)
                     
                     # Consume AP for failed action to prevent infinite loops
                     current_ap = getattr(unit, 'ap', 0)
                     if current_ap > 0:
                         unit.ap -= 1
-                        print(f"⚡ AI Agent {unit.name}: AP reduced to {unit.ap} due to failed action")
+                        logger.debug("AP reduced after failed action", unit=unit.name, ap=unit.ap)
                     
                     # Check if we should end the turn after failed action
                     if self._should_end_turn(unit, actions_taken):
-                        print(f"🤖 AI Agent {unit.name}: Ending turn after failed action (insufficient AP)")
+                        logger.debug("Ending turn after failed action (insufficient AP)", unit=unit.name)
                         break
                     
                     # Check if too many consecutive failures
                     if failed_actions >= max_failed_actions:
-                        print(f"🤖 AI Agent {unit.name}: Too many consecutive failures ({failed_actions}), ending turn")
+                        logger.warning("Too many consecutive failures, ending turn", unit=unit.name, consecutive_failures=failed_actions)
                         break
                     
             # End the turn using MCP tools
             self._end_turn_via_mcp(unit)
             
         except Exception as e:
-            print(f"❌ AI Agent {unit.name} turn execution failed: {e}")
+            logger.error("AI turn execution failed", unit=unit.name, error=str(e))
             # Fallback: end turn via MCP tools
             self._end_turn_via_mcp(unit)
     
@@ -860,10 +865,9 @@ class UnitAIController:
         """Execute an action using only MCP tools."""
         try:
             action_type = decision.action_id
-            print(f"🎮 Executing action #{action_number}: {action_type} for {unit.name}")
-            print(f"   Target positions: {decision.target_positions}")
-            print(f"   Reasoning: {decision.reasoning}")
-            print(f"   Confidence: {decision.confidence}")
+            logger.debug("Executing action", action_number=action_number, action_type=action_type, unit=unit.name,
+                         target_positions=decision.target_positions, reasoning=decision.reasoning,
+                         confidence=decision.confidence)
             
             # The new tactical analysis provides pre-calculated move-action combinations
             # We need to extract the move and action components from the decision
@@ -877,7 +881,7 @@ class UnitAIController:
             
             # Execute movement first if needed
             if move_to and (move_to.get('x') != unit.x or move_to.get('y') != unit.y):
-                print(f"🚶 Action #{action_number} - Moving to ({move_to['x']}, {move_to['y']}) first")
+                logger.debug("Moving before action", action_number=action_number, x=move_to['x'], y=move_to['y'])
                 move_result = self.tool_registry.execute_tool(
                     'move_unit',
                     unit_id=self.unit_id,
@@ -885,9 +889,9 @@ class UnitAIController:
                     target_y=move_to['y']
                 )
                 if not move_result.success:
-                    print(f"❌ Action #{action_number} - Movement failed: {move_result.error_message}")
+                    logger.warning("Pre-action movement failed", action_number=action_number, error=move_result.error_message)
                     return False
-                print(f"✅ Action #{action_number} - Movement successful: {move_result.data}")
+                logger.debug("Pre-action movement successful", action_number=action_number, result=move_result.data)
             
             # Execute the action based on the original action type from tactical analysis
             original_action_type = getattr(decision, 'original_action_type', action_type)
@@ -899,25 +903,25 @@ class UnitAIController:
             elif original_action_type == "talent":
                 return self._execute_talent_via_mcp(decision, unit, action_number)
             elif action_type == "wait":
-                print(f"💤 Action #{action_number} - {unit.name} waits (no action taken)")
+                logger.debug("Unit waits", action_number=action_number, unit=unit.name)
                 return True
             else:
-                print(f"⚠️ Action #{action_number} - Unknown action type: {action_type} (original: {original_action_type})")
+                logger.warning("Unknown action type", action_number=action_number, action_type=action_type, original=original_action_type)
                 return False
                 
         except Exception as e:
-            print(f"❌ MCP action execution failed: {e}")
+            logger.error("MCP action execution failed", error=str(e))
             return False
     
     def _execute_move_via_mcp(self, decision: ActionDecision, unit) -> bool:
         """Execute movement using MCP move_unit tool."""
         try:
             if not decision.target_positions or len(decision.target_positions) == 0:
-                print(f"❌ Move action failed: No target positions provided")
+                logger.warning("Move action failed: no target positions provided")
                 return False
                 
             target_pos = decision.target_positions[0]  # Use first target position
-            print(f"🚶 Attempting to move {unit.name} to ({target_pos['x']}, {target_pos['y']})")
+            logger.debug("Attempting move", unit=unit.name, x=target_pos['x'], y=target_pos['y'])
             
             result = self.tool_registry.execute_tool(
                 'move_unit', 
@@ -927,24 +931,24 @@ class UnitAIController:
             )
             
             if result.success:
-                print(f"✅ Move successful: {result.data}")
+                logger.debug("Move successful", result=result.data)
             else:
-                print(f"❌ Move failed: {result.error_message}")
+                logger.warning("Move failed", error=result.error_message)
                 
             return result.success
         except Exception as e:
-            print(f"❌ MCP move exception: {e}")
+            logger.error("MCP move exception", error=str(e))
             return False
     
     def _execute_attack_via_mcp(self, decision: ActionDecision, unit, action_number: int = 1) -> bool:
         """Execute attack using MCP attack_unit tool."""
         try:
             if not decision.target_positions or len(decision.target_positions) == 0:
-                print(f"❌ Action #{action_number} - Attack action failed: No target positions provided")
+                logger.warning("Attack action failed: no target positions provided", action_number=action_number)
                 return False
                 
             target_pos = decision.target_positions[0]  # Use first target position
-            print(f"⚔️ Action #{action_number} - Attempting to attack from {unit.name} to ({target_pos['x']}, {target_pos['y']})")
+            logger.debug("Attempting attack", action_number=action_number, unit=unit.name, x=target_pos['x'], y=target_pos['y'])
             
             # Track the target unit for AI targeting system
             self._set_ai_target(unit, target_pos)
@@ -960,26 +964,26 @@ class UnitAIController:
                 # Check if this was a talent-based attack
                 if hasattr(decision, 'original_action_type') and decision.original_action_type == 'talent':
                     talent_name = getattr(decision, 'talent_name', getattr(decision, 'display_type', decision.action_id))
-                    print(f"✅ Action #{action_number} - Talent attack '{talent_name}' successful: {result.data}")
+                    logger.debug("Talent attack successful", action_number=action_number, talent=talent_name, result=result.data)
                 else:
-                    print(f"✅ Action #{action_number} - Attack successful: {result.data}")
+                    logger.debug("Attack successful", action_number=action_number, result=result.data)
             else:
-                print(f"❌ Action #{action_number} - Attack failed: {result.error_message}")
+                logger.warning("Attack failed", action_number=action_number, error=result.error_message)
                 
             return result.success
         except Exception as e:
-            print(f"❌ Action #{action_number} - MCP attack exception: {e}")
+            logger.error("MCP attack exception", action_number=action_number, error=str(e))
             return False
     
     def _execute_ability_via_mcp(self, decision: ActionDecision, unit, action_number: int = 1) -> bool:
         """Execute ability using MCP cast_spell tool."""
         try:
             if not decision.target_positions or len(decision.target_positions) == 0:
-                print(f"❌ Action #{action_number} - Ability action failed: No target positions provided")
+                logger.warning("Ability action failed: no target positions provided", action_number=action_number)
                 return False
                 
             target_pos = decision.target_positions[0]  # Use first target position
-            print(f"✨ Action #{action_number} - Attempting to cast spell from {unit.name} to ({target_pos['x']}, {target_pos['y']})")
+            logger.debug("Attempting spell", action_number=action_number, unit=unit.name, x=target_pos['x'], y=target_pos['y'])
             
             # Track the target unit for AI targeting system
             self._set_ai_target(unit, target_pos)
@@ -995,15 +999,15 @@ class UnitAIController:
                 # Check if this was a talent-based ability
                 if hasattr(decision, 'original_action_type') and decision.original_action_type == 'talent':
                     talent_name = getattr(decision, 'talent_name', getattr(decision, 'display_type', decision.action_id))
-                    print(f"✅ Action #{action_number} - Talent ability '{talent_name}' successful: {result.data}")
+                    logger.debug("Talent ability successful", action_number=action_number, talent=talent_name, result=result.data)
                 else:
-                    print(f"✅ Action #{action_number} - Ability successful: {result.data}")
+                    logger.debug("Ability successful", action_number=action_number, result=result.data)
             else:
-                print(f"❌ Action #{action_number} - Ability failed: {result.error_message}")
+                logger.warning("Ability failed", action_number=action_number, error=result.error_message)
                 
             return result.success
         except Exception as e:
-            print(f"❌ Action #{action_number} - MCP ability exception: {e}")
+            logger.error("MCP ability exception", action_number=action_number, error=str(e))
             return False
     
     def _is_talent_action(self, action_type: str) -> bool:
@@ -1023,12 +1027,12 @@ class UnitAIController:
         """Execute talent using MCP execute_talent tool."""
         try:
             talent_id = decision.action_id
-            print(f"🔥 Action #{action_number} - Attempting to use talent '{talent_id}' from {unit.name}")
+            logger.debug("Attempting talent", action_number=action_number, talent=talent_id, unit=unit.name)
             
             # Find the slot index for this talent
             actions_result = self.tool_registry.execute_tool('get_available_actions', unit_id=self.unit_id)
             if not actions_result.success:
-                print(f"❌ Action #{action_number} - Failed to get available actions: {actions_result.error_message}")
+                logger.warning("Failed to get available actions", action_number=action_number, error=actions_result.error_message)
                 return False
             
             actions = actions_result.data.get('actions', [])
@@ -1039,7 +1043,7 @@ class UnitAIController:
                     break
             
             if not talent_action:
-                print(f"❌ Action #{action_number} - Talent '{talent_id}' not found in available actions")
+                logger.warning("Talent not found in available actions", action_number=action_number, talent=talent_id)
                 return False
             
             slot_index = talent_action.get('slot_index', 0)
@@ -1047,7 +1051,7 @@ class UnitAIController:
             # Check if we have target positions
             if decision.target_positions and len(decision.target_positions) > 0:
                 target_pos = decision.target_positions[0]
-                print(f"   Action #{action_number} - Targeting ({target_pos['x']}, {target_pos['y']})")
+                logger.debug("Talent targeting", action_number=action_number, x=target_pos['x'], y=target_pos['y'])
                 
                 # Track the target unit for AI targeting system
                 self._set_ai_target(unit, target_pos)
@@ -1061,7 +1065,7 @@ class UnitAIController:
                 )
             else:
                 # Self-targeted or instant talent
-                print(f"   Action #{action_number} - Self-targeted talent")
+                logger.debug("Self-targeted talent", action_number=action_number)
                 
                 result = self.tool_registry.execute_tool(
                     'execute_hotkey_talent',
@@ -1070,13 +1074,13 @@ class UnitAIController:
                 )
             
             if result.success:
-                print(f"✅ Action #{action_number} - Talent '{talent_id}' executed successfully: {result.data}")
+                logger.debug("Talent executed", action_number=action_number, talent=talent_id, result=result.data)
             else:
-                print(f"❌ Action #{action_number} - Talent '{talent_id}' failed: {result.error_message}")
+                logger.warning("Talent failed", action_number=action_number, talent=talent_id, error=result.error_message)
                 
             return result.success
         except Exception as e:
-            print(f"❌ Action #{action_number} - MCP talent exception: {e}")
+            logger.error("MCP talent exception", action_number=action_number, error=str(e))
             return False
     
     def _should_end_turn(self, unit, actions_taken: int) -> bool:
@@ -1112,7 +1116,7 @@ class UnitAIController:
             return False
             
         except Exception as e:
-            print(f"⚠️ Error checking turn end condition: {e}")
+            logger.warning("Error checking turn end condition", error=str(e))
             return True  # Default to ending turn on error
     
     def _end_turn_via_mcp(self, unit):
@@ -1120,11 +1124,11 @@ class UnitAIController:
         try:
             result = self.tool_registry.execute_tool('end_turn', unit_id=self.unit_id)
             if result.success:
-                print(f"🤖 AI Agent {unit.name}: Turn ended successfully via MCP")
+                logger.info("AI agent turn ended", unit=unit.name)
             else:
-                print(f"⚠️ AI Agent {unit.name}: MCP end_turn failed: {result.error}")
+                logger.warning("MCP end_turn failed", unit=unit.name, error=result.error)
         except Exception as e:
-            print(f"❌ MCP end_turn failed: {e}")
+            logger.error("MCP end_turn failed", error=str(e))
     
     def _get_unit_weapon_name(self):
         """Get the current unit's equipped weapon name for action labeling."""
@@ -1189,7 +1193,7 @@ class UnitAIController:
                     
             return "no_weapon_data"
         except Exception as e:
-            print(f"⚠️ Error getting unit weapon name: {e}")
+            logger.warning("Error getting unit weapon name", error=str(e))
             return "weapon_lookup_failed"
     
     def _get_contextual_ability_name(self, target: str) -> str:
@@ -1215,7 +1219,7 @@ class UnitAIController:
                                     talent_options.append(clean_name)
         
         except Exception as e:
-            print(f"⚠️ Error getting unit talents for contextual name: {e}")
+            logger.warning("Error getting unit talents for contextual name", error=str(e))
         
         # Fallback to hardcoded options if no talents found
         if not talent_options:
@@ -1247,17 +1251,17 @@ class UnitAIController:
             if target_unit:
                 # Store the target on the AI unit (similar to player units)
                 unit.target_unit = target_unit
-                print(f"🎯 AI {unit.name} now targeting {target_unit.name} at ({target_unit.x}, {target_unit.y})")
+                logger.debug("AI now targeting", unit=unit.name, target=target_unit.name, x=target_unit.x, y=target_unit.y)
                 
                 # If this AI unit is currently active, update the targeting display
                 active_unit = getattr(self.tool_registry.game_controller, 'active_unit', None)
                 if active_unit == unit:
                     self._update_ai_target_display(unit, target_unit)
             else:
-                print(f"⚠️ No target unit found at position ({target_pos['x']}, {target_pos['y']})")
+                logger.warning("No target unit found at position", x=target_pos['x'], y=target_pos['y'])
                 
         except Exception as e:
-            print(f"⚠️ Error setting AI target: {e}")
+            logger.warning("Error setting AI target", error=str(e))
     
     def _update_ai_target_display(self, unit, target_unit):
         """Update the targeting display for AI-controlled units."""
@@ -1266,19 +1270,19 @@ class UnitAIController:
             game_controller = self.tool_registry.game_controller
             if hasattr(game_controller, 'set_targeted_units'):
                 game_controller.set_targeted_units([target_unit])
-                print(f"✅ AI target display updated: {unit.name} → {target_unit.name}")
+                logger.debug("AI target display updated", unit=unit.name, target=target_unit.name)
             
         except Exception as e:
-            print(f"⚠️ Error updating AI target display: {e}")
+            logger.warning("Error updating AI target display", error=str(e))
     
     def restore_ai_target_on_activation(self, unit):
         """Restore AI target display when the AI unit becomes active."""
         try:
             if hasattr(unit, 'target_unit') and unit.target_unit is not None:
-                print(f"🎯 Restoring AI target for {unit.name}: {unit.target_unit.name}")
+                logger.debug("Restoring AI target", unit=unit.name, target=unit.target_unit.name)
                 self._update_ai_target_display(unit, unit.target_unit)
                 return True
             return False
         except Exception as e:
-            print(f"⚠️ Error restoring AI target on activation: {e}")
+            logger.warning("Error restoring AI target on activation", error=str(e))
             return False
\ No newline at end of file
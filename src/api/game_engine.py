@@ -321,12 +321,15 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                 message = json.loads(data)
                 message_type = message.get("type")
                 
+                if not websocket_manager.allow_message(websocket, message_type):
+                    continue  # The manager has queued the streak's error reply
+                
                 if message_type == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    await websocket_manager.send_to_websocket(websocket, {"type": "pong"})
                 elif message_type == "get_state":
                     # Send current game state
                     game_state = await get_game_state(session_id)
-                    await websocket.send_json({
+                    await websocket_manager.send_to_websocket(websocket, {
                         "type": "game_state",
                         "data": game_state.dict()
                     })
@@ -7,13 +7,16 @@ Manages WebSocket connections for real-time game updates and communication.
 import asyncio
 import json
 import logging
-from typing import Dict, List, Set, Optional
+from typing import Callable, Dict, List, Set, Optional
 from datetime import datetime
 
 from fastapi import WebSocket
 import structlog
 
 from .models import GameEvent, WSMessage
+from ..core.utils.backpressure import (
+    BackpressurePolicy, InboundRateLimiter, OutboundQueue, RateLimitPolicy
+)
 
 logger = structlog.get_logger()
 
@@ -21,13 +24,22 @@ logger = structlog.get_logger()
 class WebSocketConnection:
     """Represents a single WebSocket connection"""
     
-    def __init__(self, websocket: WebSocket, session_id: str, connection_id: str):
+    def __init__(self, websocket: WebSocket, session_id: str, connection_id: str,
+                 backpressure: Optional[BackpressurePolicy] = None,
+                 rate_limits: Optional[RateLimitPolicy] = None,
+                 on_failure: Optional[Callable[[str], None]] = None):
         self.websocket = websocket
         self.session_id = session_id
         self.connection_id = connection_id
         self.connected_at = datetime.now()
         self.subscribed_events: Set[str] = set()
         self.last_ping = datetime.now()
+        self.outbound = OutboundQueue(self.send_json, backpressure, on_failure)
+        self.rate_limiter = InboundRateLimiter(rate_limits)
+    
+    def enqueue(self, data: dict) -> bool:
+        """Queue data for this connection's writer; False once it has fallen too far behind"""
+        return self.outbound.start().put(data)
     
     async def send_json(self, data: dict):
         """Send JSON data to the WebSocket"""
@@ -58,9 +70,12 @@ class WebSocketConnection:
 class WebSocketManager:
     """Manages all WebSocket connections"""
     
-    def __init__(self):
+    def __init__(self, backpressure: Optional[BackpressurePolicy] = None,
+                 rate_limits: Optional[RateLimitPolicy] = None):
         self.connections: Dict[str, WebSocketConnection] = {}
         self.session_connections: Dict[str, Set[str]] = {}
+        self.backpressure = backpressure or BackpressurePolicy()
+        self.rate_limits = rate_limits or RateLimitPolicy()
         self._connection_counter = 0
         self._ping_task: Optional[asyncio.Task] = None
         
@@ -74,7 +89,10 @@ class WebSocketManager:
         await websocket.accept()
         
         connection_id = self._generate_connection_id()
-        connection = WebSocketConnection(websocket, session_id, connection_id)
+        connection = WebSocketConnection(
+            websocket, session_id, connection_id, self.backpressure, self.rate_limits,
+            on_failure=lambda reason: self._on_send_failure(connection_id, reason)
+        )
         
         # Store connection
         self.connections[connection_id] = connection
@@ -93,7 +111,7 @@ class WebSocketManager:
             self._ping_task = asyncio.create_task(self._ping_loop())
         
         # Send welcome message
-        await connection.send_json({
+        connection.enqueue({
             "type": "connected",
             "data": {
                 "connection_id": connection_id,
@@ -107,11 +125,7 @@ class WebSocketManager:
     async def disconnect(self, websocket: WebSocket, session_id: str):
         """Handle WebSocket disconnection"""
         # Find and remove connection
-        connection_id = None
-        for conn_id, conn in self.connections.items():
-            if conn.websocket == websocket:
-                connection_id = conn_id
-                break
+        connection_id = self._find_connection_id(websocket)
         
         if connection_id:
             await self._remove_connection(connection_id, session_id)
@@ -124,8 +138,9 @@ class WebSocketManager:
     
     async def _remove_connection(self, connection_id: str, session_id: str):
         """Remove a connection from tracking"""
-        if connection_id in self.connections:
-            del self.connections[connection_id]
+        connection = self.connections.pop(connection_id, None)
+        if connection is not None:
+            connection.outbound.close()
         
         if session_id in self.session_connections:
             self.session_connections[session_id].discard(connection_id)
@@ -137,15 +152,63 @@ class WebSocketManager:
                    session_id=session_id)
     
     async def send_to_connection(self, connection_id: str, message: dict):
-        """Send message to a specific connection"""
+        """Queue a message for a specific connection"""
         if connection_id in self.connections:
-            connection = self.connections[connection_id]
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.warning("Failed to send to connection, removing", 
-                             connection_id=connection_id, error=str(e))
-                await self._remove_connection(connection_id, connection.session_id)
+            self.connections[connection_id].enqueue(message)
+    
+    async def send_to_websocket(self, websocket: WebSocket, message: dict):
+        """Queue a message for the connection that owns ``websocket``"""
+        connection_id = self._find_connection_id(websocket)
+        if connection_id:
+            await self.send_to_connection(connection_id, message)
+    
+    def allow_message(self, websocket: WebSocket, message_type: Optional[str]) -> bool:
+        """
+        Apply the connection's inbound rate limit to one received message.
+        
+        The first rejection of a streak queues an error reply to the client.
+        """
+        connection_id = self._find_connection_id(websocket)
+        if connection_id is None:
+            return True
+        limiter = self.connections[connection_id].rate_limiter
+        if limiter.allow(message_type):
+            return True
+        if limiter.consecutive_rejections == 1:
+            # One error reply per streak of rejections, as the engine-side manager sends
+            logger.warning("WebSocket client rate limited",
+                         connection_id=connection_id, type=message_type)
+            self.connections[connection_id].enqueue({
+                "type": "error",
+                "data": {
+                    "message": "Rate limit exceeded",
+                    "original_type": message_type
+                }
+            })
+        return False
+    
+    def _find_connection_id(self, websocket: WebSocket) -> Optional[str]:
+        for conn_id, conn in self.connections.items():
+            if conn.websocket is websocket:
+                return conn_id
+        return None
+    
+    def _on_send_failure(self, connection_id: str, reason: str):
+        """Disconnect a connection whose outbound queue failed (overflow, lag or send error)"""
+        connection = self.connections.get(connection_id)
+        if connection is None:
+            return
+        logger.warning("Disconnecting slow WebSocket consumer",
+                      connection_id=connection_id, reason=reason,
+                      stats=connection.outbound.get_stats())
+        asyncio.create_task(self._evict(connection))
+    
+    async def _evict(self, connection: WebSocketConnection):
+        try:
+            await connection.websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass  # Connection might already be closed
+        await self._remove_connection(connection.connection_id, connection.session_id)
     
     async def broadcast_to_session(self, session_id: str, event: GameEvent):
         """Broadcast an event to all connections in a session"""
@@ -160,29 +223,18 @@ class WebSocketManager:
         # Get connections for this session
         connection_ids = list(self.session_connections[session_id])
         
-        # Send to all connections concurrently
-        tasks = []
+        # Queue for every subscribed connection; each writer delivers at its own pace
         for connection_id in connection_ids:
             if connection_id in self.connections:
                 connection = self.connections[connection_id]
                 # Check if connection is subscribed to this event type
                 if connection.is_subscribed_to(event.type):
-                    tasks.append(self.send_to_connection(connection_id, message))
-        
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+                    connection.enqueue(message)
     
     async def broadcast_to_all(self, message: dict):
         """Broadcast a message to all connections"""
-        if not self.connections:
-            return
-        
-        tasks = [
-            self.send_to_connection(conn_id, message)
-            for conn_id in self.connections.keys()
-        ]
-        
-        await asyncio.gather(*tasks, return_exceptions=True)
+        for connection in list(self.connections.values()):
+            connection.enqueue(message)
     
     async def disconnect_session(self, session_id: str):
         """Disconnect all connections for a session"""
@@ -206,6 +258,7 @@ class WebSocketManager:
         
         for connection_id in connection_ids:
             connection = self.connections[connection_id]
+            connection.outbound.close()
             try:
                 await connection.websocket.close()
             except:
@@ -234,6 +287,9 @@ class WebSocketManager:
         return {
             "total_connections": len(self.connections),
             "active_sessions": len(self.session_connections),
+            "outbound_queued": sum(len(conn.outbound) for conn in self.connections.values()),
+            "slow_consumers": sum(1 for conn in self.connections.values() if conn.outbound.failed),
+            "rate_limited_messages": sum(conn.rate_limiter.rejected for conn in self.connections.values()),
             "connections_per_session": {
                 session_id: len(conn_ids)
                 for session_id, conn_ids in self.session_connections.items()
@@ -270,14 +326,8 @@ class WebSocketManager:
                     "timestamp": datetime.now().isoformat()
                 }
                 
-                # Send ping to all connections
-                tasks = [
-                    self.send_to_connection(conn_id, ping_message)
-                    for conn_id in list(self.connections.keys())
-                ]
-                
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                # Queue ping for all connections; stale pings coalesce
+                await self.broadcast_to_all(ping_message)
                 
             except asyncio.CancelledError:
                 break
@@ -6,7 +6,13 @@ Handles UI updates, panel management, and visual synchronization.
 """
 
 import logging
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
+from functools import partial
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
+
+from core.math.particles import ParticleEmitter
+from ui.visual.highlight_layers import HighlightEntityPool
+
+from .scene_diff import SceneDiff, SceneModel, TileView, UnitView, build_scene_model, diff_scene, health_band
 
 if TYPE_CHECKING:
     from .websocket_game_client import WebSocketGameClient
@@ -45,119 +51,187 @@ class ClientUIBridge:
         self.highlighted_tiles = []
         self.active_animations = []
         
+        # What the battlefield currently shows, and the pooled entities showing it
+        self.scene = SceneModel()
+        self._tile_entities: Dict[Tuple[int, int], Any] = {}
+        self._unit_entities: Dict[str, Any] = {}
+        self._tile_pool: Optional[HighlightEntityPool] = None
+        self._unit_pool: Optional[HighlightEntityPool] = None
+        
+        # Particle emitters simulated locally from server parameters: id -> (emitter, entity)
+        self.particle_emitters: Dict[str, Tuple[ParticleEmitter, Any]] = {}
+        self._particle_driver = None  # Entity whose per-frame update advances the emitters
+        
         logger.info("Client UI Bridge initialized")
     
     def update_battlefield_from_state(self, game_state: Dict[str, Any]):
         """
         Update battlefield visualization from server game state.
         
+        The state is diffed against the current scene, so only tiles and
+        units that changed are created, moved, recolored or destroyed.
+        
         Args:
             game_state: Complete game state from server
         """
         try:
-            battlefield = game_state.get('battlefield', {})
-            units = battlefield.get('units', [])
-            
-            # Clear existing battlefield
-            self.client_app._clear_battlefield()
-            
-            # Recreate battlefield from server state
-            battlefield_size = battlefield.get('size', (10, 10))
-            self._create_grid_tiles(battlefield_size)
+            target = build_scene_model(game_state.get('battlefield', {}))
+            diff = diff_scene(self.scene, target)
+            if not diff.is_empty():
+                self._apply_scene_diff(diff)
             
-            # Place units
-            for unit_data in units:
-                self._create_unit_from_server_data(unit_data)
+            # Keep unit data current even when nothing visible changed
+            for unit_id, unit_entity in self._unit_entities.items():
+                unit_entity.unit_data = target.unit_data[unit_id]
+            self.scene = target
             
-            logger.info(f"Battlefield updated: {len(units)} units")
+            logger.debug(f"Battlefield updated: {len(target.units)} units, changes {diff.get_stats()}")
             
+        except ImportError:
+            logger.warning("Ursina not available for battlefield update")
         except Exception as e:
             logger.error(f"Error updating battlefield: {e}")
     
-    def _create_grid_tiles(self, size: tuple):
-        """Create interactive grid tiles"""
-        width, height = size
+    def reset_scene(self):
+        """Destroy the drawn battlefield and forget it; the next state message redraws it"""
+        for entity in [*self._tile_entities.values(), *self._unit_entities.values()]:
+            self._destroy_entity(entity)
+        for pool in (self._tile_pool, self._unit_pool):
+            if pool is not None:
+                for entity in pool.drain():
+                    self._destroy_entity(entity)
         
-        try:
-            from ursina import Entity, color
-            
-            for x in range(width):
-                for y in range(height):
-                    tile = Entity(
-                        model='cube',
-                        color=color.dark_gray,
-                        scale=(0.95, 0.1, 0.95),
-                        position=(x + 0.5, 0, y + 0.5)
-                    )
-                    tile.x_coord = x
-                    tile.y_coord = y
-                    tile.on_click = lambda t=tile: self.client_app._handle_tile_click(t.x_coord, t.y_coord)
-                    self.client_app.grid_tiles.append(tile)
-                    
-        except ImportError:
-            logger.warning("Ursina not available for grid tile creation")
+        self.scene = SceneModel()
+        self._tile_entities.clear()
+        self._unit_entities.clear()
+        self._tile_pool = None
+        self._unit_pool = None
+        if self.client_app is not None:
+            self.client_app.grid_tiles.clear()
+            self.client_app.unit_entities.clear()
     
-    def _create_unit_from_server_data(self, unit_data: Dict[str, Any]):
-        """Create unit entity from server data"""
-        try:
-            from ursina import Entity, color, Text
-            
-            x = unit_data.get('x', 0)
-            y = unit_data.get('y', 0)
-            name = unit_data.get('name', 'Unit')
-            team = unit_data.get('team', 'neutral')
-            unit_type = unit_data.get('type', 'warrior')
-            
-            # Determine unit color based on team
-            if team == 'player':
-                unit_color = color.blue
-            elif team == 'enemy':
-                unit_color = color.red
-            else:
-                unit_color = color.gray
-            
-            # Create unit visual
-            unit_entity = Entity(
-                model='cube',
-                color=unit_color,
-                scale=(0.8, 1.5, 0.8),
-                position=(x + 0.5, 1.0, y + 0.5)
-            )
-            
-            # Store unit data
-            unit_entity.unit_data = unit_data
-            unit_entity.x_coord = x
-            unit_entity.y_coord = y
-            
-            # Add name label
-            unit_label = Text(
-                text=name,
-                parent=unit_entity,
-                position=(0, 2, 0),
-                scale=10,
-                color=color.white,
-                billboard=True
-            )
-            
-            # Add health indicator if available
-            if 'hp' in unit_data and 'max_hp' in unit_data:
-                hp_ratio = unit_data['hp'] / unit_data['max_hp']
-                health_color = color.green if hp_ratio > 0.5 else color.yellow if hp_ratio > 0.25 else color.red
-                
-                health_bar = Entity(
-                    model='cube',
-                    color=health_color,
-                    scale=(0.8 * hp_ratio, 0.1, 0.1),
-                    position=(0, 2.5, 0),
-                    parent=unit_entity
-                )
-            
-            self.client_app.unit_entities.append(unit_entity)
-            
-        except ImportError:
-            logger.warning("Ursina not available for unit creation")
-        except Exception as e:
-            logger.error(f"Error creating unit entity: {e}")
+    def _apply_scene_diff(self, diff: SceneDiff):
+        """Apply scene changes to pooled tile and unit entities"""
+        self._ensure_pools()
+        
+        for coord in diff.tiles_destroyed:
+            self._tile_pool.release(self._tile_entities.pop(coord))
+        for tile in diff.tiles_created:
+            tile_entity = self._tile_pool.acquire()
+            self._place_tile(tile_entity, tile)
+            self._tile_entities[(tile.x, tile.y)] = tile_entity
+        for tile in diff.tiles_recolored:
+            self._place_tile(self._tile_entities[(tile.x, tile.y)], tile)
+        
+        for unit_id in diff.units_destroyed:
+            unit_entity = self._unit_entities.pop(unit_id)
+            if hasattr(unit_entity, 'selection_indicator'):
+                unit_entity.selection_indicator.enabled = False
+            self._unit_pool.release(unit_entity)
+        for unit in diff.units_created:
+            unit_entity = self._unit_pool.acquire()
+            self._place_unit(unit_entity, unit)
+            self._style_unit(unit_entity, unit)
+            self._unit_entities[unit.unit_id] = unit_entity
+        for unit in diff.units_moved:
+            self._place_unit(self._unit_entities[unit.unit_id], unit)
+        for unit in diff.units_updated:
+            self._style_unit(self._unit_entities[unit.unit_id], unit)
+        
+        # The app's entity lists mirror what is drawn
+        if diff.tiles_created or diff.tiles_destroyed:
+            self.client_app.grid_tiles[:] = self._tile_entities.values()
+        if diff.units_created or diff.units_destroyed:
+            self.client_app.unit_entities[:] = self._unit_entities.values()
+    
+    def _ensure_pools(self):
+        """Create the entity pools on first use (requires Ursina)"""
+        if self._tile_pool is not None:
+            return
+        
+        self._tile_pool = HighlightEntityPool(self._create_tile_entity)
+        self._unit_pool = HighlightEntityPool(self._create_unit_entity)
+    
+    def _create_tile_entity(self):
+        """Create a poolable grid tile; its click handler is bound once"""
+        from ursina import Entity, color
+        
+        tile = Entity(
+            model='cube',
+            color=color.dark_gray,
+            scale=(0.95, 0.1, 0.95)
+        )
+        tile.on_click = partial(self._on_tile_click, tile)
+        return tile
+    
+    def _on_tile_click(self, tile):
+        self.client_app._handle_tile_click(tile.x_coord, tile.y_coord)
+    
+    def _place_tile(self, tile_entity, tile: TileView):
+        from ursina import color
+        
+        terrain_colors = {
+            'forest': color.olive,
+            'mountains': color.gray,
+            'water': color.azure,
+            'walls': color.black,
+            'rough': color.brown,
+            'road': color.light_gray
+        }
+        tile_entity.position = (tile.x + 0.5, 0, tile.y + 0.5)
+        tile_entity.color = terrain_colors.get(tile.terrain, color.dark_gray)
+        tile_entity.x_coord = tile.x
+        tile_entity.y_coord = tile.y
+    
+    def _create_unit_entity(self):
+        """Create a poolable unit with its name label and health bar"""
+        from ursina import Entity, color, Text
+        
+        unit_entity = Entity(
+            model='cube',
+            color=color.gray,
+            scale=(0.8, 1.5, 0.8)
+        )
+        unit_entity.unit_label = Text(
+            text='',
+            parent=unit_entity,
+            position=(0, 2, 0),
+            scale=10,
+            color=color.white,
+            billboard=True
+        )
+        unit_entity.health_bar = Entity(
+            model='cube',
+            color=color.green,
+            scale=(0.8, 0.1, 0.1),
+            position=(0, 2.5, 0),
+            parent=unit_entity
+        )
+        return unit_entity
+    
+    def _place_unit(self, unit_entity, unit: UnitView):
+        unit_entity.position = (unit.x + 0.5, 1.0, unit.y + 0.5)
+        unit_entity.x_coord = unit.x
+        unit_entity.y_coord = unit.y
+    
+    def _style_unit(self, unit_entity, unit: UnitView):
+        from ursina import color
+        
+        # Determine unit color based on team
+        if unit.team == 'player':
+            unit_entity.color = color.blue
+        elif unit.team == 'enemy':
+            unit_entity.color = color.red
+        else:
+            unit_entity.color = color.gray
+        
+        unit_entity.unit_label.text = unit.name
+        
+        band = health_band(unit.hp, unit.max_hp)
+        unit_entity.health_bar.enabled = band is not None
+        if band is not None:
+            unit_entity.health_bar.color = getattr(color, band)
+            unit_entity.health_bar.scale_x = 0.8 * unit.hp / unit.max_hp
     
     def update_unit_selection(self, selected_unit_id: Optional[str]):
         """Update visual unit selection"""
@@ -428,6 +502,69 @@ class ClientUIBridge:
             source_pos = effect.get('source_pos', (0, 0))
             target_pos = effect.get('target_pos', (0, 0))
             self.show_action_animation(action_type, source_pos, target_pos)
+        
+        elif effect_type == 'particle_emitter':
+            self.start_particle_emitter(effect.get('id'), effect.get('emitter', {}))
+    
+    def start_particle_emitter(self, emitter_id: str, emitter_data: Dict[str, Any]):
+        """
+        Start simulating a server particle emitter locally.
+        
+        The server sends emitter parameters, seed and elapsed time only; the
+        particles are regenerated here, so repeated updates are ignored.
+        """
+        if emitter_id in self.particle_emitters:
+            return
+        
+        try:
+            emitter = ParticleEmitter.from_wire(emitter_data)
+            self.particle_emitters[emitter_id] = (emitter, self._create_particle_entity(emitter))
+            self._ensure_particle_driver()
+            
+        except ImportError:
+            logger.warning("Ursina not available for particle effects")
+        except Exception as e:
+            logger.error(f"Error starting particle emitter {emitter_id}: {e}")
+    
+    def _create_particle_entity(self, emitter: ParticleEmitter):
+        """Create the point-mesh entity drawing one emitter"""
+        from ursina import Entity, Mesh, color
+        
+        return Entity(
+            model=Mesh(vertices=[], mode='point', thickness=emitter.params.particle_size * 50, static=False),
+            color=color.hex(emitter.params.particle_color)
+        )
+    
+    def _ensure_particle_driver(self):
+        """Hook update_particles into Ursina's frame update, once"""
+        if self._particle_driver is not None:
+            return
+        from ursina import Entity, time
+        
+        self._particle_driver = Entity()
+        self._particle_driver.update = lambda: self.update_particles(time.dt)
+    
+    def _destroy_entity(self, entity):
+        from ursina import destroy
+        destroy(entity)
+    
+    def update_particles(self, delta_time: float):
+        """Advance local particle emitters and redraw their point meshes; called every frame"""
+        finished = []
+        for emitter_id, (emitter, entity) in self.particle_emitters.items():
+            if not emitter.update(delta_time):
+                finished.append(emitter_id)
+                continue
+            
+            mesh = entity.model
+            mesh.vertices = emitter.live_positions().tolist()
+            base = entity.color
+            mesh.colors = [(base[0], base[1], base[2], alpha) for alpha in emitter.life_ratios().tolist()]
+            mesh.generate()
+        
+        for emitter_id in finished:
+            _, entity = self.particle_emitters.pop(emitter_id)
+            self._destroy_entity(entity)
     
     def _process_ui_state_updates(self, ui_state: Dict[str, Any]):
         """Process UI state updates"""
@@ -472,6 +609,13 @@ class ClientUIBridge:
     def cleanup(self):
         """Clean up UI bridge resources"""
         self._clear_tile_highlights()
+        self.reset_scene()
         self.notification_queue.clear()
         self.active_animations.clear()
+        for _, entity in self.particle_emitters.values():
+            self._destroy_entity(entity)
+        self.particle_emitters.clear()
+        if self._particle_driver is not None:
+            self._destroy_entity(self._particle_driver)
+            self._particle_driver = None
         logger.info("Client UI Bridge cleaned up")
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+Battlefield Scene Diffing
+
+Pure-Python model of the battlefield as the client draws it, and the diff
+between two models. ClientUIBridge applies a diff to its Ursina entities so
+a state message only creates, moves, recolors or destroys what changed.
+Nothing here touches Ursina, so it runs without a display.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+Coord = Tuple[int, int]
+
+DEFAULT_TERRAIN = 'plains'
+
+
+def health_band(hp: Optional[float], max_hp: Optional[float]) -> Optional[str]:
+    """Health bar color band ('green', 'yellow', 'red'), or None without HP data."""
+    if hp is None or not max_hp:
+        return None
+    ratio = hp / max_hp
+    return 'green' if ratio > 0.5 else 'yellow' if ratio > 0.25 else 'red'
+
+
+@dataclass(frozen=True, slots=True)
+class TileView:
+    """How one grid tile is drawn."""
+    x: int
+    y: int
+    terrain: str = DEFAULT_TERRAIN
+
+
+@dataclass(frozen=True, slots=True)
+class UnitView:
+    """How one unit is drawn."""
+    unit_id: str
+    x: int
+    y: int
+    name: str = 'Unit'
+    team: str = 'neutral'
+    unit_type: str = 'warrior'
+    hp: Optional[float] = None
+    max_hp: Optional[float] = None
+
+    @property
+    def position(self) -> Coord:
+        return (self.x, self.y)
+
+    def appearance(self) -> Tuple[Any, ...]:
+        """Everything but position; a change here means a redraw."""
+        return (self.name, self.team, self.unit_type, self.hp, self.max_hp)
+
+    @classmethod
+    def from_server(cls, data: Dict[str, Any], index: int) -> 'UnitView':
+        unit_id = data.get('id') or data.get('unit_id') or f"unit_{index}"
+        has_health = 'hp' in data and 'max_hp' in data
+        return cls(
+            unit_id=str(unit_id),
+            x=data.get('x', 0),
+            y=data.get('y', 0),
+            name=data.get('name', 'Unit'),
+            team=data.get('team', 'neutral'),
+            unit_type=data.get('type', 'warrior'),
+            hp=data['hp'] if has_health else None,
+            max_hp=data['max_hp'] if has_health else None
+        )
+
+
+@dataclass
+class SceneModel:
+    """Tiles by coordinate and units by ID, plus each unit's server data."""
+    size: Coord = (0, 0)
+    tiles: Dict[Coord, TileView] = field(default_factory=dict)
+    units: Dict[str, UnitView] = field(default_factory=dict)
+    unit_data: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+def build_scene_model(battlefield: Dict[str, Any]) -> SceneModel:
+    """
+    Build the scene model for a battlefield state message.
+
+    Args:
+        battlefield: ``game_state['battlefield']`` with 'size', 'units'
+            and optionally 'tiles' carrying terrain per position
+    """
+    size = battlefield.get('size', (10, 10))
+    if isinstance(size, dict):
+        size = (size.get('width', 10), size.get('height', 10))
+    width, height = size
+
+    terrain: Dict[Coord, str] = {}
+    for tile_data in battlefield.get('tiles', ()):
+        position = tile_data.get('position', tile_data)
+        terrain[(position.get('x', 0), position.get('y', 0))] = str(
+            tile_data.get('terrain_type', DEFAULT_TERRAIN))
+
+    tiles = {
+        (x, y): TileView(x, y, terrain.get((x, y), DEFAULT_TERRAIN))
+        for x in range(width) for y in range(height)
+    }
+    units, unit_data = {}, {}
+    for index, data in enumerate(battlefield.get('units', ())):
+        unit = UnitView.from_server(data, index)
+        units[unit.unit_id] = unit
+        unit_data[unit.unit_id] = data
+    return SceneModel((width, height), tiles, units, unit_data)
+
+
+@dataclass
+class SceneDiff:
+    """Changes that turn one scene model into another."""
+    tiles_created: List[TileView] = field(default_factory=list)
+    tiles_recolored: List[TileView] = field(default_factory=list)
+    tiles_destroyed: List[Coord] = field(default_factory=list)
+    units_created: List[UnitView] = field(default_factory=list)
+    units_moved: List[UnitView] = field(default_factory=list)
+    units_updated: List[UnitView] = field(default_factory=list)  # Appearance changed
+    units_destroyed: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.tiles_created or self.tiles_recolored or self.tiles_destroyed
+                    or self.units_created or self.units_moved or self.units_updated
+                    or self.units_destroyed)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'tiles_created': len(self.tiles_created),
+            'tiles_recolored': len(self.tiles_recolored),
+            'tiles_destroyed': len(self.tiles_destroyed),
+            'units_created': len(self.units_created),
+            'units_moved': len(self.units_moved),
+            'units_updated': len(self.units_updated),
+            'units_destroyed': len(self.units_destroyed),
+        }
+
+
+def diff_scene(current: SceneModel, target: SceneModel) -> SceneDiff:
+    """
+    Compute the changes from ``current`` to ``target``.
+
+    A unit that both moved and changed appearance is listed in
+    ``units_moved`` and ``units_updated``.
+    """
+    diff = SceneDiff()
+
+    for coord, tile in target.tiles.items():
+        existing = current.tiles.get(coord)
+        if existing is None:
+            diff.tiles_created.append(tile)
+        elif existing != tile:
+            diff.tiles_recolored.append(tile)
+    diff.tiles_destroyed = [coord for coord in current.tiles if coord not in target.tiles]
+
+    for unit_id, unit in target.units.items():
+        existing = current.units.get(unit_id)
+        if existing is None:
+            diff.units_created.append(unit)
+            continue
+        if existing.position != unit.position:
+            diff.units_moved.append(unit)
+        if existing.appearance() != unit.appearance():
+            diff.units_updated.append(unit)
+    diff.units_destroyed = [unit_id for unit_id in current.units if unit_id not in target.units]
+
+    return diff
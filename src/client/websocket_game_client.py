@@ -8,7 +8,10 @@ Provides async methods for game actions and state synchronization.
 import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional, Callable, List
+import random
+import time
+from typing import Dict, Any, Optional, Callable, List, Union
+from urllib.parse import urlencode
 from dataclasses import dataclass
 from enum import Enum
 
@@ -24,6 +27,11 @@ except ImportError:
     WEBSOCKETS_AVAILABLE = False
     WebSocketClientProtocol = Any
 
+from core.utils.wire_protocol import (
+    DEFAULT_COMPRESSION_THRESHOLD, MSGPACK_AVAILABLE, PROTOCOL_BINARY, PROTOCOL_JSON,
+    WireCodec, WireProtocolError, decode_message, encode_message, make_resume_token
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +40,7 @@ class ConnectionState(Enum):
     DISCONNECTED = "disconnected"
     CONNECTING = "connecting"
     CONNECTED = "connected"
+    RECONNECTING = "reconnecting"
     ERROR = "error"
 
 
@@ -55,12 +64,22 @@ class WebSocketGameClient:
     - Real-time event handling (unit moves, attacks, etc.)
     """
     
-    def __init__(self, server_url: str):
+    def __init__(self, server_url: str, binary_protocol: bool = True, auto_reconnect: bool = True,
+                 reconnect_base_delay: float = 0.5, reconnect_max_delay: float = 15.0,
+                 max_reconnect_attempts: Optional[int] = None,
+                 ping_interval: float = 10.0, heartbeat_timeout: float = 25.0):
         """
         Initialize WebSocket client.
         
         Args:
             server_url: WebSocket server URL (e.g., "ws://localhost:8002")
+            binary_protocol: Request the binary wire protocol when msgpack is available
+            auto_reconnect: Reconnect and resume the session when the connection drops
+            reconnect_base_delay: First reconnect delay; doubles per failed attempt
+            reconnect_max_delay: Upper bound for the reconnect delay
+            max_reconnect_attempts: Give up after this many attempts (None retries forever)
+            ping_interval: Seconds between pings
+            heartbeat_timeout: Treat the connection as dead after this long without a message
         """
         if not WEBSOCKETS_AVAILABLE:
             raise ImportError("websockets library is required for WebSocket client")
@@ -74,6 +93,27 @@ class WebSocketGameClient:
         self.session_id: Optional[str] = None
         self.player_id: Optional[str] = None
         
+        # Wire protocol; JSON until the server acknowledges the binary protocol
+        self.binary_protocol = binary_protocol and MSGPACK_AVAILABLE
+        self.protocol = PROTOCOL_JSON
+        self._codec: Optional[WireCodec] = None
+        
+        # Resume state: the server's stream ID and the last sequence number applied
+        self.stream_id: Optional[str] = None
+        self.last_seq: Optional[int] = None
+        
+        # Reconnect and liveness
+        self.auto_reconnect = auto_reconnect
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.ping_interval = ping_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.reconnect_count = 0
+        self._last_received = 0.0
+        self._closing = False
+        self._reconnect_task: Optional[asyncio.Task] = None
+        
         # Event callbacks
         self._callbacks: Dict[str, Callable] = {}
         
@@ -90,6 +130,8 @@ class WebSocketGameClient:
             "pong": self._handle_pong,
             "select_unit_result": self._handle_select_unit_result,
             "deselect_unit_result": self._handle_deselect_unit_result,
+            "protocol": self._handle_protocol,
+            "resumed": self._handle_resumed,
         }
         
         # Connection monitoring
@@ -133,46 +175,66 @@ class WebSocketGameClient:
         Returns:
             True if connected successfully
         """
-        try:
-            self.connection_state = ConnectionState.CONNECTING
-            
-            # Build WebSocket URL with optional parameters
-            ws_url = self.ws_url
-            if session_id:
-                ws_url += f"/{session_id}"
-                self.session_id = session_id
-            
-            if player_id:
-                ws_url += f"?player_id={player_id}"
-                self.player_id = player_id
-            
-            logger.info(f"Connecting to {ws_url}")
-            
-            # Connect to WebSocket
-            self.websocket = await websockets.connect(ws_url)
-            self.connection_state = ConnectionState.CONNECTED
-            
-            # Start background tasks
-            self._listen_task = asyncio.create_task(self._listen_for_messages())
-            self._ping_task = asyncio.create_task(self._ping_loop())
-            
+        self.session_id = session_id
+        self.player_id = player_id
+        self.stream_id = None
+        self.last_seq = None
+        self._closing = False
+        
+        self.connection_state = ConnectionState.CONNECTING
+        if await self._open():
             logger.info("WebSocket connected successfully")
             return True
-            
+        self.connection_state = ConnectionState.ERROR
+        return False
+    
+    def _build_url(self) -> str:
+        """WebSocket URL with player, protocol and resume parameters"""
+        ws_url = self.ws_url
+        if self.session_id:
+            ws_url += f"/{self.session_id}"
+        
+        params = {}
+        if self.player_id:
+            params["player_id"] = self.player_id
+        if self.binary_protocol:
+            params["protocol"] = PROTOCOL_BINARY
+        if self.stream_id is not None and self.last_seq is not None:
+            params["resume"] = make_resume_token(self.stream_id, self.last_seq)
+        if params:
+            ws_url += f"?{urlencode(params)}"
+        return ws_url
+    
+    async def _open(self) -> bool:
+        """Open the socket and start the listen and ping tasks"""
+        ws_url = self._build_url()
+        logger.info(f"Connecting to {ws_url}")
+        
+        self.protocol = PROTOCOL_JSON
+        self._codec = None
+        try:
+            self.websocket = await websockets.connect(ws_url)
         except Exception as e:
             logger.error(f"Failed to connect: {e}")
-            self.connection_state = ConnectionState.ERROR
             return False
+        
+        self.connection_state = ConnectionState.CONNECTED
+        self._last_received = time.monotonic()
+        
+        # Start background tasks
+        self._listen_task = asyncio.create_task(self._listen_for_messages())
+        self._ping_task = asyncio.create_task(self._ping_loop())
+        return True
     
     async def disconnect(self):
         """Disconnect from the WebSocket server"""
         logger.info("Disconnecting from WebSocket server")
+        self._closing = True
         
         # Cancel background tasks
-        if self._ping_task:
-            self._ping_task.cancel()
-        if self._listen_task:
-            self._listen_task.cancel()
+        for task in (self._ping_task, self._listen_task, self._reconnect_task):
+            if task and task is not asyncio.current_task():
+                task.cancel()
         
         # Close WebSocket connection
         if self.websocket:
@@ -182,6 +244,10 @@ class WebSocketGameClient:
         self.connection_state = ConnectionState.DISCONNECTED
         self.session_id = None
         self.player_id = None
+        self.protocol = PROTOCOL_JSON
+        self._codec = None
+        self.stream_id = None
+        self.last_seq = None
     
     async def _listen_for_messages(self):
         """Listen for incoming WebSocket messages"""
@@ -192,19 +258,60 @@ class WebSocketGameClient:
                     break
                 
                 message = await self.websocket.recv()
+                self._last_received = time.monotonic()
                 await self._handle_message(message)
+        except asyncio.CancelledError:
+            return
         except websockets.exceptions.ConnectionClosed:
             logger.info("WebSocket connection closed")
             self.connection_state = ConnectionState.DISCONNECTED
         except Exception as e:
             logger.error(f"Error listening for messages: {e}")
             self.connection_state = ConnectionState.ERROR
+        
+        self._on_connection_lost()
+    
+    def _on_connection_lost(self):
+        """Start reconnecting unless the disconnect was requested"""
+        if self._ping_task and self._ping_task is not asyncio.current_task():
+            self._ping_task.cancel()
+        if self._closing or not self.auto_reconnect:
+            return
+        if self._reconnect_task and not self._reconnect_task.done():
+            return
+        self.connection_state = ConnectionState.RECONNECTING
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+    
+    async def _reconnect(self):
+        """Reconnect with exponential backoff and jitter, resuming where we left off"""
+        attempt = 0
+        while not self._closing:
+            if self.max_reconnect_attempts is not None and attempt >= self.max_reconnect_attempts:
+                logger.error(f"Giving up after {attempt} reconnect attempts")
+                self.connection_state = ConnectionState.ERROR
+                return
+            
+            delay = min(self.reconnect_max_delay, self.reconnect_base_delay * (2 ** attempt))
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            attempt += 1
+            
+            if self._closing:
+                return
+            if await self._open():
+                self.reconnect_count += 1
+                logger.info(f"Reconnected after {attempt} attempt(s) (last_seq={self.last_seq})")
+                return
     
     async def _ping_loop(self):
-        """Send periodic ping messages to keep connection alive"""
+        """Send periodic pings; close the socket if the server has gone silent"""
         try:
             while self.websocket:
-                await asyncio.sleep(30)  # Ping every 30 seconds
+                await asyncio.sleep(self.ping_interval)
+                
+                if time.monotonic() - self._last_received > self.heartbeat_timeout:
+                    logger.warning(f"No message for {self.heartbeat_timeout}s, dropping connection")
+                    await self.websocket.close()
+                    break
                 
                 # Check if connection is still open
                 if self.websocket and (not hasattr(self.websocket, 'closed') or not self.websocket.closed):
@@ -228,31 +335,58 @@ class WebSocketGameClient:
             return False
         
         try:
-            message_json = json.dumps(message)
-            await self.websocket.send(message_json)
+            await self.websocket.send(encode_message(message, self._codec))
             logger.debug(f"Sent message: {message.get('type', 'unknown')}")
             return True
         except Exception as e:
             logger.error(f"Failed to send message: {e}")
             return False
     
-    async def _handle_message(self, message: str):
-        """Handle incoming WebSocket message"""
+    async def _handle_message(self, message: Union[str, bytes]):
+        """Handle incoming WebSocket message (JSON text or binary frame)"""
         try:
-            data = json.loads(message)
+            data = decode_message(message, self._codec)
             message_type = data.get("type")
             
+            # Snapshots reset the resume position; sequenced messages apply once
+            if "snapshot_seq" in data:
+                self.stream_id = data.get("stream", self.stream_id)
+                self.last_seq = data["snapshot_seq"]
+            seq = data.get("seq")
+            if seq is not None:
+                if self.last_seq is not None and seq <= self.last_seq:
+                    logger.debug(f"Skipping already applied message {seq}")
+                    return
+                self.last_seq = seq
+            
             if message_type in self._message_handlers:
                 await self._message_handlers[message_type](data)
             else:
                 logger.warning(f"Unknown message type: {message_type}")
                 
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, WireProtocolError) as e:
             logger.error(f"Failed to decode message: {e}")
         except Exception as e:
             logger.error(f"Error handling message: {e}")
     
     # Message handlers
+    async def _handle_resumed(self, data: Dict[str, Any]):
+        """Handle a session resume; missed messages follow"""
+        info = data.get("data", {})
+        logger.info(f"Session resumed from seq {info.get('from_seq')}, "
+                    f"replaying {info.get('replayed')} message(s)")
+    
+    async def _handle_protocol(self, data: Dict[str, Any]):
+        """Handle the server's wire protocol acknowledgement"""
+        protocol = data.get("data", {}).get("protocol", PROTOCOL_JSON)
+        if protocol == PROTOCOL_BINARY and self.binary_protocol:
+            self._codec = WireCodec(data["data"].get("compression_threshold", DEFAULT_COMPRESSION_THRESHOLD))
+            self.protocol = PROTOCOL_BINARY
+        else:
+            self._codec = None
+            self.protocol = PROTOCOL_JSON
+        logger.info(f"Using {self.protocol} wire protocol")
+    
     async def _handle_game_state(self, data: Dict[str, Any]):
         """Handle game state update"""
         game_state = data.get("data")
@@ -427,6 +561,7 @@ class WebSocketGameClient:
             return {
                 "session_id": self.session_id,
                 "player_id": self.player_id,
-                "server_url": self.server_url
+                "server_url": self.server_url,
+                "protocol": self.protocol
             }
         return None
\ No newline at end of file
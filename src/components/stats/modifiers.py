@@ -12,6 +12,8 @@ from enum import Enum
 import uuid
 
 from core.ecs.component import BaseComponent
+from core.utils.logging import Logger
+from core.utils.stat_cache import DerivedStatCache
 
 class ModifierType(Enum):
     """Type of stat modifier"""
@@ -154,6 +156,21 @@ class Modifier:
         
         return modifier
 
+@dataclass
+class ModifierTotals:
+    """Pre-aggregated active modifiers for one stat"""
+    flat: float = 0.0
+    percentage: float = 0.0
+    multiplier: float = 1.0
+    set_value: Optional[float] = None
+    expires_at: float = 0.0  # Earliest expiry among included modifiers (0 = none)
+    
+    def apply(self, base_stat: int) -> float:
+        """Apply the totals to a base value"""
+        if self.set_value is not None:
+            return self.set_value
+        return (base_stat + self.flat) * (1.0 + self.percentage) * self.multiplier
+
 class ModifierManager(BaseComponent):
     """
     Component managing temporary modifiers for an entity.
@@ -166,13 +183,15 @@ class ModifierManager(BaseComponent):
         super().__init__()
         
         self.modifiers: List[Modifier] = []
-        self.modifier_cache: Dict[str, float] = {}  # stat_name -> final_modifier
-        self.cache_timestamp = 0.0
-        self.cache_valid = False
+        self.modifiers_by_stat: Dict[str, List[Modifier]] = {}
+        
+        # Per-stat modifier totals, invalidated only for the stat that changed
+        self.stat_cache = DerivedStatCache()
         
         # Performance tracking
         self.calculation_count = 0
         self.last_calculation_time = 0.0
+        self.last_cleanup_time = time.time()
     
     def add_modifier(self, modifier: Modifier) -> bool:
         """
@@ -185,8 +204,8 @@ class ModifierManager(BaseComponent):
             True if modifier was added successfully
         """
         # Check for stacking conflicts
-        existing_modifiers = [m for m in self.modifiers 
-                            if m.stat_name == modifier.stat_name and m.active]
+        existing_modifiers = [m for m in self.modifiers_by_stat.get(modifier.stat_name, [])
+                              if m.active]
         
         # Handle stacking rules
         if modifier.stacking_rule == StackingRule.NONE:
@@ -226,7 +245,8 @@ class ModifierManager(BaseComponent):
         
         # Add the modifier
         self.modifiers.append(modifier)
-        self._invalidate_cache()
+        self.modifiers_by_stat.setdefault(modifier.stat_name, []).append(modifier)
+        self._invalidate_stat(modifier.stat_name)
         return True
     
     def remove_modifier(self, modifier_id: str) -> bool:
@@ -242,7 +262,7 @@ class ModifierManager(BaseComponent):
         for modifier in self.modifiers:
             if modifier.modifier_id == modifier_id:
                 modifier.active = False
-                self._invalidate_cache()
+                self._invalidate_stat(modifier.stat_name)
                 return True
         return False
     
@@ -260,11 +280,9 @@ class ModifierManager(BaseComponent):
         for modifier in self.modifiers:
             if modifier.source_id == source_id and modifier.active:
                 modifier.active = False
+                self._invalidate_stat(modifier.stat_name)
                 removed_count += 1
         
-        if removed_count > 0:
-            self._invalidate_cache()
-        
         return removed_count
     
     def update(self, delta_time: float):
@@ -274,20 +292,16 @@ class ModifierManager(BaseComponent):
         Args:
             delta_time: Time elapsed since last update
         """
-        expired_count = 0
-        
         for modifier in self.modifiers:
             if modifier.active and modifier.is_expired:
                 modifier.active = False
-                expired_count += 1
-        
-        if expired_count > 0:
-            self._invalidate_cache()
+                self._invalidate_stat(modifier.stat_name)
         
         # Clean up old inactive modifiers periodically
         current_time = time.time()
-        if current_time - self.last_calculation_time > 10.0:  # Every 10 seconds
+        if current_time - self.last_cleanup_time > 10.0:  # Every 10 seconds
             self._cleanup_inactive_modifiers()
+            self.last_cleanup_time = current_time
     
     def calculate_final_stat(self, base_stat: int, stat_name: str) -> int:
         """
@@ -300,49 +314,53 @@ class ModifierManager(BaseComponent):
         Returns:
             Final stat value with modifiers
         """
-        calculation_start = time.perf_counter()
+        totals = self.stat_cache.get(stat_name, lambda: self._aggregate_modifiers(stat_name))
+        
+        # A timed modifier ran out since the totals were built
+        if totals.expires_at and time.time() >= totals.expires_at:
+            self._invalidate_stat(stat_name)
+            totals = self.stat_cache.get(stat_name, lambda: self._aggregate_modifiers(stat_name))
         
-        # Use cache if valid
-        if self.cache_valid and stat_name in self.modifier_cache:
-            cached_modifier = self.modifier_cache[stat_name]
-            result = int(base_stat + cached_modifier)
-            return max(0, result)  # Ensure non-negative
+        return max(0, int(totals.apply(base_stat)))  # Ensure non-negative integer
+    
+    def _aggregate_modifiers(self, stat_name: str) -> ModifierTotals:
+        """
+        Fold the active modifiers of one stat into totals.
+        
+        Args:
+            stat_name: Name of stat being aggregated
+            
+        Returns:
+            Totals applied as flat, then percentage, then multiplicative,
+            with a set-value modifier overriding all of them
+        """
+        calculation_start = time.perf_counter()
         
         # Get active modifiers for this stat
-        active_modifiers = [m for m in self.modifiers 
-                          if m.stat_name == stat_name and m.active and not m.is_expired]
+        active_modifiers = [m for m in self.modifiers_by_stat.get(stat_name, [])
+                            if m.active and not m.is_expired]
         
         # Sort by priority (higher priority first)
         active_modifiers.sort(key=lambda m: m.priority, reverse=True)
         
-        # Apply modifiers in order
-        final_value = float(base_stat)
-        
-        # Apply flat modifiers first
-        flat_total = sum(m.value for m in active_modifiers 
-                        if m.modifier_type == ModifierType.FLAT)
-        final_value += flat_total
-        
-        # Apply percentage modifiers
-        percentage_total = sum(m.value for m in active_modifiers 
-                             if m.modifier_type == ModifierType.PERCENTAGE)
-        final_value *= (1.0 + percentage_total)
-        
-        # Apply multiplicative modifiers
+        totals = ModifierTotals()
         for modifier in active_modifiers:
-            if modifier.modifier_type == ModifierType.MULTIPLICATIVE:
-                final_value *= modifier.value
+            if modifier.modifier_type == ModifierType.FLAT:
+                totals.flat += modifier.value
+            elif modifier.modifier_type == ModifierType.PERCENTAGE:
+                totals.percentage += modifier.value
+            elif modifier.modifier_type == ModifierType.MULTIPLICATIVE:
+                totals.multiplier *= modifier.value
         
         # Handle set value modifiers (highest priority wins)
         set_value_modifiers = [m for m in active_modifiers 
                              if m.modifier_type == ModifierType.SET_VALUE]
         if set_value_modifiers:
             highest_priority = max(set_value_modifiers, key=lambda m: m.priority)
-            final_value = highest_priority.value
+            totals.set_value = highest_priority.value
         
-        # Cache the result
-        total_modifier = final_value - base_stat
-        self.modifier_cache[stat_name] = total_modifier
+        expiries = [m.expires_at for m in active_modifiers if m.duration > 0]
+        totals.expires_at = min(expiries) if expiries else 0.0
         
         # Performance tracking
         self.calculation_count += 1
@@ -351,15 +369,14 @@ class ModifierManager(BaseComponent):
         
         # Warn if calculation is slow
         if calculation_time > 0.001:  # 1ms target
-            from core.utils.logging import Logger
             Logger.warning(f"Slow modifier calculation: {calculation_time*1000:.2f}ms for {stat_name}")
         
-        return max(0, int(final_value))  # Ensure non-negative integer
+        return totals
     
     def get_modifiers_for_stat(self, stat_name: str) -> List[Modifier]:
         """Get all active modifiers affecting a specific stat"""
-        return [m for m in self.modifiers 
-                if m.stat_name == stat_name and m.active and not m.is_expired]
+        return [m for m in self.modifiers_by_stat.get(stat_name, [])
+                if m.active and not m.is_expired]
     
     def get_modifier_summary(self) -> Dict[str, Any]:
         """Get summary of all active modifiers"""
@@ -375,13 +392,16 @@ class ModifierManager(BaseComponent):
             'total_active': len(active_modifiers),
             'by_stat': by_stat,
             'calculation_count': self.calculation_count,
-            'cache_valid': self.cache_valid
+            'cache': self.stat_cache.get_stats()
         }
     
+    def _invalidate_stat(self, stat_name: str):
+        """Invalidate cached totals for one stat"""
+        self.stat_cache.invalidate(stat_name)
+    
     def _invalidate_cache(self):
-        """Invalidate modifier cache"""
-        self.cache_valid = False
-        self.modifier_cache.clear()
+        """Invalidate all cached totals"""
+        self.stat_cache.invalidate_all()
     
     def _cleanup_inactive_modifiers(self):
         """Remove old inactive modifiers to free memory"""
@@ -390,6 +410,13 @@ class ModifierManager(BaseComponent):
         
         self.modifiers = [m for m in self.modifiers 
                          if m.active or (current_time - m.created_at) < cleanup_threshold]
+        self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """Rebuild the per-stat modifier index"""
+        self.modifiers_by_stat = {}
+        for modifier in self.modifiers:
+            self.modifiers_by_stat.setdefault(modifier.stat_name, []).append(modifier)
     
     def to_dict(self) -> Dict[str, Any]:
         """Serialize component to dictionary"""
@@ -409,6 +436,7 @@ class ModifierManager(BaseComponent):
         for modifier_data in data.get('modifiers', []):
             modifier = Modifier.from_dict(modifier_data)
             manager.modifiers.append(modifier)
+        manager._rebuild_index()
         
         # Restore base component data
         manager.entity_id = data.get('entity_id')
@@ -0,0 +1,346 @@
+"""
+Asset Bundle
+
+Prebuilt binary bundle of every JSON asset under ``assets/``.
+
+``build_bundle`` validates each file against ``SCHEMAS`` and writes one
+content-hashed file of marshal-encoded entries. At runtime the bundle is
+memory-mapped read-only, so every worker process shares the same pages,
+and entries are decoded on request. An entry whose source file changed
+since the build is treated as stale and read from the JSON file instead.
+
+Build with ``scripts/build_asset_bundle.py``; set ``APEX_ASSET_BUNDLE=0``
+to ignore the bundle, or to a path to use a bundle elsewhere.
+"""
+
+import fnmatch
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..utils.logging import Logger
+
+logger = Logger.get_logger(__name__)
+
+BUNDLE_MAGIC = b"APXB"
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_FILENAME = "assets.bundle"
+
+# magic, format version, python major, python minor, content hash, index offset, index length
+_HEADER = struct.Struct("<4sHBB32sQQ")
+
+DEFAULT_ASSETS_ROOT = Path(__file__).resolve().parent.parent.parent.parent / "assets"
+
+
+class BundleError(Exception):
+    """Raised when assets fail validation or a bundle cannot be read."""
+
+
+@dataclass
+class FileSchema:
+    """
+    Structural schema for one kind of asset file.
+
+    Attributes:
+        required: Top-level keys and their expected types
+        entries: Top-level list key whose elements are checked
+        entry_required: Keys and types each list element must have
+        unique_key: Element key that must be unique across the list
+    """
+    required: Dict[str, Union[type, Tuple[type, ...]]] = field(default_factory=dict)
+    entries: Optional[str] = None
+    entry_required: Dict[str, Union[type, Tuple[type, ...]]] = field(default_factory=dict)
+    unique_key: Optional[str] = None
+
+    def validate(self, data: Any) -> List[str]:
+        """Return a list of problems, empty when the data matches."""
+        if not isinstance(data, dict):
+            return [f"top level must be an object, got {type(data).__name__}"]
+
+        errors = _check_keys(data, self.required, "")
+        if self.entries is None or errors:
+            return errors
+
+        seen = set()
+        for i, entry in enumerate(data[self.entries]):
+            where = f"{self.entries}[{i}]"
+            if not isinstance(entry, dict):
+                errors.append(f"{where} must be an object")
+                continue
+            errors.extend(_check_keys(entry, self.entry_required, where))
+            if self.unique_key and self.unique_key in entry:
+                key = entry[self.unique_key]
+                if key in seen:
+                    errors.append(f"{where}: duplicate {self.unique_key} {key!r}")
+                seen.add(key)
+        return errors
+
+
+def _check_keys(data: Dict[str, Any], required: Dict[str, Any], where: str) -> List[str]:
+    errors = []
+    prefix = f"{where}: " if where else ""
+    for key, expected in required.items():
+        if key not in data:
+            errors.append(f"{prefix}missing '{key}'")
+        elif not isinstance(data[key], expected):
+            errors.append(f"{prefix}'{key}' has type {type(data[key]).__name__}")
+    return errors
+
+
+_TALENT = FileSchema(
+    required={'talents': list},
+    entries='talents',
+    entry_required={'id': str, 'name': str, 'action_type': str, 'tier': str,
+                    'level': int, 'cost': dict, 'effects': dict, 'requirements': dict},
+    unique_key='id'
+)
+
+# Schemas by path pattern relative to the assets root; first match wins
+SCHEMAS: Dict[str, FileSchema] = {
+    'data/abilities/*_talents.json': _TALENT,
+    'data/items/base_items.json': FileSchema(
+        required={'items': list},
+        entries='items',
+        entry_required={'id': str, 'name': str, 'type': str, 'tier': str,
+                        'stats': dict, 'requirements': dict, 'value': (int, float)},
+        unique_key='id'
+    ),
+    'data/characters/*.json': FileSchema(required={'character_types': dict}),
+    'data/units/unit_types.json': FileSchema(required={'unit_types': dict}),
+    'data/units/unit_generation.json': FileSchema(required={'unit_generation': dict}),
+    'data/units/ai_difficulty.json': FileSchema(required={'ai_difficulty': dict}),
+    'data/gameplay/combat_values.json': FileSchema(required={'combat_values': dict}),
+    'data/gameplay/movement_values.json': FileSchema(required={'movement_values': dict}),
+    'data/config/talent_types.json': FileSchema(required={'talent_types': dict}),
+    '*.json': FileSchema(),
+}
+
+
+def schema_for(relpath: str) -> FileSchema:
+    """Get the schema that applies to an asset path."""
+    for pattern, schema in SCHEMAS.items():
+        if fnmatch.fnmatch(relpath, pattern):
+            return schema
+    return SCHEMAS['*.json']
+
+
+def _source_files(assets_root: Path) -> List[Tuple[str, Path]]:
+    return sorted(
+        (path.relative_to(assets_root).as_posix(), path)
+        for path in assets_root.rglob("*.json")
+    )
+
+
+def build_bundle(assets_root: Union[str, Path, None] = None,
+                 output: Union[str, Path, None] = None) -> Dict[str, Any]:
+    """
+    Validate all JSON assets and compile them into a bundle.
+
+    Args:
+        assets_root: Assets directory (defaults to the project assets folder)
+        output: Bundle path (defaults to ``<assets_root>/assets.bundle``)
+
+    Returns:
+        Build summary with the bundle path, entry count and content hash
+
+    Raises:
+        BundleError: If any file fails to parse or validate; nothing is written
+    """
+    assets_root = Path(assets_root or DEFAULT_ASSETS_ROOT).resolve()
+    output = Path(output or assets_root / BUNDLE_FILENAME)
+
+    blobs: List[bytes] = []
+    index: Dict[str, Tuple[int, int, int, int, bytes]] = {}
+    errors: List[str] = []
+    content_hash = hashlib.sha256()
+    offset = _HEADER.size
+
+    for relpath, path in _source_files(assets_root):
+        raw = path.read_bytes()
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            errors.append(f"{relpath}: invalid JSON: {e}")
+            continue
+        errors.extend(f"{relpath}: {problem}" for problem in schema_for(relpath).validate(data))
+
+        digest = hashlib.sha256(raw).digest()
+        content_hash.update(relpath.encode("utf-8") + b"\0" + digest)
+
+        blob = marshal.dumps(data)
+        stat = path.stat()
+        index[relpath] = (offset, len(blob), stat.st_size, stat.st_mtime_ns, digest)
+        blobs.append(blob)
+        offset += len(blob)
+
+    if errors:
+        raise BundleError("Asset validation failed:\n  " + "\n  ".join(errors))
+
+    index_blob = marshal.dumps(index)
+    header = _HEADER.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, sys.version_info[0],
+                          sys.version_info[1], content_hash.digest(), offset, len(index_blob))
+
+    # Write beside the target and swap in, so mapped readers keep the old file
+    tmp_path = output.with_name(output.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+        f.write(index_blob)
+    os.replace(tmp_path, output)
+
+    return {
+        'path': str(output),
+        'entries': len(index),
+        'bytes': offset + len(index_blob),
+        'content_hash': content_hash.hexdigest(),
+    }
+
+
+class AssetBundle:
+    """
+    Read-only, memory-mapped view of a built asset bundle.
+
+    ``get`` returns a freshly decoded object each call, so callers may
+    mutate what they receive exactly as they could a ``json.load`` result.
+    """
+
+    def __init__(self, path: Union[str, Path], assets_root: Union[str, Path, None] = None):
+        self.path = Path(path)
+        self.assets_root = Path(assets_root or DEFAULT_ASSETS_ROOT).resolve()
+        self._root = str(self.assets_root)
+
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, py_major, py_minor, digest, index_offset, index_length = \
+                _HEADER.unpack_from(self._map, 0)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_FORMAT_VERSION:
+                raise BundleError(f"{self.path} is not a version {BUNDLE_FORMAT_VERSION} asset bundle")
+            if (py_major, py_minor) != sys.version_info[:2]:
+                raise BundleError(f"{self.path} was built for Python {py_major}.{py_minor}")
+            self.content_hash = digest.hex()
+            self._index = marshal.loads(self._map[index_offset:index_offset + index_length])
+        except (BundleError, struct.error, ValueError, EOFError, TypeError):
+            self._map.close()
+            raise
+
+        self._fresh: Dict[str, Tuple[int, bool]] = {}  # relpath -> (mtime_ns, unchanged)
+        self.hits = 0
+        self.stale_reads = 0
+
+    def __contains__(self, relpath: str) -> bool:
+        return relpath in self._index
+
+    def is_fresh(self, relpath: str) -> bool:
+        """Check whether an entry still matches its source JSON file."""
+        offset, length, size, mtime_ns, digest = self._index[relpath]
+        source_path = os.path.join(self._root, relpath)
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return False  # Source deleted since the build
+
+        if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+            return True
+        if stat.st_size != size:
+            return False
+
+        # Touched but maybe unchanged; compare content once and remember
+        fresh = self._fresh.get(relpath)
+        if fresh is None or fresh[0] != stat.st_mtime_ns:
+            with open(source_path, 'rb') as f:
+                source = f.read()
+            fresh = (stat.st_mtime_ns, hashlib.sha256(source).digest() == digest)
+            self._fresh[relpath] = fresh
+        return fresh[1]
+
+    def get(self, relpath: str) -> Optional[Any]:
+        """
+        Decode an entry.
+
+        Args:
+            relpath: Path relative to the assets root, e.g. 'data/items/base_items.json'
+
+        Returns:
+            Decoded data, or None if the entry is missing or stale
+        """
+        if relpath not in self._index or not self.is_fresh(relpath):
+            if relpath in self._index:
+                self.stale_reads += 1
+            return None
+
+        offset, length = self._index[relpath][:2]
+        self.hits += 1
+        return marshal.loads(self._map[offset:offset + length])
+
+    def relpath(self, path: Union[str, Path]) -> Optional[str]:
+        """Entry key for a file path, or None if it lies outside the assets root."""
+        relpath = os.path.relpath(os.path.abspath(path), self._root)
+        if relpath == os.pardir or relpath.startswith(os.pardir + os.sep):
+            return None
+        return relpath.replace(os.sep, '/')
+
+    def close(self):
+        self._map.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bundle statistics."""
+        return {
+            'path': str(self.path),
+            'entries': len(self._index),
+            'bytes': len(self._map),
+            'content_hash': self.content_hash,
+            'hits': self.hits,
+            'stale_reads': self.stale_reads,
+        }
+
+
+# Global bundle, opened on first use; False once known to be unavailable
+_bundle: Union[AssetBundle, None, bool] = None
+
+
+def get_asset_bundle() -> Optional[AssetBundle]:
+    """Get the shared asset bundle, or None if disabled or not built."""
+    global _bundle
+    if _bundle is None:
+        setting = os.getenv("APEX_ASSET_BUNDLE", "")
+        path = Path(setting) if setting not in ("", "0") else DEFAULT_ASSETS_ROOT / BUNDLE_FILENAME
+        _bundle = False
+        if setting != "0" and path.exists():
+            try:
+                _bundle = AssetBundle(path)
+                logger.info("Asset bundle mapped", path=str(path), entries=len(_bundle._index))
+            except (OSError, BundleError) as e:
+                logger.warning("Asset bundle unusable, reading JSON files", path=str(path), error=str(e))
+    return _bundle or None
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    Load a JSON asset, from the bundle when it holds a fresh copy.
+
+    Args:
+        path: Path to the JSON file
+
+    Raises:
+        OSError, ValueError: As ``json.load`` would when reading the file
+    """
+    bundle = get_asset_bundle()
+    if bundle is not None:
+        relpath = bundle.relpath(path)
+        if relpath is not None:
+            data = bundle.get(relpath)
+            if data is not None:
+                return data
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
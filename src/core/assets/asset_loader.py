@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List, Union
 import logging
 
+from .asset_bundle import load_json
+
 try:
     from ursina import load_texture, Audio
     URSINA_AVAILABLE = True
@@ -103,8 +105,7 @@ class AssetLoader:
                 self.logger.warning(f"Data file not found: {full_path}")
                 return None
             
-            with open(full_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json(full_path)
             
             # Cache the data
             if cache:
@@ -0,0 +1,357 @@
+"""
+Talent and Item Catalog
+
+Immutable, indexed view of the talent trees and base items. Entries are
+frozen dataclasses whose nested data is read-only (``MappingProxyType`` and
+tuples), so AI and MCP code can share them without defensive copies.
+
+Indexes cover id, action type, tier, tree, targeting range and AP cost
+bucket. Each talent also carries precomputed targeting footprints: the
+tile offsets it can target from the caster, and the offsets its area
+covers around the target.
+
+Usage:
+    catalog = get_catalog()
+    fireball = catalog.talent('fireball')
+    for dx, dy in fireball.range_footprint:
+        ...
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .asset_bundle import DEFAULT_ASSETS_ROOT, load_json
+from ..utils.logging import Logger
+
+logger = Logger.get_logger(__name__)
+
+Offset = Tuple[int, int]
+
+# Talent tree name -> file under assets/data/abilities
+TALENT_TREE_FILES = {
+    "Physical": "physical_talents.json",
+    "Magical": "magical_talents.json",
+    "Spiritual": "spiritual_talents.json",
+}
+ITEMS_FILE = "items/base_items.json"
+
+# AP costs at or above this share the top bucket
+MAX_COST_BUCKET = 5
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+_OFFENSIVE_ACTION_TYPES = frozenset({'attack', 'ability', 'spell', 'magic', 'combat'})
+_OFFENSIVE_NAME_WORDS = ('attack', 'strike', 'blast', 'bolt')
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of ``freeze``, for callers that need plain JSON data."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def diamond(radius: int, include_center: bool = False) -> Tuple[Offset, ...]:
+    """Offsets within a Manhattan radius, nearest first."""
+    offsets = [
+        (dx, dy)
+        for dx in range(-radius, radius + 1)
+        for dy in range(-radius, radius + 1)
+        if abs(dx) + abs(dy) <= radius and (include_center or dx or dy)
+    ]
+    offsets.sort(key=lambda o: (abs(o[0]) + abs(o[1]), o))
+    return tuple(offsets)
+
+
+_ADJACENT: Tuple[Offset, ...] = tuple(
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+)
+
+
+def cost_bucket(ap_cost: int) -> int:
+    """AP cost bucket used by the catalog's cost index."""
+    return max(0, min(int(ap_cost), MAX_COST_BUCKET))
+
+
+@dataclass(frozen=True, slots=True)
+class TalentEntry:
+    """Read-only talent record with derived targeting data."""
+    id: str
+    name: str
+    tree: str
+    action_type: str
+    tier: str
+    level: int
+    description: str
+    cost: Mapping[str, Any]
+    effects: Mapping[str, Any]
+    requirements: Mapping[str, Any]
+    ap_cost: int
+    range: int
+    area_radius: int
+    target_type: str
+    offensive: bool
+    range_footprint: Tuple[Offset, ...]
+    area_footprint: Tuple[Offset, ...]
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], tree: str = "") -> 'TalentEntry':
+        """Create an entry from a talent file record."""
+        effects = freeze(dict(data.get('effects') or {}))
+        cost = freeze(dict(data.get('cost') or {}))
+        name = data.get('name', 'Unknown')
+        action_type = data.get('action_type', 'Attack')
+
+        talent_range = effects.get('range', 0)
+        talent_range = talent_range if isinstance(talent_range, int) else 0
+        area = effects.get('area_of_effect', 1)
+        if area == 'adjacent':
+            area_radius, area_footprint = 1, _ADJACENT
+        else:
+            area_radius = max(int(area) - 1, 0) if isinstance(area, int) else 0
+            area_footprint = diamond(area_radius, include_center=True)
+
+        lowered_name = name.lower()
+        offensive = (
+            action_type.lower() in _OFFENSIVE_ACTION_TYPES
+            or any('damage' in key for key in effects)
+            or any(word in lowered_name for word in _OFFENSIVE_NAME_WORDS)
+        )
+
+        return cls(
+            id=data['id'],
+            name=name,
+            tree=tree or data.get('tree', ''),
+            action_type=action_type,
+            tier=data.get('tier', 'Novice'),
+            level=data.get('level', 1),
+            description=data.get('description', ''),
+            cost=cost,
+            effects=effects,
+            requirements=freeze(dict(data.get('requirements') or {})),
+            ap_cost=cost.get('ap_cost', cost.get('ap', 1)),
+            range=talent_range,
+            area_radius=area_radius,
+            target_type=effects.get('target_type', 'enemy' if offensive else 'self'),
+            offensive=offensive,
+            range_footprint=diamond(talent_range) if talent_range else ((0, 0),),
+            area_footprint=area_footprint,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, mutable copy in the talent file format plus ``tree``."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'tree': self.tree,
+            'action_type': self.action_type,
+            'tier': self.tier,
+            'level': self.level,
+            'description': self.description,
+            'cost': thaw(self.cost),
+            'effects': thaw(self.effects),
+            'requirements': thaw(self.requirements),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ItemEntry:
+    """Read-only item record."""
+    id: str
+    name: str
+    type: str
+    tier: str
+    rarity: str
+    value: int
+    stats: Mapping[str, Any]
+    requirements: Mapping[str, Any]
+    data: Mapping[str, Any]  # Full frozen record
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'ItemEntry':
+        frozen = freeze(dict(data))
+        return cls(
+            id=data['id'],
+            name=data['name'],
+            type=data['type'],
+            tier=data.get('tier', ''),
+            rarity=data.get('rarity', ''),
+            value=data.get('value', 0),
+            stats=frozen.get('stats', _EMPTY),
+            requirements=frozen.get('requirements', _EMPTY),
+            data=frozen,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, mutable copy of the item file record."""
+        return thaw(self.data)
+
+
+def _group(entries: Iterable[Any], key) -> Mapping[Any, Tuple[Any, ...]]:
+    groups: Dict[Any, List[Any]] = {}
+    for entry in entries:
+        groups.setdefault(key(entry), []).append(entry)
+    return MappingProxyType({k: tuple(v) for k, v in groups.items()})
+
+
+class Catalog:
+    """
+    Indexed, immutable talent and item catalog.
+
+    All lookups are dict reads returning shared tuples or entries; nothing
+    is copied per query.
+    """
+
+    def __init__(self, talents: Iterable[TalentEntry] = (), items: Iterable[ItemEntry] = (),
+                 trees: Optional[Mapping[str, Mapping[str, Any]]] = None):
+        self.talents: Tuple[TalentEntry, ...] = tuple(talents)
+        self.items: Tuple[ItemEntry, ...] = tuple(items)
+        # Tree name -> tree file metadata (name, description) without its talents
+        self.trees: Mapping[str, Mapping[str, Any]] = freeze(dict(trees or {}))
+
+        self._talents_by_id = MappingProxyType({t.id: t for t in self.talents})
+        self._talents_by_action_type = _group(self.talents, lambda t: t.action_type)
+        self._talents_by_tier = _group(self.talents, lambda t: t.tier)
+        self._talents_by_tree = _group(self.talents, lambda t: t.tree)
+        self._talents_by_cost = _group(self.talents, lambda t: cost_bucket(t.ap_cost))
+
+        # Talents able to reach at least distance d, for d up to the max range
+        max_range = max((t.range for t in self.talents), default=0)
+        self._talents_reaching = tuple(
+            tuple(t for t in self.talents if t.range >= distance)
+            for distance in range(max_range + 1)
+        )
+        # Talents costing at most b AP, per bucket
+        self._talents_affordable = tuple(
+            tuple(t for t in self.talents if cost_bucket(t.ap_cost) <= bucket)
+            for bucket in range(MAX_COST_BUCKET + 1)
+        )
+
+        self._items_by_id = MappingProxyType({i.id: i for i in self.items})
+        self._items_by_type = _group(self.items, lambda i: i.type)
+        self._items_by_tier = _group(self.items, lambda i: i.tier)
+
+    # Talents
+
+    def talent(self, talent_id: str) -> Optional[TalentEntry]:
+        """Get a talent by id."""
+        return self._talents_by_id.get(talent_id)
+
+    def talents_by_action_type(self, action_type: str) -> Tuple[TalentEntry, ...]:
+        return self._talents_by_action_type.get(action_type, ())
+
+    def talents_by_tier(self, tier: str) -> Tuple[TalentEntry, ...]:
+        return self._talents_by_tier.get(tier, ())
+
+    def talents_by_tree(self, tree: str) -> Tuple[TalentEntry, ...]:
+        return self._talents_by_tree.get(tree, ())
+
+    def talents_by_cost_bucket(self, bucket: int) -> Tuple[TalentEntry, ...]:
+        """Talents whose AP cost falls in a bucket (see ``cost_bucket``)."""
+        return self._talents_by_cost.get(bucket, ())
+
+    def talents_in_range(self, distance: int) -> Tuple[TalentEntry, ...]:
+        """Talents whose range reaches a target ``distance`` tiles away."""
+        if distance < 0:
+            distance = 0
+        if distance >= len(self._talents_reaching):
+            return ()
+        return self._talents_reaching[distance]
+
+    def talents_affordable(self, ap: int) -> Tuple[TalentEntry, ...]:
+        """Talents costing at most ``ap`` action points (top bucket inclusive)."""
+        if ap < 0:
+            return ()
+        return self._talents_affordable[min(ap, MAX_COST_BUCKET)]
+
+    # Items
+
+    def item(self, item_id: str) -> Optional[ItemEntry]:
+        """Get an item by id."""
+        return self._items_by_id.get(item_id)
+
+    def items_by_type(self, item_type: str) -> Tuple[ItemEntry, ...]:
+        return self._items_by_type.get(item_type, ())
+
+    def items_by_tier(self, tier: str) -> Tuple[ItemEntry, ...]:
+        return self._items_by_tier.get(tier, ())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get catalog statistics."""
+        return {
+            'talents': len(self.talents),
+            'items': len(self.items),
+            'talent_trees': list(self.trees),
+            'max_talent_range': len(self._talents_reaching) - 1,
+        }
+
+
+def load_catalog(abilities_path: Optional[Path] = None,
+                 items_path: Optional[Path] = None) -> Catalog:
+    """
+    Build a catalog from the talent tree and item files.
+
+    Args:
+        abilities_path: Directory holding the talent tree files
+        items_path: Base items file
+    """
+    data_root = DEFAULT_ASSETS_ROOT / "data"
+    abilities_path = Path(abilities_path or data_root / "abilities")
+    items_path = Path(items_path or data_root / ITEMS_FILE)
+
+    talents: Dict[str, TalentEntry] = {}
+    trees: Dict[str, Dict[str, Any]] = {}
+    for tree, filename in TALENT_TREE_FILES.items():
+        path = abilities_path / filename
+        if not path.exists():
+            continue
+        try:
+            tree_data = load_json(path)
+            for record in tree_data.get('talents', []):
+                if record.get('id'):
+                    talents[record['id']] = TalentEntry.from_dict(record, tree)
+            trees[tree] = {k: v for k, v in tree_data.items() if k != 'talents'}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Could not load talent tree", tree=tree, error=str(e))
+
+    items: Dict[str, ItemEntry] = {}
+    if items_path.exists():
+        try:
+            for record in load_json(items_path).get('items', []):
+                items[record['id']] = ItemEntry.from_dict(record)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Could not load items", error=str(e))
+
+    return Catalog(talents.values(), items.values(), trees)
+
+
+# Global catalog instance
+_catalog: Optional[Catalog] = None
+
+
+def get_catalog() -> Catalog:
+    """Get the shared catalog built from the project assets."""
+    global _catalog
+    if _catalog is None:
+        _catalog = load_catalog()
+        logger.debug("Catalog built", talents=len(_catalog.talents), items=len(_catalog.items))
+    return _catalog
+
+
+def reload_catalog() -> Catalog:
+    """Rebuild the shared catalog from the asset files."""
+    global _catalog
+    _catalog = None
+    return get_catalog()
@@ -11,6 +11,10 @@ import time
 from typing import Dict, Any, Optional, List, Union, Callable
 from pathlib import Path
 
+from ..utils.stat_cache import DerivedStatCache
+from .asset_bundle import load_json
+from .formula import CompiledFormula, FormulaError, compile_formula
+
 try:
     from ursina import color
     URSINA_AVAILABLE = True
@@ -31,7 +35,7 @@ class ModifierEffect:
     
     def is_expired(self) -> bool:
         """Check if this temporary modifier has expired."""
-        if self.persistent:
+        if self.persistent or self.duration <= 0:
             return False
         return time.time() - self.start_time > self.duration
     
@@ -42,6 +46,63 @@ class ModifierEffect:
         return value
 
 
+# Marks a path that does not exist in the loaded configs
+_MISSING = object()
+
+
+class _VersionCell:
+    """Per-path version counter shared by every handle on that path."""
+    
+    __slots__ = ('version', 'expires_at')
+    
+    def __init__(self):
+        self.version = 0
+        self.expires_at: Optional[float] = None  # Earliest timed-modifier expiry
+
+
+class ConfigHandle:
+    """
+    Pre-resolved accessor for one configuration path.
+    
+    The path is walked and modifiers applied once; ``value`` then returns
+    the stored result until the path's version changes (``hot_reload``,
+    ``add_modifier``, ``remove_modifier``, ``clear_modifiers``) or a timed
+    modifier on it expires.
+    
+    Usage:
+        attack_range = config.get_handle('combat.combat_values.base_combat_values.attack_range.default', 1)
+        ...
+        reach = attack_range.value
+    """
+    
+    __slots__ = ('path', 'default', 'apply_modifiers', '_manager', '_cell', '_seen', '_value')
+    
+    def __init__(self, manager: 'ConfigManager', path: str, default: Any, apply_modifiers: bool):
+        self.path = path
+        self.default = default
+        self.apply_modifiers = apply_modifiers
+        self._manager = manager
+        self._cell = manager._version_cell(path)
+        self._seen = -1
+        self._value = _MISSING
+    
+    @property
+    def value(self) -> Any:
+        """Current value, re-resolved only when the path has changed."""
+        manager = self._manager
+        manager.handle_reads += 1
+        cell = self._cell
+        if self._seen != cell.version or (cell.expires_at is not None and self.apply_modifiers
+                                          and time.time() >= cell.expires_at):
+            self._value = manager._resolve(self.path, self.apply_modifiers)
+            self._seen = cell.version
+        value = self._value
+        return self.default if value is _MISSING else value
+    
+    def __repr__(self) -> str:
+        return f"ConfigHandle({self.path!r})"
+
+
 class ConfigManager:
     """
     Centralized configuration manager for all game values.
@@ -66,9 +127,12 @@ class ConfigManager:
         self.configs: Dict[str, Dict[str, Any]] = {}
         self.last_loaded: Dict[str, float] = {}
         self.modifiers: Dict[str, List[ModifierEffect]] = {}
-        self.cache: Dict[str, Any] = {}
-        self.cache_timeout = 0.1  # Cache values for 100ms
-        self.last_cache_clear = time.time()
+        
+        # Resolved-path handles backing get_value, and their version counters
+        self.handles: Dict[tuple, ConfigHandle] = {}
+        self.versions: Dict[str, _VersionCell] = {}
+        self.handle_reads = 0
+        self.slow_lookups = 0
         
         # Define configuration file mappings
         self.config_files = {
@@ -105,12 +169,10 @@ class ConfigManager:
         
         try:
             if full_path.exists():
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.configs[config_name] = data
-                    self.last_loaded[config_name] = time.time()
-                    print(f"✅ Loaded config '{config_name}' from {file_path}")
-                    return True
+                self.configs[config_name] = load_json(full_path)
+                self.last_loaded[config_name] = time.time()
+                print(f"✅ Loaded config '{config_name}' from {file_path}")
+                return True
             else:
                 print(f"⚠️ Config file not found: {full_path}")
                 self._load_default_config(config_name)
@@ -163,42 +225,68 @@ class ConfigManager:
         Returns:
             Configuration value with modifiers applied
         """
-        # Check cache first
-        cache_key = f"{path}_{apply_modifiers}"
-        current_time = time.time()
-        
-        if cache_key in self.cache:
-            cached_value, cache_time = self.cache[cache_key]
-            if current_time - cache_time < self.cache_timeout:
-                return cached_value
+        handle = self.handles.get((path, apply_modifiers))
+        if handle is None:
+            handle = self.handles[(path, apply_modifiers)] = ConfigHandle(
+                self, path, _MISSING, apply_modifiers
+            )
         
-        # Clear old cache entries periodically
-        if current_time - self.last_cache_clear > 1.0:
-            self._clear_expired_cache()
-            self.last_cache_clear = current_time
+        value = handle.value
+        if value is _MISSING:
+            # Modifiers still apply to the caller's default, as before
+            if apply_modifiers and default is not None and self.modifiers.get(path):
+                return self._apply_modifiers(path, default)
+            return default
+        return value
+    
+    def get_handle(self, path: str, default: Any = None, apply_modifiers: bool = True) -> ConfigHandle:
+        """
+        Get a pre-resolved accessor for a path, for lookups on hot paths.
         
-        # Navigate to the value
-        parts = path.split('.')
+        Args:
+            path: Dot-separated configuration path
+            default: Value returned while the path does not exist
+            apply_modifiers: Whether to apply active modifiers
+        """
+        return ConfigHandle(self, path, default, apply_modifiers)
+    
+    def _version_cell(self, path: str) -> _VersionCell:
+        cell = self.versions.get(path)
+        if cell is None:
+            cell = self.versions[path] = _VersionCell()
+        return cell
+    
+    def _bump_version(self, path: str):
+        """Invalidate every handle on a path."""
+        cell = self._version_cell(path)
+        cell.version += 1
+        cell.expires_at = self._next_expiry(path)
+    
+    def _next_expiry(self, path: str) -> Optional[float]:
+        expiries = [
+            m.start_time + m.duration for m in self.modifiers.get(path, ())
+            if not m.persistent and m.duration > 0
+        ]
+        return min(expiries) if expiries else None
+    
+    def _resolve(self, path: str, apply_modifiers: bool) -> Any:
+        """Walk the dot path and apply modifiers (slow path)."""
+        self.slow_lookups += 1
         current = self.configs
         
-        try:
-            for part in parts:
-                if isinstance(current, dict) and part in current:
-                    current = current[part]
-                else:
-                    current = default
-                    break
-            
-            # Apply modifiers if requested
-            if apply_modifiers and current is not None:
+        for part in path.split('.'):
+            if isinstance(current, dict) and part in current:
+                current = current[part]
+            else:
+                return _MISSING
+        
+        if apply_modifiers and current is not None:
+            try:
                 current = self._apply_modifiers(path, current)
-            
-            # Cache the result
-            self.cache[cache_key] = (current, current_time)
-            return current
-            
-        except Exception:
-            return default
+            except Exception:
+                return _MISSING
+            self._version_cell(path).expires_at = self._next_expiry(path)
+        return current
     
     def _apply_modifiers(self, path: str, value: Any) -> Any:
         """Apply all active modifiers for a given path."""
@@ -212,16 +300,6 @@ class ConfigManager:
         
         return value
     
-    def _clear_expired_cache(self):
-        """Remove expired cache entries."""
-        current_time = time.time()
-        expired_keys = [
-            key for key, (_, cache_time) in self.cache.items()
-            if current_time - cache_time > self.cache_timeout
-        ]
-        for key in expired_keys:
-            del self.cache[key]
-    
     def add_modifier(self, path: str, name: str, modifier_func: Callable, 
                     duration: float = 0, persistent: bool = False):
         """
@@ -243,11 +321,7 @@ class ConfigManager:
         # Add new modifier
         modifier = ModifierEffect(name, modifier_func, duration, persistent)
         self.modifiers[path].append(modifier)
-        
-        # Clear cache for this path
-        cache_keys_to_remove = [key for key in self.cache.keys() if key.startswith(f"{path}_")]
-        for key in cache_keys_to_remove:
-            del self.cache[key]
+        self._bump_version(path)
         
         print(f"🔧 Added modifier '{name}' to '{path}'")
     
@@ -255,19 +329,18 @@ class ConfigManager:
         """Remove a specific modifier."""
         if path in self.modifiers:
             self.modifiers[path] = [m for m in self.modifiers[path] if m.name != name]
-            # Clear cache for this path
-            cache_keys_to_remove = [key for key in self.cache.keys() if key.startswith(f"{path}_")]
-            for key in cache_keys_to_remove:
-                del self.cache[key]
+            self._bump_version(path)
             print(f"🗑️ Removed modifier '{name}' from '{path}'")
     
     def clear_modifiers(self, path: str = None):
         """Clear modifiers for a path or all paths."""
         if path:
             self.modifiers[path] = []
+            self._bump_version(path)
         else:
             self.modifiers.clear()
-        self.cache.clear()
+            for cell_path in list(self.versions):
+                self._bump_version(cell_path)
         print(f"🧹 Cleared modifiers for {'all paths' if path is None else path}")
     
     def hot_reload(self, config_name: str = None):
@@ -277,16 +350,23 @@ class ConfigManager:
         Args:
             config_name: Specific config to reload, or None for all
         """
-        self.cache.clear()  # Clear cache after reload
-        
         if config_name:
             if config_name in self.config_files:
                 self.load_config(config_name, self.config_files[config_name])
             else:
                 print(f"❌ Unknown config name: {config_name}")
+                return
         else:
             print("🔄 Hot-reloading all configurations...")
             self.load_all_configs()
+        
+        # Invalidate handles on reloaded paths
+        for path in list(self.versions):
+            if config_name is None or path == config_name or path.startswith(f"{config_name}."):
+                self._bump_version(path)
+        
+        # Derived stats (units, stats and equipment components) may read reloaded values
+        DerivedStatCache.invalidate_everywhere()
     
     # Convenience methods for common configuration types
     
@@ -328,33 +408,66 @@ class ConfigManager:
             )
         return default
     
+    def get_formula(self, formula_path: str) -> Optional[CompiledFormula]:
+        """
+        Get the compiled formula stored at a configuration path.
+        
+        Returns:
+            Compiled formula, or None if the path is missing or invalid
+        """
+        source = self.get_value(formula_path, None)
+        if not source or not isinstance(source, str):
+            return None
+        
+        try:
+            return compile_formula(source)
+        except FormulaError as e:
+            print(f"⚠️ Invalid formula at '{formula_path}': {e}")
+            return None
+    
     def get_formula_result(self, formula_path: str, variables: Dict[str, Any], default: Any = 0) -> Any:
         """
         Evaluate a formula from configuration with provided variables.
         
         Args:
             formula_path: Path to formula string in config
-            variables: Variables to substitute in formula
+            variables: Variables to bind by name in the formula
             default: Default result if formula fails
             
         Returns:
             Evaluated formula result
         """
-        formula = self.get_value(formula_path, None)
-        if not formula:
+        formula = self.get_formula(formula_path)
+        if formula is None:
             return default
         
         try:
-            # Simple formula evaluation with variable substitution
-            # Note: In production, consider using a safer expression evaluator
-            for var_name, var_value in variables.items():
-                formula = formula.replace(var_name, str(var_value))
+            return formula.evaluate(variables)
+        except FormulaError as e:
+            print(f"⚠️ {e}")
+            return default
+    
+    def get_formula_batch_result(self, formula_path: str, variables: Dict[str, Any],
+                                 default: Any = 0) -> Any:
+        """
+        Evaluate a formula element-wise over NumPy arrays of variables.
+        
+        Args:
+            formula_path: Path to formula string in config
+            variables: Arrays or scalars, broadcast against each other
+            default: Default result if formula fails
             
-            # Evaluate the formula (CAUTION: using eval - consider safer alternatives)
-            result = eval(formula)
-            return result
-        except Exception as e:
-            print(f"⚠️ Error evaluating formula '{formula}': {e}")
+        Returns:
+            Array of results
+        """
+        formula = self.get_formula(formula_path)
+        if formula is None:
+            return default
+        
+        try:
+            return formula.evaluate_batch(variables)
+        except FormulaError as e:
+            print(f"⚠️ {e}")
             return default
     
     def list_modifiers(self) -> Dict[str, List[str]]:
@@ -370,7 +483,9 @@ class ConfigManager:
         """Get configuration manager statistics."""
         return {
             'loaded_configs': list(self.configs.keys()),
-            'cache_size': len(self.cache),
+            'cache_size': len(self.handles),
+            'handle_reads': self.handle_reads,
+            'slow_lookups': self.slow_lookups,
             'active_modifiers': sum(len(mods) for mods in self.modifiers.values()),
             'last_reload': max(self.last_loaded.values()) if self.last_loaded else 0
         }
@@ -412,6 +527,11 @@ def reload_configs():
     config_manager.hot_reload()
 
 
+def get_config_handle(path: str, default: Any = None) -> ConfigHandle:
+    """Get a pre-resolved accessor on the global configuration manager."""
+    return get_config_manager().get_handle(path, default)
+
+
 # Convenience functions for common operations
 def get_combat_value(path: str, default: Any = None) -> Any:
     """Get a combat-related configuration value."""
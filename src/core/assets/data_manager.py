@@ -8,6 +8,10 @@ Provides typed interfaces for different data types like items, abilities, etc.
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from .asset_loader import get_asset_loader
+from .catalog import Catalog, get_catalog, reload_catalog
+from ..utils.logging import Logger
+
+logger = Logger.get_logger(__name__)
 
 
 @dataclass
@@ -147,6 +151,7 @@ class DataManager:
     def __init__(self):
         """Initialize the data manager."""
         self.asset_loader = get_asset_loader()
+        self.catalog: Catalog = get_catalog()
         
         # Data caches
         self._items: Dict[str, ItemData] = {}
@@ -162,49 +167,33 @@ class DataManager:
         self._load_items()
         self._load_abilities()
         self._load_talents()
-        print("✅ DataManager loaded all game data")
+        logger.info("DataManager loaded all game data")
     
     def _load_items(self):
-        """Load item data from files."""
-        # Load base items
-        base_items_data = self.asset_loader.load_data("items/base_items.json")
-        if base_items_data and 'items' in base_items_data:
-            for item_dict in base_items_data['items']:
-                item = ItemData.from_dict(item_dict)
-                self._items[item.id] = item
-                
-                # Organize by type
-                if item.type not in self._item_types:
-                    self._item_types[item.type] = []
-                self._item_types[item.type].append(item)
+        """Load item data from the shared catalog."""
+        for entry in self.catalog.items:
+            item = ItemData.from_dict(entry.to_dict())
+            self._items[item.id] = item
+            
+            # Organize by type
+            if item.type not in self._item_types:
+                self._item_types[item.type] = []
+            self._item_types[item.type].append(item)
         
-        print(f"✅ Loaded {len(self._items)} items from data files")
+        logger.debug("Loaded items from data files", count=len(self._items))
     
     def _load_abilities(self):
         """Load ability data from files."""
         # No abilities files exist yet - abilities are different from talents
         # When abilities are implemented, they would be loaded from abilities/base_abilities.json
-        print(f"✅ Loaded {len(self._abilities)} abilities from data files (no ability files exist yet)")
+        logger.debug("Loaded abilities from data files", count=len(self._abilities))
     
     def _load_talents(self):
-        """Load talents from talent files."""
-        # Load talents from each talent tree file
-        talent_files = [
-            "abilities/physical_talents.json",
-            "abilities/magical_talents.json", 
-            "abilities/spiritual_talents.json"
-        ]
-        
-        total_talents = 0
-        for file_path in talent_files:
-            talent_data = self.asset_loader.load_data(file_path)
-            if talent_data and 'talents' in talent_data:
-                for talent_dict in talent_data['talents']:
-                    talent = TalentData.from_dict(talent_dict)
-                    self._talents[talent.id] = talent
-                    total_talents += 1
+        """Load talents from the shared catalog."""
+        for entry in self.catalog.talents:
+            self._talents[entry.id] = TalentData.from_dict(entry.to_dict())
         
-        print(f"✅ Loaded {total_talents} talents from data files")
+        logger.debug("Loaded talents from data files", count=len(self._talents))
     
     def get_item(self, item_id: str) -> Optional[ItemData]:
         """Get item data by ID."""
@@ -236,11 +225,11 @@ class DataManager:
     
     def get_talents_by_action_type(self, action_type: str) -> List[TalentData]:
         """Get all talents of a specific action type."""
-        return [talent for talent in self._talents.values() if talent.action_type == action_type]
+        return [self._talents[entry.id] for entry in self.catalog.talents_by_action_type(action_type)]
     
     def get_talents_by_tier(self, tier: str) -> List[TalentData]:
         """Get all talents of a specific tier."""
-        return [talent for talent in self._talents.values() if talent.tier == tier]
+        return [self._talents[entry.id] for entry in self.catalog.talents_by_tier(tier)]
     
     def get_all_talents(self) -> List[TalentData]:
         """Get all talents."""
@@ -255,7 +244,7 @@ class DataManager:
                 return ui_config_data
                 
             # Fallback to old config files
-            print("⚠️ Falling back to legacy UI config files")
+            logger.warning("Falling back to legacy UI config files")
             
             # Try character interface config
             char_config = self.asset_loader.load_data("ui/character_interface_config.json")
@@ -272,7 +261,7 @@ class DataManager:
                 
             return None
         except Exception as e:
-            print(f"Could not load UI config: {e}")
+            logger.warning("Could not load UI config", error=str(e))
             return None
     
     def get_action_item_config(self) -> Dict[str, Any]:
@@ -354,10 +343,11 @@ class DataManager:
         
         # Clear asset loader cache
         self.asset_loader.clear_cache('data')
+        self.catalog = reload_catalog()
         
         # Reload all data
         self._load_all_data()
-        print("✅ Reloaded all game data")
+        logger.info("Reloaded all game data")
 
 
 # Global data manager instance
@@ -0,0 +1,291 @@
+"""
+Formula Engine
+
+Safe evaluation of the arithmetic formulas stored in configuration files,
+e.g. ``"(speed + strength + finesse) // 2"`` or
+``"max(min_damage, damage - defense)"``.
+
+Formulas are parsed once into a restricted AST (arithmetic, comparisons,
+conditionals and whitelisted math functions only), compiled, and cached
+per formula string. Variables are bound by name, and the same formula can
+be evaluated over NumPy arrays to compute many results at once.
+
+Usage:
+    formula = compile_formula("max(min_damage, damage - defense)")
+    formula.evaluate({'damage': 12, 'defense': 5, 'min_damage': 1})
+    formula.evaluate_batch({'damage': 12, 'defense': defenses, 'min_damage': 1})
+"""
+
+import ast
+import math
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Mapping
+
+import numpy as np
+
+
+class FormulaError(ValueError):
+    """Raised when a formula is rejected or cannot be evaluated."""
+
+
+# Largest exponent allowed in ``**`` so formulas cannot build huge integers
+MAX_EXPONENT = 64
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub, ast.Not)
+_COMPARE_OPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+
+def _pow(base, exponent):
+    if np.any(np.abs(exponent) > MAX_EXPONENT):
+        raise FormulaError(f"Exponent exceeds {MAX_EXPONENT}")
+    return base ** exponent
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+def _reduce(ufunc):
+    def apply(*args):
+        if len(args) == 1:
+            raise FormulaError("Batch min/max need at least two arguments")
+        result = args[0]
+        for arg in args[1:]:
+            result = ufunc(result, arg)
+        return result
+    return apply
+
+
+# Functions callable from formulas, in scalar and NumPy form
+SCALAR_FUNCTIONS: Dict[str, Any] = {
+    'abs': abs,
+    'min': min,
+    'max': max,
+    'round': round,
+    'int': int,
+    'float': float,
+    'floor': math.floor,
+    'ceil': math.ceil,
+    'sqrt': math.sqrt,
+    'log': math.log,
+    'exp': math.exp,
+    'clamp': _clamp,
+}
+
+BATCH_FUNCTIONS: Dict[str, Any] = {
+    'abs': np.abs,
+    'min': _reduce(np.minimum),
+    'max': _reduce(np.maximum),
+    'round': np.round,
+    'int': np.trunc,
+    'float': np.asarray,
+    'floor': np.floor,
+    'ceil': np.ceil,
+    'sqrt': np.sqrt,
+    'log': np.log,
+    'exp': np.exp,
+    'clamp': np.clip,
+}
+
+# Helpers the compiler injects; not callable from formula text
+_SCALAR_HELPERS = {'_pow': _pow}
+_BATCH_HELPERS = {
+    '_pow': _pow,
+    '_where': np.where,
+    '_and': np.logical_and,
+    '_or': np.logical_or,
+    '_not': np.logical_not,
+}
+
+
+class _Validator(ast.NodeVisitor):
+    """Rejects any node outside the formula grammar and collects variables."""
+
+    def __init__(self):
+        self.variables = set()
+
+    def generic_visit(self, node):
+        raise FormulaError(f"Unsupported syntax: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        self.visit(node.body)
+
+    def visit_Constant(self, node):
+        if type(node.value) not in (int, float, bool):
+            raise FormulaError(f"Unsupported constant: {node.value!r}")
+
+    def visit_Name(self, node):
+        if node.id.startswith('_'):
+            raise FormulaError(f"Invalid name: {node.id}")
+        self.variables.add(node.id)
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _BIN_OPS):
+            raise FormulaError(f"Unsupported operator: {type(node.op).__name__}")
+        self.visit(node.left)
+        self.visit(node.right)
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARY_OPS):
+            raise FormulaError(f"Unsupported operator: {type(node.op).__name__}")
+        self.visit(node.operand)
+
+    def visit_BoolOp(self, node):
+        for value in node.values:
+            self.visit(value)
+
+    def visit_Compare(self, node):
+        for op in node.ops:
+            if not isinstance(op, _COMPARE_OPS):
+                raise FormulaError(f"Unsupported comparison: {type(op).__name__}")
+        self.visit(node.left)
+        for comparator in node.comparators:
+            self.visit(comparator)
+
+    def visit_IfExp(self, node):
+        self.visit(node.test)
+        self.visit(node.body)
+        self.visit(node.orelse)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in SCALAR_FUNCTIONS:
+            raise FormulaError(f"Unknown function: {ast.unparse(node.func)}")
+        if node.keywords:
+            raise FormulaError("Keyword arguments are not supported")
+        for arg in node.args:
+            self.visit(arg)
+
+
+class _PowRewriter(ast.NodeTransformer):
+    """Routes ``**`` through the bounded ``_pow`` helper."""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return _call('_pow', [node.left, node.right])
+        return node
+
+
+class _BatchRewriter(_PowRewriter):
+    """Rewrites control flow that NumPy arrays cannot short-circuit."""
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        helper = '_and' if isinstance(node.op, ast.And) else '_or'
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = _call(helper, [result, value])
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return _call('_not', [node.operand])
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        # a < b < c  ->  _and(a < b, b < c)
+        left, result = node.left, None
+        for op, right in zip(node.ops, node.comparators):
+            pair = ast.Compare(left=left, ops=[op], comparators=[right])
+            result = pair if result is None else _call('_and', [result, pair])
+            left = right
+        return result
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return _call('_where', [node.test, node.body, node.orelse])
+
+
+def _call(name: str, args) -> ast.Call:
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=args, keywords=[])
+
+
+def _compile(tree: ast.Expression, rewriter: ast.NodeTransformer, source: str):
+    tree = ast.fix_missing_locations(rewriter.visit(tree))
+    return compile(tree, f"<formula {source!r}>", 'eval')
+
+
+class CompiledFormula:
+    """
+    A validated formula compiled for scalar and batch evaluation.
+
+    Attributes:
+        source: Original formula text
+        variables: Names the formula reads that must be supplied
+    """
+
+    __slots__ = ('source', 'variables', '_scalar_code', '_batch_code',
+                 '_scalar_globals', '_batch_globals')
+
+    def __init__(self, source: str):
+        self.source = source
+        try:
+            tree = ast.parse(source.strip(), mode='eval')
+        except SyntaxError as e:
+            raise FormulaError(f"Invalid formula {source!r}: {e.msg}") from None
+
+        validator = _Validator()
+        validator.visit(tree)
+        self.variables: FrozenSet[str] = frozenset(validator.variables - SCALAR_FUNCTIONS.keys())
+
+        self._scalar_code = _compile(tree, _PowRewriter(), source)
+        self._batch_code = _compile(ast.parse(source.strip(), mode='eval'), _BatchRewriter(), source)
+        self._scalar_globals = {'__builtins__': {}, **SCALAR_FUNCTIONS, **_SCALAR_HELPERS}
+        self._batch_globals = {'__builtins__': {}, **BATCH_FUNCTIONS, **_BATCH_HELPERS}
+
+    def _check_bound(self, variables: Mapping[str, Any]):
+        missing = self.variables.difference(variables)
+        if missing:
+            raise FormulaError(f"Formula {self.source!r} missing variables: {sorted(missing)}")
+
+    def evaluate(self, variables: Mapping[str, Any]) -> Any:
+        """
+        Evaluate with scalar variables.
+
+        Args:
+            variables: Values for the formula's variables; extras are ignored
+        """
+        self._check_bound(variables)
+        try:
+            return eval(self._scalar_code, self._scalar_globals, variables)
+        except FormulaError:
+            raise
+        except Exception as e:
+            raise FormulaError(f"Error evaluating {self.source!r}: {e}") from e
+
+    def evaluate_batch(self, variables: Mapping[str, Any]) -> np.ndarray:
+        """
+        Evaluate element-wise over NumPy arrays.
+
+        Array and scalar variables broadcast against each other, so one
+        attacker's damage can be applied against many targets' defenses.
+
+        Args:
+            variables: Arrays or scalars for the formula's variables
+        """
+        self._check_bound(variables)
+        bound = {name: np.asarray(variables[name]) for name in self.variables}
+        try:
+            with np.errstate(divide='raise', invalid='raise'):
+                return np.asarray(eval(self._batch_code, self._batch_globals, bound))
+        except FormulaError:
+            raise
+        except Exception as e:
+            raise FormulaError(f"Error evaluating {self.source!r}: {e}") from e
+
+    def __call__(self, **variables) -> Any:
+        return self.evaluate(variables)
+
+    def __repr__(self) -> str:
+        return f"CompiledFormula({self.source!r})"
+
+
+@lru_cache(maxsize=512)
+def compile_formula(source: str) -> CompiledFormula:
+    """Parse, validate and compile a formula, cached per formula string."""
+    return CompiledFormula(source)
@@ -10,6 +10,8 @@ import os
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from .catalog import Catalog, get_catalog, load_catalog, thaw
+
 
 class TalentManager:
     """
@@ -33,42 +35,23 @@ class TalentManager:
             # Default to assets directory relative to this file
             current_dir = Path(__file__).parent
             self.assets_path = current_dir.parent.parent.parent / "assets" / "data" / "abilities"
+            self.catalog: Catalog = get_catalog()
         else:
             self.assets_path = Path(assets_path)
+            self.catalog = load_catalog(abilities_path=self.assets_path)
         
         self.talent_trees: Dict[str, Dict[str, Any]] = {}
         self.talent_lookup: Dict[str, Dict[str, Any]] = {}  # talent_id -> talent data
         self._load_talent_trees()
     
     def _load_talent_trees(self):
-        """Load all talent trees from asset files."""
+        """Load all talent trees from the talent catalog."""
         try:
-            # Load physical talents
-            physical_file = self.assets_path / "physical_talents.json"
-            if physical_file.exists():
-                with open(physical_file, 'r', encoding='utf-8') as f:
-                    physical_data = json.load(f)
-                    self.talent_trees["Physical"] = physical_data
-                    self._index_talents("Physical", physical_data["talents"])
-                    print(f"✅ Loaded {len(physical_data['talents'])} physical talents")
-            
-            # Load magical talents
-            magical_file = self.assets_path / "magical_talents.json"
-            if magical_file.exists():
-                with open(magical_file, 'r', encoding='utf-8') as f:
-                    magical_data = json.load(f)
-                    self.talent_trees["Magical"] = magical_data
-                    self._index_talents("Magical", magical_data["talents"])
-                    print(f"✅ Loaded {len(magical_data['talents'])} magical talents")
-            
-            # Load spiritual talents
-            spiritual_file = self.assets_path / "spiritual_talents.json"
-            if spiritual_file.exists():
-                with open(spiritual_file, 'r', encoding='utf-8') as f:
-                    spiritual_data = json.load(f)
-                    self.talent_trees["Spiritual"] = spiritual_data
-                    self._index_talents("Spiritual", spiritual_data["talents"])
-                    print(f"✅ Loaded {len(spiritual_data['talents'])} spiritual talents")
+            for tree_name in self.catalog.trees:
+                talents = [entry.to_dict() for entry in self.catalog.talents_by_tree(tree_name)]
+                self.talent_trees[tree_name] = {**thaw(self.catalog.trees[tree_name]), "talents": talents}
+                self._index_talents(tree_name, talents)
+                print(f"✅ Loaded {len(talents)} {tree_name.lower()} talents")
             
             if not self.talent_trees:
                 print("⚠️ No talent trees loaded, using fallback data")
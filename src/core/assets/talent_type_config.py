@@ -10,6 +10,8 @@ import os
 from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+from .asset_bundle import load_json
+
 try:
     from ursina import color
     URSINA_AVAILABLE = True
@@ -45,8 +47,7 @@ class TalentTypeConfig:
         """Load talent type configuration from JSON file."""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    self._config_data = json.load(f)
+                self._config_data = load_json(self.config_path)
                 print(f"Loaded talent type config from {self.config_path}")
             else:
                 print(f"Warning: Talent type config not found at {self.config_path}, using defaults")
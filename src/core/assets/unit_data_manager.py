@@ -17,6 +17,7 @@ except ImportError:
     URSINA_AVAILABLE = False
 
 from core.models.unit_types import UnitType
+from .asset_bundle import load_json
 
 
 class UnitDataManager:
@@ -70,17 +71,15 @@ class UnitDataManager:
         # Load from all_characters.json first
         all_characters_file = self.characters_path / "all_characters.json"
         if all_characters_file.exists():
-            with open(all_characters_file, 'r') as f:
-                data = json.load(f)
-                self._character_types_data.update(data.get('character_types', {}))
+            data = load_json(all_characters_file)
+            self._character_types_data.update(data.get('character_types', {}))
         
         # Load individual character files
         if self.characters_path.exists():
             for char_file in self.characters_path.glob("*_character.json"):
                 try:
-                    with open(char_file, 'r') as f:
-                        data = json.load(f)
-                        self._character_types_data.update(data.get('character_types', {}))
+                    data = load_json(char_file)
+                    self._character_types_data.update(data.get('character_types', {}))
                 except Exception as e:
                     print(f"Warning: Failed to load character file {char_file}: {e}")
     
@@ -88,25 +87,22 @@ class UnitDataManager:
         """Load unit types configuration (fallback)."""
         unit_types_file = self.units_path / "unit_types.json"
         if unit_types_file.exists():
-            with open(unit_types_file, 'r') as f:
-                data = json.load(f)
-                self._unit_types_data = data.get('unit_types', {})
+            data = load_json(unit_types_file)
+            self._unit_types_data = data.get('unit_types', {})
     
     def _load_generation_data(self):
         """Load unit generation configuration."""
         generation_file = self.units_path / "unit_generation.json"
         if generation_file.exists():
-            with open(generation_file, 'r') as f:
-                data = json.load(f)
-                self._generation_data = data.get('unit_generation', {})
+            data = load_json(generation_file)
+            self._generation_data = data.get('unit_generation', {})
     
     def _load_ai_difficulty_data(self):
         """Load AI difficulty configuration."""
         ai_file = self.units_path / "ai_difficulty.json"
         if ai_file.exists():
-            with open(ai_file, 'r') as f:
-                data = json.load(f)
-                self._ai_difficulty_data = data.get('ai_difficulty', {})
+            data = load_json(ai_file)
+            self._ai_difficulty_data = data.get('ai_difficulty', {})
     
     def _load_fallback_data(self):
         """Load fallback hardcoded data if files are missing."""
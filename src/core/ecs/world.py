@@ -159,6 +159,38 @@ class World:
         """
         return self.entity_manager.get_entity(entity_id)
     
+    def get_component(self, entity_id: str, component_type: Type[BaseComponent]) -> Optional[BaseComponent]:
+        """
+        Get a component of an entity by entity ID.
+        
+        Args:
+            entity_id: Entity ID
+            component_type: Component type to get
+            
+        Returns:
+            Component or None if the entity or component is missing
+        """
+        entity = self.entity_manager.get_entity(entity_id)
+        return entity.get_component(component_type) if entity else None
+    
+    def add_component(self, entity_id: str, component: BaseComponent) -> bool:
+        """
+        Add a component to an entity by entity ID.
+        
+        Args:
+            entity_id: Entity ID
+            component: Component instance to add
+            
+        Returns:
+            True if the entity was found
+        """
+        entity = self.entity_manager.get_entity(entity_id)
+        if not entity:
+            return False
+        entity.add_component(component)
+        self.entity_manager._invalidate_query_cache()
+        return True
+    
     def get_entities_with_component(self, component_type: Type[BaseComponent]) -> List[Entity]:
         """
         Get entities that have specified component.
@@ -9,6 +9,10 @@ from typing import Any, Callable, Dict, List, Optional
 from collections import defaultdict
 import time
 
+from ..utils.logging import Logger
+
+logger = Logger.get_logger(__name__)
+
 
 class Event:
     """Represents a single event with metadata."""
@@ -46,7 +50,7 @@ class EventSubscription:
                 if self.once:
                     self.active = False
             except Exception as e:
-                print(f"❌ Error in event handler for {self.event_type}: {e}")
+                logger.error("Error in event handler", event_type=self.event_type, error=str(e))
 
 
 class EventBus:
@@ -85,7 +89,7 @@ class EventBus:
         # Sort by priority (highest first)
         self.subscriptions[event_type].sort(key=lambda s: s.priority, reverse=True)
         
-        print(f"📧 Subscribed to '{event_type}' (priority: {priority})")
+        logger.debug("Subscribed", event_type=event_type, priority=priority)
         return subscription
     
     def unsubscribe(self, subscription: EventSubscription):
@@ -93,7 +97,7 @@ class EventBus:
         event_type = subscription.event_type
         if subscription in self.subscriptions[event_type]:
             self.subscriptions[event_type].remove(subscription)
-            print(f"📭 Unsubscribed from '{event_type}'")
+            logger.debug("Unsubscribed", event_type=event_type)
     
     def emit(self, event_type: str, data: Any = None, source: str = None):
         """
@@ -126,7 +130,7 @@ class EventBus:
         # Clean up one-time subscriptions
         self.subscriptions[event_type] = [s for s in subscribers if s.active]
         
-        print(f"📡 Emitted '{event_type}' to {len(active_subscribers)} subscribers")
+        logger.debug("Emitted event", event_type=event_type, subscribers=len(active_subscribers))
     
     def emit_immediate(self, event_type: str, data: Any = None, source: str = None):
         """Emit event with immediate processing (alias for emit)."""
@@ -136,20 +140,20 @@ class EventBus:
         """Clear subscriptions for specific event type or all."""
         if event_type:
             self.subscriptions[event_type].clear()
-            print(f"🧹 Cleared subscriptions for '{event_type}'")
+            logger.debug("Cleared subscriptions", event_type=event_type)
         else:
             self.subscriptions.clear()
-            print("🧹 Cleared all subscriptions")
+            logger.debug("Cleared all subscriptions")
     
     def disable(self):
         """Disable event bus (events will be ignored)."""
         self.enabled = False
-        print("⏸️  Event bus disabled")
+        logger.info("Event bus disabled")
     
     def enable(self):
         """Enable event bus."""
         self.enabled = True
-        print("▶️  Event bus enabled")
+        logger.info("Event bus enabled")
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get event bus statistics."""
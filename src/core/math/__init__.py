@@ -7,6 +7,8 @@ Mathematical operations for 3D vectors, grid coordinates, and spatial calculatio
 from .vector import Vector3, Vector2Int
 from .grid import TacticalGrid, GridCell, TerrainType
 from .pathfinding import AStarPathfinder, PathfindingResult, JumpPointSearch
+from .reachability import TileMask, RangeCache, reachable_mask, attack_mask
+from .particles import EmitterParams, ParticleEmitter
 
 # Aliases for backward compatibility
 Vector2 = Vector2Int
@@ -21,5 +23,7 @@ __all__ = [
     'Vector3', 'Vector2Int', 'Vector2', 'GridPosition',
     'TacticalGrid', 'GridCell', 'TerrainType',
     'AStarPathfinder', 'PathfindingResult', 'JumpPointSearch',
+    'TileMask', 'RangeCache', 'reachable_mask', 'attack_mask',
+    'EmitterParams', 'ParticleEmitter',
     'clamp'
 ]
\ No newline at end of file
@@ -9,6 +9,8 @@ import math
 from typing import Dict, List, Optional, Tuple, Set, Callable
 from enum import Enum
 
+import numpy as np
+
 from .vector import Vector3, Vector2Int
 
 class TerrainType(Enum):
@@ -130,6 +132,10 @@ class TacticalGrid:
                 grid_pos = Vector2Int(x, y)
                 self.cells[grid_pos] = GridCell(grid_pos)
         
+        # Bumped on any terrain, height or occupancy change
+        self.version = 0
+        self._range_inputs: Optional[Tuple[int, np.ndarray, np.ndarray, np.ndarray]] = None
+        
         # Cache for pathfinding optimization
         self._pathfinding_cache: Dict[Tuple[Vector2Int, Vector2Int], List[Vector2Int]] = {}
         self._cache_max_size = 1000
@@ -193,6 +199,7 @@ class TacticalGrid:
         if cell and not cell.occupied and cell.passable:
             cell.occupied = True
             cell.occupant_id = occupant_id
+            self.version += 1
             return True
         return False
     
@@ -210,6 +217,7 @@ class TacticalGrid:
         if cell and cell.occupied:
             cell.occupied = False
             cell.occupant_id = None
+            self.version += 1
             return True
         return False
     
@@ -408,9 +416,40 @@ class TacticalGrid:
         
         return cells_in_range
     
+    def get_range_inputs(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Arrays for ``core.math.reachability``, indexed [x, y].
+        
+        Returns:
+            (entry costs with ``inf`` for impassable cells, heights, occupied)
+        """
+        if self._range_inputs is None or self._range_inputs[0] != self.version:
+            costs = np.empty((self.width, self.height))
+            heights = np.empty((self.width, self.height))
+            occupied = np.zeros((self.width, self.height), dtype=bool)
+            for pos, cell in self.cells.items():
+                costs[pos.x, pos.y] = cell.movement_cost if cell.passable else np.inf
+                heights[pos.x, pos.y] = cell.height
+                occupied[pos.x, pos.y] = cell.occupied
+            self._range_inputs = (self.version, costs, heights, occupied)
+        return self._range_inputs[1:]
+    
+    def height_step_cost(self, from_xy: Tuple[int, int], to_xy: Tuple[int, int]) -> float:
+        """Extra cost of stepping between adjacent cells, as ``get_movement_cost`` charges it"""
+        heights = self.get_range_inputs()[1]
+        height_diff = abs(heights[from_xy] - heights[to_xy])
+        if height_diff > 2.0:
+            return float('inf')
+        if height_diff <= 0.5:
+            return 0.0
+        elif height_diff <= 1.0:
+            return 0.5
+        return 1.0
+    
     def _invalidate_pathfinding_cache(self):
         """Clear pathfinding cache when grid changes"""
         self._pathfinding_cache.clear()
+        self.version += 1
     
     def _precompute_neighbors(self):
         """Pre-compute neighbor relationships for all grid positions"""
@@ -0,0 +1,213 @@
+"""
+Particle Emitters
+
+Data-oriented particle simulation shared by the engine and clients. Each
+emitter keeps its live particles in preallocated NumPy arrays and integrates
+them in bulk. A particle's spawn offset and velocity depend only on the
+emitter seed and the particle's emission index, so a client given an
+emitter's parameters regenerates the same particles the server simulates
+instead of receiving them.
+"""
+
+import math
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+SPAWN_CHUNK = 1024  # Particles per block of seeded spawn parameters
+CATCH_UP_STEP = 1.0 / 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class EmitterParams:
+    """Everything needed to reproduce an emitter's particles."""
+    position: Tuple[float, float, float]
+    emission_rate: float
+    particle_lifetime: float
+    duration: float
+    seed: int
+    particle_size: float = 0.1
+    particle_color: str = "#FFFFFF"
+    spread_radius: float = 1.0
+    velocity_range: Tuple[float, float] = (1.0, 3.0)
+    gravity: float = -9.8
+
+    @property
+    def emission_end(self) -> float:
+        """Emission stops one particle lifetime before the emitter ends."""
+        return self.duration - self.particle_lifetime
+
+    @property
+    def total_particles(self) -> int:
+        """Particles emitted over the emitter's life, one every 1/rate seconds."""
+        if self.emission_end <= 0 or self.emission_rate <= 0:
+            return 0
+        return int(math.ceil(self.emission_end * self.emission_rate))
+
+    def to_wire(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_wire(cls, data: Dict[str, Any]) -> 'EmitterParams':
+        fields = {key: data[key] for key in cls.__dataclass_fields__ if key in data}
+        fields['position'] = tuple(fields['position'])
+        if 'velocity_range' in fields:
+            fields['velocity_range'] = tuple(fields['velocity_range'])
+        return cls(**fields)
+
+
+class ParticleEmitter:
+    """
+    Live particles of one emitter, stored oldest first in parallel arrays.
+
+    All particles share a lifetime, so dead particles are always a prefix
+    of the live range and compaction is a single shift.
+    """
+
+    def __init__(self, params: EmitterParams):
+        self.params = params
+        self.elapsed = 0.0
+        self.emitted = 0
+        self.count = 0
+
+        # One lifetime of emission plus headroom for particles outliving it by a frame
+        capacity = min(params.total_particles,
+                       int(math.ceil(params.emission_rate * params.particle_lifetime * 1.1)) + 1)
+        self._allocate(max(capacity, 1))
+        self._chunk_index = -1
+        self._chunk: np.ndarray = np.empty((0, 6), dtype=np.float32)
+
+    @classmethod
+    def from_wire(cls, data: Dict[str, Any]) -> 'ParticleEmitter':
+        """Rebuild an emitter and fast-forward it to the sender's elapsed time."""
+        emitter = cls(EmitterParams.from_wire(data))
+        emitter.fast_forward(data.get('elapsed', 0.0))
+        return emitter
+
+    def _allocate(self, capacity: int):
+        positions = np.zeros((capacity, 3), dtype=np.float32)
+        velocities = np.zeros((capacity, 3), dtype=np.float32)
+        life = np.zeros(capacity, dtype=np.float32)
+        if self.count:
+            positions[:self.count] = self.positions[:self.count]
+            velocities[:self.count] = self.velocities[:self.count]
+            life[:self.count] = self.life[:self.count]
+        self.positions, self.velocities, self.life = positions, velocities, life
+        self._scratch = np.zeros((capacity, 3), dtype=np.float32)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.life)
+
+    @property
+    def is_emitting(self) -> bool:
+        return self.elapsed < self.params.duration
+
+    @property
+    def is_finished(self) -> bool:
+        return not self.is_emitting and self.count == 0
+
+    def update(self, delta_time: float) -> bool:
+        """Advance the simulation; returns False once the emitter is finished."""
+        self.elapsed += delta_time
+
+        # Age and drop expired particles before spawning, so the live count
+        # never exceeds one lifetime's worth of emission
+        if self.count:
+            life = self.life[:self.count]
+            life -= delta_time
+            dead = int(np.searchsorted(life, 0.0, side='right'))
+            if dead:
+                self._drop_oldest(dead)
+
+        if self.is_emitting:
+            self._spawn_due()
+
+        n = self.count
+        if n:
+            positions = self.positions[:n]
+            step = self._scratch[:n]
+            np.multiply(self.velocities[:n], delta_time, out=step)
+            positions += step
+            self.velocities[:n, 1] += self.params.gravity * delta_time
+
+        return not self.is_finished
+
+    def fast_forward(self, elapsed: float, step: float = CATCH_UP_STEP):
+        """Simulate in fixed steps until ``elapsed`` seconds have passed."""
+        while self.elapsed + step <= elapsed and not self.is_finished:
+            self.update(step)
+        if elapsed > self.elapsed and not self.is_finished:
+            self.update(elapsed - self.elapsed)
+
+    def _drop_oldest(self, dead: int):
+        n = self.count - dead
+        self.positions[:n] = self.positions[dead:self.count]
+        self.velocities[:n] = self.velocities[dead:self.count]
+        self.life[:n] = self.life[dead:self.count]
+        self.count = n
+
+    def _spawn_due(self):
+        params = self.params
+        due = min(params.total_particles, int(self.elapsed * params.emission_rate) + 1)
+        new = due - self.emitted
+        if new <= 0:
+            return
+
+        if self.count + new > self.capacity:
+            self._allocate(max(self.count + new, self.capacity * 3 // 2))
+
+        spawn = self._spawn_table(self.emitted, due)
+        start, stop = self.count, self.count + new
+        self.positions[start:stop] = spawn[:, :3]
+        self.positions[start:stop] += np.asarray(params.position, dtype=np.float32)
+        self.velocities[start:stop] = spawn[:, 3:]
+        self.life[start:stop] = params.particle_lifetime
+        self.count = stop
+        self.emitted = due
+
+    def _spawn_table(self, start: int, stop: int) -> np.ndarray:
+        """Spawn offsets and velocities for emission indices [start, stop)."""
+        parts = []
+        for chunk in range(start // SPAWN_CHUNK, (stop - 1) // SPAWN_CHUNK + 1):
+            base = chunk * SPAWN_CHUNK
+            table = self._spawn_chunk(chunk)
+            parts.append(table[max(start, base) - base:min(stop, base + SPAWN_CHUNK) - base])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def _spawn_chunk(self, chunk: int) -> np.ndarray:
+        if chunk != self._chunk_index:
+            params = self.params
+            rng = np.random.default_rng((params.seed, chunk))
+            angle = rng.uniform(0, 2 * math.pi, SPAWN_CHUNK)
+            radius = rng.uniform(0, params.spread_radius, SPAWN_CHUNK)
+            speed = rng.uniform(*params.velocity_range, SPAWN_CHUNK)
+            heading = rng.uniform(0, 2 * math.pi, SPAWN_CHUNK)
+            lift = rng.uniform(1.0, 3.0, SPAWN_CHUNK)
+
+            table = np.empty((SPAWN_CHUNK, 6), dtype=np.float32)
+            table[:, 0] = np.cos(angle) * radius
+            table[:, 1] = 0.0
+            table[:, 2] = np.sin(angle) * radius
+            table[:, 3] = np.cos(heading) * speed
+            table[:, 4] = lift
+            table[:, 5] = np.sin(heading) * speed
+            self._chunk_index, self._chunk = chunk, table
+        return self._chunk
+
+    def life_ratios(self) -> np.ndarray:
+        """Remaining life per particle in [0, 1]; drives size and fade."""
+        return self.life[:self.count] / self.params.particle_lifetime
+
+    def sizes(self) -> np.ndarray:
+        return self.params.particle_size * self.life_ratios()
+
+    def live_positions(self) -> np.ndarray:
+        return self.positions[:self.count]
+
+    def to_wire(self) -> Dict[str, Any]:
+        """Emitter parameters plus elapsed time; particles are not sent."""
+        data = self.params.to_wire()
+        data['elapsed'] = self.elapsed
+        return data
@@ -0,0 +1,291 @@
+"""
+Movement and Attack Reachability
+
+Grid-agnostic range queries shared by the server UI manager and the client
+interaction layer. Boards are described by NumPy arrays indexed ``[x, y]``:
+
+- ``costs``: cost to enter each tile, ``inf`` where impassable
+- ``occupied``: tiles holding a unit, which cannot be entered or crossed
+- ``vision_blockers``: tiles that block line of sight
+
+Movement range is cost-bounded Dijkstra over orthogonal steps; attack range
+is the Manhattan diamond filtered by line of sight. Results are ``TileMask``
+bitsets, which encode to a compact run-length or base64 bitset for the wire.
+"""
+
+import base64
+import heapq
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_EPSILON = 1e-9  # Absorbs float error in summed terrain costs
+
+
+@dataclass(frozen=True, slots=True)
+class TileMask:
+    """
+    Immutable set of tiles on a ``width`` x ``height`` board.
+
+    Tiles are stored as packed bits in x-major order (index ``x * height + y``).
+    """
+    width: int
+    height: int
+    bits: bytes
+
+    @classmethod
+    def from_array(cls, mask: np.ndarray) -> 'TileMask':
+        width, height = mask.shape
+        return cls(width, height, np.packbits(mask.astype(bool, copy=False).ravel()).tobytes())
+
+    @classmethod
+    def empty(cls, width: int, height: int) -> 'TileMask':
+        return cls.from_array(np.zeros((width, height), dtype=bool))
+
+    def to_array(self) -> np.ndarray:
+        count = self.width * self.height
+        flat = np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8), count=count)
+        return flat.astype(bool).reshape(self.width, self.height)
+
+    def positions(self) -> List[Tuple[int, int]]:
+        """Set tiles as (x, y) pairs."""
+        xs, ys = np.nonzero(self.to_array())
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def __contains__(self, position: Tuple[int, int]) -> bool:
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        index = x * self.height + y
+        return bool(self.bits[index >> 3] & (0x80 >> (index & 7)))
+
+    def __len__(self) -> int:
+        return int(np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8)).sum())
+
+    def __or__(self, other: 'TileMask') -> 'TileMask':
+        return TileMask.from_array(self.to_array() | other.to_array())
+
+    def runs(self) -> List[int]:
+        """Alternating run lengths in x-major order, starting with an unset run."""
+        flat = self.to_array().ravel()
+        changes = np.flatnonzero(np.diff(flat.astype(np.int8))) + 1
+        bounds = np.concatenate(([0], changes, [flat.size]))
+        runs = np.diff(bounds).tolist()
+        if flat.size and flat[0]:
+            runs.insert(0, 0)
+        return runs
+
+    def to_wire(self) -> Dict[str, Any]:
+        """Compact JSON form: run lengths or a base64 bitset, whichever is smaller."""
+        runs = self.runs()
+        bitset = base64.b64encode(self.bits).decode('ascii')
+        if len(runs) * 3 < len(bitset):
+            return {'w': self.width, 'h': self.height, 'rle': runs}
+        return {'w': self.width, 'h': self.height, 'bits': bitset}
+
+    @classmethod
+    def from_wire(cls, data: Dict[str, Any]) -> 'TileMask':
+        width, height = data['w'], data['h']
+        if 'bits' in data:
+            return cls(width, height, base64.b64decode(data['bits']))
+        values = np.zeros(len(data['rle']), dtype=bool)
+        values[1::2] = True
+        flat = np.repeat(values, data['rle'])
+        return cls.from_array(flat.reshape(width, height))
+
+
+def movement_costs(costs: np.ndarray, start: Tuple[int, int], budget: float,
+                   occupied: Optional[np.ndarray] = None,
+                   step_cost: Optional[Callable[[Tuple[int, int], Tuple[int, int]], float]] = None
+                   ) -> np.ndarray:
+    """
+    Cheapest cost to reach every tile within a movement budget.
+
+    Args:
+        costs: Cost to enter each tile, ``inf`` where impassable
+        start: Starting tile; its own cost and occupancy are ignored
+        budget: Movement points available
+        occupied: Tiles that cannot be entered or crossed
+        step_cost: Extra cost per step, e.g. for height changes (``inf`` forbids it)
+
+    Returns:
+        Array of path costs, ``inf`` where unreachable within the budget
+    """
+    width, height = costs.shape
+    best = np.full((width, height), np.inf)
+    sx, sy = start
+    if not (0 <= sx < width and 0 <= sy < height):
+        return best
+
+    best[sx, sy] = 0.0
+    frontier = [(0.0, sx, sy)]
+    limit = budget + _EPSILON
+    while frontier:
+        cost, x, y = heapq.heappop(frontier)
+        if cost > best[x, y]:
+            continue
+        for dx, dy in _STEPS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            if occupied is not None and occupied[nx, ny]:
+                continue
+            new_cost = cost + costs[nx, ny]
+            if step_cost is not None:
+                new_cost += step_cost((x, y), (nx, ny))
+            if new_cost <= limit and new_cost < best[nx, ny]:
+                best[nx, ny] = new_cost
+                heapq.heappush(frontier, (new_cost, nx, ny))
+    return best
+
+
+def reachable_mask(costs: np.ndarray, start: Tuple[int, int], budget: float,
+                   occupied: Optional[np.ndarray] = None,
+                   step_cost: Optional[Callable[[Tuple[int, int], Tuple[int, int]], float]] = None
+                   ) -> TileMask:
+    """Tiles a unit can move to within its budget, excluding its own tile."""
+    reachable = np.isfinite(movement_costs(costs, start, budget, occupied, step_cost))
+    x, y = start
+    if 0 <= x < reachable.shape[0] and 0 <= y < reachable.shape[1]:
+        reachable[x, y] = False
+    return TileMask.from_array(reachable)
+
+
+def _line_between(dx: int, dy: int) -> List[Tuple[int, int]]:
+    """Bresenham cells strictly between the origin and (dx, dy)."""
+    cells = []
+    x, y = 0, 0
+    adx, ady = abs(dx), abs(dy)
+    sx = 1 if dx > 0 else -1
+    sy = 1 if dy > 0 else -1
+    error = adx - ady
+    while (x, y) != (dx, dy):
+        error2 = 2 * error
+        if error2 > -ady:
+            error -= ady
+            x += sx
+        if error2 < adx:
+            error += adx
+            y += sy
+        if (x, y) != (dx, dy):
+            cells.append((x, y))
+    return cells
+
+
+@lru_cache(maxsize=32)
+def _attack_template(radius: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Target offsets within a Manhattan radius and the line cells to each.
+
+    Lines are translation invariant, so one template serves every origin.
+    Returns (target_dx, target_dy, line_target, line_dx, line_dy) where
+    ``line_target`` indexes the target each line cell belongs to.
+    """
+    targets, line_target, line_cells = [], [], []
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            if 0 < abs(dx) + abs(dy) <= radius:
+                for cell in _line_between(dx, dy):
+                    line_target.append(len(targets))
+                    line_cells.append(cell)
+                targets.append((dx, dy))
+    targets = np.array(targets, dtype=np.int64).reshape(-1, 2)
+    line_cells = np.array(line_cells, dtype=np.int64).reshape(-1, 2)
+    return (targets[:, 0], targets[:, 1], np.array(line_target, dtype=np.int64),
+            line_cells[:, 0], line_cells[:, 1])
+
+
+def attack_mask(origin: Tuple[int, int], attack_range: int, shape: Tuple[int, int],
+                vision_blockers: Optional[np.ndarray] = None,
+                line_of_sight: Optional[Callable[[Tuple[int, int], Tuple[int, int]], bool]] = None
+                ) -> TileMask:
+    """
+    Tiles within attack range of an origin that it can see.
+
+    Args:
+        origin: Attacker's tile
+        attack_range: Maximum Manhattan distance
+        shape: Board (width, height)
+        vision_blockers: Tiles that block sight when crossed (endpoints never block)
+        line_of_sight: Extra per-target check, e.g. height-based sight
+
+    Returns:
+        Visible tiles within range, excluding the origin
+    """
+    width, height = shape
+    mask = np.zeros(shape, dtype=bool)
+    if attack_range <= 0:
+        return TileMask.from_array(mask)
+
+    ox, oy = origin
+    target_dx, target_dy, line_target, line_dx, line_dy = _attack_template(attack_range)
+    xs, ys = ox + target_dx, oy + target_dy
+    visible = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+
+    if vision_blockers is not None and line_target.size:
+        # Line cells of an in-bounds target lie inside its bounding box, so in bounds
+        in_bounds = visible[line_target]
+        blocked = vision_blockers[ox + line_dx[in_bounds], oy + line_dy[in_bounds]]
+        blocked_targets = line_target[in_bounds][blocked]
+        visible[blocked_targets] = False
+
+    xs, ys = xs[visible], ys[visible]
+    if line_of_sight is not None and xs.size:
+        keep = np.fromiter((line_of_sight(origin, (x, y)) for x, y in zip(xs.tolist(), ys.tolist())),
+                           dtype=bool, count=xs.size)
+        xs, ys = xs[keep], ys[keep]
+    mask[xs, ys] = True
+    return TileMask.from_array(mask)
+
+
+class RangeCache:
+    """
+    Range masks per unit, valid until the board version changes.
+
+    The version is any hashable that changes whenever terrain or occupancy
+    does; callers typically combine a terrain counter and a unit-move counter.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[Hashable, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, unit_key: Hashable, version: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a unit's cached ranges, recomputing when the board changed.
+
+        Args:
+            unit_key: Unit identity plus anything else the ranges depend on
+            version: Current board version
+            compute: Builds the ranges on a miss
+        """
+        entry = self._entries.get(unit_key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = compute()
+        if entry is None and len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[unit_key] = (version, value)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def discard_where(self, match: Callable[[Hashable], bool]) -> int:
+        """Drop entries whose unit key matches, e.g. every unit of an ended session"""
+        keys = [key for key in self._entries if match(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
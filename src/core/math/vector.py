@@ -229,6 +229,9 @@ class Vector2Int:
         """Calculate Manhattan distance (grid distance)"""
         return abs(self._x - other._x) + abs(self._y - other._y)
     
+    # GridPosition spelling used by the engine systems
+    manhattan_distance = manhattan_distance_to
+    
     def to_dict(self) -> Dict[str, int]:
         """Serialize to dictionary"""
         return {'x': self._x, 'y': self._y}
@@ -0,0 +1,109 @@
+"""
+Prometheus Metrics Support
+
+Shared helpers for the game engine and AI service metrics endpoints:
+idempotent metric creation, a scrape-time collector for cache hit ratios,
+and the exposition response. Labels are kept to small fixed sets; per-session
+labels are only added when APEX_METRICS_SESSION_LABELS is enabled.
+"""
+
+import os
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Response
+from prometheus_client import REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Latency buckets (seconds) shared by request-style histograms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Cache name -> callable returning (hits, misses)
+_cache_sources: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+
+def session_labels_enabled() -> bool:
+    """Per-session labels are opt-in to keep label cardinality bounded"""
+    return os.getenv("APEX_METRICS_SESSION_LABELS", "").lower() in ("1", "true", "yes")
+
+
+def get_or_create(metric_cls, name: str, documentation: str,
+                  labelnames: Iterable[str] = (), **kwargs):
+    """Create a metric once, returning the registered one on re-import"""
+    existing = REGISTRY._names_to_collectors.get(name)
+    if existing is not None:
+        return existing
+    return metric_cls(name, documentation, labelnames=tuple(labelnames), **kwargs)
+
+
+def bounded_label(value: Any, allowed: Iterable[str], fallback: str = "other") -> str:
+    """Map a label value onto a fixed set"""
+    value = str(getattr(value, "value", value) or "").lower()
+    return value if value in allowed else fallback
+
+
+def register_cache_source(name: str, source: Any):
+    """
+    Export a cache's hit ratio under ``name``.
+
+    ``source`` is either a callable returning ``(hits, misses)`` or an object
+    whose ``get_stats()`` result has ``hits``/``misses`` (attributes or keys),
+    such as ``CacheManager``.
+    """
+    if callable(source) and not hasattr(source, "get_stats"):
+        _cache_sources[name] = source
+    else:
+        _cache_sources[name] = lambda: _hits_and_misses(source.get_stats())
+
+
+def unregister_cache_source(name: str):
+    """Stop exporting a cache"""
+    _cache_sources.pop(name, None)
+
+
+def _hits_and_misses(stats: Any) -> Tuple[int, int]:
+    """Read hits/misses from a stats object or dict"""
+    if isinstance(stats, dict):
+        return int(stats.get("hits", 0)), int(stats.get("misses", 0))
+    return int(getattr(stats, "hits", 0)), int(getattr(stats, "misses", 0))
+
+
+class CacheRatioCollector:
+    """Reads registered cache counters at scrape time"""
+
+    def collect(self):
+        hits = CounterMetricFamily("apex_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("apex_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("apex_cache_hit_ratio", "Cache hit ratio", labels=["cache"])
+
+        for name, source in list(_cache_sources.items()):
+            try:
+                cache_hits, cache_misses = source()
+            except Exception:
+                continue
+            lookups = cache_hits + cache_misses
+            hits.add_metric([name], cache_hits)
+            misses.add_metric([name], cache_misses)
+            ratio.add_metric([name], cache_hits / lookups if lookups else 0.0)
+
+        yield hits
+        yield misses
+        yield ratio
+
+    def describe(self):
+        return []
+
+
+_cache_collector: Optional[CacheRatioCollector] = None
+
+
+def install_cache_collector():
+    """Register the cache collector with the default registry (once)"""
+    global _cache_collector
+    if _cache_collector is None:
+        _cache_collector = CacheRatioCollector()
+        REGISTRY.register(_cache_collector)
+
+
+def metrics_response() -> Response:
+    """Prometheus text exposition of the default registry"""
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -1,9 +1,34 @@
 import random
 from .unit_types import UnitType
 from ..assets.config_manager import get_config_manager
+from ..utils.stat_cache import DerivedStatCache
+
+# Inputs each derived stat is computed from; assigning any of them marks the stat dirty
+STAT_DEPENDENCIES = {
+    'physical_defense': ('speed', 'strength', 'fortitude'),
+    'magical_defense': ('wisdom', 'wonder', 'finesse'),
+    'spiritual_defense': ('spirit', 'faith', 'worthy'),
+    'attack_range': ('base_attack_range', 'equipped_weapon'),
+    'attack_effect_area': ('base_attack_effect_area', 'equipped_weapon'),
+    'physical_attack': ('speed', 'strength', 'finesse', 'equipped_weapon'),
+    'magical_attack': ('wisdom', 'wonder', 'spirit', 'equipped_weapon'),
+    'spiritual_attack': ('faith', 'fortitude', 'worthy'),
+    'magic_range': ('base_magic_range', 'equipped_accessory'),
+    'magic_effect_area': ('base_magic_effect_area', 'equipped_accessory'),
+    'magic_mp_cost': ('base_magic_mp_cost', 'equipped_accessory'),
+}
+STAT_INPUTS = frozenset(name for inputs in STAT_DEPENDENCIES.values() for name in inputs)
+
+# Fields whose changes bump stat_version, so caches keyed on it (e.g. action predictions) go stale
+VERSIONED_FIELDS = STAT_INPUTS | frozenset({
+    'hp', 'max_hp', 'mp', 'max_mp', 'ap', 'max_ap', 'rage', 'max_rage', 'kwan', 'max_kwan',
+    'alive', 'equipped_armor'
+})
+_UNSET = object()
 
 class Unit:
     def __init__(self, name, unit_type, x, y, wisdom=None, wonder=None, worthy=None, faith=None, finesse=None, fortitude=None, speed=None, spirit=None, strength=None):
+        self._stat_cache = DerivedStatCache()
         self.name = name
         self.type = unit_type
         self.x, self.y = x, y
@@ -106,9 +131,36 @@ class Unit:
         # Assign to self
         for attr, value in base_attrs.items():
             setattr(self, attr, value)
+    
+    def __setattr__(self, name, value):
+        # Stat inputs invalidate the derived stats that read them
+        if name in STAT_INPUTS:
+            cache = self.__dict__.get('_stat_cache')
+            if cache is not None:
+                cache.invalidate(name)
+        if name in VERSIONED_FIELDS and self.__dict__.get(name, _UNSET) != value:
+            self.__dict__['stat_version'] = self.__dict__.get('stat_version', 0) + 1
+        object.__setattr__(self, name, value)
+    
+    def _cached_stat(self, stat, compute):
+        """Read a derived stat through the cache"""
+        return self._stat_cache.get(stat, compute, STAT_DEPENDENCIES[stat])
+    
+    def invalidate_stats(self):
+        """Drop all cached derived stats (e.g. after a configuration reload)"""
+        self._stat_cache.invalidate_all()
+        # Derived defenses and attacks may now differ, so stat_version readers must refresh
+        self.__dict__['stat_version'] = self.__dict__.get('stat_version', 0) + 1
+    
+    def get_stat_cache_stats(self):
+        """Get derived stat cache hits and recomputes"""
+        return self._stat_cache.get_stats()
         
     @property
     def physical_defense(self):
+        return self._cached_stat('physical_defense', self._compute_physical_defense)
+    
+    def _compute_physical_defense(self):
         # Use configuration formula for physical defense
         config = get_config_manager()
         divisor = config.get_value('combat.combat_values.defense_calculations.physical_defense.divisor', 3)
@@ -116,6 +168,9 @@ class Unit:
         
     @property
     def magical_defense(self):
+        return self._cached_stat('magical_defense', self._compute_magical_defense)
+    
+    def _compute_magical_defense(self):
         # Use configuration formula for magical defense
         config = get_config_manager()
         divisor = config.get_value('combat.combat_values.defense_calculations.magical_defense.divisor', 3)
@@ -123,6 +178,9 @@ class Unit:
         
     @property
     def spiritual_defense(self):
+        return self._cached_stat('spiritual_defense', self._compute_spiritual_defense)
+    
+    def _compute_spiritual_defense(self):
         # Use configuration formula for spiritual defense
         config = get_config_manager()
         divisor = config.get_value('combat.combat_values.defense_calculations.spiritual_defense.divisor', 3)
@@ -131,6 +189,9 @@ class Unit:
     @property
     def attack_range(self):
         """Get current attack range including weapon bonuses"""
+        return self._cached_stat('attack_range', self._compute_attack_range)
+    
+    def _compute_attack_range(self):
         base_range = self.base_attack_range
         
         # Add weapon range bonus
@@ -148,6 +209,9 @@ class Unit:
     @property
     def attack_effect_area(self):
         """Get current attack effect area including weapon bonuses"""
+        return self._cached_stat('attack_effect_area', self._compute_attack_effect_area)
+    
+    def _compute_attack_effect_area(self):
         base_area = self.base_attack_effect_area
         
         # Add weapon area bonus
@@ -159,6 +223,9 @@ class Unit:
     
     @property
     def physical_attack(self):
+        return self._cached_stat('physical_attack', self._compute_physical_attack)
+    
+    def _compute_physical_attack(self):
         # Use configuration formula for physical attack
         config = get_config_manager()
         divisor = config.get_value('combat.combat_values.attack_calculations.physical_attack.divisor', 2)
@@ -173,6 +240,9 @@ class Unit:
         
     @property
     def magical_attack(self):
+        return self._cached_stat('magical_attack', self._compute_magical_attack)
+    
+    def _compute_magical_attack(self):
         # Use configuration formula for magical attack
         config = get_config_manager()
         divisor = config.get_value('combat.combat_values.attack_calculations.magical_attack.divisor', 2)
@@ -187,6 +257,9 @@ class Unit:
         
     @property
     def spiritual_attack(self):
+        return self._cached_stat('spiritual_attack', self._compute_spiritual_attack)
+    
+    def _compute_spiritual_attack(self):
         # Use configuration formula for spiritual attack
         config = get_config_manager()
         divisor = config.get_value('combat.combat_values.attack_calculations.spiritual_attack.divisor', 2)
@@ -195,6 +268,9 @@ class Unit:
     @property
     def magic_range(self):
         """Get current magic range including equipment bonuses"""
+        return self._cached_stat('magic_range', self._compute_magic_range)
+    
+    def _compute_magic_range(self):
         base_range = self.base_magic_range
         
         # Add equipment magic range bonus (could be from accessories or magic weapons)
@@ -207,6 +283,9 @@ class Unit:
     @property
     def magic_effect_area(self):
         """Get current magic effect area including equipment bonuses"""
+        return self._cached_stat('magic_effect_area', self._compute_magic_effect_area)
+    
+    def _compute_magic_effect_area(self):
         base_area = self.base_magic_effect_area
         
         # Add equipment magic area bonus
@@ -219,6 +298,9 @@ class Unit:
     @property
     def magic_mp_cost(self):
         """Get current magic MP cost including equipment bonuses"""
+        return self._cached_stat('magic_mp_cost', self._compute_magic_mp_cost)
+    
+    def _compute_magic_mp_cost(self):
         base_cost = self.base_magic_mp_cost
         
         # Equipment could reduce MP cost
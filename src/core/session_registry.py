@@ -0,0 +1,389 @@
+"""
+Session Registry
+
+Central lifecycle tracking for per-session state spread across subsystems.
+Records last activity and approximate memory footprint per session, pages out
+or evicts idle sessions under a memory budget, and guarantees that every
+registered subsystem releases its state when a session goes away.
+"""
+
+import asyncio
+import inspect
+import pickle
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class SessionRegistryConfig:
+    """Session registry configuration"""
+    memory_budget_bytes: int = 256 * 1024 * 1024
+    idle_timeout: float = 600.0         # Seconds before a session counts as idle
+    paged_ttl: float = 3600.0           # Seconds a paged-out session is kept before eviction
+    sweep_interval: float = 30.0        # Seconds between maintenance sweeps
+    page_out_idle: bool = True          # Page out idle sessions instead of evicting them
+    size_walk_limit: int = 50000        # Max objects visited per footprint estimate
+
+
+@dataclass
+class SubsystemHandle:
+    """Per-session state owner registered with the registry"""
+    name: str
+    release: Callable[[str], Any]
+    state_getter: Optional[Callable[[str], Any]] = None
+    restore: Optional[Callable[[str, Any], Any]] = None
+    evict_only: bool = False  # Kept through page-out; released only on eviction
+
+    @property
+    def pageable(self) -> bool:
+        """Subsystem state can be snapshotted and restored"""
+        return self.state_getter is not None and self.restore is not None
+
+
+@dataclass
+class SessionRecord:
+    """Lifecycle record for a single session"""
+    session_id: str
+    created_at: float = field(default_factory=time.monotonic)
+    last_activity: float = field(default_factory=time.monotonic)
+    footprint_bytes: int = 0
+    paged_out: bool = False
+    paged_at: Optional[float] = None
+    pinned: bool = False
+
+    def idle_seconds(self, now: Optional[float] = None) -> float:
+        """Seconds since last activity"""
+        return (now if now is not None else time.monotonic()) - self.last_activity
+
+
+def estimate_size(obj: Any, limit: int = 50000) -> int:
+    """Approximate deep size of an object graph in bytes (bounded walk)"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    visited = 0
+
+    while stack and visited < limit:
+        current = stack.pop()
+        obj_id = id(current)
+        if obj_id in seen:
+            continue
+        seen.add(obj_id)
+        visited += 1
+
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+
+        if isinstance(current, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, '__dict__'):
+            stack.append(vars(current))
+        elif hasattr(current, '__slots__'):
+            stack.extend(getattr(current, slot) for slot in current.__slots__
+                         if hasattr(current, slot))
+
+    return total
+
+
+class SessionRegistry:
+    """Tracks session activity and footprint and enforces the memory budget"""
+
+    def __init__(self, config: Optional[SessionRegistryConfig] = None,
+                 on_evict: Optional[Callable[[str], Any]] = None):
+        self.config = config or SessionRegistryConfig()
+        self.on_evict = on_evict
+
+        self.subsystems: Dict[str, SubsystemHandle] = {}
+        self.sessions: Dict[str, SessionRecord] = {}
+        self.paged_state: Dict[str, bytes] = {}
+
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+        # Statistics
+        self.page_outs = 0
+        self.page_ins = 0
+        self.evictions = 0
+        self.release_errors = 0
+        self.page_out_failures = 0
+
+    def register_subsystem(self, name: str, release: Callable[[str], Any],
+                           state_getter: Optional[Callable[[str], Any]] = None,
+                           restore: Optional[Callable[[str, Any], Any]] = None,
+                           evict_only: bool = False):
+        """Register a subsystem that holds per-session state.
+
+        ``release`` must drop all state for a session. Subsystems that also
+        provide ``state_getter`` and ``restore`` are paged out and back in;
+        the rest are treated as rebuildable caches and released on page-out,
+        unless ``evict_only`` is set because their state can't be rebuilt
+        after a page-in (connections, registrations).
+        """
+        self.subsystems[name] = SubsystemHandle(name, release, state_getter, restore, evict_only)
+
+    def track(self, session_id: str, pinned: bool = False) -> SessionRecord:
+        """Start tracking a session (idempotent)"""
+        record = self.sessions.get(session_id)
+        if record is None:
+            record = SessionRecord(session_id=session_id, pinned=pinned)
+            self.sessions[session_id] = record
+        return record
+
+    def touch(self, session_id: str):
+        """Record activity for a session"""
+        record = self.sessions.get(session_id)
+        if record:
+            record.last_activity = time.monotonic()
+
+    def pin(self, session_id: str, pinned: bool = True):
+        """Exempt a session from idle page-out and eviction"""
+        record = self.track(session_id)
+        record.pinned = pinned
+
+    def is_paged_out(self, session_id: str) -> bool:
+        """Check whether a session's state is currently paged out"""
+        record = self.sessions.get(session_id)
+        return bool(record and record.paged_out)
+
+    def measure(self, session_id: str) -> int:
+        """Measure the current footprint of a resident session"""
+        record = self.sessions.get(session_id)
+        if not record or record.paged_out:
+            return 0
+
+        total = 0
+        for handle in self.subsystems.values():
+            if handle.state_getter is None:
+                continue
+            try:
+                state = handle.state_getter(session_id)
+            except Exception as e:
+                logger.warning("Session size probe failed",
+                               subsystem=handle.name, session_id=session_id, error=str(e))
+                continue
+            if state is not None:
+                total += estimate_size(state, self.config.size_walk_limit)
+
+        record.footprint_bytes = total
+        return total
+
+    async def release(self, session_id: str):
+        """Release a session from every subsystem and stop tracking it"""
+        for handle in self.subsystems.values():
+            await self._call_release(handle, session_id)
+
+        self.sessions.pop(session_id, None)
+        self.paged_state.pop(session_id, None)
+
+    async def page_out(self, session_id: str) -> bool:
+        """Snapshot pageable state into a compressed blob and release live state"""
+        record = self.sessions.get(session_id)
+        if not record or record.paged_out:
+            return False
+
+        snapshot = {}
+        for handle in self.subsystems.values():
+            if not handle.pageable:
+                continue
+            try:
+                state = handle.state_getter(session_id)
+            except Exception as e:
+                logger.warning("Session snapshot failed",
+                               subsystem=handle.name, session_id=session_id, error=str(e))
+                return False
+            if state is not None:
+                snapshot[handle.name] = state
+
+        try:
+            blob = zlib.compress(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            logger.warning("Session not pageable", session_id=session_id, error=str(e))
+            return False
+
+        for handle in self.subsystems.values():
+            if not handle.evict_only:
+                await self._call_release(handle, session_id)
+
+        self.paged_state[session_id] = blob
+        record.paged_out = True
+        record.paged_at = time.monotonic()
+        record.footprint_bytes = 0
+        self.page_outs += 1
+
+        logger.info("Session paged out", session_id=session_id, blob_bytes=len(blob))
+        return True
+
+    async def page_in(self, session_id: str) -> bool:
+        """Restore a paged-out session into its subsystems"""
+        record = self.sessions.get(session_id)
+        blob = self.paged_state.pop(session_id, None)
+        if not record or not record.paged_out or blob is None:
+            return False
+
+        snapshot = pickle.loads(zlib.decompress(blob))
+        for name, state in snapshot.items():
+            handle = self.subsystems.get(name)
+            if handle and handle.restore:
+                result = handle.restore(session_id, state)
+                if inspect.isawaitable(result):
+                    await result
+
+        record.paged_out = False
+        record.paged_at = None
+        record.last_activity = time.monotonic()
+        self.page_ins += 1
+
+        logger.info("Session paged in", session_id=session_id)
+        return True
+
+    async def ensure_resident(self, session_id: str) -> bool:
+        """Page a session back in if needed and mark it active"""
+        async with self._lock:
+            if self.is_paged_out(session_id):
+                await self.page_in(session_id)
+        self.touch(session_id)
+        return session_id in self.sessions
+
+    async def evict(self, session_id: str):
+        """Fully evict a session and notify the owner"""
+        await self.release(session_id)
+        self.evictions += 1
+
+        if self.on_evict:
+            result = self.on_evict(session_id)
+            if inspect.isawaitable(result):
+                await result
+
+        logger.info("Session evicted", session_id=session_id)
+
+    async def sweep(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Page out or evict idle sessions, then enforce the memory budget"""
+        now = now if now is not None else time.monotonic()
+        counts = {"paged_out": 0, "evicted": 0, "kept": 0}
+
+        async with self._lock:
+            # Drop paged-out sessions nobody came back for
+            for record in list(self.sessions.values()):
+                if (record.paged_out and not record.pinned and
+                        now - record.paged_at > self.config.paged_ttl):
+                    await self.evict(record.session_id)
+                    counts["evicted"] += 1
+
+            # Idle sessions leave memory regardless of budget
+            for record in list(self.sessions.values()):
+                if record.paged_out or record.pinned:
+                    continue
+                if record.idle_seconds(now) > self.config.idle_timeout:
+                    counts[await self._shed(record.session_id)] += 1
+
+            # Then shed least recently active sessions until within budget
+            resident = [r for r in self.sessions.values() if not r.paged_out]
+            total = sum(self.measure(r.session_id) for r in resident)
+            for record in sorted(resident, key=lambda r: r.last_activity):
+                if total <= self.config.memory_budget_bytes:
+                    break
+                if record.pinned:
+                    continue
+                outcome = await self._shed(record.session_id)
+                if outcome != "kept":
+                    total -= record.footprint_bytes
+                counts[outcome] += 1
+
+        return {**counts, "resident_bytes": total}
+
+    async def _shed(self, session_id: str) -> str:
+        """Page out, or evict when page-out is disabled.
+
+        A session whose page-out fails stays resident rather than losing its
+        state. Returns "paged_out", "evicted" or "kept".
+        """
+        if not self.config.page_out_idle:
+            await self.evict(session_id)
+            return "evicted"
+        if await self.page_out(session_id):
+            return "paged_out"
+
+        self.page_out_failures += 1
+        logger.error("Session page-out failed, keeping it resident", session_id=session_id)
+        return "kept"
+
+    async def _call_release(self, handle: SubsystemHandle, session_id: str):
+        """Invoke a subsystem release, isolating failures from other subsystems"""
+        try:
+            result = handle.release(session_id)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            self.release_errors += 1
+            logger.error("Subsystem session release failed",
+                         subsystem=handle.name, session_id=session_id, error=str(e))
+
+    def start(self):
+        """Start the periodic maintenance sweep"""
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def stop(self):
+        """Stop the periodic maintenance sweep"""
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+
+    async def _maintenance_loop(self):
+        """Run sweeps until cancelled"""
+        while True:
+            await asyncio.sleep(self.config.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error("Session sweep failed", error=str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics"""
+        resident = [r for r in self.sessions.values() if not r.paged_out]
+        return {
+            "tracked_sessions": len(self.sessions),
+            "resident_sessions": len(resident),
+            "paged_sessions": len(self.paged_state),
+            "resident_bytes": sum(r.footprint_bytes for r in resident),
+            "paged_bytes": sum(len(blob) for blob in self.paged_state.values()),
+            "memory_budget_bytes": self.config.memory_budget_bytes,
+            "subsystems": list(self.subsystems.keys()),
+            "page_outs": self.page_outs,
+            "page_ins": self.page_ins,
+            "evictions": self.evictions,
+            "release_errors": self.release_errors,
+            "page_out_failures": self.page_out_failures
+        }
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """Get per-session lifecycle records"""
+        now = time.monotonic()
+        return [
+            {
+                "session_id": r.session_id,
+                "idle_seconds": round(r.idle_seconds(now), 1),
+                "footprint_bytes": r.footprint_bytes,
+                "paged_out": r.paged_out,
+                "pinned": r.pinned
+            }
+            for r in self.sessions.values()
+        ]
@@ -6,8 +6,13 @@ Essential utilities for logging, performance monitoring, and system support.
 
 from .logging import Logger
 from .performance import PerformanceMonitor
+from .stat_cache import DerivedStatCache
+from .tracing import Tracer, get_tracer
 
 __all__ = [
     'Logger',
-    'PerformanceMonitor'
+    'PerformanceMonitor',
+    'DerivedStatCache',
+    'Tracer',
+    'get_tracer'
 ]
\ No newline at end of file
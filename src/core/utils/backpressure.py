@@ -0,0 +1,250 @@
+"""
+WebSocket Backpressure
+
+Per-connection outbound queues and inbound rate limits for WebSocket servers.
+Broadcasting only enqueues, and a dedicated writer task per connection does
+the sending, so a slow or stalled client delays nobody but itself. Stale state
+updates are coalesced, overflow follows a configurable policy, and clients
+that fall too far behind are disconnected (clients resume on reconnect).
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+OVERFLOW_DROP_STALE = "drop_stale"      # Drop the oldest queued state update, else disconnect
+OVERFLOW_DROP_OLDEST = "drop_oldest"    # Drop the oldest queued message of any type
+OVERFLOW_DISCONNECT = "disconnect"      # Disconnect as soon as the queue is full
+
+STATE_UPDATE_TYPES = frozenset({"game_state", "ui_data", "ping", "pong"})
+
+
+@dataclass(frozen=True, slots=True)
+class BackpressurePolicy:
+    """Outbound queue limits for one connection"""
+    max_queue: int = 256
+    coalesce_types: FrozenSet[str] = STATE_UPDATE_TYPES  # Only the newest queued one is kept
+    overflow: str = OVERFLOW_DROP_STALE
+    max_lag: float = 10.0        # Seconds the oldest undelivered message may wait
+    send_timeout: float = 5.0    # Seconds a single send may block the writer
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitPolicy:
+    """Inbound message limits for one connection"""
+    messages_per_second: float = 20.0
+    message_burst: int = 40
+    actions_per_second: float = 4.0
+    action_burst: int = 8
+    limited_types: FrozenSet[str] = frozenset({"player_action"})
+
+
+class OutboundQueue:
+    """
+    Bounded outbound queue drained by its own writer task.
+
+    ``put`` never blocks. It returns False once the connection has failed
+    (overflow, lag or a send error); ``on_failure`` is called once with the
+    reason so the owner can close the socket.
+    """
+
+    def __init__(self, send: Callable[[Any], Awaitable[None]],
+                 policy: Optional[BackpressurePolicy] = None,
+                 on_failure: Optional[Callable[[str], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.policy = policy or BackpressurePolicy()
+        self._send = send
+        self._on_failure = on_failure
+        self._clock = clock
+
+        # Entries are [message, enqueued_at]; a coalesced or dropped entry's message
+        # becomes None and is compacted away once dead entries outnumber the limit
+        self._entries: deque = deque()
+        self._latest: Dict[str, list] = {}
+        self._live = 0
+        self._in_flight_since: Optional[float] = None
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self.failed: Optional[str] = None
+
+        # Statistics
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def start(self) -> 'OutboundQueue':
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+        return self
+
+    def __len__(self) -> int:
+        return self._live
+
+    def lag(self, now: Optional[float] = None) -> float:
+        """Seconds the oldest undelivered message has been waiting"""
+        oldest = self._in_flight_since
+        if oldest is None:
+            for message, enqueued_at in self._entries:
+                if message is not None:
+                    oldest = enqueued_at
+                    break
+        if oldest is None:
+            return 0.0
+        return (self._clock() if now is None else now) - oldest
+
+    def put(self, message: Dict[str, Any]) -> bool:
+        """Queue a message for the writer; False if the connection has failed."""
+        if self.failed:
+            return False
+
+        now = self._clock()
+        if self.lag(now) > self.policy.max_lag:
+            self._fail("lag")
+            return False
+
+        message_type = message.get("type")
+        coalesce = message_type in self.policy.coalesce_types
+        if coalesce:
+            stale = self._latest.get(message_type)
+            if stale is not None:
+                stale[0] = None
+                self._live -= 1
+                self.coalesced += 1
+
+        if self._live >= self.policy.max_queue and not self._make_room():
+            self._fail("overflow")
+            return False
+
+        if len(self._entries) - self._live > self.policy.max_queue:
+            self._entries = deque(entry for entry in self._entries if entry[0] is not None)
+
+        entry = [message, now]
+        self._entries.append(entry)
+        if coalesce:
+            self._latest[message_type] = entry
+        self._live += 1
+        self.max_depth = max(self.max_depth, self._live)
+        self._ready.set()
+        return True
+
+    def _make_room(self) -> bool:
+        overflow = self.policy.overflow
+        if overflow == OVERFLOW_DISCONNECT:
+            return False
+        for entry in self._entries:
+            message = entry[0]
+            if message is None:
+                continue
+            if overflow == OVERFLOW_DROP_OLDEST or message.get("type") in self.policy.coalesce_types:
+                self._discard(entry)
+                self.dropped += 1
+                return True
+        return False
+
+    def _discard(self, entry: list):
+        message_type = entry[0].get("type")
+        if self._latest.get(message_type) is entry:
+            del self._latest[message_type]
+        entry[0] = None
+        self._live -= 1
+
+    async def _run(self):
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._entries:
+                    entry = self._entries.popleft()
+                    message = entry[0]
+                    if message is None:
+                        continue
+                    self._discard(entry)
+                    self._in_flight_since = entry[1]
+                    await asyncio.wait_for(self._send(message), self.policy.send_timeout)
+                    self._in_flight_since = None
+                    self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except asyncio.TimeoutError:
+            self._fail("send_timeout")
+        except Exception as e:
+            logger.warning("Outbound send failed", error=str(e))
+            self._fail("send_error")
+
+    def _fail(self, reason: str):
+        if self.failed:
+            return
+        self.failed = reason
+        self.close()
+        if self._on_failure:
+            self._on_failure(reason)
+
+    def close(self):
+        """Stop the writer and discard anything still queued."""
+        if self._writer and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._entries.clear()
+        self._latest.clear()
+        self._live = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._live,
+            "lag_seconds": round(self.lag(), 3),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "max_depth": self.max_depth,
+            "failed": self.failed
+        }
+
+
+class TokenBucket:
+    """Token bucket: ``rate`` tokens per second up to ``burst``"""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def allow(self, cost: float = 1.0) -> bool:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < cost:
+            return False
+        self._tokens -= cost
+        return True
+
+
+class InboundRateLimiter:
+    """Per-connection limits on all messages and, more tightly, on game actions"""
+
+    def __init__(self, policy: Optional[RateLimitPolicy] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.policy = policy or RateLimitPolicy()
+        self._messages = TokenBucket(self.policy.messages_per_second, self.policy.message_burst, clock)
+        self._actions = TokenBucket(self.policy.actions_per_second, self.policy.action_burst, clock)
+        self.rejected = 0
+        self.consecutive_rejections = 0
+
+    def allow(self, message_type: Optional[str]) -> bool:
+        allowed = self._messages.allow()
+        if allowed and message_type in self.policy.limited_types:
+            allowed = self._actions.allow()
+
+        if allowed:
+            self.consecutive_rejections = 0
+        else:
+            self.rejected += 1
+            self.consecutive_rejections += 1
+        return allowed
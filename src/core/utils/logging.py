@@ -3,14 +3,33 @@ Logging System for Tactical RPG Engine
 
 Provides structured logging with performance considerations.
 Designed to have minimal impact on release builds.
+
+Records are handed to a background thread through a queue, so the calling
+thread never formats or writes output. Levels can be set per module, and
+a message repeated faster than the rate limit is collapsed into a count.
+
+Usage:
+    logger = Logger.get_logger(__name__)
+    logger.debug("Decision made", unit_id=unit_id, action=action_id)
 """
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from enum import Enum
 
+ROOT_LOGGER_NAME = "TacticalRPG"
+
+# Level constants for ModuleLogger.is_enabled guards
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
 class LogLevel(Enum):
     """Log level enumeration"""
     DEBUG = "DEBUG"
@@ -19,100 +38,286 @@ class LogLevel(Enum):
     ERROR = "ERROR"
     CRITICAL = "CRITICAL"
 
+
+class ContextFormatter(logging.Formatter):
+    """Appends structured context and suppressed-repeat counts to the message"""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        context = getattr(record, "context", None)
+        if context:
+            message += " [" + ", ".join(f"{k}={v}" for k, v in context.items()) + "]"
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f" (+{suppressed} similar suppressed)"
+        return message
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops repeats of the same message from the same logger.
+
+    The first ``burst`` records per ``window`` seconds pass; the rest are
+    counted and the count is attached to the next record that gets through.
+    Messages are keyed on their template, so pass variable parts as context.
+    """
+
+    MAX_KEYS = 2048
+
+    def __init__(self, burst: int = 10, window: float = 1.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._windows: Dict[Tuple[str, Any], list] = {}
+        self.suppressed_total = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+
+        key = (record.name, record.msg)
+        now = record.created
+        entry = self._windows.get(key)
+
+        if entry is None or now - entry[0] >= self.window:
+            if len(self._windows) >= self.MAX_KEYS:
+                self._windows.clear()
+            suppressed = entry[2] if entry else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+
+        entry[1] += 1
+        if entry[1] <= self.burst:
+            return True
+
+        entry[2] += 1
+        self.suppressed_total += 1
+        return False
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class ModuleLogger:
+    """
+    Leveled, structured logger for one module.
+
+    Each call checks the level before doing any work, so disabled levels
+    cost one method call and a cached level lookup.
+    """
+
+    __slots__ = ("name", "_logger")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._logger = logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}" if name else ROOT_LOGGER_NAME)
+
+    def is_enabled(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def _log(self, level: int, message: str, context: Dict[str, Any], exc_info=None):
+        self._logger.log(level, message, exc_info=exc_info,
+                         extra={"context": context} if context else None)
+
+    def debug(self, message: str, **context):
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, message, context)
+
+    def info(self, message: str, **context):
+        if self._logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, message, context)
+
+    def warning(self, message: str, **context):
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, message, context)
+
+    def error(self, message: str, **context):
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, message, context)
+
+    def exception(self, message: str, **context):
+        """Log an error with the active exception's traceback"""
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, message, context, exc_info=True)
+
+    def critical(self, message: str, **context):
+        if self._logger.isEnabledFor(logging.CRITICAL):
+            self._log(logging.CRITICAL, message, context)
+
+
 class Logger:
     """
     Centralized logging system for the engine.
-    
+
     Provides structured logging with context and performance tracking.
     """
-    
+
     _initialized = False
     _logger = None
     _log_level = LogLevel.INFO
-    
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _rate_limit: Optional[RateLimitFilter] = None
+    _module_loggers: Dict[str, ModuleLogger] = {}
+
     @classmethod
-    def initialize(cls, log_level: str = "INFO", log_file: Optional[str] = None):
+    def initialize(cls, log_level: str = "INFO", log_file: Optional[str] = None,
+                   module_levels: Optional[Dict[str, str]] = None,
+                   rate_limit_burst: int = 10, rate_limit_window: float = 1.0):
         """
         Initialize the logging system.
-        
+
         Args:
             log_level: Minimum log level to output
             log_file: Optional file to write logs to
+            module_levels: Per-module overrides, e.g. {"ai": "DEBUG"};
+                merged with APEX_LOG_LEVELS ("ai=DEBUG,game.queue=WARNING")
+            rate_limit_burst: Repeats of one message allowed per window
+            rate_limit_window: Rate limit window in seconds
         """
         if cls._initialized:
             return
-        
-        cls._log_level = LogLevel(log_level.upper())
-        
-        # Configure Python logging
+
+        log_level = os.getenv("APEX_LOG_LEVEL", log_level).upper()
+        cls._log_level = LogLevel(log_level)
+
+        # Configure Python logging for third-party loggers
         logging.basicConfig(
-            level=getattr(logging, log_level.upper()),
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            level=getattr(logging, log_level),
+            format=LOG_FORMAT,
             handlers=[
                 logging.StreamHandler(sys.stdout)
             ]
         )
-        
+
+        # Engine records go through a queue to a background writer thread
+        formatter = ContextFormatter(LOG_FORMAT)
+        handlers = [logging.StreamHandler(sys.stdout)]
         if log_file:
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setFormatter(logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            ))
-            logging.getLogger().addHandler(file_handler)
-        
-        cls._logger = logging.getLogger("TacticalRPG")
+            handlers.append(logging.FileHandler(log_file))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = _DeferredQueueHandler(log_queue)
+        cls._rate_limit = RateLimitFilter(rate_limit_burst, rate_limit_window)
+        queue_handler.addFilter(cls._rate_limit)
+
+        cls._logger = logging.getLogger(ROOT_LOGGER_NAME)
+        cls._logger.setLevel(getattr(logging, log_level))
+        cls._logger.handlers = [queue_handler]
+        cls._logger.propagate = False
+
+        cls._listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        cls._listener.start()
+        atexit.register(cls.shutdown)
+
+        levels = dict(cls._parse_levels(os.getenv("APEX_LOG_LEVELS", "")))
+        levels.update(module_levels or {})
+        for module, level in levels.items():
+            cls.set_level(module, level)
+
         cls._initialized = True
-    
+
     @classmethod
-    def debug(cls, message: str, **kwargs):
-        """Log debug message with optional context"""
+    def shutdown(cls):
+        """Flush queued records and stop the writer thread"""
+        if cls._listener is not None:
+            cls._listener.stop()
+            cls._listener = None
+        cls._initialized = False
+
+    @staticmethod
+    def _parse_levels(spec: str):
+        for item in spec.split(","):
+            if "=" in item:
+                module, level = item.split("=", 1)
+                yield module.strip(), level.strip()
+
+    @staticmethod
+    def _module_name(name: str) -> str:
+        """Normalize module paths so src.ai.x and ai.x share a logger"""
+        if name.startswith("src."):
+            name = name[4:]
+        return name
+
+    @classmethod
+    def get_logger(cls, name: str = "") -> ModuleLogger:
+        """
+        Get the structured logger for a module.
+
+        Args:
+            name: Module name, usually ``__name__``
+        """
         if not cls._initialized:
             cls.initialize()
-        
-        context = cls._format_context(kwargs)
-        cls._logger.debug(f"{message}{context}")
-    
+
+        name = cls._module_name(name)
+        module_logger = cls._module_loggers.get(name)
+        if module_logger is None:
+            module_logger = cls._module_loggers[name] = ModuleLogger(name)
+        return module_logger
+
     @classmethod
-    def info(cls, message: str, **kwargs):
-        """Log info message with optional context"""
+    def set_level(cls, module: str, level: str):
+        """Set the minimum level for a module and its submodules"""
+        module = cls._module_name(module)
+        name = f"{ROOT_LOGGER_NAME}.{module}" if module else ROOT_LOGGER_NAME
+        logging.getLogger(name).setLevel(getattr(logging, level.upper()))
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Get logging pipeline statistics"""
+        return {
+            "initialized": cls._initialized,
+            "level": cls._log_level.value,
+            "module_loggers": len(cls._module_loggers),
+            "suppressed_repeats": cls._rate_limit.suppressed_total if cls._rate_limit else 0
+        }
+
+    @classmethod
+    def _log(cls, level: int, message: str, context: Dict[str, Any]):
         if not cls._initialized:
             cls.initialize()
-        
-        context = cls._format_context(kwargs)
-        cls._logger.info(f"{message}{context}")
-    
+
+        if cls._logger.isEnabledFor(level):
+            cls._logger.log(level, message, extra={"context": context} if context else None)
+
+    @classmethod
+    def debug(cls, message: str, **kwargs):
+        """Log debug message with optional context"""
+        cls._log(logging.DEBUG, message, kwargs)
+
+    @classmethod
+    def info(cls, message: str, **kwargs):
+        """Log info message with optional context"""
+        cls._log(logging.INFO, message, kwargs)
+
     @classmethod
     def warning(cls, message: str, **kwargs):
         """Log warning message with optional context"""
-        if not cls._initialized:
-            cls.initialize()
-        
-        context = cls._format_context(kwargs)
-        cls._logger.warning(f"{message}{context}")
-    
+        cls._log(logging.WARNING, message, kwargs)
+
     @classmethod
     def error(cls, message: str, **kwargs):
         """Log error message with optional context"""
-        if not cls._initialized:
-            cls.initialize()
-        
-        context = cls._format_context(kwargs)
-        cls._logger.error(f"{message}{context}")
-    
+        cls._log(logging.ERROR, message, kwargs)
+
     @classmethod
     def critical(cls, message: str, **kwargs):
         """Log critical message with optional context"""
-        if not cls._initialized:
-            cls.initialize()
-        
-        context = cls._format_context(kwargs)
-        cls._logger.critical(f"{message}{context}")
-    
+        cls._log(logging.CRITICAL, message, kwargs)
+
     @classmethod
     def _format_context(cls, context: Dict[str, Any]) -> str:
         """Format context dictionary as string"""
         if not context:
             return ""
-        
+
         context_items = [f"{k}={v}" for k, v in context.items()]
-        return f" [{', '.join(context_items)}]"
\ No newline at end of file
+        return f" [{', '.join(context_items)}]"
@@ -1,24 +1,15 @@
 """
 Performance Profiler
 
-Performance monitoring and profiling utilities for the tactical RPG engine.
+Profiling API for the tactical RPG engine, backed by the shared span
+tracer (see ``tracing.py``).
 """
 
 import time
-import statistics
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
-from contextlib import contextmanager
-from collections import defaultdict
+from typing import Dict, Optional, Any
+from dataclasses import dataclass
 
-
-@dataclass
-class PerformanceMetric:
-    """Individual performance measurement"""
-    name: str
-    duration: float
-    timestamp: float
-    metadata: Dict[str, Any] = field(default_factory=dict)
+from .tracing import Tracer, get_tracer
 
 
 @dataclass
@@ -31,8 +22,9 @@ class PerformanceStats:
     max_time: float
     average_time: float
     median_time: float
-    last_measurement: float
-    
+    p95_time: float
+    p99_time: float
+
     @property
     def calls_per_second(self) -> float:
         """Calculate calls per second over total runtime"""
@@ -44,16 +36,17 @@ class PerformanceStats:
 class PerformanceProfiler:
     """
     Performance profiling system for monitoring engine performance.
-    
-    Tracks execution times, memory usage, and system performance metrics
-    to ensure performance targets are met.
+
+    Measurements are spans on the shared tracer; statistics come from its
+    latency histograms rather than stored samples. ``reset`` clears only the
+    operations this profiler measured.
     """
-    
-    def __init__(self, max_samples: int = 1000):
-        self.max_samples = max_samples
-        self.measurements: Dict[str, List[PerformanceMetric]] = defaultdict(list)
-        self.active_timers: Dict[str, float] = {}
-        
+
+    def __init__(self, tracer: Optional[Tracer] = None):
+        self.tracer = tracer or get_tracer()
+        self.active_timers: Dict[str, int] = {}
+        self.operations = set()
+
         # Performance targets (from Advanced-Implementation-Guide.md)
         self.performance_targets = {
             'stat_calculations': 0.001,      # <1ms for complex character sheets
@@ -62,139 +55,62 @@ class PerformanceProfiler:
             'ai_decisions': 0.100,          # <100ms per unit turn
             'frame_time': 0.016,            # ~60 FPS (16ms per frame)
         }
-        
-        # Warnings and alerts
-        self.warning_threshold_multiplier = 1.5  # Warn at 150% of target
-        self.critical_threshold_multiplier = 2.0  # Critical at 200% of target
-        
-        # Performance history for trend analysis
-        self.performance_history: List[Dict[str, float]] = []
-        self.history_interval = 1.0  # seconds
-        self.last_history_time = time.time()
-    
-    @contextmanager
+        self.tracer.targets.update(self.performance_targets)
+
     def measure(self, operation_name: str, **metadata):
         """Context manager for measuring operation performance"""
-        start_time = time.perf_counter()
-        
-        try:
-            yield
-        finally:
-            end_time = time.perf_counter()
-            duration = end_time - start_time
-            
-            self.record_measurement(operation_name, duration, **metadata)
-    
+        self.operations.add(operation_name)
+        return self.tracer.span(operation_name, **metadata)
+
     def start_timer(self, operation_name: str):
         """Start a named timer"""
-        self.active_timers[operation_name] = time.perf_counter()
-    
+        self.active_timers[operation_name] = time.perf_counter_ns()
+
     def stop_timer(self, operation_name: str, **metadata) -> float:
         """Stop a named timer and record the measurement"""
         if operation_name not in self.active_timers:
             raise ValueError(f"Timer '{operation_name}' was not started")
-        
-        start_time = self.active_timers.pop(operation_name)
-        end_time = time.perf_counter()
-        duration = end_time - start_time
-        
-        self.record_measurement(operation_name, duration, **metadata)
+
+        duration = (time.perf_counter_ns() - self.active_timers.pop(operation_name)) / 1e9
+        self.record_measurement(operation_name, duration)
         return duration
-    
+
     def record_measurement(self, operation_name: str, duration: float, **metadata):
         """Record a performance measurement"""
-        metric = PerformanceMetric(
-            name=operation_name,
-            duration=duration,
-            timestamp=time.time(),
-            metadata=metadata
-        )
-        
-        self.measurements[operation_name].append(metric)
-        
-        # Limit sample size to prevent memory growth
-        if len(self.measurements[operation_name]) > self.max_samples:
-            self.measurements[operation_name] = self.measurements[operation_name][-self.max_samples:]
-        
-        # Check for performance issues
-        self._check_performance_threshold(operation_name, duration)
-        
-        # Update performance history
-        self._update_performance_history()
-    
-    def _check_performance_threshold(self, operation_name: str, duration: float):
-        """Check if measurement exceeds performance thresholds"""
-        target = self.performance_targets.get(operation_name)
-        if target is None:
-            return
-        
-        warning_threshold = target * self.warning_threshold_multiplier
-        critical_threshold = target * self.critical_threshold_multiplier
-        
-        if duration > critical_threshold:
-            print(f"CRITICAL: {operation_name} took {duration*1000:.2f}ms "
-                  f"(target: {target*1000:.2f}ms, critical: {critical_threshold*1000:.2f}ms)")
-        elif duration > warning_threshold:
-            print(f"WARNING: {operation_name} took {duration*1000:.2f}ms "
-                  f"(target: {target*1000:.2f}ms, warning: {warning_threshold*1000:.2f}ms)")
-    
-    def _update_performance_history(self):
-        """Update performance history for trend analysis"""
-        current_time = time.time()
-        
-        if current_time - self.last_history_time >= self.history_interval:
-            # Calculate average performance for each operation in the last interval
-            history_entry = {}
-            
-            for operation_name, metrics in self.measurements.items():
-                recent_metrics = [m for m in metrics 
-                                if current_time - m.timestamp <= self.history_interval]
-                
-                if recent_metrics:
-                    avg_duration = statistics.mean(m.duration for m in recent_metrics)
-                    history_entry[operation_name] = avg_duration
-            
-            if history_entry:
-                self.performance_history.append(history_entry)
-                
-                # Limit history size
-                if len(self.performance_history) > 300:  # 5 minutes at 1-second intervals
-                    self.performance_history = self.performance_history[-300:]
-            
-            self.last_history_time = current_time
-    
+        self.operations.add(operation_name)
+        self.tracer.record(operation_name, duration)
+
     def get_stats(self, operation_name: str) -> Optional[PerformanceStats]:
         """Get aggregated statistics for an operation"""
-        if operation_name not in self.measurements:
+        histogram = self.tracer.get_histogram(operation_name)
+        if histogram is None or histogram.total == 0:
             return None
-        
-        metrics = self.measurements[operation_name]
-        if not metrics:
-            return None
-        
-        durations = [m.duration for m in metrics]
-        
+
         return PerformanceStats(
             name=operation_name,
-            total_calls=len(durations),
-            total_time=sum(durations),
-            min_time=min(durations),
-            max_time=max(durations),
-            average_time=statistics.mean(durations),
-            median_time=statistics.median(durations),
-            last_measurement=durations[-1]
+            total_calls=histogram.total,
+            total_time=histogram.sum_ns / 1e9,
+            min_time=histogram.min_ns / 1e9,
+            max_time=histogram.max_ns / 1e9,
+            average_time=histogram.mean_ns / 1e9,
+            median_time=histogram.percentile(50) / 1e9,
+            p95_time=histogram.percentile(95) / 1e9,
+            p99_time=histogram.percentile(99) / 1e9
         )
-    
+
     def get_all_stats(self) -> Dict[str, PerformanceStats]:
         """Get statistics for all measured operations"""
-        return {name: self.get_stats(name) 
-                for name in self.measurements.keys() 
-                if self.get_stats(name) is not None}
-    
+        all_stats = {}
+        for name in list(self.tracer.histograms):
+            stats = self.get_stats(name)
+            if stats is not None:
+                all_stats[name] = stats
+        return all_stats
+
     def get_performance_report(self) -> Dict[str, Any]:
         """Generate comprehensive performance report"""
         all_stats = self.get_all_stats()
-        
+
         # Check target compliance
         target_compliance = {}
         for operation_name, target in self.performance_targets.items():
@@ -204,20 +120,18 @@ class PerformanceProfiler:
                 target_compliance[operation_name] = {
                     'target_ms': target * 1000,
                     'average_ms': stats.average_time * 1000,
+                    'p95_ms': stats.p95_time * 1000,
                     'compliance_ratio': compliance_ratio,
                     'meets_target': compliance_ratio <= 1.0,
-                    'status': ('PASS' if compliance_ratio <= 1.0 
-                             else 'WARN' if compliance_ratio <= 1.5 
+                    'status': ('PASS' if compliance_ratio <= 1.0
+                             else 'WARN' if compliance_ratio <= 1.5
                              else 'FAIL')
                 }
-        
-        # Performance trends
-        trends = self._analyze_performance_trends()
-        
+
         return {
             'timestamp': time.time(),
-            'measurement_count': sum(len(metrics) for metrics in self.measurements.values()),
-            'operations_tracked': len(self.measurements),
+            'measurement_count': sum(stats.total_calls for stats in all_stats.values()),
+            'operations_tracked': len(all_stats),
             'target_compliance': target_compliance,
             'performance_stats': {name: {
                 'total_calls': stats.total_calls,
@@ -225,57 +139,21 @@ class PerformanceProfiler:
                 'min_ms': stats.min_time * 1000,
                 'max_ms': stats.max_time * 1000,
                 'median_ms': stats.median_time * 1000,
+                'p95_ms': stats.p95_time * 1000,
+                'p99_ms': stats.p99_time * 1000,
                 'calls_per_second': stats.calls_per_second
             } for name, stats in all_stats.items()},
-            'performance_trends': trends,
+            'recent_warnings': list(self.tracer.warnings)[-10:],
             'memory_usage': self._get_memory_usage()
         }
-    
-    def _analyze_performance_trends(self) -> Dict[str, Any]:
-        """Analyze performance trends over time"""
-        if len(self.performance_history) < 2:
-            return {}
-        
-        trends = {}
-        
-        for operation_name in self.performance_targets.keys():
-            # Get recent measurements
-            recent_values = []
-            for entry in self.performance_history[-30:]:  # Last 30 seconds
-                if operation_name in entry:
-                    recent_values.append(entry[operation_name])
-            
-            if len(recent_values) >= 5:
-                # Calculate trend (simple linear regression slope)
-                x_values = list(range(len(recent_values)))
-                y_values = recent_values
-                
-                n = len(recent_values)
-                sum_x = sum(x_values)
-                sum_y = sum(y_values)
-                sum_xy = sum(x * y for x, y in zip(x_values, y_values))
-                sum_x_squared = sum(x * x for x in x_values)
-                
-                slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x_squared - sum_x * sum_x)
-                
-                trends[operation_name] = {
-                    'slope_ms_per_second': slope * 1000,
-                    'trend': ('improving' if slope < -0.001 
-                            else 'degrading' if slope > 0.001 
-                            else 'stable'),
-                    'recent_average_ms': statistics.mean(recent_values) * 1000,
-                    'sample_count': len(recent_values)
-                }
-        
-        return trends
-    
+
     def _get_memory_usage(self) -> Dict[str, Any]:
         """Get current memory usage information"""
         try:
             import psutil
             process = psutil.Process()
             memory_info = process.memory_info()
-            
+
             return {
                 'rss_mb': memory_info.rss / (1024 * 1024),
                 'vms_mb': memory_info.vms / (1024 * 1024),
@@ -284,13 +162,13 @@ class PerformanceProfiler:
             }
         except ImportError:
             return {'available': False, 'error': 'psutil not installed'}
-    
+
     def print_performance_summary(self):
         """Print a formatted performance summary"""
         print("\n=== Performance Summary ===")
-        
+
         all_stats = self.get_all_stats()
-        
+
         # Print target compliance
         print("\nTarget Compliance:")
         for operation_name, target in self.performance_targets.items():
@@ -302,7 +180,7 @@ class PerformanceProfiler:
                       f"(target: {target*1000:.2f}ms, ratio: {ratio:.2f})")
             else:
                 print(f"  - {operation_name}: No measurements")
-        
+
         # Print detailed stats
         print("\nDetailed Statistics:")
         for name, stats in all_stats.items():
@@ -310,35 +188,19 @@ class PerformanceProfiler:
             print(f"    Calls: {stats.total_calls}")
             print(f"    Average: {stats.average_time*1000:.2f}ms")
             print(f"    Min/Max: {stats.min_time*1000:.2f}ms / {stats.max_time*1000:.2f}ms")
-            print(f"    Median: {stats.median_time*1000:.2f}ms")
-            if stats.calls_per_second > 0:
-                print(f"    Rate: {stats.calls_per_second:.1f} calls/sec")
-    
+            print(f"    Median/p95/p99: {stats.median_time*1000:.2f}ms / "
+                  f"{stats.p95_time*1000:.2f}ms / {stats.p99_time*1000:.2f}ms")
+
     def reset(self):
-        """Reset all measurements"""
-        self.measurements.clear()
+        """Reset this profiler's measurements"""
+        self.tracer.reset(list(self.operations))
         self.active_timers.clear()
-        self.performance_history.clear()
-        self.last_history_time = time.time()
-    
-    def export_measurements(self, filename: str):
-        """Export measurements to CSV file"""
-        import csv
-        
-        with open(filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(['operation', 'duration_ms', 'timestamp', 'metadata'])
-            
-            for operation_name, metrics in self.measurements.items():
-                for metric in metrics:
-                    writer.writerow([
-                        operation_name,
-                        metric.duration * 1000,
-                        metric.timestamp,
-                        str(metric.metadata)
-                    ])
-        
-        print(f"Performance measurements exported to {filename}")
+
+    def export_measurements(self, filename: str, session_id: Optional[str] = None,
+                            turn: Optional[int] = None):
+        """Export buffered spans as a Chrome trace-event JSON file"""
+        written = self.tracer.export_chrome_trace(filename, session_id=session_id, turn=turn)
+        print(f"Performance trace ({written} spans) exported to {filename}")
 
 
 # Global profiler instance
@@ -348,9 +210,5 @@ profiler = PerformanceProfiler()
 # Decorator for easy profiling
 def profile_performance(operation_name: str):
     """Decorator to automatically profile function performance"""
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            with profiler.measure(operation_name):
-                return func(*args, **kwargs)
-        return wrapper
-    return decorator
\ No newline at end of file
+    profiler.operations.add(operation_name)
+    return profiler.tracer.trace(operation_name)
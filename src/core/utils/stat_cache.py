@@ -0,0 +1,133 @@
+"""
+Derived Stat Cache
+
+Memoizes derived stats and invalidates them through declared dependencies,
+so a change to one input (equipping an item, a modifier expiring, a level
+up) recomputes only the stats that read it.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Set
+
+
+class DerivedStatCache:
+    """
+    Derived-stat memo with dependency-based dirty tracking.
+
+    Each cached stat records the input keys it was computed from. Marking an
+    input dirty drops every stat that depends on it, transitively, and the
+    next read recomputes just those stats. Bumping the class-wide
+    ``generation`` (``invalidate_everywhere``, e.g. on a configuration
+    reload) drops every instance's stats on its next read.
+    """
+
+    # Totals across every cache instance
+    totals: Dict[str, int] = {"hits": 0, "recomputes": 0, "invalidations": 0}
+
+    # Bumped when something every derived stat may read changes (configuration)
+    generation = 0
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._generation = DerivedStatCache.generation
+        self.hits = 0
+        self.recomputes = 0
+        self.invalidations = 0
+
+    def get(self, stat: str, compute: Callable[[], Any], depends_on: Iterable[str] = ()) -> Any:
+        """
+        Get a cached stat, computing it on first access or after invalidation.
+
+        Args:
+            stat: Stat key
+            compute: Zero-argument function producing the value
+            depends_on: Input keys whose invalidation should drop this stat
+
+        Returns:
+            Cached or freshly computed value
+        """
+        if self._generation != DerivedStatCache.generation:
+            self._adopt_generation()
+        if stat in self._values:
+            self.hits += 1
+            DerivedStatCache.totals["hits"] += 1
+            return self._values[stat]
+
+        value = compute()
+        self._values[stat] = value
+        for dependency in depends_on:
+            self._dependents.setdefault(dependency, set()).add(stat)
+
+        self.recomputes += 1
+        DerivedStatCache.totals["recomputes"] += 1
+        return value
+
+    def invalidate(self, *keys: str) -> int:
+        """
+        Mark inputs or stats dirty, dropping everything derived from them.
+
+        Returns:
+            Number of cached stats dropped
+        """
+        dropped = 0
+        pending = list(keys)
+        seen = set()
+
+        while pending:
+            key = pending.pop()
+            if key in seen:
+                continue
+            seen.add(key)
+
+            if key in self._values:
+                del self._values[key]
+                dropped += 1
+            pending.extend(self._dependents.pop(key, ()))
+
+        if dropped:
+            self.invalidations += dropped
+            DerivedStatCache.totals["invalidations"] += dropped
+        return dropped
+
+    def invalidate_all(self) -> int:
+        """Drop every cached stat"""
+        dropped = len(self._values)
+        self._values.clear()
+        self._dependents.clear()
+
+        if dropped:
+            self.invalidations += dropped
+            DerivedStatCache.totals["invalidations"] += dropped
+        return dropped
+
+    def _adopt_generation(self):
+        """Drop stats computed before the latest ``invalidate_everywhere``"""
+        self._generation = DerivedStatCache.generation
+        self.invalidate_all()
+
+    def is_cached(self, stat: str) -> bool:
+        """Check whether a stat is currently cached"""
+        if self._generation != DerivedStatCache.generation:
+            self._adopt_generation()
+        return stat in self._values
+
+    @classmethod
+    def invalidate_everywhere(cls):
+        """Make every cache instance recompute its stats on next read"""
+        cls.generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.recomputes
+        return {
+            "cached_stats": len(self._values),
+            "hits": self.hits,
+            "recomputes": self.recomputes,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    @classmethod
+    def get_global_stats(cls) -> Dict[str, int]:
+        """Get totals across all caches"""
+        return dict(cls.totals)
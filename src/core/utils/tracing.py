@@ -0,0 +1,462 @@
+"""
+Span Tracing
+
+Single profiling and tracing layer for the engine. Spans nest through a
+context variable so async tasks keep their own parent chain, finished spans
+go into fixed-size ring buffers (one per recent session turn, plus one for
+spans outside any turn), and durations feed HDR-style log-linear
+histograms. A disabled tracer hands back a shared no-op span, so leaving
+instrumentation in hot paths costs one attribute check.
+
+Usage:
+    with tracer.span("combat.resolve", session_id=session_id, turn=turn):
+        ...
+
+    tracer.export_chrome_trace("turn_12.json", session_id=session_id, turn=12)
+"""
+
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in nanoseconds.
+
+    Values below 128ns are counted exactly; above that every power of two is
+    split into 64 sub-buckets, bounding the relative error of any percentile
+    to under 1.6% in constant memory.
+    """
+
+    SUB_BUCKET_BITS = 7
+    SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+    SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+    MAX_SHIFT = 34  # Highest trackable value is ~2^41ns (~36 minutes)
+    BUCKET_COUNT = SUB_BUCKET_COUNT + MAX_SHIFT * SUB_BUCKET_HALF
+
+    __slots__ = ("counts", "total", "sum_ns", "min_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * self.BUCKET_COUNT))
+        self.total = 0
+        self.sum_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        if value < cls.SUB_BUCKET_COUNT:
+            return value
+        shift = min(value.bit_length() - cls.SUB_BUCKET_BITS, cls.MAX_SHIFT)
+        sub = min(value >> shift, cls.SUB_BUCKET_COUNT - 1)
+        return cls.SUB_BUCKET_COUNT + (shift - 1) * cls.SUB_BUCKET_HALF + (sub - cls.SUB_BUCKET_HALF)
+
+    @classmethod
+    def _value_at(cls, index: int) -> int:
+        """Upper bound of a bucket"""
+        if index < cls.SUB_BUCKET_COUNT:
+            return index
+        offset = index - cls.SUB_BUCKET_COUNT
+        shift = offset // cls.SUB_BUCKET_HALF + 1
+        sub = offset % cls.SUB_BUCKET_HALF + cls.SUB_BUCKET_HALF
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value_ns: int):
+        """Record one duration"""
+        value_ns = max(int(value_ns), 0)
+        self.counts[self._index(value_ns)] += 1
+        if self.total == 0 or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        self.total += 1
+        self.sum_ns += value_ns
+
+    def percentile(self, percent: float) -> int:
+        """Duration at a percentile (0-100) in nanoseconds"""
+        if self.total == 0:
+            return 0
+        threshold = max(1, int(round(self.total * percent / 100.0)))
+        running = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                running += bucket_count
+                if running >= threshold:
+                    return min(self._value_at(index), self.max_ns)
+        return self.max_ns
+
+    @property
+    def mean_ns(self) -> float:
+        return self.sum_ns / self.total if self.total else 0.0
+
+    def stddev_ns(self) -> float:
+        """Standard deviation estimated from bucket midpoints"""
+        if self.total < 2:
+            return 0.0
+        mean = self.mean_ns
+        variance = 0.0
+        previous = -1
+        for index, bucket_count in enumerate(self.counts):
+            upper = self._value_at(index)
+            if bucket_count:
+                midpoint = (previous + 1 + upper) / 2.0
+                variance += bucket_count * (midpoint - mean) ** 2
+            previous = upper
+        return (variance / self.total) ** 0.5
+
+    def reset(self):
+        """Clear all recorded values"""
+        self.counts = array("Q", bytes(8 * self.BUCKET_COUNT))
+        self.total = 0
+        self.sum_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def summary(self) -> Dict[str, float]:
+        """Count and latency summary in milliseconds"""
+        return {
+            "count": self.total,
+            "total_ms": self.sum_ns / 1e6,
+            "mean_ms": self.mean_ns / 1e6,
+            "min_ms": self.min_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p95_ms": self.percentile(95) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6
+        }
+
+
+@dataclass(slots=True)
+class Span:
+    """A finished (or in-flight) traced operation"""
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    root_id: int
+    start_ns: int
+    end_ns: int = 0
+    thread_id: int = 0
+    session_id: Optional[str] = None
+    turn: Optional[int] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+
+class _NoopSpan:
+    """Shared span returned while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+_UNSAMPLED = object()
+
+# Innermost open span for the current thread or async task
+_current_span: ContextVar[Any] = ContextVar("apex_current_span", default=None)
+
+
+class _UnsampledRoot:
+    """Marks a trace that lost the sampling roll so its children are skipped"""
+
+    __slots__ = ("_token",)
+
+    def __enter__(self):
+        self._token = _current_span.set(_UNSAMPLED)
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        return False
+
+
+class _ActiveSpan:
+    """Context manager that times one span and hands it to the tracer"""
+
+    __slots__ = ("_tracer", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self._tracer = tracer
+        self._span = span
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        self._span.start_ns = time.perf_counter_ns()
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        self._span.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self._span.args["error"] = exc_type.__name__
+        self._tracer._finish(self._span)
+        return False
+
+
+class Tracer:
+    """
+    Span-based tracer with sampling, ring-buffered spans and per-name
+    latency histograms.
+
+    Sampling is decided once per root span; children of an unsampled root
+    are skipped entirely. Spans inherit ``session_id`` and ``turn`` from
+    their parent. Spans of a session turn are buffered per turn, for the
+    last ``retained_turns`` turns, so exporting a recent turn doesn't depend
+    on how many spans other sessions and turns produced since.
+    """
+
+    def __init__(self, enabled: bool = True, sample_rate: float = 1.0,
+                 capacity: int = 10000, turn_capacity: int = 16384,
+                 retained_turns: int = 8, seed: Optional[int] = None):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.spans: deque = deque(maxlen=capacity)  # Spans outside any session turn
+        self.turn_spans: "OrderedDict[Tuple[str, int], deque]" = OrderedDict()
+        self.turn_capacity = turn_capacity
+        self.retained_turns = retained_turns
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.targets: Dict[str, float] = {}
+        self.warnings: deque = deque(maxlen=100)
+        self.start_ns = time.perf_counter_ns()
+        self.epoch_offset_ns = time.time_ns() - self.start_ns
+        self._ids = count(1)
+        self._random = random.Random(seed).random
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, session_id: Optional[str] = None,
+             turn: Optional[int] = None, **args):
+        """
+        Open a span as a context manager.
+
+        Args:
+            name: Operation name; also the histogram key
+            session_id: Game session the work belongs to (inherited if omitted)
+            turn: Turn number within the session (inherited if omitted)
+            **args: Extra attributes recorded on the span
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+
+        parent = _current_span.get()
+        if parent is _UNSAMPLED:
+            return NOOP_SPAN
+
+        span_id = next(self._ids)
+        if parent is None:
+            if self.sample_rate < 1.0 and self._random() >= self.sample_rate:
+                return _UnsampledRoot()
+            parent_id, root_id = None, span_id
+        else:
+            parent_id, root_id = parent.span_id, parent.root_id
+            if session_id is None:
+                session_id = parent.session_id
+            if turn is None:
+                turn = parent.turn
+
+        return _ActiveSpan(self, Span(
+            name=name, span_id=span_id, parent_id=parent_id, root_id=root_id,
+            start_ns=0, thread_id=threading.get_ident(),
+            session_id=session_id, turn=turn, args=args
+        ))
+
+    def trace(self, name: Optional[str] = None):
+        """Decorator that wraps a function (sync or async) in a span"""
+        def decorator(func: Callable) -> Callable:
+            span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name: str, duration_seconds: float):
+        """Record an externally measured duration into the histogram only"""
+        if self.enabled:
+            self._record_duration(name, int(duration_seconds * 1e9))
+
+    def _finish(self, span: Span):
+        if span.session_id is not None and span.turn is not None:
+            self._turn_buffer(span.session_id, span.turn).append(span)
+        else:
+            self.spans.append(span)
+        self._record_duration(span.name, span.end_ns - span.start_ns)
+
+    def _turn_buffer(self, session_id: str, turn: int) -> deque:
+        """Span buffer for a session turn, dropping the oldest turn when full"""
+        key = (session_id, turn)
+        buffer = self.turn_spans.get(key)
+        if buffer is None:
+            with self._lock:
+                buffer = self.turn_spans.get(key)
+                if buffer is None:
+                    buffer = self.turn_spans[key] = deque(maxlen=self.turn_capacity)
+                    while len(self.turn_spans) > self.retained_turns:
+                        self.turn_spans.popitem(last=False)
+        return buffer
+
+    def _record_duration(self, name: str, duration_ns: int):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        histogram.record(duration_ns)
+
+        target = self.targets.get(name)
+        if target is not None and duration_ns > target * 1e9:
+            self.warnings.append({
+                "operation": name,
+                "duration": duration_ns / 1e9,
+                "target": target,
+                "timestamp": time.time()
+            })
+
+    def get_histogram(self, name: str) -> Optional[LatencyHistogram]:
+        return self.histograms.get(name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Histogram summaries keyed by span name"""
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "buffered_spans": len(self.spans) + sum(map(len, list(self.turn_spans.values()))),
+            "buffered_turns": len(self.turn_spans),
+            "span_capacity": self.spans.maxlen,
+            "turn_capacity": self.turn_capacity,
+            "operations": {name: hist.summary() for name, hist in list(self.histograms.items())}
+        }
+
+    def reset(self, names: Optional[List[str]] = None):
+        """Clear spans and histograms, or just the histograms for ``names``"""
+        if names is None:
+            self.spans.clear()
+            self.turn_spans.clear()
+            self.histograms.clear()
+            self.warnings.clear()
+            return
+        for name in names:
+            histogram = self.histograms.get(name)
+            if histogram is not None:
+                histogram.reset()
+
+    def get_spans(self, session_id: Optional[str] = None,
+                  turn: Optional[int] = None) -> List[Span]:
+        """Buffered spans, optionally filtered to one session and turn"""
+        if session_id is not None and turn is not None:
+            return list(self.turn_spans.get((session_id, turn), ()))
+        buffers = [self.spans, *list(self.turn_spans.values())]
+        return [
+            span for buffer in buffers for span in list(buffer)
+            if (session_id is None or span.session_id == session_id)
+            and (turn is None or span.turn == turn)
+        ]
+
+    def to_chrome_trace(self, session_id: Optional[str] = None,
+                        turn: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build a Chrome trace-event document (chrome://tracing, Perfetto).
+
+        Each root span gets its own track so interleaved async work does not
+        break nesting; the track is named after the root span.
+        """
+        spans = sorted(self.get_spans(session_id, turn), key=lambda s: s.start_ns)
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        tracks: Dict[int, str] = {}
+
+        for span in spans:
+            if span.parent_id is None:
+                tracks[span.root_id] = span.name
+            args = dict(span.args)
+            args.update(span_id=span.span_id, parent_id=span.parent_id)
+            if span.session_id is not None:
+                args["session_id"] = span.session_id
+            if span.turn is not None:
+                args["turn"] = span.turn
+            events.append({
+                "name": span.name,
+                "cat": span.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (span.start_ns + self.epoch_offset_ns) / 1000.0,
+                "dur": span.duration_ns / 1000.0,
+                "pid": pid,
+                "tid": span.root_id,
+                "args": args
+            })
+
+        for root_id, root_name in tracks.items():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": root_id,
+                "args": {"name": f"{root_name} #{root_id}"}
+            })
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"session_id": session_id, "turn": turn}
+        }
+
+    def export_chrome_trace(self, path: str, session_id: Optional[str] = None,
+                            turn: Optional[int] = None) -> int:
+        """
+        Write one session's turn (or any filtered slice) as trace-event JSON.
+
+        Returns:
+            Number of spans written
+        """
+        document = self.to_chrome_trace(session_id, turn)
+        with open(path, "w") as f:
+            json.dump(document, f)
+        return sum(1 for event in document["traceEvents"] if event["ph"] == "X")
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
+
+# Process-wide tracer; APEX_TRACING=0 turns every span into a no-op
+tracer = Tracer(
+    enabled=_env_flag("APEX_TRACING", "1"),
+    sample_rate=float(os.getenv("APEX_TRACE_SAMPLE_RATE", "1.0")),
+    capacity=int(os.getenv("APEX_TRACE_BUFFER", "10000")),
+    turn_capacity=int(os.getenv("APEX_TRACE_TURN_BUFFER", "16384")),
+    retained_turns=int(os.getenv("APEX_TRACE_TURNS", "8"))
+)
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer"""
+    return tracer
@@ -0,0 +1,372 @@
+"""
+Wire Protocol
+
+Message encoding for the game WebSocket. JSON text is the default and the
+fallback; a connection that negotiates ``PROTOCOL_BINARY`` exchanges binary
+frames instead:
+
+    byte 0    flags (FLAG_COMPRESSED, FLAG_HANDLES)
+    byte 1    MessageType code (UNKNOWN keeps the type name in the body)
+    [msgpack [first_handle, [entity_id, ...]]]   only with FLAG_HANDLES
+    msgpack body, zlib-compressed with FLAG_COMPRESSED
+
+Entity IDs (values under ENTITY_ID_KEYS, and "id" inside "units") travel as
+integer handles. Each direction keeps a HandleTable; the sender announces new
+handles in the frame that first uses them. Naive ISO timestamps travel as
+integer microseconds. Decoding restores the original message, so handlers
+see the same dicts in both protocols.
+
+Session broadcasts carry a "seq" number from the session's ReplayBuffer. A
+client that reconnects with a resume token (stream ID and last applied seq)
+is sent only the messages it missed, or a full snapshot if they have been
+evicted.
+"""
+
+import json
+import struct
+import time
+import uuid
+import zlib
+from collections import deque
+from datetime import datetime, timedelta
+from enum import Enum, IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "msgpack-v1"
+
+FLAG_COMPRESSED = 0x01
+FLAG_HANDLES = 0x02
+
+EXT_HANDLE = 1
+EXT_TIMESTAMP = 2
+
+DEFAULT_COMPRESSION_THRESHOLD = 4096  # Body bytes before compression is tried
+
+ENTITY_ID_KEYS = frozenset({
+    "unit_id", "target_id", "attacker_id", "source_id", "entity_id",
+    "occupant", "selected_unit", "current_unit", "active_unit"
+})
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class MessageType(IntEnum):
+    """One-byte codes for WebSocket message types"""
+    UNKNOWN = 0
+
+    # Connection
+    PING = 1
+    PONG = 2
+    PROTOCOL = 3
+    ERROR = 4
+    RESUMED = 5
+
+    # Server state and UI
+    GAME_STATE = 10
+    UI_DATA = 11
+    UI_UPDATE = 12
+    UI_UPDATE_BATCH = 13
+    NOTIFICATION = 14
+
+    # Server events and results
+    ACTION_RESULT = 20
+    UNIT_MOVED = 21
+    UNIT_ATTACKED = 22
+    UNIT_DIED = 23
+    GAME_END = 24
+    SELECT_UNIT_RESULT = 25
+    DESELECT_UNIT_RESULT = 26
+    DISMISS_NOTIFICATION_RESULT = 27
+
+    # Client requests
+    PLAYER_ACTION = 40
+    REQUEST_GAME_STATE = 41
+    REQUEST_UI_DATA = 42
+    SELECT_UNIT = 43
+    DESELECT_UNIT = 44
+    DISMISS_NOTIFICATION = 45
+
+    @classmethod
+    def for_name(cls, name: Optional[str]) -> 'MessageType':
+        return _TYPE_CODES.get(name, cls.UNKNOWN)
+
+    @property
+    def wire_name(self) -> str:
+        return self.name.lower()
+
+
+_TYPE_CODES = {member.wire_name: member for member in MessageType if member is not MessageType.UNKNOWN}
+
+
+class WireProtocolError(ValueError):
+    """Raised for frames that cannot be decoded"""
+
+
+class HandleTable:
+    """Append-only mapping between entity ID strings and integer handles"""
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._handles: Dict[str, int] = {}
+
+    def handle_for(self, entity_id: str) -> int:
+        handle = self._handles.get(entity_id)
+        if handle is None:
+            handle = self._handles[entity_id] = len(self._ids)
+            self._ids.append(entity_id)
+        return handle
+
+    def resolve(self, handle: int) -> str:
+        try:
+            return self._ids[handle]
+        except IndexError:
+            raise WireProtocolError(f"Unknown entity handle {handle}") from None
+
+    def extend(self, first_handle: int, entity_ids: List[str]):
+        if first_handle != len(self._ids):
+            raise WireProtocolError(f"Handle gap: expected {len(self._ids)}, got {first_handle}")
+        for entity_id in entity_ids:
+            self.handle_for(entity_id)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def _to_wire_value(value: Any) -> Any:
+    """msgpack ``default`` hook for values JSON callers pass as-is"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+class WireCodec:
+    """
+    Binary encoder/decoder for one connection.
+
+    Handle tables are per direction, so each side of a connection keeps its
+    own codec and frames must be decoded in the order they were sent.
+    """
+
+    def __init__(self, compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD):
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack is required for the binary wire protocol")
+
+        self.compression_threshold = compression_threshold
+        self.outgoing = HandleTable()
+        self.incoming = HandleTable()
+        self._pending_handles: List[str] = []
+
+        # Statistics
+        self.frames_encoded = 0
+        self.frames_decoded = 0
+        self.frames_compressed = 0
+        self.bytes_encoded = 0
+        self.bytes_decoded = 0
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        """Encode a message dict as a binary frame."""
+        message_type = MessageType.for_name(message.get("type"))
+        body = {key: value for key, value in message.items()
+                if not (key == "type" and message_type is not MessageType.UNKNOWN)}
+
+        first_handle = len(self.outgoing)
+        payload = msgpack.packb(self._pack_refs(body), default=_to_wire_value, use_bin_type=True)
+
+        flags = 0
+        sections = []
+        if self._pending_handles:
+            flags |= FLAG_HANDLES
+            sections.append(msgpack.packb([first_handle, self._pending_handles], use_bin_type=True))
+            self._pending_handles = []
+
+        if len(payload) >= self.compression_threshold:
+            compressed = zlib.compress(payload, 1)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= FLAG_COMPRESSED
+                self.frames_compressed += 1
+
+        frame = bytes((flags, message_type)) + b"".join(sections) + payload
+        self.frames_encoded += 1
+        self.bytes_encoded += len(frame)
+        return frame
+
+    def decode(self, frame: bytes) -> Dict[str, Any]:
+        """Decode a binary frame back into a message dict."""
+        if len(frame) < 2:
+            raise WireProtocolError("Frame too short")
+
+        flags, code = frame[0], frame[1]
+        try:
+            message_type = MessageType(code)
+        except ValueError:
+            raise WireProtocolError(f"Unknown message type code {code}") from None
+
+        offset = 2
+        if flags & FLAG_HANDLES:
+            unpacker = msgpack.Unpacker(raw=False)
+            unpacker.feed(frame[offset:])
+            first_handle, entity_ids = unpacker.unpack()
+            self.incoming.extend(first_handle, entity_ids)
+            offset += unpacker.tell()
+
+        payload = frame[offset:]
+        if flags & FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+
+        body = msgpack.unpackb(payload, raw=False, strict_map_key=False, ext_hook=self._ext_hook)
+        self.frames_decoded += 1
+        self.bytes_decoded += len(frame)
+
+        if message_type is MessageType.UNKNOWN:
+            return body
+        return {"type": message_type.wire_name, **body}
+
+    def _pack_refs(self, value: Any, key: Optional[str] = None, parent: Optional[str] = None) -> Any:
+        """Copy of ``value`` with entity IDs and timestamps as ext values"""
+        if isinstance(value, dict):
+            return {k: self._pack_refs(v, k, key) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._pack_refs(item, key, parent) for item in value]
+        if isinstance(value, str) and key is not None:
+            if key in ENTITY_ID_KEYS or (key == "id" and parent == "units"):
+                return self._handle_ext(value)
+            if key == "timestamp":
+                return _timestamp_ext(value) or value
+        return value
+
+    def _handle_ext(self, entity_id: str) -> 'msgpack.ExtType':
+        known = len(self.outgoing)
+        handle = self.outgoing.handle_for(entity_id)
+        if handle == known:
+            self._pending_handles.append(entity_id)
+        return msgpack.ExtType(EXT_HANDLE, handle.to_bytes(_handle_width(handle), "little"))
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == EXT_HANDLE:
+            return self.incoming.resolve(int.from_bytes(data, "little"))
+        if code == EXT_TIMESTAMP:
+            return (_EPOCH + struct.unpack("<q", data)[0] * _MICROSECOND).isoformat()
+        return msgpack.ExtType(code, data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "frames_encoded": self.frames_encoded,
+            "frames_decoded": self.frames_decoded,
+            "frames_compressed": self.frames_compressed,
+            "bytes_encoded": self.bytes_encoded,
+            "bytes_decoded": self.bytes_decoded,
+            "outgoing_handles": len(self.outgoing),
+            "incoming_handles": len(self.incoming)
+        }
+
+
+def _handle_width(handle: int) -> int:
+    return 1 if handle < 0x100 else 2 if handle < 0x10000 else 4
+
+
+def _timestamp_ext(value: str) -> Optional['msgpack.ExtType']:
+    """Naive ISO timestamps that round-trip exactly, as integer microseconds"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None or parsed.isoformat() != value:
+        return None
+    return msgpack.ExtType(EXT_TIMESTAMP, struct.pack("<q", (parsed - _EPOCH) // _MICROSECOND))
+
+
+def encode_message(message: Dict[str, Any], codec: Optional[WireCodec] = None) -> Union[str, bytes]:
+    """Encode for the connection's protocol: a binary frame with a codec, else JSON text."""
+    if codec is not None:
+        return codec.encode(message)
+    return json.dumps(message)
+
+
+def decode_message(raw: Union[str, bytes], codec: Optional[WireCodec] = None) -> Dict[str, Any]:
+    """Decode a text (JSON) or binary (framed msgpack) WebSocket message."""
+    if isinstance(raw, (bytes, bytearray)):
+        if codec is None:
+            raise WireProtocolError("Binary frame received without a negotiated codec")
+        return codec.decode(bytes(raw))
+    return json.loads(raw)
+
+
+def negotiate_protocol(requested: Optional[str]) -> str:
+    """Protocol a server grants for a client's request"""
+    if requested == PROTOCOL_BINARY and MSGPACK_AVAILABLE:
+        return PROTOCOL_BINARY
+    return PROTOCOL_JSON
+
+
+def make_resume_token(stream_id: str, seq: int) -> str:
+    return f"{stream_id}:{seq}"
+
+
+def parse_resume_token(token: Optional[str]) -> Optional[Tuple[str, int]]:
+    """(stream_id, last_seq) from a resume token, or None if malformed"""
+    if not token:
+        return None
+    stream_id, _, seq = token.rpartition(":")
+    if not stream_id or not seq.isdigit():
+        return None
+    return stream_id, int(seq)
+
+
+class ReplayBuffer:
+    """
+    Recent sequenced messages of one session, bounded by count and age.
+
+    The stream ID changes whenever a buffer is created, so sequence numbers
+    from before a server restart or session cleanup never match.
+    """
+
+    def __init__(self, max_events: int = 512, max_age: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.last_seq = 0
+        self.max_age = max_age
+        self._clock = clock
+        self._entries: deque = deque(maxlen=max_events)  # (seq, recorded_at, player_id, message)
+
+    def append(self, message: Dict[str, Any], player_id: Optional[str] = None) -> Dict[str, Any]:
+        """Stamp the next sequence number on a copy of ``message`` and record it."""
+        self.last_seq += 1
+        stamped = {**message, "seq": self.last_seq}
+        self._entries.append((self.last_seq, self._clock(), player_id, stamped))
+        return stamped
+
+    def since(self, seq: int, player_id: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Messages after ``seq`` addressed to the session or to ``player_id``.
+
+        Returns None when some of them are no longer buffered.
+        """
+        self._evict_expired()
+        if seq > self.last_seq:
+            return None
+        oldest = self._entries[0][0] if self._entries else self.last_seq + 1
+        if seq + 1 < oldest:
+            return None
+        return [message for entry_seq, _, target, message in self._entries
+                if entry_seq > seq and (target is None or target == player_id)]
+
+    def _evict_expired(self):
+        cutoff = self._clock() - self.max_age
+        while self._entries and self._entries[0][1] < cutoff:
+            self._entries.popleft()
+
+    def __len__(self) -> int:
+        return len(self._entries)
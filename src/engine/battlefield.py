@@ -8,6 +8,7 @@ for tactical combat gameplay.
 import asyncio
 import heapq
 import math
+from functools import partial
 from typing import Dict, Any, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
@@ -17,6 +18,8 @@ import numpy as np
 
 from ..core.math import Vector2, GridPosition
 from ..core.ecs import EntityID
+from ..core.math.reachability import RangeCache, TileMask, attack_mask, reachable_mask
+from .spatial_index import EMPTY, SpatialIndex
 
 logger = structlog.get_logger()
 
@@ -116,6 +119,14 @@ class BattlefieldManager:
         self.battlefields: Dict[str, Dict[Tuple[int, int], BattlefieldTile]] = {}
         self.terrain_properties = self._initialize_terrain_properties()
         
+        # Unit occupancy index per session
+        self.spatial_indexes: Dict[str, SpatialIndex] = {}
+        
+        # Terrain/occupancy version per session, and the range inputs built for it
+        self.board_versions: Dict[str, int] = {}
+        self._board_arrays: Dict[str, Tuple[int, np.ndarray, np.ndarray]] = {}
+        self.range_cache = RangeCache()
+        
         # Pathfinding cache
         self.pathfinding_cache: Dict[str, Dict[Tuple[Tuple[int, int], Tuple[int, int]], List[GridPosition]]] = {}
         
@@ -188,6 +199,7 @@ class BattlefieldManager:
                 battlefield[(x, y)] = BattlefieldTile(position=position)
         
         self.battlefields[session_id] = battlefield
+        self.spatial_indexes[session_id] = SpatialIndex(self.width, self.height)
         self.pathfinding_cache[session_id] = {}
         
         logger.info("Battlefield initialized for session", 
@@ -215,7 +227,8 @@ class BattlefieldManager:
         if tile:
             tile.height = height
     
-    def occupy_tile(self, session_id: str, position: GridPosition, entity_id: EntityID) -> bool:
+    def occupy_tile(self, session_id: str, position: GridPosition, entity_id: EntityID,
+                    team: Optional[str] = None) -> bool:
         """Occupy a tile with an entity"""
         tile = self.get_tile(session_id, position)
         if not tile:
@@ -226,6 +239,7 @@ class BattlefieldManager:
         
         tile.status = TileStatus.OCCUPIED
         tile.occupant = entity_id
+        self.spatial_indexes[session_id].place(entity_id, position.x, position.y, team)
         self._invalidate_pathfinding_cache(session_id)
         
         logger.debug("Tile occupied", 
@@ -243,6 +257,7 @@ class BattlefieldManager:
         if tile.status == TileStatus.OCCUPIED:
             tile.status = TileStatus.EMPTY
             tile.occupant = None
+            self.spatial_indexes[session_id].remove_at(position.x, position.y)
             self._invalidate_pathfinding_cache(session_id)
             
             logger.debug("Tile vacated", 
@@ -257,6 +272,22 @@ class BattlefieldManager:
         tile = self.get_tile(session_id, position)
         return tile.occupant if tile else None
     
+    def get_spatial_index(self, session_id: str) -> Optional[SpatialIndex]:
+        """Get the unit occupancy index for a session"""
+        return self.spatial_indexes.get(session_id)
+    
+    def bind_position(self, session_id: str, position_component, team: Optional[str] = None):
+        """Keep a PositionComponent's moves mirrored in the session's spatial index"""
+        index = self.spatial_indexes.get(session_id)
+        if index is None:
+            return
+        
+        # Bound by session, not index object, so moves reach the index rebuilt on page-in
+        position_component.spatial_index_source = partial(self.spatial_indexes.get, session_id)
+        if position_component.entity_id is not None:
+            position = position_component.position
+            index.place(position_component.entity_id, position.x, position.y, team)
+    
     def is_position_valid(self, position: GridPosition) -> bool:
         """Check if position is within battlefield bounds"""
         return (0 <= position.x < self.width and 
@@ -547,6 +578,70 @@ class BattlefieldManager:
         """Invalidate pathfinding cache for session"""
         if session_id in self.pathfinding_cache:
             self.pathfinding_cache[session_id].clear()
+        self.board_versions[session_id] = self.board_versions.get(session_id, 0) + 1
+    
+    def get_board_version(self, session_id: str) -> Tuple[int, int]:
+        """Version that changes whenever terrain or any unit position does"""
+        index = self.spatial_indexes.get(session_id)
+        return self.board_versions.get(session_id, 0), index.version if index else 0
+    
+    def get_board_arrays(self, session_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-tile entry costs and vision blockers, indexed [x, y].
+        
+        Blocked tiles and impassable terrain cost ``inf``. Occupancy is not
+        included; range queries read it from the spatial index, which also
+        sees moves made through bound PositionComponents. Rebuilt only
+        after a terrain or tile change.
+        """
+        version = self.board_versions.get(session_id, 0)
+        cached = self._board_arrays.get(session_id)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        
+        costs = np.ones((self.width, self.height))
+        vision_blockers = np.zeros((self.width, self.height), dtype=bool)
+        for (x, y), tile in self.battlefields.get(session_id, {}).items():
+            props = self.terrain_properties.get(tile.terrain_type)
+            if tile.status == TileStatus.BLOCKED or (props and props.blocks_movement):
+                costs[x, y] = np.inf
+            elif props:
+                costs[x, y] = props.movement_cost
+            if props and props.blocks_vision:
+                vision_blockers[x, y] = True
+        
+        self._board_arrays[session_id] = (version, costs, vision_blockers)
+        return costs, vision_blockers
+    
+    def get_unit_ranges(self, session_id: str, entity_id: EntityID, start: GridPosition,
+                        movement: float, attack_range: int) -> Tuple[TileMask, TileMask]:
+        """
+        Movement and attack range masks for a unit, cached until the board changes.
+        
+        Movement is cost-bounded over orthogonal steps through passable,
+        unoccupied tiles; attack range is the Manhattan diamond around the
+        unit filtered by line of sight.
+        
+        Args:
+            session_id: Session ID
+            entity_id: Unit the ranges belong to
+            start: Unit's tile
+            movement: Movement points available
+            attack_range: Maximum attack distance
+            
+        Returns:
+            (movement mask, attack mask); both exclude the unit's own tile
+        """
+        def compute():
+            costs, vision_blockers = self.get_board_arrays(session_id)
+            index = self.spatial_indexes.get(session_id)
+            occupied = index.occupancy != EMPTY if index else None
+            origin = (start.x, start.y)
+            return (reachable_mask(costs, origin, movement, occupied),
+                    attack_mask(origin, attack_range, (self.width, self.height), vision_blockers))
+        
+        key = (session_id, entity_id, start.x, start.y, movement, attack_range)
+        return self.range_cache.get_or_compute(key, self.get_board_version(session_id), compute)
     
     async def get_teams_with_living_units(self, session_id: str) -> Set[str]:
         """Get teams that have living units on battlefield"""
@@ -555,11 +650,12 @@ class BattlefieldManager:
         if session_id not in self.battlefields:
             return teams
         
+        index = self.spatial_indexes.get(session_id)
         for tile in self.battlefields[session_id].values():
             if tile.occupant:
-                # This would need to query the ECS for team information
-                # For now, we'll return a placeholder
-                teams.add("team_placeholder")
+                # Team is known when the unit was placed with one
+                team = index.team_of(tile.occupant) if index else None
+                teams.add(team or "team_placeholder")
         
         return teams
     
@@ -610,8 +706,34 @@ class BattlefieldManager:
         if session_id in self.pathfinding_cache:
             del self.pathfinding_cache[session_id]
         
+        self.spatial_indexes.pop(session_id, None)
+        self._board_arrays.pop(session_id, None)
+        self.board_versions.pop(session_id, None)
+        self.range_cache.discard_where(lambda key: key[0] == session_id)
+        
         logger.info("Battlefield session cleaned up", session_id=session_id)
     
+    def get_session_snapshot(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get the restorable state of a session's battlefield"""
+        if session_id not in self.battlefields:
+            return None
+        
+        index = self.spatial_indexes.get(session_id)
+        return {
+            "tiles": self.battlefields[session_id],
+            "placements": index.placements() if index else []
+        }
+    
+    def restore_session(self, session_id: str, snapshot: Dict[str, Any]):
+        """Restore a previously paged-out battlefield, rebuilding its spatial index"""
+        self.battlefields[session_id] = snapshot["tiles"]
+        index = SpatialIndex(self.width, self.height)
+        for entity_id, x, y, team in snapshot["placements"]:
+            index.place(entity_id, x, y, team)
+        self.spatial_indexes[session_id] = index
+        self.pathfinding_cache[session_id] = {}
+        self._invalidate_pathfinding_cache(session_id)
+    
     def get_pathfinding_stats(self) -> Dict[str, Any]:
         """Get pathfinding performance statistics"""
         hit_rate = (self.cache_hits / self.pathfinding_calls 
@@ -621,7 +743,8 @@ class BattlefieldManager:
             "pathfinding_calls": self.pathfinding_calls,
             "cache_hits": self.cache_hits,
             "cache_hit_rate": hit_rate,
-            "active_sessions": len(self.battlefields)
+            "active_sessions": len(self.battlefields),
+            "range_cache": self.range_cache.get_stats()
         }
 
 # Alias for backward compatibility
@@ -10,6 +10,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 
 from ...core.ecs import Component
+from ...core.utils.stat_cache import DerivedStatCache
 
 
 class EquipmentTier(str, Enum):
@@ -150,6 +151,14 @@ class EquipmentComponent(Component):
     # Equipment state
     needs_recalculation: bool = True
     
+    # Derived bonus cache, dropped whenever the equipped set changes
+    stat_cache: DerivedStatCache = field(default_factory=DerivedStatCache, repr=False, compare=False)
+    
+    def mark_dirty(self):
+        """Flag equipment bonuses for recalculation (equip, unequip, durability)"""
+        self.needs_recalculation = True
+        self.stat_cache.invalidate("equipment")
+    
     def equip_item(self, item: EquipmentItem) -> bool:
         """Equip an item"""
         if item.slot not in self.equipped_items:
@@ -162,7 +171,7 @@ class EquipmentComponent(Component):
         
         # Equip new item
         self.equipped_items[item.slot] = item
-        self.needs_recalculation = True
+        self.mark_dirty()
         
         return True
     
@@ -171,7 +180,7 @@ class EquipmentComponent(Component):
         item = self.equipped_items.get(slot)
         if item:
             self.equipped_items[slot] = None
-            self.needs_recalculation = True
+            self.mark_dirty()
         
         return item
     
@@ -232,6 +241,11 @@ class EquipmentComponent(Component):
     
     def get_damage_multiplier(self) -> float:
         """Get overall damage multiplier from equipment"""
+        return self.stat_cache.get("damage_multiplier", self._compute_damage_multiplier,
+                                   depends_on=("equipment",))
+    
+    def _compute_damage_multiplier(self) -> float:
+        """Geometric mean of equipped item tier multipliers"""
         # Calculate average tier multiplier
         multipliers = []
         for item in self.equipped_items.values():
@@ -260,6 +274,13 @@ class EquipmentComponent(Component):
     
     def get_defense_bonus(self, damage_type: DamageType) -> int:
         """Get defense bonus against specific damage type"""
+        key = f"defense:{getattr(damage_type, 'value', damage_type)}"
+        return self.stat_cache.get(key,
+                                   lambda: self._compute_defense_bonus(damage_type),
+                                   depends_on=("equipment",))
+    
+    def _compute_defense_bonus(self, damage_type: DamageType) -> int:
+        """Defense bonus with resistance applied"""
         self.calculate_bonuses()
         
         base_defense = self.total_defense_bonus
@@ -311,6 +332,7 @@ class EquipmentComponent(Component):
         for item in self.equipped_items.values():
             if item:
                 item.repair()
+        self.mark_dirty()
     
     def get_equipment_value(self) -> int:
         """Get total value of equipped items"""
@@ -399,4 +421,4 @@ class EquipmentComponent(Component):
         self.active_abilities = data.get("active_abilities", [])
         self.status_immunities = data.get("status_immunities", [])
         
-        self.needs_recalculation = True
\ No newline at end of file
+        self.mark_dirty()
\ No newline at end of file
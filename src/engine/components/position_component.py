@@ -5,8 +5,8 @@ Manages unit position, facing direction, and movement state
 for battlefield positioning and tactical gameplay.
 """
 
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, Callable, Optional
+from dataclasses import dataclass, field
 
 from ...core.ecs import Component
 from ...core.math import GridPosition
@@ -31,10 +31,21 @@ class PositionComponent(Component):
     is_flying: bool = False
     is_hidden: bool = False  # For stealth mechanics
     
+    # Looks up the session's live spatial index, kept in sync on moves (bound by
+    # BattlefieldManager; a lookup rather than the index, which page-in replaces)
+    spatial_index_source: Optional[Callable[[], Any]] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def spatial_index(self) -> Optional[Any]:
+        """Spatial index this component is bound to, if it is live"""
+        return self.spatial_index_source() if self.spatial_index_source else None
+    
     def move_to(self, new_position: GridPosition) -> bool:
         """Move to new position if possible"""
         if not self.can_move or self.movement_remaining <= 0:
             return False
+        if not self._can_occupy(new_position):
+            return False
         
         # Calculate movement cost (simplified - would need battlefield integration)
         movement_cost = self.position.manhattan_distance(new_position)
@@ -46,9 +57,25 @@ class PositionComponent(Component):
         self.position = new_position
         self.movement_remaining -= movement_cost
         self.has_moved = True
+        self._sync_spatial_index()
         
         return True
     
+    def _can_occupy(self, new_position: GridPosition) -> bool:
+        """Check the bound spatial index before moving, so a refused move changes nothing"""
+        index = self.spatial_index
+        if index is None or getattr(self, 'entity_id', None) is None:
+            return True
+        if index.position_of(self.entity_id) is None:
+            return True
+        return index.can_place(self.entity_id, new_position.x, new_position.y)
+    
+    def _sync_spatial_index(self):
+        """Mirror the current position into the bound spatial index"""
+        index = self.spatial_index
+        if index is not None and getattr(self, 'entity_id', None) is not None:
+            index.move(self.entity_id, self.position.x, self.position.y)
+    
     def set_facing(self, target_position: GridPosition):
         """Set facing direction towards target"""
         dx = target_position.x - self.position.x
@@ -121,10 +148,15 @@ class PositionComponent(Component):
         """Check if target is within range"""
         return self.get_distance_to(target_position) <= range_value
     
-    def teleport_to(self, new_position: GridPosition):
+    def teleport_to(self, new_position: GridPosition) -> bool:
         """Teleport to position without movement cost"""
+        if not self._can_occupy(new_position):
+            return False
+        
         self.previous_position = self.position
         self.position = new_position
+        self._sync_spatial_index()
+        return True
     
     def get_height_advantage(self, other_position: 'PositionComponent') -> float:
         """Get height advantage over another position"""
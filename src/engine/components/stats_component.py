@@ -9,6 +9,7 @@ from typing import Dict, Any
 from dataclasses import dataclass, field
 
 from ...core.ecs import Component
+from ...core.utils.stat_cache import DerivedStatCache
 
 
 @dataclass
@@ -70,18 +71,47 @@ class StatsComponent(Component):
     # Equipment modifiers
     equipment_bonuses: Dict[str, float] = field(default_factory=dict)
     
+    # Effective attribute cache; writes through the methods below keep it
+    # current, direct dict edits need a call to invalidate_attributes()
+    stat_cache: DerivedStatCache = field(default_factory=DerivedStatCache, repr=False, compare=False)
+    
     def get_effective_attribute(self, attribute_name: str) -> float:
         """Get effective attribute value including all modifiers"""
-        base_value = self.attributes.get(attribute_name, 0)
-        temp_modifier = self.temporary_modifiers.get(attribute_name, 0)
-        equipment_bonus = self.equipment_bonuses.get(attribute_name, 0)
-        
-        return base_value + temp_modifier + equipment_bonus
+        return self.stat_cache.get(
+            attribute_name,
+            lambda: (self.attributes.get(attribute_name, 0) +
+                     self.temporary_modifiers.get(attribute_name, 0) +
+                     self.equipment_bonuses.get(attribute_name, 0)),
+            depends_on=(f"base:{attribute_name}", f"temporary:{attribute_name}",
+                        f"equipment:{attribute_name}")
+        )
+    
+    def set_attribute(self, attribute: str, value: int):
+        """Set a base attribute"""
+        self.attributes[attribute] = value
+        self.stat_cache.invalidate(f"base:{attribute}")
+    
+    def set_equipment_bonuses(self, bonuses: Dict[str, float]):
+        """Replace equipment bonuses, invalidating only attributes that changed"""
+        changed = {
+            attribute for attribute in set(bonuses) | set(self.equipment_bonuses)
+            if bonuses.get(attribute, 0) != self.equipment_bonuses.get(attribute, 0)
+        }
+        self.equipment_bonuses = dict(bonuses)
+        self.stat_cache.invalidate(*(f"equipment:{attribute}" for attribute in changed))
+    
+    def invalidate_attributes(self, *attributes: str):
+        """Drop cached effective values (all of them when no names are given)"""
+        if attributes:
+            self.stat_cache.invalidate(*(f"base:{attribute}" for attribute in attributes))
+        else:
+            self.stat_cache.invalidate_all()
     
     def apply_temporary_modifier(self, attribute: str, value: float, duration: int = 3):
         """Apply temporary attribute modifier"""
         current_modifier = self.temporary_modifiers.get(attribute, 0)
         self.temporary_modifiers[attribute] = current_modifier + value
+        self.stat_cache.invalidate(f"temporary:{attribute}")
     
     def remove_temporary_modifier(self, attribute: str, value: float):
         """Remove temporary attribute modifier"""
@@ -90,9 +120,19 @@ class StatsComponent(Component):
         
         if self.temporary_modifiers[attribute] == 0:
             del self.temporary_modifiers[attribute]
+        self.stat_cache.invalidate(f"temporary:{attribute}")
+    
+    def level_up(self, attribute_gains: Dict[str, int]):
+        """Gain a level, raise primary attributes and refresh derived stats"""
+        self.level += 1
+        for attribute, gain in attribute_gains.items():
+            self.set_attribute(attribute, self.attributes.get(attribute, 0) + gain)
+        self.calculate_derived_stats()
     
     def calculate_derived_stats(self):
         """Calculate derived stats from primary attributes"""
+        previous = dict(self.attributes)
+        
         # HP calculation: base 50 + (fortitude * 5) + (strength * 2)
         self.max_hp = 50 + (self.attributes["fortitude"] * 5) + (self.attributes["strength"] * 2)
         
@@ -132,6 +172,12 @@ class StatsComponent(Component):
         # Movement points: base 2 + speed * 0.2
         self.attributes["move_points"] = 2 + int(self.attributes["speed"] * 0.2)
         
+        # Only derived stats whose value moved are invalidated
+        self.stat_cache.invalidate(*(
+            f"base:{attribute}" for attribute, value in self.attributes.items()
+            if previous.get(attribute) != value
+        ))
+        
         # Ensure current values don't exceed maximums
         if self.current_hp > self.max_hp:
             self.current_hp = self.max_hp
@@ -215,4 +261,5 @@ class StatsComponent(Component):
         self.alive = data.get("alive", True)
         self.attributes = data.get("attributes", {})
         self.temporary_modifiers = data.get("temporary_modifiers", {})
-        self.equipment_bonuses = data.get("equipment_bonuses", {})
\ No newline at end of file
+        self.equipment_bonuses = data.get("equipment_bonuses", {})
+        self.stat_cache.invalidate_all()
\ No newline at end of file
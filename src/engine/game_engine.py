@@ -21,6 +21,9 @@ import uvicorn
 from ..core.events import EventBus, GameEvent, EventType
 from ..core.ecs import ECSManager, Entity, Component, System, EntityID
 from ..core.math import Vector2, GridPosition
+from ..core.session_registry import SessionRegistry, SessionRegistryConfig
+from ..core.utils.stat_cache import DerivedStatCache
+from ..core.utils.tracing import tracer
 from .systems.turn_system import TurnSystem
 # from .systems.movement_system import MovementSystem  # TODO: Create this file
 from .systems.combat_system import CombatSystem
@@ -28,6 +31,7 @@ from .components.position_component import PositionComponent
 from .components.stats_component import StatsComponent
 from .components.team_component import TeamComponent
 from .battlefield import BattlefieldManager
+from . import metrics
 from .game_state import GameStateManager, GamePhase
 from .integrations.ai_integration import AIIntegrationManager
 from .ui.game_ui_manager import GameUIManager
@@ -56,6 +60,8 @@ class GameConfig:
     enable_fog_of_war: bool = False
     enable_permadeath: bool = True
     victory_conditions: List[str] = field(default_factory=lambda: ["eliminate_all"])
+    session_memory_budget_mb: int = 256
+    session_idle_timeout: float = 600.0
 
 
 @dataclass
@@ -83,9 +89,9 @@ class GameEngine:
         self.game_state = GameStateManager()
         
         # Game systems
-        self.turn_system = TurnSystem(self.ecs, self.event_bus)
+        self.turn_system = TurnSystem(self.ecs, self.event_bus, self.battlefield)
         # self.movement_system = MovementSystem(self.ecs, self.event_bus, self.battlefield)  # TODO: Create this file
-        self.combat_system = CombatSystem(self.ecs, self.event_bus)
+        self.combat_system = CombatSystem(self.ecs, self.event_bus, self.battlefield)
         self.ai_integration = AIIntegrationManager(
             self.ecs, 
             self.event_bus, 
@@ -94,7 +100,7 @@ class GameEngine:
         )
         
         # UI systems
-        self.ui_manager = GameUIManager(self.ecs, self.event_bus)
+        self.ui_manager = GameUIManager(self.ecs, self.event_bus, self.battlefield)
         self.visual_effects = VisualEffectsManager(self.event_bus)
         self.notifications = NotificationSystem(self.event_bus)
         
@@ -104,6 +110,13 @@ class GameEngine:
         # Session management
         self.active_sessions: Dict[str, GameSession] = {}
         self.websocket_connections: Dict[str, WebSocket] = {}
+        self.session_registry = SessionRegistry(
+            SessionRegistryConfig(
+                memory_budget_bytes=self.config.session_memory_budget_mb * 1024 * 1024,
+                idle_timeout=self.config.session_idle_timeout
+            ),
+            on_evict=self._handle_session_evicted
+        )
         
         # Performance tracking
         self.frame_count = 0
@@ -113,6 +126,7 @@ class GameEngine:
         
         # Register systems
         self._register_systems()
+        self._register_session_subsystems()
         self._setup_event_handlers()
         
         logger.info("Game engine initialized", config=self.config.__dict__)
@@ -126,6 +140,34 @@ class GameEngine:
         
         logger.info("Game systems registered", system_count=len(self.ecs.system_manager._systems))
     
+    def _register_session_subsystems(self):
+        """Register every owner of per-session state with the session registry"""
+        registry = self.session_registry
+        registry.register_subsystem(
+            "battlefield", self.battlefield.cleanup_session,
+            state_getter=self.battlefield.get_session_snapshot,
+            restore=self.battlefield.restore_session
+        )
+        registry.register_subsystem(
+            "game_state", self.game_state.cleanup_session,
+            state_getter=self.game_state.sessions.get,
+            restore=self.game_state.restore_session
+        )
+        registry.register_subsystem(
+            "turn_system", self.turn_system.cleanup_session,
+            state_getter=self.turn_system.session_turns.get,
+            restore=self.turn_system.restore_session
+        )
+        # Transient state: rebuilt from events after a page-in
+        registry.register_subsystem("ui_manager", self.ui_manager.cleanup_session)
+        registry.register_subsystem("notifications", self.notifications.cleanup_session)
+        # Not rebuildable after a page-in (AI units are only registered on spawn,
+        # clients stay connected), so these are released on eviction only
+        registry.register_subsystem("ai_integration", self.ai_integration.cleanup_session,
+                                    evict_only=True)
+        registry.register_subsystem("websockets", self._release_session_connections,
+                                    evict_only=True)
+    
     def _setup_event_handlers(self):
         """Setup event handlers"""
         self.event_bus.subscribe(EventType.GAME_START, self._handle_game_start)
@@ -152,6 +194,8 @@ class GameEngine:
         )
         
         self.active_sessions[session_id] = session
+        self.session_registry.track(session_id)
+        self.session_registry.start()
         
         # Initialize game state for session
         await self.game_state.initialize_session(session_id, session_config)
@@ -174,6 +218,7 @@ class GameEngine:
             raise ValueError(f"Session {session_id} not found")
         
         session = self.active_sessions[session_id]
+        await self.session_registry.ensure_resident(session_id)
         
         # Transition to game start
         await self.game_state.set_phase(session_id, GamePhase.ACTIVE)
@@ -207,8 +252,14 @@ class GameEngine:
             while session.current_phase == GamePhase.ACTIVE:
                 frame_start = time.time()
                 
+                # Paged-out sessions are suspended until a player returns
+                if self.session_registry.is_paged_out(session_id):
+                    await asyncio.sleep(self.frame_time_budget)
+                    continue
+                
                 # Update all systems
-                await self._update_systems(session_id)
+                with tracer.span("engine.tick", session_id=session_id, turn=session.turn_number):
+                    await self._update_systems(session_id)
                 
                 # Check victory conditions
                 if await self._check_victory_conditions(session_id):
@@ -221,6 +272,7 @@ class GameEngine:
                 
                 # Frame timing
                 frame_time = time.time() - frame_start
+                metrics.observe_tick(session_id, frame_time)
                 if frame_time < self.frame_time_budget:
                     await asyncio.sleep(self.frame_time_budget - frame_time)
                 
@@ -235,13 +287,16 @@ class GameEngine:
     async def _update_systems(self, session_id: str):
         """Update all game systems"""
         # Update ECS systems
-        await self.ecs.update(session_id)
+        with tracer.span("engine.ecs_update"):
+            await self.ecs.update(session_id)
         
         # Update battlefield state
-        await self.battlefield.update(session_id)
+        with tracer.span("engine.battlefield_update"):
+            await self.battlefield.update(session_id)
         
         # Update game state
-        await self.game_state.update(session_id)
+        with tracer.span("engine.game_state_update"):
+            await self.game_state.update(session_id)
         
         # Calculate delta time for UI updates
         current_time = time.time()
@@ -249,9 +304,10 @@ class GameEngine:
         self._last_ui_update = current_time
         
         # Update UI systems
-        await self.ui_manager.update(delta_time)
-        await self.visual_effects.update(delta_time)
-        await self.notifications.update(delta_time)
+        with tracer.span("engine.ui_update"):
+            await self.ui_manager.update(delta_time)
+            await self.visual_effects.update(delta_time)
+            await self.notifications.update(delta_time)
     
     async def _check_victory_conditions(self, session_id: str) -> bool:
         """Check if victory conditions are met"""
@@ -366,6 +422,7 @@ class GameEngine:
         if session:
             session.turn_number = event.data.get("turn_number", session.turn_number)
             session.last_activity = datetime.now()
+            self.session_registry.touch(session_id)
         
         logger.debug("Turn start", session_id=session_id, turn=session.turn_number if session else None)
     
@@ -377,6 +434,7 @@ class GameEngine:
         session = self.active_sessions.get(event.session_id)
         if session:
             session.last_activity = datetime.now()
+            self.session_registry.touch(event.session_id)
     
     async def _handle_unit_moved(self, event: GameEvent):
         """Handle unit movement event"""
@@ -409,6 +467,7 @@ class GameEngine:
         self.websocket_connections[f"{session_id}_{id(websocket)}"] = websocket
         
         logger.info("WebSocket connected", session_id=session_id)
+        await self.session_registry.ensure_resident(session_id)
         
         # Send current game state
         game_state = await self.game_state.get_state(session_id)
@@ -428,15 +487,21 @@ class GameEngine:
     async def _broadcast_to_session(self, session_id: str, message: Dict[str, Any]):
         """Broadcast message to all clients in session"""
         disconnected = []
+        recipients = 0
+        fanout_start = time.perf_counter()
         
         for conn_key, websocket in self.websocket_connections.items():
             if conn_key.startswith(f"{session_id}_"):
+                recipients += 1
                 try:
                     await websocket.send_json(message)
                 except Exception as e:
                     logger.warning("Failed to send to WebSocket", error=str(e))
                     disconnected.append(conn_key)
         
+        if recipients:
+            metrics.observe_fanout(recipients, time.perf_counter() - fanout_start, len(disconnected))
+        
         # Clean up disconnected websockets
         for conn_key in disconnected:
             del self.websocket_connections[conn_key]
@@ -451,12 +516,29 @@ class GameEngine:
         if player_id not in session.player_ids:
             raise ValueError(f"Player {player_id} not in session")
         
-        # Validate action
-        if not await self._validate_action(session_id, player_id, action):
-            return False
+        await self.session_registry.ensure_resident(session_id)
+        session.last_activity = datetime.now()
         
-        # Execute action through appropriate system
         action_type = action.get("type")
+        action_start = time.perf_counter()
+        result = "error"
+        try:
+            with tracer.span("engine.action", session_id=session_id, turn=session.turn_number,
+                             action_type=action_type, player_id=player_id):
+                # Validate action
+                if not await self._validate_action(session_id, player_id, action):
+                    result = "rejected"
+                    return False
+                
+                success = await self._dispatch_action(session_id, player_id, action_type, action)
+                result = "success" if success else "failed"
+                return success
+        finally:
+            metrics.observe_action(action_type, result, time.perf_counter() - action_start)
+    
+    async def _dispatch_action(self, session_id: str, player_id: str, action_type: str,
+                               action: Dict[str, Any]) -> bool:
+        """Execute action through appropriate system"""
         if action_type == "move":
             return await self.movement_system.execute_move(session_id, action)
         elif action_type == "attack":
@@ -492,6 +574,7 @@ class GameEngine:
             return None
         
         session = self.active_sessions[session_id]
+        await self.session_registry.ensure_resident(session_id)
         game_state = await self.game_state.get_state(session_id)
         battlefield_state = await self.battlefield.get_state(session_id)
         
@@ -505,27 +588,32 @@ class GameEngine:
     async def cleanup_session(self, session_id: str):
         """Clean up a game session"""
         if session_id in self.active_sessions:
-            # Cleanup systems
-            await self.battlefield.cleanup_session(session_id)
-            await self.game_state.cleanup_session(session_id)
-            await self.ui_manager.cleanup_session(session_id)
-            await self.notifications.cleanup_session(session_id)
-            self.turn_system.cleanup_session(session_id)
+            # Every registered subsystem releases its state
+            await self.session_registry.release(session_id)
             
             # Remove session
-            del self.active_sessions[session_id]
-            
-            # Clean up websocket connections
-            disconnected = []
-            for conn_key in self.websocket_connections.keys():
-                if conn_key.startswith(f"{session_id}_"):
-                    disconnected.append(conn_key)
-            
-            for conn_key in disconnected:
-                del self.websocket_connections[conn_key]
+            session = self.active_sessions.pop(session_id)
+            session.current_phase = GamePhase.ENDED
             
             logger.info("Session cleaned up", session_id=session_id)
     
+    def _release_session_connections(self, session_id: str):
+        """Drop WebSocket connections belonging to a session"""
+        disconnected = [
+            conn_key for conn_key in self.websocket_connections
+            if conn_key.startswith(f"{session_id}_")
+        ]
+        
+        for conn_key in disconnected:
+            del self.websocket_connections[conn_key]
+    
+    def _handle_session_evicted(self, session_id: str):
+        """Drop an evicted session; its subsystems were already released"""
+        session = self.active_sessions.pop(session_id, None)
+        if session:
+            session.current_phase = GamePhase.ENDED
+            logger.info("Idle session evicted", session_id=session_id)
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get engine performance statistics"""
         current_time = time.time()
@@ -537,6 +625,9 @@ class GameEngine:
             "frame_count": self.frame_count,
             "active_sessions": len(self.active_sessions),
             "websocket_connections": len(self.websocket_connections),
+            "session_registry": self.session_registry.get_stats(),
+            "stat_cache": DerivedStatCache.get_global_stats(),
+            "tracing": tracer.get_stats(),
             "systems_count": len(self.ecs.systems),
             "entities_count": len(self.ecs.entities),
             "uptime_seconds": elapsed
@@ -653,6 +744,7 @@ class GameEngine:
         # End all active sessions
         for session_id in list(self.active_sessions.keys()):
             await self.cleanup_session(session_id)
+        await self.session_registry.stop()
         
         # Shutdown MCP Gateway if enabled
         if self.mcp_gateway:
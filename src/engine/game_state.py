@@ -592,6 +592,10 @@ class GameStateManager:
             del self.sessions[session_id]
             logger.info("Game session cleaned up", session_id=session_id)
     
+    def restore_session(self, session_id: str, game_state: Dict[str, Any]):
+        """Restore a previously paged-out game state"""
+        self.sessions[session_id] = game_state
+    
     def get_session_count(self) -> int:
         """Get number of active sessions"""
         return len(self.sessions)
@@ -0,0 +1,418 @@
+"""
+Headless Battle Simulator
+
+Runs AI-vs-AI battles directly against CombatSystem, TurnSystem and
+BattlefieldManager with no frame pacing, UI managers or WebSocket
+broadcasting. Battles are seeded and reproducible, and batches are spread
+across a process pool to produce aggregate win-rate and turn statistics
+for tuning difficulty parameters and personalities.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import structlog
+
+from ..core.events import EventBus, GameEvent
+from ..core.ecs import ECSManager, Entity, EntityID
+from ..core.math import GridPosition
+from .battlefield import BattlefieldManager
+from .systems.turn_system import TurnSystem
+from .systems.combat_system import CombatSystem
+from .components.position_component import PositionComponent
+from .components.stats_component import StatsComponent
+from .components.team_component import TeamComponent
+
+logger = structlog.get_logger()
+
+
+# Default AI parameters, same keys as AdaptiveDifficultySystem.difficulty_parameters
+DEFAULT_AI_PARAMETERS = {
+    "ai_aggression": 0.5,
+    "ai_intelligence": 0.6,
+    "mistake_tolerance": 0.3
+}
+
+
+@dataclass
+class TeamSetup:
+    """Team composition and AI behaviour for a simulated battle"""
+    team: str
+    unit_count: int = 4
+    ai_parameters: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_AI_PARAMETERS))
+    target_prioritization: str = "balanced"  # PersonalityTraits.target_prioritization
+    attribute_overrides: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class SimulationConfig:
+    """Configuration shared by every battle in a batch"""
+    teams: List[TeamSetup] = field(default_factory=lambda: [
+        TeamSetup(team="team_a"), TeamSetup(team="team_b")
+    ])
+    battlefield_size: Tuple[int, int] = (10, 10)
+    max_turns: int = 50
+
+
+@dataclass
+class BattleResult:
+    """Outcome of a single simulated battle"""
+    seed: int
+    winner: Optional[str]
+    turns: int
+    survivors: Dict[str, int]
+    actions: int
+    events: int
+
+
+@dataclass
+class BatchStatistics:
+    """Aggregate statistics over a batch of battles"""
+    battles: int
+    wins: Dict[str, int]
+    draws: int
+    win_rates: Dict[str, float]
+    turns_mean: float
+    turns_median: float
+    turns_p90: float
+    turns_min: int
+    turns_max: int
+    average_survivors: Dict[str, float]
+    wall_time: float
+    battles_per_second: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize statistics to dictionary"""
+        return dict(self.__dict__)
+
+
+class HeadlessEventBus(EventBus):
+    """Event bus that dispatches inline instead of queueing, with no history"""
+
+    def __init__(self):
+        super().__init__()
+        self.events_emitted = 0
+
+    async def emit(self, event: GameEvent):
+        """Dispatch an event to subscribers immediately"""
+        self.events_emitted += 1
+        for handler in self.subscribers.get(event.type, ()):
+            await self._call_handler(handler, event)
+
+
+class HeadlessBattle:
+    """Single seeded battle driven without sleeps, UI or broadcasting"""
+
+    def __init__(self, config: SimulationConfig, seed: int):
+        self.config = config
+        self.seed = seed
+        self.session_id = f"sim_{seed}"
+        self.rng = random.Random(seed)
+
+        self.event_bus = HeadlessEventBus()
+        self.ecs = ECSManager()
+        self.battlefield = BattlefieldManager(config.battlefield_size)
+        self.turn_system = TurnSystem(self.ecs, self.event_bus, self.battlefield)
+        self.combat_system = CombatSystem(self.ecs, self.event_bus, self.battlefield)
+
+        self.team_setups = {setup.team: setup for setup in config.teams}
+        self.units_by_team: Dict[str, List[EntityID]] = {setup.team: [] for setup in config.teams}
+        self.entities: Dict[EntityID, Entity] = {}
+        self.actions_taken = 0
+
+    async def run(self) -> BattleResult:
+        """Run the battle to completion and return its result"""
+        self.combat_system.seed(self.seed)
+
+        await self.battlefield.initialize_for_session(self.session_id, self.config.battlefield_size)
+        self._deploy_units()
+
+        teams = [setup.team for setup in self.config.teams]
+        await self.turn_system.initialize_for_session(self.session_id, teams)
+        await self.turn_system.start_turn(self.session_id)
+
+        winner = None
+        while self._current_turn() <= self.config.max_turns:
+            team = self.turn_system.session_turns[self.session_id]["current_player"]
+
+            for entity_id in list(self.units_by_team[team]):
+                if self._is_alive(entity_id):
+                    await self._take_unit_turn(team, entity_id)
+
+            living_teams = self._living_teams()
+            if len(living_teams) <= 1:
+                winner = next(iter(living_teams), None)
+                break
+
+            await self.turn_system.end_turn(self.session_id, team)
+
+        return BattleResult(
+            seed=self.seed,
+            winner=winner,
+            turns=min(self._current_turn(), self.config.max_turns),
+            survivors={
+                team: sum(1 for e in units if self._is_alive(e))
+                for team, units in self.units_by_team.items()
+            },
+            actions=self.actions_taken,
+            events=self.event_bus.events_emitted
+        )
+
+    def _deploy_units(self):
+        """Place each team's units on opposite edges of the battlefield"""
+        width, height = self.config.battlefield_size
+        team_count = len(self.config.teams)
+
+        for team_index, setup in enumerate(self.config.teams):
+            # Spread teams across columns, units along rows
+            column = 0 if team_index == 0 else (width - 1) * team_index // max(1, team_count - 1)
+            rows = self.rng.sample(range(height), min(setup.unit_count, height))
+
+            for row in rows:
+                position = GridPosition(column, row)
+
+                stats = StatsComponent()
+                stats.attributes.update(setup.attribute_overrides)
+                if setup.attribute_overrides:
+                    stats.calculate_derived_stats()
+                    stats.current_hp = stats.max_hp
+                    stats.current_mp = stats.max_mp
+
+                position_component = PositionComponent(
+                    position=position,
+                    max_movement=stats.attributes.get("move_points", 3),
+                    movement_remaining=stats.attributes.get("move_points", 3)
+                )
+                entity = self.ecs.create_entity(stats, position_component, TeamComponent(team=setup.team))
+                entity_id = entity.id
+                self.entities[entity_id] = entity
+
+                self.battlefield.occupy_tile(self.session_id, position, entity_id, setup.team)
+                self.battlefield.bind_position(self.session_id, position_component, setup.team)
+                self.units_by_team[setup.team].append(entity_id)
+
+    async def _take_unit_turn(self, team: str, entity_id: EntityID):
+        """Move and/or attack with one unit according to its team's AI parameters"""
+        setup = self.team_setups[team]
+        params = setup.ai_parameters
+        enemies = [
+            e for other, units in self.units_by_team.items() if other != team
+            for e in units if self._is_alive(e)
+        ]
+        if not enemies:
+            return
+
+        # Occasional mistakes: skip the best option and wander instead
+        if self.rng.random() < params.get("mistake_tolerance", 0.0) * 0.5:
+            await self._move_randomly(entity_id)
+            self.actions_taken += 1
+            return
+
+        if await self._attack_best_target(entity_id, enemies, setup):
+            return
+
+        if self.rng.random() < max(0.1, params.get("ai_aggression", 0.5)):
+            await self._advance_toward(entity_id, self._nearest(entity_id, enemies))
+            await self._attack_best_target(entity_id, enemies, setup)
+
+    async def _attack_best_target(self, entity_id: EntityID, enemies: List[EntityID],
+                                  setup: TeamSetup) -> bool:
+        """Attack the preferred enemy in range, if any"""
+        stats = self._component(entity_id, StatsComponent)
+        position = self._component(entity_id, PositionComponent).position
+        melee_range = stats.attributes.get("melee_range", 1)
+        ranged_range = stats.attributes.get("ranged_range", 3)
+
+        in_range = []
+        for enemy in enemies:
+            distance = position.manhattan_distance(
+                self._component(enemy, PositionComponent).position
+            )
+            if distance <= ranged_range:
+                in_range.append((enemy, distance))
+        if not in_range:
+            return False
+
+        target, distance = self._choose_target(in_range, setup)
+        attack_type = "melee" if distance <= melee_range else "ranged"
+
+        executed = await self.combat_system.execute_attack(self.session_id, {
+            "attacker_id": str(entity_id),
+            "target_id": str(target),
+            "attack_type": attack_type
+        })
+        self.actions_taken += 1
+
+        target_stats = self._component(target, StatsComponent)
+        if target_stats and (target_stats.current_hp <= 0 or not target_stats.alive):
+            target_stats.alive = False
+            self.battlefield.vacate_tile(
+                self.session_id, self._component(target, PositionComponent).position
+            )
+
+        return executed
+
+    def _choose_target(self, in_range: List[Tuple[EntityID, int]],
+                       setup: TeamSetup) -> Tuple[EntityID, int]:
+        """Pick a target; smarter AIs focus fire according to their prioritization"""
+        if self.rng.random() >= setup.ai_parameters.get("ai_intelligence", 0.5):
+            return self.rng.choice(in_range)
+
+        def hp(entry):
+            return self._component(entry[0], StatsComponent).current_hp
+
+        if setup.target_prioritization == "damage":
+            return max(in_range, key=lambda entry: self._component(
+                entry[0], StatsComponent).attributes.get("physical_attack", 0))
+        if setup.target_prioritization == "survival":
+            return min(in_range, key=lambda entry: entry[1])
+        return min(in_range, key=hp)
+
+    async def _advance_toward(self, entity_id: EntityID, target: EntityID):
+        """Move to the reachable tile closest to the target"""
+        position_component = self._component(entity_id, PositionComponent)
+        target_position = self._component(target, PositionComponent).position
+
+        reachable = self.battlefield.get_reachable_tiles(
+            self.session_id, position_component.position, position_component.movement_remaining
+        )
+        best = min(reachable, key=lambda pos: pos.manhattan_distance(target_position))
+        self._relocate(entity_id, position_component, best)
+
+    async def _move_randomly(self, entity_id: EntityID):
+        """Move to a random reachable tile"""
+        position_component = self._component(entity_id, PositionComponent)
+        reachable = self.battlefield.get_reachable_tiles(
+            self.session_id, position_component.position, position_component.movement_remaining
+        )
+        self._relocate(entity_id, position_component, self.rng.choice(reachable))
+
+    def _relocate(self, entity_id: EntityID, position_component: PositionComponent,
+                  destination: GridPosition):
+        """Move a unit on both the battlefield and its position component"""
+        if destination == position_component.position:
+            return
+        team = self._component(entity_id, TeamComponent).team
+        self.battlefield.vacate_tile(self.session_id, position_component.position)
+        self.battlefield.occupy_tile(self.session_id, destination, entity_id, team)
+        position_component.teleport_to(destination)
+        position_component.has_moved = True
+        position_component.movement_remaining = 0
+
+    def _nearest(self, entity_id: EntityID, candidates: List[EntityID]) -> EntityID:
+        """Closest candidate by Manhattan distance"""
+        origin = self._component(entity_id, PositionComponent).position
+        return min(candidates, key=lambda e: origin.manhattan_distance(
+            self._component(e, PositionComponent).position
+        ))
+
+    def _component(self, entity_id: EntityID, component_type):
+        """Read one of a unit's components through its entity"""
+        return self.entities[entity_id].get_component(component_type)
+
+    def _is_alive(self, entity_id: EntityID) -> bool:
+        """Check whether a unit is still alive"""
+        stats = self._component(entity_id, StatsComponent)
+        return bool(stats and stats.alive and stats.current_hp > 0)
+
+    def _living_teams(self) -> set:
+        """Teams with at least one living unit"""
+        return {
+            team for team, units in self.units_by_team.items()
+            if any(self._is_alive(e) for e in units)
+        }
+
+    def _current_turn(self) -> int:
+        """Current turn number from the turn system"""
+        return self.turn_system.session_turns[self.session_id]["current_turn"]
+
+
+def run_battle(config: SimulationConfig, seed: int) -> BattleResult:
+    """Run one battle synchronously"""
+    return asyncio.run(HeadlessBattle(config, seed).run())
+
+
+def _init_worker(log_level: int):
+    """Silence per-turn engine logging inside simulation workers"""
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(log_level))
+
+
+def _run_chunk(config: SimulationConfig, seeds: List[int]) -> List[BattleResult]:
+    """Run a chunk of battles on one event loop"""
+    async def run_all():
+        return [await HeadlessBattle(config, seed).run() for seed in seeds]
+
+    return asyncio.run(run_all())
+
+
+def run_batch(config: SimulationConfig, seeds: List[int], workers: Optional[int] = None,
+              chunk_size: int = 25, log_level: int = logging.WARNING) -> Tuple[List[BattleResult], BatchStatistics]:
+    """
+    Run many seeded battles across a process pool and aggregate the results.
+    
+    Pool workers log at ``log_level``; with ``workers=1`` the battles run in
+    this process and its logging configuration is left alone.
+    """
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+
+    results: List[BattleResult] = []
+    if workers == 1:
+        for chunk in chunks:
+            results.extend(_run_chunk(config, chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(log_level,)) as executor:
+            for chunk_results in executor.map(_run_chunk, [config] * len(chunks), chunks):
+                results.extend(chunk_results)
+
+    stats = aggregate_results(config, results, time.perf_counter() - start)
+    logger.info("Simulation batch complete",
+                battles=stats.battles,
+                win_rates=stats.win_rates,
+                turns_mean=stats.turns_mean,
+                battles_per_second=stats.battles_per_second)
+    return results, stats
+
+
+def aggregate_results(config: SimulationConfig, results: List[BattleResult],
+                      wall_time: float = 0.0) -> BatchStatistics:
+    """Aggregate battle results into batch statistics"""
+    teams = [setup.team for setup in config.teams]
+    battles = len(results)
+    wins = {team: 0 for team in teams}
+    survivors = {team: 0 for team in teams}
+    draws = 0
+
+    for result in results:
+        if result.winner is None:
+            draws += 1
+        else:
+            wins[result.winner] += 1
+        for team, count in result.survivors.items():
+            survivors[team] += count
+
+    turns = sorted(result.turns for result in results) or [0]
+
+    return BatchStatistics(
+        battles=battles,
+        wins=wins,
+        draws=draws,
+        win_rates={team: wins[team] / battles if battles else 0.0 for team in teams},
+        turns_mean=statistics.fmean(turns),
+        turns_median=statistics.median(turns),
+        turns_p90=turns[min(len(turns) - 1, int(len(turns) * 0.9))],
+        turns_min=turns[0],
+        turns_max=turns[-1],
+        average_survivors={team: survivors[team] / battles if battles else 0.0 for team in teams},
+        wall_time=wall_time,
+        battles_per_second=battles / wall_time if wall_time > 0 else 0.0
+    )
@@ -99,6 +99,20 @@ class AIIntegrationManager:
         self.pending_decisions.clear()
         logger.info("AI integration shut down")
     
+    def cleanup_session(self, session_id: str):
+        """Release AI tracking state for a session"""
+        for entity_id in self.ai_units.pop(session_id, set()):
+            self.unit_control_levels.pop(entity_id, None)
+        
+        stale_requests = [
+            request_id for request_id, context in self.pending_decisions.items()
+            if context.get("session_id") == session_id
+        ]
+        for request_id in stale_requests:
+            del self.pending_decisions[request_id]
+        
+        self.last_state_update.pop(session_id, None)
+    
     async def _on_turn_start(self, event: GameEvent):
         """Handle turn start event"""
         session_id = event.session_id
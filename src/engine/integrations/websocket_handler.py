@@ -5,8 +5,9 @@ Handles WebSocket connections for real-time communication
 between clients and the game engine.
 """
 
-import json
+import time
 import asyncio
+from functools import partial
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
@@ -16,6 +17,16 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from ...core.events import EventBus, GameEvent, EventType
 from ..game_engine import GameEngine, GameConfig, GameMode
+from .. import metrics
+from ...core.metrics import metrics_response
+from ...core.utils.tracing import tracer
+from ...core.utils.backpressure import (
+    BackpressurePolicy, InboundRateLimiter, OutboundQueue, RateLimitPolicy
+)
+from ...core.utils.wire_protocol import (
+    DEFAULT_COMPRESSION_THRESHOLD, PROTOCOL_BINARY, ReplayBuffer, WireCodec, decode_message,
+    negotiate_protocol, parse_resume_token
+)
 
 logger = structlog.get_logger()
 
@@ -23,17 +34,57 @@ logger = structlog.get_logger()
 class WebSocketManager:
     """Manages WebSocket connections for game sessions"""
     
-    def __init__(self, game_engine: GameEngine):
+    def __init__(self, game_engine: GameEngine,
+                 backpressure: Optional[BackpressurePolicy] = None,
+                 rate_limits: Optional[RateLimitPolicy] = None):
         self.game_engine = game_engine
         self.connections: Dict[str, List[WebSocket]] = {}  # session_id -> list of websockets
         self.connection_info: Dict[str, Dict[str, Any]] = {}  # connection_id -> info
+        self.codecs: Dict[int, WireCodec] = {}  # id(websocket) -> binary codec
+        self.compression_threshold = DEFAULT_COMPRESSION_THRESHOLD
+        self.replay_buffers: Dict[str, ReplayBuffer] = {}  # session_id -> recent broadcasts
         
-    async def connect(self, websocket: WebSocket, session_id: str, player_id: str = None):
-        """Accept WebSocket connection"""
+        # Each connection has its own outbound queue and writer, so a slow
+        # client never delays broadcasts to the rest of its session
+        self.backpressure = backpressure or BackpressurePolicy()
+        self.rate_limits = rate_limits or RateLimitPolicy()
+        self.outbound: Dict[int, OutboundQueue] = {}  # id(websocket) -> queue
+        self.rate_limiters: Dict[int, InboundRateLimiter] = {}  # id(websocket) -> limiter
+        
+    def _replay_buffer(self, session_id: str) -> ReplayBuffer:
+        buffer = self.replay_buffers.get(session_id)
+        if buffer is None:
+            buffer = self.replay_buffers[session_id] = ReplayBuffer()
+        return buffer
+    
+    async def connect(self, websocket: WebSocket, session_id: str, player_id: str = None,
+                      protocol: Optional[str] = None, resume: Optional[str] = None):
+        """Accept WebSocket connection, negotiate its wire protocol and resume or snapshot"""
         await websocket.accept()
         
         connection_id = f"{session_id}_{id(websocket)}"
         
+        # The acknowledgement is always JSON text; binary frames follow it
+        protocol = negotiate_protocol(protocol)
+        if protocol == PROTOCOL_BINARY:
+            self.codecs[id(websocket)] = WireCodec(self.compression_threshold)
+            await websocket.send_json({
+                "type": "protocol",
+                "data": {
+                    "protocol": protocol,
+                    "compression_threshold": self.compression_threshold
+                }
+            })
+        
+        self.outbound[id(websocket)] = OutboundQueue(
+            partial(self._write, websocket), self.backpressure,
+            on_failure=partial(self._on_send_failure, websocket, session_id)
+        ).start()
+        self.rate_limiters[id(websocket)] = InboundRateLimiter(self.rate_limits)
+        
+        # Replay before joining the session so live broadcasts follow replayed ones
+        resumed = bool(resume) and await self._resume(websocket, session_id, player_id, resume)
+        
         # Add to connections
         if session_id not in self.connections:
             self.connections[session_id] = []
@@ -44,27 +95,27 @@ class WebSocketManager:
             "session_id": session_id,
             "player_id": player_id,
             "connected_at": datetime.now(),
-            "websocket": websocket
+            "websocket": websocket,
+            "protocol": protocol
         }
         
         logger.info("WebSocket connected", 
                    session_id=session_id, 
                    player_id=player_id,
-                   connection_id=connection_id)
+                   connection_id=connection_id,
+                   protocol=protocol)
+        
+        if resumed:
+            return
         
         # Send initial game state and UI data
         try:
-            game_state = await self.game_engine.get_session_state(session_id)
-            if game_state:
-                await websocket.send_json({
-                    "type": "game_state",
-                    "data": game_state
-                })
+            await self._send_game_state(websocket, session_id)
             
             # Send initial UI data
             ui_data = await self.game_engine.get_ui_data(session_id, player_id)
             if ui_data:
-                await websocket.send_json({
+                await self.send(websocket, {
                     "type": "ui_data",
                     "data": ui_data
                 })
@@ -73,10 +124,70 @@ class WebSocketManager:
                         session_id=session_id, 
                         error=str(e))
     
+    async def _resume(self, websocket: WebSocket, session_id: str, player_id: str, resume: str) -> bool:
+        """Replay missed messages for a resume token; False if a snapshot is needed"""
+        buffer = self.replay_buffers.get(session_id)
+        token = parse_resume_token(resume)
+        if buffer is None or token is None or token[0] != buffer.stream_id:
+            return False
+        
+        missed = buffer.since(token[1], player_id)
+        if missed is not None and len(missed) > self.backpressure.max_queue:
+            missed = None  # A snapshot is cheaper than a replay the queue cannot hold
+        if missed is None:
+            logger.info("Resume window expired, sending snapshot",
+                       session_id=session_id, last_seq=token[1], current_seq=buffer.last_seq)
+            return False
+        
+        await self.send(websocket, {
+            "type": "resumed",
+            "data": {
+                "stream": buffer.stream_id,
+                "from_seq": token[1],
+                "to_seq": buffer.last_seq,
+                "replayed": len(missed)
+            }
+        })
+        
+        # Keep replaying until caught up with messages recorded during any sends
+        replayed = 0
+        while missed:
+            for message in missed:
+                await self.send(websocket, message)
+            replayed += len(missed)
+            missed = buffer.since(missed[-1]["seq"], player_id) or []
+        
+        logger.info("WebSocket session resumed", session_id=session_id,
+                   player_id=player_id, replayed=replayed)
+        return True
+    
+    async def _send_game_state(self, websocket: WebSocket, session_id: str):
+        """Send a full game state snapshot with the sequence number it reflects"""
+        game_state = await self.game_engine.get_session_state(session_id)
+        if game_state:
+            buffer = self._replay_buffer(session_id)
+            await self.send(websocket, {
+                "type": "game_state",
+                "data": game_state,
+                "stream": buffer.stream_id,
+                "snapshot_seq": buffer.last_seq
+            })
+    
+    def drop_session(self, session_id: str):
+        """Forget a session's replay buffer once the session is cleaned up"""
+        self.replay_buffers.pop(session_id, None)
+    
     async def disconnect(self, websocket: WebSocket, session_id: str):
         """Handle WebSocket disconnect"""
         connection_id = f"{session_id}_{id(websocket)}"
         
+        # Stop the writer; anything still queued is discarded
+        queue = self.outbound.pop(id(websocket), None)
+        if queue is not None:
+            queue.close()
+            metrics.observe_outbound_discards(queue.coalesced, queue.dropped)
+        self.rate_limiters.pop(id(websocket), None)
+        
         # Remove from connections
         if session_id in self.connections:
             if websocket in self.connections[session_id]:
@@ -88,37 +199,83 @@ class WebSocketManager:
         
         # Remove connection info
         self.connection_info.pop(connection_id, None)
+        self.codecs.pop(id(websocket), None)
         
         logger.info("WebSocket disconnected", 
                    session_id=session_id,
                    connection_id=connection_id)
     
+    async def send(self, websocket: WebSocket, message: Dict[str, Any]) -> bool:
+        """Queue a message for the connection's writer; False if the connection was dropped"""
+        queue = self.outbound.get(id(websocket))
+        if queue is None:
+            await self._write(websocket, message)
+            return True
+        return queue.put(message)
+    
+    async def _write(self, websocket: WebSocket, message: Dict[str, Any]):
+        """Send a message in the connection's negotiated protocol"""
+        codec = self.codecs.get(id(websocket))
+        if codec is not None:
+            await websocket.send_bytes(codec.encode(message))
+        else:
+            await websocket.send_json(message)
+    
+    def _on_send_failure(self, websocket: WebSocket, session_id: str, reason: str):
+        """Disconnect a consumer that fell behind; it can resume on reconnect"""
+        queue = self.outbound.get(id(websocket))
+        logger.warning("Disconnecting slow WebSocket consumer",
+                      session_id=session_id,
+                      reason=reason,
+                      stats=queue.get_stats() if queue is not None else None)
+        metrics.observe_slow_consumer(reason)
+        asyncio.create_task(self._evict(websocket, session_id))
+    
+    async def _evict(self, websocket: WebSocket, session_id: str):
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass  # Connection might already be closed
+        await self.disconnect(websocket, session_id)
+    
+    def decode(self, websocket: WebSocket, raw) -> Dict[str, Any]:
+        """Decode a received text or binary message"""
+        return decode_message(raw, self.codecs.get(id(websocket)))
+    
     async def send_to_session(self, session_id: str, message: Dict[str, Any]):
-        """Send message to all connections in a session"""
+        """Send message to all connections in a session, recorded for resume"""
+        message = self._replay_buffer(session_id).append(message)
         if session_id not in self.connections:
             return
         
         disconnected = []
-        for websocket in self.connections[session_id]:
+        recipients = self.connections[session_id]
+        fanout_start = time.perf_counter()
+        for websocket in list(recipients):
             try:
-                await websocket.send_json(message)
+                if not await self.send(websocket, message):
+                    disconnected.append(websocket)
             except Exception as e:
                 logger.warning("Failed to send message to websocket", 
                              session_id=session_id, 
                              error=str(e))
                 disconnected.append(websocket)
         
-        # Clean up disconnected websockets
+        metrics.observe_fanout(len(recipients), time.perf_counter() - fanout_start, len(disconnected))
+        
+        # Clean up websockets whose direct send raised; queue failures evict themselves
         for websocket in disconnected:
-            await self.disconnect(websocket, session_id)
+            if id(websocket) not in self.outbound:
+                await self.disconnect(websocket, session_id)
     
     async def send_to_player(self, session_id: str, player_id: str, message: Dict[str, Any]):
-        """Send message to specific player in session"""
+        """Send message to specific player in session, recorded for resume"""
+        message = self._replay_buffer(session_id).append(message, player_id)
         for conn_id, info in self.connection_info.items():
             if (info["session_id"] == session_id and 
                 info["player_id"] == player_id):
                 try:
-                    await info["websocket"].send_json(message)
+                    await self.send(info["websocket"], message)
                 except Exception as e:
                     logger.warning("Failed to send message to player", 
                                  session_id=session_id,
@@ -136,6 +293,23 @@ class WebSocketManager:
                     player_id=player_id,
                     type=message_type)
         
+        limiter = self.rate_limiters.get(id(websocket))
+        if limiter is not None and not limiter.allow(message_type):
+            metrics.observe_rate_limited(message_type)
+            if limiter.consecutive_rejections == 1:
+                logger.warning("WebSocket client rate limited",
+                              session_id=session_id,
+                              player_id=player_id,
+                              type=message_type)
+                await self.send(websocket, {
+                    "type": "error",
+                    "data": {
+                        "message": "Rate limit exceeded",
+                        "original_type": message_type
+                    }
+                })
+            return
+        
         try:
             if message_type == "player_action":
                 await self._handle_player_action(session_id, player_id, data)
@@ -162,7 +336,7 @@ class WebSocketManager:
                         error=str(e))
             
             # Send error response
-            await websocket.send_json({
+            await self.send(websocket, {
                 "type": "error",
                 "data": {
                     "message": str(e),
@@ -186,15 +360,11 @@ class WebSocketManager:
     
     async def _handle_game_state_request(self, websocket: WebSocket, session_id: str):
         """Handle game state request"""
-        game_state = await self.game_engine.get_session_state(session_id)
-        await websocket.send_json({
-            "type": "game_state",
-            "data": game_state
-        })
+        await self._send_game_state(websocket, session_id)
     
     async def _handle_ping(self, websocket: WebSocket):
         """Handle ping message"""
-        await websocket.send_json({
+        await self.send(websocket, {
             "type": "pong",
             "timestamp": datetime.now().isoformat()
         })
@@ -202,7 +372,7 @@ class WebSocketManager:
     async def _handle_ui_data_request(self, websocket: WebSocket, session_id: str, player_id: str):
         """Handle UI data request"""
         ui_data = await self.game_engine.get_ui_data(session_id, player_id)
-        await websocket.send_json({
+        await self.send(websocket, {
             "type": "ui_data",
             "data": ui_data
         })
@@ -260,6 +430,11 @@ class WebSocketManager:
         return {
             "total_connections": total_connections,
             "active_sessions": sessions_with_connections,
+            "binary_connections": len(self.codecs),
+            "replay_buffered_messages": sum(len(buffer) for buffer in self.replay_buffers.values()),
+            "outbound_queued": sum(len(queue) for queue in self.outbound.values()),
+            "max_outbound_lag_seconds": round(max((queue.lag() for queue in self.outbound.values()), default=0.0), 3),
+            "rate_limited_messages": sum(limiter.rejected for limiter in self.rate_limiters.values()),
             "connections_by_session": {
                 session_id: len(conns) 
                 for session_id, conns in self.connections.items()
@@ -283,6 +458,9 @@ def create_websocket_app(game_engine: GameEngine) -> FastAPI:
     # WebSocket manager
     ws_manager = WebSocketManager(game_engine)
     
+    # Prometheus gauges and cache ratios read from this engine
+    metrics.bind_engine(game_engine)
+    
     # Set up WebSocket callbacks for UI updates
     async def websocket_callback(session_id: str, message: Dict[str, Any], player_id: str = None):
         """Callback for sending UI updates via WebSocket"""
@@ -295,15 +473,19 @@ def create_websocket_app(game_engine: GameEngine) -> FastAPI:
     # await game_engine.set_websocket_callbacks(websocket_callback)
     
     @app.websocket("/ws/{session_id}")
-    async def websocket_endpoint(websocket: WebSocket, session_id: str, player_id: str = None):
+    async def websocket_endpoint(websocket: WebSocket, session_id: str, player_id: str = None,
+                                 protocol: str = None, resume: str = None):
         """WebSocket endpoint for game sessions"""
-        await ws_manager.connect(websocket, session_id, player_id)
+        await ws_manager.connect(websocket, session_id, player_id, protocol, resume)
         
         try:
             while True:
-                # Receive message
-                data = await websocket.receive_text()
-                message_data = json.loads(data)
+                # Receive message (JSON text or binary frame)
+                received = await websocket.receive()
+                if received["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(received.get("code", 1000))
+                raw = received.get("bytes")
+                message_data = ws_manager.decode(websocket, raw if raw is not None else received.get("text"))
                 
                 # Handle message
                 await ws_manager.handle_message(websocket, session_id, player_id, message_data)
@@ -365,6 +547,7 @@ def create_websocket_app(game_engine: GameEngine) -> FastAPI:
     async def cleanup_session(session_id: str):
         """Clean up session"""
         await game_engine.cleanup_session(session_id)
+        ws_manager.drop_session(session_id)
         return {"status": "success"}
     
     @app.get("/api/sessions/{session_id}/ui")
@@ -413,6 +596,19 @@ def create_websocket_app(game_engine: GameEngine) -> FastAPI:
             }
         }
     
+    @app.get("/api/sessions/{session_id}/trace")
+    async def get_session_trace(session_id: str, turn: Optional[int] = None):
+        """Chrome trace-event JSON of buffered spans for a session (optionally one turn)"""
+        trace = tracer.to_chrome_trace(session_id=session_id, turn=turn)
+        if not any(event["ph"] == "X" for event in trace["traceEvents"]):
+            raise HTTPException(status_code=404, detail="No spans recorded for session")
+        return trace
+    
+    @app.get("/api/metrics")
+    async def get_metrics():
+        """Prometheus metrics"""
+        return metrics_response()
+    
     @app.on_event("startup")
     async def startup_event():
         """Handle application startup"""
@@ -0,0 +1,134 @@
+"""
+Game Engine Metrics
+
+Prometheus histograms, counters and gauges for the game engine, exposed on
+``/api/metrics``.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from ..core.metrics import (
+    LATENCY_BUCKETS, get_or_create, bounded_label, register_cache_source,
+    install_cache_collector, session_labels_enabled
+)
+from ..core.utils.stat_cache import DerivedStatCache
+
+ACTION_TYPES = ("move", "attack", "ability", "end_turn")
+WS_RATE_LIMITED_TYPES = ("player_action", "request_game_state", "request_ui_data", "select_unit", "ping")
+
+ACTION_LATENCY = get_or_create(
+    Histogram, "apex_engine_action_seconds",
+    "Player action processing latency", ["action_type", "result"],
+    buckets=LATENCY_BUCKETS
+)
+TICK_DURATION = get_or_create(
+    Histogram, "apex_engine_tick_seconds",
+    "Per-session game loop tick duration",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.016, 0.025, 0.033, 0.05, 0.1, 0.25)
+)
+SESSION_TICK_DURATION = None  # Created on demand when session labels are enabled
+WS_FANOUT_SECONDS = get_or_create(
+    Histogram, "apex_engine_ws_fanout_seconds",
+    "Time to deliver one message to every WebSocket in a session",
+    buckets=LATENCY_BUCKETS
+)
+WS_FANOUT_RECIPIENTS = get_or_create(
+    Histogram, "apex_engine_ws_fanout_recipients",
+    "WebSocket recipients per broadcast",
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64)
+)
+WS_SEND_FAILURES = get_or_create(
+    Counter, "apex_engine_ws_send_failures",
+    "WebSocket sends that failed and dropped the connection"
+)
+WS_SLOW_CONSUMERS = get_or_create(
+    Counter, "apex_engine_ws_slow_consumer_disconnects",
+    "WebSockets disconnected for falling behind their outbound queue", ["reason"]
+)
+WS_OUTBOUND_DROPPED = get_or_create(
+    Counter, "apex_engine_ws_outbound_dropped",
+    "Queued WebSocket messages coalesced or dropped under backpressure", ["kind"]
+)
+WS_RATE_LIMITED = get_or_create(
+    Counter, "apex_engine_ws_rate_limited",
+    "Inbound WebSocket messages rejected by rate limits", ["message_type"]
+)
+EVENT_QUEUE_DEPTH = get_or_create(
+    Gauge, "apex_engine_event_queue_depth",
+    "Events waiting in the engine event bus queue"
+)
+WS_CONNECTIONS = get_or_create(
+    Gauge, "apex_engine_websocket_connections",
+    "Open WebSocket connections"
+)
+ACTIVE_SESSIONS = get_or_create(
+    Gauge, "apex_engine_active_sessions",
+    "Game sessions held by the engine"
+)
+
+
+def observe_action(action_type: str, result: str, seconds: float):
+    """Record one player action"""
+    ACTION_LATENCY.labels(
+        action_type=bounded_label(action_type, ACTION_TYPES),
+        result=result
+    ).observe(seconds)
+
+
+def observe_tick(session_id: str, seconds: float):
+    """Record one game loop tick"""
+    global SESSION_TICK_DURATION
+    TICK_DURATION.observe(seconds)
+
+    if session_labels_enabled():
+        if SESSION_TICK_DURATION is None:
+            SESSION_TICK_DURATION = get_or_create(
+                Histogram, "apex_engine_session_tick_seconds",
+                "Game loop tick duration per session (opt-in)", ["session_id"],
+                buckets=TICK_DURATION._upper_bounds[:-1]
+            )
+        SESSION_TICK_DURATION.labels(session_id=session_id).observe(seconds)
+
+
+def observe_fanout(recipients: int, seconds: float, failures: int = 0):
+    """Record one WebSocket broadcast"""
+    WS_FANOUT_SECONDS.observe(seconds)
+    WS_FANOUT_RECIPIENTS.observe(recipients)
+    if failures:
+        WS_SEND_FAILURES.inc(failures)
+
+
+def observe_slow_consumer(reason: str):
+    """Record a WebSocket disconnected by backpressure"""
+    WS_SLOW_CONSUMERS.labels(reason=reason).inc()
+
+
+def observe_outbound_discards(coalesced: int, dropped: int):
+    """Record queued messages a closing connection coalesced or dropped"""
+    if coalesced:
+        WS_OUTBOUND_DROPPED.labels(kind="coalesced").inc(coalesced)
+    if dropped:
+        WS_OUTBOUND_DROPPED.labels(kind="dropped").inc(dropped)
+
+
+def observe_rate_limited(message_type: str):
+    """Record one inbound message rejected by rate limits"""
+    WS_RATE_LIMITED.labels(
+        message_type=bounded_label(message_type, WS_RATE_LIMITED_TYPES)
+    ).inc()
+
+
+def bind_engine(engine):
+    """Attach scrape-time gauges and cache sources to an engine instance"""
+    EVENT_QUEUE_DEPTH.set_function(lambda: engine.event_bus.event_queue.qsize())
+    WS_CONNECTIONS.set_function(lambda: len(engine.websocket_connections))
+    ACTIVE_SESSIONS.set_function(lambda: len(engine.active_sessions))
+
+    battlefield = engine.battlefield
+    register_cache_source("pathfinding", lambda: (
+        battlefield.cache_hits, battlefield.pathfinding_calls - battlefield.cache_hits
+    ))
+    register_cache_source("derived_stats", lambda: (
+        DerivedStatCache.totals["hits"], DerivedStatCache.totals["recomputes"]
+    ))
+    install_cache_collector()
@@ -0,0 +1,282 @@
+"""
+Spatial Occupancy Index
+
+Per-session dense occupancy grid with team bitmasks for unit-by-position
+queries. Radius, diamond, line and adjacency queries touch only the tiles
+inside the queried shape, so their cost scales with the area rather than
+with the number of units or the size of the battlefield.
+"""
+
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+import numpy as np
+
+from ..core.ecs import EntityID
+
+EMPTY = -1
+MAX_TEAMS = 32
+
+
+@lru_cache(maxsize=128)
+def diamond_offsets(radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Offsets within Manhattan distance ``radius`` (including the center)"""
+    span = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(span, span, indexing="ij")
+    mask = np.abs(dx) + np.abs(dy) <= radius
+    return dx[mask], dy[mask]
+
+
+@lru_cache(maxsize=128)
+def radius_offsets(radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Offsets within Euclidean distance ``radius`` (including the center)"""
+    reach = int(radius)
+    span = np.arange(-reach, reach + 1)
+    dx, dy = np.meshgrid(span, span, indexing="ij")
+    mask = dx * dx + dy * dy <= radius * radius
+    return dx[mask], dy[mask]
+
+
+@lru_cache(maxsize=4)
+def adjacent_offsets(include_diagonals: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Offsets of the 4 or 8 neighbouring tiles"""
+    if include_diagonals:
+        pairs = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+    else:
+        pairs = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    dx, dy = zip(*pairs)
+    return np.array(dx), np.array(dy)
+
+
+def line_cells(x0: int, y0: int, x1: int, y1: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Cells along a Bresenham line from (x0, y0) to (x1, y1) inclusive"""
+    xs, ys = [], []
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx - dy
+
+    while True:
+        xs.append(x0)
+        ys.append(y0)
+        if x0 == x1 and y0 == y1:
+            break
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x0 += sx
+        if e2 < dx:
+            err += dx
+            y0 += sy
+
+    return np.array(xs), np.array(ys)
+
+
+class SpatialIndex:
+    """Dense occupancy array plus team bitmasks for one battlefield"""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+        # Entity handle per tile (EMPTY when vacant) and team bit per tile
+        self.occupancy = np.full((width, height), EMPTY, dtype=np.int32)
+        self.team_mask = np.zeros((width, height), dtype=np.uint32)
+
+        self._entities: List[Optional[EntityID]] = []
+        self._free_handles: List[int] = []
+        self._handles: Dict[EntityID, int] = {}
+        self._positions: Dict[EntityID, Tuple[int, int]] = {}
+        self._entity_teams: Dict[EntityID, str] = {}
+        self._team_bits: Dict[str, int] = {}
+
+        # Bumped on every occupancy change so range caches can detect moves
+        self.version = 0
+
+    # Maintenance
+
+    def place(self, entity_id: EntityID, x: int, y: int, team: Optional[str] = None) -> bool:
+        """Place (or move) an entity onto a tile; False if out of bounds or taken"""
+        if not self.can_place(entity_id, x, y):
+            return False
+
+        if team is not None:
+            self._entity_teams[entity_id] = team
+        if entity_id in self._positions:
+            self._clear_tile(*self._positions[entity_id])
+
+        handle = self._handles.get(entity_id)
+        if handle is None:
+            handle = self._free_handles.pop() if self._free_handles else len(self._entities)
+            if handle == len(self._entities):
+                self._entities.append(entity_id)
+            else:
+                self._entities[handle] = entity_id
+            self._handles[entity_id] = handle
+
+        self.occupancy[x, y] = handle
+        self.team_mask[x, y] = self._bit_for(self._entity_teams.get(entity_id))
+        self._positions[entity_id] = (x, y)
+        self.version += 1
+        return True
+
+    def move(self, entity_id: EntityID, x: int, y: int) -> bool:
+        """Move a tracked entity; untracked entities are ignored"""
+        if entity_id not in self._positions:
+            return False
+        return self.place(entity_id, x, y)
+
+    def can_place(self, entity_id: EntityID, x: int, y: int) -> bool:
+        """Check whether an entity may stand on a tile (in bounds, vacant or its own)"""
+        if not self.in_bounds(x, y):
+            return False
+        occupant = self.occupancy[x, y]
+        return occupant == EMPTY or self._entities[occupant] == entity_id
+
+    def remove(self, entity_id: EntityID):
+        """Remove an entity from the index"""
+        position = self._positions.pop(entity_id, None)
+        if position:
+            self._clear_tile(*position)
+            self.version += 1
+
+        handle = self._handles.pop(entity_id, None)
+        if handle is not None:
+            self._entities[handle] = None
+            self._free_handles.append(handle)
+        self._entity_teams.pop(entity_id, None)
+
+    def remove_at(self, x: int, y: int) -> Optional[EntityID]:
+        """Remove whichever entity occupies a tile"""
+        entity_id = self.entity_at(x, y)
+        if entity_id is not None:
+            self.remove(entity_id)
+        return entity_id
+
+    def set_team(self, entity_id: EntityID, team: str):
+        """Assign or change an entity's team"""
+        self._entity_teams[entity_id] = team
+        position = self._positions.get(entity_id)
+        if position:
+            self.team_mask[position] = self._bit_for(team)
+
+    # Point lookups
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """Check whether a tile is on the battlefield"""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def entity_at(self, x: int, y: int) -> Optional[EntityID]:
+        """Entity occupying a tile, if any"""
+        if not self.in_bounds(x, y):
+            return None
+        handle = self.occupancy[x, y]
+        return self._entities[handle] if handle != EMPTY else None
+
+    def __contains__(self, entity_id: EntityID) -> bool:
+        """Check whether an entity is on this battlefield"""
+        return entity_id in self._positions
+
+    def position_of(self, entity_id: EntityID) -> Optional[Tuple[int, int]]:
+        """Tile an entity occupies"""
+        return self._positions.get(entity_id)
+
+    def team_of(self, entity_id: EntityID) -> Optional[str]:
+        """Team recorded for an entity"""
+        return self._entity_teams.get(entity_id)
+
+    def placements(self) -> List[Tuple[EntityID, int, int, Optional[str]]]:
+        """(entity, x, y, team) for every tracked entity, enough to rebuild the index"""
+        return [(entity_id, x, y, self._entity_teams.get(entity_id))
+                for entity_id, (x, y) in self._positions.items()]
+
+    # Shape queries
+
+    def query_diamond(self, x: int, y: int, radius: int, **filters) -> List[EntityID]:
+        """Entities within Manhattan distance of a tile"""
+        dx, dy = diamond_offsets(radius)
+        return self._query(x + dx, y + dy, **filters)
+
+    def query_radius(self, x: int, y: int, radius: float, **filters) -> List[EntityID]:
+        """Entities within Euclidean distance of a tile"""
+        dx, dy = radius_offsets(radius)
+        return self._query(x + dx, y + dy, **filters)
+
+    def query_line(self, x0: int, y0: int, x1: int, y1: int, **filters) -> List[EntityID]:
+        """Entities along a Bresenham line, ordered from start to end"""
+        xs, ys = line_cells(x0, y0, x1, y1)
+        return self._query(xs, ys, **filters)
+
+    def query_adjacent(self, x: int, y: int, include_diagonals: bool = True,
+                       **filters) -> List[EntityID]:
+        """Entities on the tiles neighbouring a tile"""
+        dx, dy = adjacent_offsets(include_diagonals)
+        return self._query(x + dx, y + dy, **filters)
+
+    def count_adjacent(self, x: int, y: int, include_diagonals: bool = True, **filters) -> int:
+        """Number of entities neighbouring a tile"""
+        dx, dy = adjacent_offsets(include_diagonals)
+        return int(self._match_mask(x + dx, y + dy, **filters)[0].sum())
+
+    def _query(self, xs: np.ndarray, ys: np.ndarray, **filters) -> List[EntityID]:
+        """Entities on the given cells matching the team filters"""
+        mask, handles = self._match_mask(xs, ys, **filters)
+        entities = self._entities
+        return [entities[handle] for handle in handles[mask]]
+
+    def _match_mask(self, xs: np.ndarray, ys: np.ndarray,
+                    teams: Optional[Iterable[str]] = None,
+                    exclude_teams: Optional[Iterable[str]] = None,
+                    exclude: Optional[EntityID] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Boolean match mask and handles for candidate cells.
+
+        ``teams`` keeps entities on any of the given teams; ``exclude_teams``
+        keeps entities with a known team that is not one of the given teams.
+        """
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs, ys = xs[inside], ys[inside]
+
+        handles = self.occupancy[xs, ys]
+        mask = handles != EMPTY
+
+        if teams is not None:
+            mask &= (self.team_mask[xs, ys] & self._bits_for(teams)) != 0
+        if exclude_teams is not None:
+            team_bits = self.team_mask[xs, ys]
+            mask &= (team_bits != 0) & ((team_bits & self._bits_for(exclude_teams)) == 0)
+        if exclude is not None and exclude in self._handles:
+            mask &= handles != self._handles[exclude]
+
+        return mask, handles
+
+    def _bit_for(self, team: Optional[str]) -> int:
+        """Bit assigned to a team, allocating one on first use"""
+        if team is None:
+            return 0
+        bit = self._team_bits.get(team)
+        if bit is None:
+            if len(self._team_bits) >= MAX_TEAMS:
+                raise ValueError(f"Spatial index supports at most {MAX_TEAMS} teams")
+            bit = 1 << len(self._team_bits)
+            self._team_bits[team] = bit
+        return bit
+
+    def _bits_for(self, teams: Iterable[str]) -> np.uint32:
+        """Combined bitmask for several teams (unknown teams match nothing)"""
+        bits = 0
+        for team in teams:
+            bits |= self._team_bits.get(team, 0)
+        return np.uint32(bits)
+
+    def _clear_tile(self, x: int, y: int):
+        """Mark a tile as vacant"""
+        self.occupancy[x, y] = EMPTY
+        self.team_mask[x, y] = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        return {
+            "size": (self.width, self.height),
+            "tracked_entities": len(self._positions),
+            "teams": list(self._team_bits.keys())
+        }
@@ -0,0 +1,152 @@
+"""
+Batch Combat Resolver
+
+Resolves one attack against many targets in a single NumPy pass. Attacker
+and per-target modifiers are gathered into arrays once, then hit chance,
+critical hits, flanking and defense are computed for every target together.
+The same kernel runs in sampled mode for real attacks and in deterministic
+expected-value mode for previews and AI scoring.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from ...core.ecs import EntityID
+
+
+@dataclass
+class CombatParameters:
+    """Attack-wide scalars shared by every target in a batch"""
+    base_damage: float
+    accuracy: float
+    critical_chance: float
+    critical_multiplier: float = 1.5
+    flanking_bonus: float = 0.25
+    height_bonus: float = 0.1
+    attacker_height: float = 0.0
+    attacker_accuracy_mod: float = 0.0   # Attacker status effects (blind, focused)
+    long_range: Optional[float] = None   # Distance beyond which ranged attacks lose accuracy
+    true_damage: bool = False
+    penetration: float = 0.0
+
+
+@dataclass
+class TargetBatch:
+    """Per-target arrays gathered from the ECS"""
+    target_ids: List[EntityID]
+    defense: np.ndarray
+    height: np.ndarray
+    distance: np.ndarray
+    accuracy_mod: np.ndarray             # Target status effects (dodge_boost, stunned)
+    flanked: np.ndarray
+    damage_scale: np.ndarray             # 1.0 for the primary target, reduced for splash
+
+    def __len__(self) -> int:
+        return len(self.target_ids)
+
+
+@dataclass
+class BatchResolution:
+    """Per-target results of a resolved batch"""
+    target_ids: List[EntityID]
+    hit_chance: np.ndarray
+    hit: np.ndarray
+    critical: np.ndarray
+    damage: np.ndarray                   # Sampled damage, or expected damage in preview mode
+    damage_min: np.ndarray
+    damage_max: np.ndarray
+    damage_critical: np.ndarray
+
+    def damage_by_target(self) -> Dict[EntityID, float]:
+        """Non-zero damage keyed by target"""
+        return {
+            target_id: float(damage)
+            for target_id, damage in zip(self.target_ids, self.damage)
+            if damage > 0
+        }
+
+    def to_dict(self, index: int = 0) -> Dict[str, Any]:
+        """Preview summary for one target"""
+        return {
+            "accuracy": round(float(self.hit_chance[index]), 3),
+            "expected_damage": round(float(self.damage[index]), 1),
+            "damage_range": {
+                "min": round(float(self.damage_min[index]), 1),
+                "max": round(float(self.damage_max[index]), 1),
+                "critical": round(float(self.damage_critical[index]), 1)
+            }
+        }
+
+
+def build_target_batch(target_ids: List[EntityID], defense, height, distance,
+                       accuracy_mod, flanked, damage_scale) -> TargetBatch:
+    """Pack gathered per-target values into arrays"""
+    return TargetBatch(
+        target_ids=list(target_ids),
+        defense=np.asarray(defense, dtype=np.float64),
+        height=np.asarray(height, dtype=np.float64),
+        distance=np.asarray(distance, dtype=np.float64),
+        accuracy_mod=np.asarray(accuracy_mod, dtype=np.float64),
+        flanked=np.asarray(flanked, dtype=bool),
+        damage_scale=np.asarray(damage_scale, dtype=np.float64)
+    )
+
+
+def resolve_batch(params: CombatParameters, batch: TargetBatch,
+                  rng: Optional[np.random.Generator] = None,
+                  expected: bool = False) -> BatchResolution:
+    """Resolve an attack against every target in the batch.
+
+    With ``expected`` set no randomness is used: ``hit`` is the hit chance
+    rounded at 0.5, ``critical`` is all False and ``damage`` is the
+    expected damage including miss chance, crit chance and variance.
+    """
+    # Hit chance
+    hit_chance = params.accuracy + params.attacker_accuracy_mod + batch.accuracy_mod
+    hit_chance = hit_chance + np.where(params.attacker_height > batch.height, params.height_bonus, 0.0)
+    if params.long_range is not None:
+        hit_chance = hit_chance - np.where(batch.distance > params.long_range, 0.1, 0.0)
+    hit_chance = np.clip(hit_chance, 0.05, 0.95)
+
+    # Damage before variance and crits; flanked targets take more and defend less
+    base = params.base_damage * batch.damage_scale
+    base = base * np.where(batch.flanked, 1.0 + params.flanking_bonus, 1.0)
+
+    if params.true_damage:
+        multiplier = np.ones(len(batch))
+    else:
+        defense = batch.defense * np.where(batch.flanked, 0.8, 1.0) * (1.0 - params.penetration)
+        # Hybrid formula from DamageInstance: reduction plus 10% guaranteed damage
+        multiplier = 100.0 / (100.0 + defense) + 0.1
+
+    damage_min = base * 0.9 * multiplier
+    damage_max = base * 1.1 * multiplier
+    damage_critical = damage_max * params.critical_multiplier
+
+    if expected:
+        crit_factor = 1.0 + params.critical_chance * (params.critical_multiplier - 1.0)
+        hit = hit_chance >= 0.5
+        critical = np.zeros(len(batch), dtype=bool)
+        damage = hit_chance * base * multiplier * crit_factor
+    else:
+        rng = rng if rng is not None else np.random.default_rng()
+        hit_roll, crit_roll, variance_roll = rng.random((3, len(batch)))
+        hit = hit_roll <= hit_chance
+        critical = hit & (crit_roll <= params.critical_chance)
+        variance = 0.9 + 0.2 * variance_roll
+        damage = base * variance * multiplier
+        damage = np.where(critical, damage * params.critical_multiplier, damage)
+        damage = np.where(hit, damage, 0.0)
+
+    return BatchResolution(
+        target_ids=batch.target_ids,
+        hit_chance=hit_chance,
+        hit=hit,
+        critical=critical,
+        damage=damage,
+        damage_min=damage_min,
+        damage_max=damage_max,
+        damage_critical=damage_critical
+    )
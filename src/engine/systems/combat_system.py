@@ -7,21 +7,25 @@ ability usage, and combat resolution for tactical RPG gameplay.
 
 import asyncio
 import math
-import random
 from typing import Dict, Any, List, Optional, Tuple, Set, Type
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
 import structlog
 
 from ...core.ecs import System, EntityID, ECSManager, BaseComponent, Entity
 from ...core.events import EventBus, GameEvent, EventType
 from ...core.math import GridPosition, clamp
+from ...core.utils.tracing import tracer
 from ..components.stats_component import StatsComponent
 from ..components.position_component import PositionComponent
 from ..components.team_component import TeamComponent
 from ..components.equipment_component import EquipmentComponent
 from ..components.status_effects_component import StatusEffectsComponent
+from .combat_resolver import (
+    CombatParameters, TargetBatch, BatchResolution, build_target_batch, resolve_batch
+)
 
 logger = structlog.get_logger()
 
@@ -105,15 +109,17 @@ class CombatOutcome:
     effects_applied: List[str] = field(default_factory=list)
     mp_consumed: int = 0
     experience_gained: int = 0
+    damage_by_target: Dict[EntityID, float] = field(default_factory=dict)
 
 
 class CombatSystem(System):
     """Main combat system"""
     
-    def __init__(self, ecs: ECSManager, event_bus: EventBus):
+    def __init__(self, ecs: ECSManager, event_bus: EventBus, battlefield=None):
         super().__init__()
         self.ecs = ecs
         self.event_bus = event_bus
+        self.battlefield = battlefield  # Provides per-session spatial indexes
         self.execution_order = 30  # After movement, before AI
         
         # Combat configuration
@@ -122,6 +128,10 @@ class CombatSystem(System):
         self.critical_damage_multiplier = 1.5
         self.height_advantage_bonus = 0.1
         self.flanking_damage_bonus = 0.25
+        self.area_damage_scale = 0.7  # Splash damage relative to the primary target
+        
+        # Combat rolls (seed for reproducible battles)
+        self.rng = np.random.default_rng()
         
         # Status effect durations
         self.status_effect_durations = {
@@ -154,6 +164,10 @@ class CombatSystem(System):
         
         logger.info("Combat system initialized")
     
+    def seed(self, seed: Optional[int]):
+        """Reseed the combat random generator"""
+        self.rng = np.random.default_rng(seed)
+    
     def get_required_components(self) -> Set[Type[BaseComponent]]:
         """Return required components for this system"""
         return {StatsComponent, PositionComponent, TeamComponent}
@@ -164,6 +178,20 @@ class CombatSystem(System):
         # The actual combat logic is handled separately by session-specific methods
         pass
     
+    def get_entities_with_components(self, session_id: str,
+                                     *component_types: Type[BaseComponent]) -> List[EntityID]:
+        """
+        IDs of the session's entities that have all the given components.
+        
+        A session's entities are those on its battlefield's spatial index;
+        without a battlefield attached every matching entity is returned.
+        """
+        entities = self.ecs.get_entities_with_components(*component_types)
+        index = self._get_spatial_index(session_id)
+        if index is None:
+            return [entity.id for entity in entities]
+        return [entity.id for entity in entities if entity.id in index]
+    
     async def update_for_session(self, session_id: str, delta_time: float):
         """Update combat system (process status effects)"""
         entities_with_status = self.get_entities_with_components(
@@ -346,137 +374,113 @@ class CombatSystem(System):
             mp_consumed=action.mp_cost
         )
         
-        # Calculate accuracy modifiers
-        final_accuracy = await self._calculate_final_accuracy(session_id, action)
-        
-        # Roll for hit
-        hit_roll = random.random()
-        if hit_roll > final_accuracy:
-            outcome.result = CombatResult.MISS
-            return outcome
-        
-        # Hit! Now calculate damage
-        outcome.result = CombatResult.HIT
-        outcome.targets_hit.append(action.target)
-        
-        # Roll for critical
-        crit_roll = random.random()
-        is_critical = crit_roll <= action.critical_chance
+        targets = [action.target]
+        if action.area_effect:
+            targets.extend(await self._get_area_targets(
+                session_id, action.target, action.area_radius
+            ))
         
-        if is_critical:
-            outcome.result = CombatResult.CRITICAL
+        resolution = await self._resolve_targets(session_id, action, targets)
         
-        # Calculate damage
-        damage_dealt = await self._calculate_damage(
-            session_id, action, is_critical
-        )
-        
-        outcome.damage_dealt = damage_dealt
+        # The primary target decides whether the attack lands at all
+        if not resolution.hit[0]:
+            return outcome
         
-        # Handle area effects
-        if action.area_effect:
-            additional_targets = await self._get_area_targets(
-                session_id, action.target, action.area_radius
-            )
-            
-            for target in additional_targets:
-                if target != action.target:
-                    area_damage = damage_dealt * 0.7  # Reduced area damage
-                    outcome.targets_hit.append(target)
-                    # Apply area damage (simplified)
+        outcome.result = CombatResult.CRITICAL if resolution.critical[0] else CombatResult.HIT
+        outcome.damage_dealt = float(resolution.damage[0])
+        outcome.targets_hit = [
+            target_id for target_id, hit in zip(resolution.target_ids, resolution.hit) if hit
+        ]
+        outcome.damage_by_target = resolution.damage_by_target()
         
         return outcome
     
-    async def _calculate_final_accuracy(self, session_id: str, action: CombatAction) -> float:
-        """Calculate final accuracy with all modifiers"""
-        base_accuracy = action.accuracy
-        
-        # Get attacker and target positions
+    async def _resolve_targets(self, session_id: str, action: CombatAction,
+                               targets: List[EntityID], expected: bool = False,
+                               splash: bool = True) -> BatchResolution:
+        """Gather attacker and target modifiers and resolve them in one batch"""
+        with tracer.span("combat.resolve", session_id=session_id,
+                         targets=len(targets), expected=expected):
+            params, batch = await self._gather_batch(session_id, action, targets, splash)
+            return resolve_batch(params, batch, rng=self.rng, expected=expected)
+    
+    async def _gather_batch(self, session_id: str, action: CombatAction,
+                            targets: List[EntityID],
+                            splash: bool = True) -> Tuple[CombatParameters, TargetBatch]:
+        """Collect per-target stats into arrays (one ECS pass per target)"""
         attacker_pos = self.ecs.get_component(action.attacker, PositionComponent)
-        target_pos = self.ecs.get_component(action.target, PositionComponent)
-        
-        if not attacker_pos or not target_pos:
-            return base_accuracy
-        
-        # Height advantage bonus
-        height_diff = attacker_pos.height - target_pos.height
-        if height_diff > 0:
-            base_accuracy += self.height_advantage_bonus
-        
-        # Range penalty for ranged attacks
-        if action.action_type == AttackType.RANGED:
-            distance = attacker_pos.position.manhattan_distance(target_pos.position)
-            if distance > action.range_value * 0.7:  # Long range penalty
-                base_accuracy -= 0.1
-        
-        # Status effect modifiers
         attacker_status = self.ecs.get_component(action.attacker, StatusEffectsComponent)
+        
+        attacker_mod = 0.0
         if attacker_status:
             if "blind" in attacker_status.active_effects:
-                base_accuracy -= 0.3
+                attacker_mod = -0.3
             elif "focused" in attacker_status.active_effects:
-                base_accuracy += 0.15
+                attacker_mod = 0.15
+        
+        attacker_height = attacker_pos.height if attacker_pos else 0.0
+        params = CombatParameters(
+            base_damage=action.base_damage,
+            accuracy=action.accuracy,
+            critical_chance=action.critical_chance,
+            critical_multiplier=self.critical_damage_multiplier,
+            flanking_bonus=self.flanking_damage_bonus,
+            height_bonus=self.height_advantage_bonus,
+            attacker_height=attacker_height,
+            attacker_accuracy_mod=attacker_mod,
+            long_range=action.range_value * 0.7 if action.action_type == AttackType.RANGED else None,
+            true_damage=action.damage_type == DamageType.TRUE
+        )
         
-        target_status = self.ecs.get_component(action.target, StatusEffectsComponent)
-        if target_status:
-            if "dodge_boost" in target_status.active_effects:
-                base_accuracy -= 0.2
-            elif "stunned" in target_status.active_effects:
-                base_accuracy += 0.25
+        defense, height, distance, accuracy_mod, flanked, scale = [], [], [], [], [], []
+        for target_id in targets:
+            defense.append(self._get_defense(target_id, action.damage_type))
+            
+            target_pos = self.ecs.get_component(target_id, PositionComponent)
+            if attacker_pos and target_pos:
+                height.append(target_pos.height)
+                distance.append(attacker_pos.position.manhattan_distance(target_pos.position))
+            else:
+                height.append(attacker_height)
+                distance.append(0)
+            
+            target_mod = 0.0
+            target_status = self.ecs.get_component(target_id, StatusEffectsComponent)
+            if target_status:
+                if "dodge_boost" in target_status.active_effects:
+                    target_mod = -0.2
+                elif "stunned" in target_status.active_effects:
+                    target_mod = 0.25
+            accuracy_mod.append(target_mod)
+            
+            flanked.append(await self._check_flanking(session_id, action.attacker, target_id))
+            is_splash = splash and target_id != action.target
+            scale.append(self.area_damage_scale if is_splash else 1.0)
         
-        return clamp(base_accuracy, 0.05, 0.95)
+        return params, build_target_batch(targets, defense, height, distance,
+                                          accuracy_mod, flanked, scale)
     
-    async def _calculate_damage(self, session_id: str, action: CombatAction, 
-                               is_critical: bool) -> float:
-        """Calculate final damage"""
-        base_damage = action.base_damage
-        
-        # Critical hit multiplier
-        if is_critical:
-            base_damage *= self.critical_damage_multiplier
+    def _get_defense(self, target_id: EntityID, damage_type: DamageType) -> float:
+        """Target defense against a damage type, including equipment"""
+        if damage_type == DamageType.TRUE:
+            return 0.0
         
-        # Damage variance (±10%)
-        variance = random.uniform(0.9, 1.1)
-        base_damage *= variance
-        
-        # Get target defense
-        target_stats = self.ecs.get_component(action.target, StatsComponent)
+        target_stats = self.ecs.get_component(target_id, StatsComponent)
         if not target_stats:
-            return base_damage
+            return 0.0
         
-        # Select appropriate defense
-        if action.damage_type == DamageType.PHYSICAL:
+        if damage_type == DamageType.PHYSICAL:
             defense = target_stats.attributes.get("physical_defense", 0)
-        elif action.damage_type == DamageType.MAGICAL:
+        elif damage_type == DamageType.MAGICAL:
             defense = target_stats.attributes.get("magical_defense", 0)
-        elif action.damage_type == DamageType.SPIRITUAL:
+        else:
             defense = target_stats.attributes.get("spiritual_defense", 0)
-        else:  # TRUE damage
-            defense = 0
         
-        # Apply equipment defense bonuses
-        target_equipment = self.ecs.get_component(action.target, EquipmentComponent)
+        target_equipment = self.ecs.get_component(target_id, EquipmentComponent)
         if target_equipment:
-            defense += target_equipment.get_defense_bonus(action.damage_type)
-        
-        # Check for flanking
-        is_flanking = await self._check_flanking(session_id, action.attacker, action.target)
-        if is_flanking:
-            base_damage *= (1.0 + self.flanking_damage_bonus)
-            defense *= 0.8  # Reduced defense when flanked
-        
-        # Create damage instance and calculate final damage
-        damage_instance = DamageInstance(
-            amount=base_damage,
-            damage_type=action.damage_type,
-            source_entity=action.attacker,
-            target_entity=action.target,
-            attack_type=action.action_type,
-            is_critical=is_critical,
-            penetration=0.0  # Could be modified by abilities/equipment
-        )
+            defense += target_equipment.get_defense_bonus(damage_type)
         
-        return damage_instance.calculate_final_damage(defense)
+        return defense
     
     async def _check_flanking(self, session_id: str, attacker_id: EntityID, 
                              target_id: EntityID) -> bool:
@@ -490,24 +494,22 @@ class CombatSystem(System):
         if not attacker_pos or not target_pos:
             return False
         
-        # Count enemies adjacent to target
-        adjacent_enemies = 0
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                check_pos = GridPosition(
-                    target_pos.position.x + dx,
-                    target_pos.position.y + dy
+        index = self._get_spatial_index(session_id)
+        if index is not None and index.position_of(target_id) is not None:
+            target_team = index.team_of(target_id)
+            if target_team is not None:
+                # Enemies of the target on any of its 8 neighbouring tiles
+                adjacent_enemies = index.count_adjacent(
+                    target_pos.position.x, target_pos.position.y,
+                    exclude_teams=[target_team]
                 )
-                
-                # Check if there's an enemy at this position
-                # This would need battlefield integration to check occupancy
-                # For now, simplified check
-                if (check_pos.x == attacker_pos.position.x and 
-                    check_pos.y == attacker_pos.position.y):
-                    adjacent_enemies += 1
+                return adjacent_enemies >= 2
+        
+        # Without occupancy data only the attacker itself can be counted
+        adjacent_enemies = 0
+        if (abs(attacker_pos.position.x - target_pos.position.x) <= 1 and
+                abs(attacker_pos.position.y - target_pos.position.y) <= 1):
+            adjacent_enemies += 1
         
         # Flanking if surrounded by multiple enemies
         return adjacent_enemies >= 2
@@ -521,6 +523,14 @@ class CombatSystem(System):
         if not center_pos:
             return targets
         
+        index = self._get_spatial_index(session_id)
+        if index is not None and index.position_of(center_target) is not None:
+            # Only the tiles inside the blast diamond are inspected
+            return index.query_diamond(
+                center_pos.position.x, center_pos.position.y, radius,
+                exclude=center_target
+            )
+        
         # Get all entities with position components
         entities_with_pos = self.get_entities_with_components(session_id, PositionComponent)
         
@@ -536,6 +546,12 @@ class CombatSystem(System):
         
         return targets
     
+    def _get_spatial_index(self, session_id: str):
+        """Spatial index for a session, if a battlefield is attached"""
+        if self.battlefield is None:
+            return None
+        return self.battlefield.get_spatial_index(session_id)
+    
     async def _apply_combat_outcome(self, session_id: str, outcome: CombatOutcome):
         """Apply the results of combat"""
         # Consume MP from attacker
@@ -548,10 +564,12 @@ class CombatSystem(System):
         for target_id in outcome.targets_hit:
             target_stats = self.ecs.get_component(target_id, StatsComponent)
             if target_stats:
-                # Calculate damage to this specific target
-                damage = outcome.damage_dealt
-                if target_id != outcome.action.target:
-                    damage *= 0.7  # Reduced area damage
+                # Damage resolved for this specific target
+                damage = outcome.damage_by_target.get(target_id)
+                if damage is None:
+                    damage = outcome.damage_dealt
+                    if target_id != outcome.action.target:
+                        damage *= self.area_damage_scale
                 
                 # Apply damage
                 target_stats.current_hp = max(0, target_stats.current_hp - damage)
@@ -670,39 +688,24 @@ class CombatSystem(System):
             if not action:
                 return {"error": "Invalid combat action"}
             
-            # Calculate expected damage range
-            min_damage = action.base_damage * 0.9
-            max_damage = action.base_damage * 1.1
-            crit_damage = max_damage * self.critical_damage_multiplier
-            
-            # Get target defense for damage calculation
-            target_stats = self.ecs.get_component(target_id, StatsComponent)
-            if target_stats:
-                if action.damage_type == DamageType.PHYSICAL:
-                    defense = target_stats.attributes.get("physical_defense", 0)
-                elif action.damage_type == DamageType.MAGICAL:
-                    defense = target_stats.attributes.get("magical_defense", 0)
-                else:
-                    defense = target_stats.attributes.get("spiritual_defense", 0)
-                
-                # Apply defense formula
-                min_final = (min_damage * (100 / (100 + defense))) + (min_damage * 0.1)
-                max_final = (max_damage * (100 / (100 + defense))) + (max_damage * 0.1)
-                crit_final = (crit_damage * (100 / (100 + defense))) + (crit_damage * 0.1)
-            else:
-                min_final = min_damage
-                max_final = max_damage
-                crit_final = crit_damage
+            targets = [target_id]
+            if action.area_effect:
+                targets.extend(await self._get_area_targets(
+                    session_id, target_id, action.area_radius
+                ))
             
-            accuracy = await self._calculate_final_accuracy(session_id, action)
+            # Expected-value pass: no rolls, same kernel as real attacks
+            resolution = await self._resolve_targets(session_id, action, targets, expected=True)
+            preview = resolution.to_dict(0)
             
             return {
-                "accuracy": accuracy,
+                "accuracy": preview["accuracy"],
                 "critical_chance": action.critical_chance,
-                "damage_range": {
-                    "min": round(min_final, 1),
-                    "max": round(max_final, 1),
-                    "critical": round(crit_final, 1)
+                "damage_range": preview["damage_range"],
+                "expected_damage": preview["expected_damage"],
+                "area_expected_damage": {
+                    str(entity_id): round(float(damage), 1)
+                    for entity_id, damage in zip(resolution.target_ids[1:], resolution.damage[1:])
                 },
                 "mp_cost": action.mp_cost,
                 "can_execute": await self._validate_attack(session_id, attacker_id, target_id, attack_type)
@@ -712,6 +715,28 @@ class CombatSystem(System):
             logger.error("Combat preview failed", error=str(e))
             return {"error": "Preview calculation failed"}
     
+    async def score_targets(self, session_id: str, attacker_id: EntityID,
+                            target_ids: List[EntityID],
+                            attack_type: AttackType = AttackType.MELEE) -> Dict[EntityID, float]:
+        """Expected damage against each candidate target (for AI scoring)"""
+        if not target_ids:
+            return {}
+        
+        action = await self._create_combat_action(
+            session_id, attacker_id, target_ids[0], attack_type, None
+        )
+        if not action:
+            return {}
+        
+        # Every candidate is scored as if it were the primary target
+        resolution = await self._resolve_targets(
+            session_id, action, target_ids, expected=True, splash=False
+        )
+        return {
+            target_id: float(damage)
+            for target_id, damage in zip(target_ids, resolution.damage)
+        }
+    
     def get_combat_stats(self) -> Dict[str, Any]:
         """Get combat system statistics"""
         return {
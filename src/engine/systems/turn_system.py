@@ -24,10 +24,11 @@ logger = structlog.get_logger()
 class TurnSystem(System):
     """System for managing turn-based gameplay"""
     
-    def __init__(self, ecs: ECSManager, event_bus: EventBus):
+    def __init__(self, ecs: ECSManager, event_bus: EventBus, battlefield=None):
         super().__init__()
         self.ecs = ecs
         self.event_bus = event_bus
+        self.battlefield = battlefield  # Provides per-session spatial indexes
         self.execution_order = 10  # Early in update cycle
         
         # Turn state per session
@@ -49,6 +50,26 @@ class TurnSystem(System):
         # The actual turn logic is handled separately by session-specific methods
         pass
     
+    def get_entities_with_components(self, session_id: str,
+                                     *component_types: Type[BaseComponent]) -> List[EntityID]:
+        """
+        IDs of the session's entities that have all the given components.
+        
+        A session's entities are those on its battlefield's spatial index;
+        without a battlefield attached every matching entity is returned.
+        """
+        entities = self.ecs.get_entities_with_components(*component_types)
+        index = self._get_spatial_index(session_id)
+        if index is None:
+            return [entity.id for entity in entities]
+        return [entity.id for entity in entities if entity.id in index]
+    
+    def _get_spatial_index(self, session_id: str):
+        """Spatial index for a session, if a battlefield is attached"""
+        if self.battlefield is None:
+            return None
+        return self.battlefield.get_spatial_index(session_id)
+    
     async def update_for_session(self, session_id: str, delta_time: float):
         """Update turn system for a specific session"""
         if session_id not in self.session_turns:
@@ -462,6 +483,10 @@ class TurnSystem(System):
             del self.session_turns[session_id]
             logger.info("Turn system session cleaned up", session_id=session_id)
     
+    def restore_session(self, session_id: str, turn_data: Dict[str, Any]):
+        """Restore previously paged-out turn state"""
+        self.session_turns[session_id] = turn_data
+    
     def get_system_stats(self) -> Dict[str, Any]:
         """Get turn system statistics"""
         return {
@@ -3,11 +3,16 @@ Game UI Manager
 
 Real-time UI management system that provides WebSocket-based UI updates
 and visual feedback for connected players.
+
+UI updates are buffered per session and flushed as one message per engine
+step, or after a short deadline when no step comes. Updates that supersede
+earlier ones (battlefield snapshots, turn indicators, a highlight layer's
+mask) replace them in the buffer.
 """
 
 import asyncio
 import json
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, Hashable, List, Optional, Set
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass, field
@@ -16,6 +21,7 @@ import structlog
 
 from ...core.events import EventBus, GameEvent, EventType
 from ...core.ecs import ECSManager, EntityID
+from ...core.math.reachability import TileMask
 from ..components.stats_component import StatsComponent
 from ..components.position_component import PositionComponent
 from ..components.team_component import TeamComponent
@@ -84,6 +90,7 @@ class UIState:
     """Current UI state for a session"""
     selected_unit: Optional[EntityID] = None
     highlighted_tiles: Dict[str, UIHighlight] = field(default_factory=dict)
+    range_masks: Dict[HighlightType, TileMask] = field(default_factory=dict)
     floating_texts: List[FloatingText] = field(default_factory=list)
     available_actions: List[Dict[str, Any]] = field(default_factory=list)
     turn_order: List[str] = field(default_factory=list)
@@ -95,9 +102,10 @@ class UIState:
 class GameUIManager:
     """Manages real-time UI updates and visual feedback"""
     
-    def __init__(self, ecs: ECSManager, event_bus: EventBus):
+    def __init__(self, ecs: ECSManager, event_bus: EventBus, battlefield=None):
         self.ecs = ecs
         self.event_bus = event_bus
+        self.battlefield = battlefield  # BattlefieldManager, for terrain-aware ranges
         
         # UI state per session
         self.session_ui_states: Dict[str, UIState] = {}
@@ -105,8 +113,19 @@ class GameUIManager:
         # WebSocket message callback
         self.websocket_callback: Optional[callable] = None
         
+        # Pending updates per session, keyed for merging, flushed once per step
+        self.flush_deadline = 0.05  # seconds
+        self._pending_updates: Dict[str, Dict[Hashable, Dict[str, Any]]] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        self._update_sequence = 0
+        
         # Performance tracking
         self.ui_updates_sent = 0
+        self.ui_updates_queued = 0
+        self.ui_updates_merged = 0
+        self.ui_messages_sent = 0
+        self.ui_messages_coalesced = 0  # updates that rode in another update's message
+        self.ui_updates_failed = 0
         self.last_cleanup_time = datetime.now()
         
         # Subscribe to game events
@@ -142,6 +161,11 @@ class GameUIManager:
     
     async def cleanup_session(self, session_id: str):
         """Clean up UI state for a session"""
+        self._pending_updates.pop(session_id, None)
+        flush_task = self._flush_tasks.pop(session_id, None)
+        if flush_task:
+            flush_task.cancel()
+        
         if session_id in self.session_ui_states:
             del self.session_ui_states[session_id]
             logger.info("UI state cleaned up for session", session_id=session_id)
@@ -224,6 +248,26 @@ class GameUIManager:
             "duration": duration
         })
     
+    async def highlight_mask(self, session_id: str, mask: TileMask, highlight_type: HighlightType):
+        """
+        Highlight a tile mask, sent as one compact run-length/bitset payload.
+        
+        Re-sending the mask already shown for a type is skipped.
+        """
+        if session_id not in self.session_ui_states:
+            return
+        
+        ui_state = self.session_ui_states[session_id]
+        if ui_state.range_masks.get(highlight_type) == mask:
+            return
+        ui_state.range_masks[highlight_type] = mask
+        
+        await self._send_ui_update(session_id, UIEventType.TILE_HIGHLIGHTED, {
+            "mask": mask.to_wire(),
+            "highlight_type": highlight_type.value,
+            "color": self._get_highlight_color(highlight_type)
+        })
+    
     async def clear_highlights(self, session_id: str, highlight_type: Optional[HighlightType] = None):
         """Clear tile highlights"""
         if session_id not in self.session_ui_states:
@@ -235,6 +279,8 @@ class GameUIManager:
             # Clear all highlights
             cleared_tiles = list(ui_state.highlighted_tiles.keys())
             ui_state.highlighted_tiles.clear()
+            cleared_masks = [mask_type.value for mask_type in ui_state.range_masks]
+            ui_state.range_masks.clear()
         else:
             # Clear specific highlight type
             cleared_tiles = []
@@ -247,10 +293,15 @@ class GameUIManager:
             
             for tile_key in tiles_to_remove:
                 del ui_state.highlighted_tiles[tile_key]
+            
+            cleared_masks = []
+            if ui_state.range_masks.pop(highlight_type, None) is not None:
+                cleared_masks.append(highlight_type.value)
         
-        if cleared_tiles:
+        if cleared_tiles or cleared_masks:
             await self._send_ui_update(session_id, UIEventType.TILE_UNHIGHLIGHTED, {
                 "tiles": cleared_tiles,
+                "masks": cleared_masks,
                 "highlight_type": highlight_type.value if highlight_type else "all"
             })
     
@@ -546,7 +597,11 @@ class GameUIManager:
                     "pulse": highlight.pulse
                 }
                 for highlight in ui_state.highlighted_tiles.values()
-            ]
+            ],
+            "range_masks": {
+                highlight_type.value: mask.to_wire()
+                for highlight_type, mask in ui_state.range_masks.items()
+            }
         }
     
     async def _update_unit_highlights(self, session_id: str, entity_id: EntityID):
@@ -557,24 +612,22 @@ class GameUIManager:
         
         # Highlight unit position
         await self.highlight_tiles(session_id, [
-            {"x": position.x, "y": position.y, "intensity": 1.2, "pulse": True}
+            {"x": position.position.x, "y": position.position.y, "intensity": 1.2, "pulse": True}
         ], HighlightType.SELECTION)
         
-        # Show movement range (simplified)
-        movement_tiles = []
-        if position.can_move:
-            movement_speed = getattr(position, 'movement_speed', 3)
-            for dx in range(-movement_speed, movement_speed + 1):
-                for dy in range(-movement_speed, movement_speed + 1):
-                    if abs(dx) + abs(dy) <= movement_speed and (dx != 0 or dy != 0):
-                        movement_tiles.append({
-                            "x": position.x + dx,
-                            "y": position.y + dy,
-                            "intensity": 0.7
-                        })
-        
-        if movement_tiles:
-            await self.highlight_tiles(session_id, movement_tiles, HighlightType.MOVEMENT)
+        if not self.battlefield:
+            return
+        
+        # Terrain-aware ranges, cached by the battlefield until the board changes
+        stats = self.ecs.get_component(entity_id, StatsComponent)
+        attack_range = int(stats.get_effective_attribute("melee_range")) if stats else 1
+        movement = position.movement_remaining if position.can_move else 0
+        movement_mask, attack_mask = self.battlefield.get_unit_ranges(
+            session_id, entity_id, position.position, movement, attack_range
+        )
+        
+        await self.highlight_mask(session_id, movement_mask, HighlightType.MOVEMENT)
+        await self.highlight_mask(session_id, attack_mask, HighlightType.ATTACK_RANGE)
     
     async def _clear_selection_highlights(self, session_id: str):
         """Clear highlights related to unit selection"""
@@ -664,27 +717,109 @@ class GameUIManager:
         }
         return icons.get(effect_name, "❓")
     
+    def _merge_key(self, event_type: str, data: Dict[str, Any]) -> Optional[Hashable]:
+        """Key shared by updates where a later one supersedes an earlier one"""
+        if event_type == UIEventType.BATTLEFIELD_UPDATED:
+            return ("battlefield",)
+        if event_type == UIEventType.TURN_INDICATOR_UPDATED:
+            return ("turn_indicator",)
+        if event_type == UIEventType.TILE_HIGHLIGHTED and "mask" in data:
+            return ("mask", data["highlight_type"])
+        return None
+    
     async def _send_ui_update(self, session_id: str, event_type: str, data: Dict[str, Any]):
-        """Send UI update via WebSocket"""
+        """Queue a UI update for the session's next flush"""
         if not self.websocket_callback:
             return
         
-        message = {
-            "type": "ui_update",
-            "event_type": event_type,
-            "session_id": session_id,
-            "data": data,
-            "timestamp": datetime.now().isoformat()
-        }
+        pending = self._pending_updates.setdefault(session_id, {})
+        update = {"event_type": event_type, "data": data}
+        self.ui_updates_queued += 1
+        
+        key = self._merge_key(event_type, data)
+        if key is not None and pending.pop(key, None) is not None:
+            # Re-insert at the end so it stays ordered after anything queued since
+            self.ui_updates_merged += 1
+        elif (key is None and event_type == UIEventType.TILE_HIGHLIGHTED and pending
+              and self._extend_last_highlight(pending, data)):
+            return
         
+        if key is None:
+            self._update_sequence += 1
+            key = self._update_sequence
+        pending[key] = update
+        
+        if session_id not in self._flush_tasks:
+            self._flush_tasks[session_id] = asyncio.create_task(self._flush_after_deadline(session_id))
+    
+    def _extend_last_highlight(self, pending: Dict[Hashable, Dict[str, Any]], data: Dict[str, Any]) -> bool:
+        """Fold tiles into the newest pending highlight of the same type and duration"""
+        last = pending[next(reversed(pending))]
+        last_data = last["data"]
+        if (last["event_type"] != UIEventType.TILE_HIGHLIGHTED or "tiles" not in last_data
+                or last_data["highlight_type"] != data["highlight_type"]
+                or last_data.get("duration") != data.get("duration")):
+            return False
+        
+        last["data"] = {**last_data, "tiles": last_data["tiles"] + data["tiles"]}
+        self.ui_updates_merged += 1
+        return True
+    
+    async def _flush_after_deadline(self, session_id: str):
+        """Flush a session's updates if no engine step does it first"""
         try:
-            await self.websocket_callback(session_id, message)
-            self.ui_updates_sent += 1
-        except Exception as e:
-            logger.error("Failed to send UI update", 
-                        session_id=session_id,
-                        event_type=event_type,
-                        error=str(e))
+            await asyncio.sleep(self.flush_deadline)
+        except asyncio.CancelledError:
+            return
+        self._flush_tasks.pop(session_id, None)
+        await self.flush_updates(session_id)
+    
+    async def flush_updates(self, session_id: Optional[str] = None):
+        """
+        Send pending UI updates, one message per session.
+        
+        Args:
+            session_id: Session to flush, or None for all sessions
+        """
+        session_ids = [session_id] if session_id is not None else list(self._pending_updates)
+        for sid in session_ids:
+            flush_task = self._flush_tasks.pop(sid, None)
+            if flush_task and flush_task is not asyncio.current_task():
+                flush_task.cancel()
+            
+            pending = self._pending_updates.pop(sid, None)
+            if not pending or not self.websocket_callback:
+                continue
+            
+            updates = list(pending.values())
+            timestamp = datetime.now().isoformat()
+            if len(updates) == 1:
+                message = {
+                    "type": "ui_update",
+                    "event_type": updates[0]["event_type"],
+                    "session_id": sid,
+                    "data": updates[0]["data"],
+                    "timestamp": timestamp
+                }
+            else:
+                message = {
+                    "type": "ui_update_batch",
+                    "session_id": sid,
+                    "updates": updates,
+                    "timestamp": timestamp
+                }
+            
+            try:
+                await self.websocket_callback(sid, message)
+                self.ui_updates_sent += len(updates)
+                self.ui_messages_sent += 1
+                self.ui_messages_coalesced += len(updates) - 1
+            except Exception as e:
+                self.ui_updates_failed += len(updates)
+                logger.error("Failed to send UI update", 
+                            session_id=sid,
+                            updates=len(updates),
+                            error=str(e))
     
     async def _cleanup_floating_text(self, session_id: str, floating_text: FloatingText, duration: float):
         """Clean up floating text after duration"""
@@ -697,6 +832,8 @@ class GameUIManager:
     
     async def update(self, delta_time: float):
         """Update UI manager (called from game loop)"""
+        await self.flush_updates()
+        
         current_time = datetime.now()
         
         # Clean up expired highlights and effects periodically
@@ -740,10 +877,18 @@ class GameUIManager:
         return {
             "active_sessions": len(self.session_ui_states),
             "ui_updates_sent": self.ui_updates_sent,
+            "ui_updates_merged": self.ui_updates_merged,
+            "ui_messages_sent": self.ui_messages_sent,
+            "ui_messages_saved": self.ui_messages_coalesced + self.ui_updates_merged,
+            "ui_updates_failed": self.ui_updates_failed,
+            "ui_updates_pending": self._pending_count(),
             "total_highlights": total_highlights,
             "total_floating_texts": total_floating_texts
         }
     
+    def _pending_count(self) -> int:
+        return sum(len(pending) for pending in self._pending_updates.values())
+    
     async def get_session_ui_state(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get current UI state for a session"""
         if session_id not in self.session_ui_states:
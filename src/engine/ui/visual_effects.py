@@ -7,6 +7,7 @@ providing particle effects, animations, and visual feedback.
 
 import asyncio
 import math
+import random
 import time
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
@@ -17,6 +18,7 @@ import structlog
 
 from ...core.events import EventBus, GameEvent, EventType
 from ...core.math import Vector3
+from ...core.math.particles import EmitterParams, ParticleEmitter
 
 logger = structlog.get_logger()
 
@@ -114,7 +116,12 @@ class VisualEffect:
 
 @dataclass
 class ParticleSystem:
-    """Particle system for visual effects"""
+    """
+    Particle system for visual effects.
+    
+    Particles live in a ParticleEmitter's NumPy arrays; clients receive only
+    the emitter parameters and seed and regenerate the particles themselves.
+    """
     system_id: str
     position: Vector3
     particle_count: int
@@ -129,92 +136,43 @@ class ParticleSystem:
     gravity: float = -9.8
     
     # System state
-    particles: List[Dict[str, Any]] = field(default_factory=list)
-    last_emission: datetime = field(default_factory=datetime.now)
     is_active: bool = True
     duration: float = 5.0
+    seed: Optional[int] = None
     start_time: datetime = field(default_factory=datetime.now)
+    emitter: ParticleEmitter = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        if self.seed is None:
+            self.seed = random.getrandbits(32)
+        self.emitter = ParticleEmitter(EmitterParams(
+            position=(self.position.x, self.position.y, self.position.z),
+            emission_rate=self.emission_rate,
+            particle_lifetime=self.particle_lifetime,
+            duration=self.duration,
+            seed=self.seed,
+            particle_size=self.particle_size,
+            particle_color=self.particle_color,
+            spread_radius=self.spread_radius,
+            velocity_range=tuple(self.velocity_range),
+            gravity=self.gravity
+        ))
+    
+    @property
+    def live_particles(self) -> int:
+        return self.emitter.count
     
     def update(self, delta_time: float) -> bool:
-        """Update particle system"""
-        if not self.is_active:
-            return False
-        
-        current_time = datetime.now()
-        elapsed = (current_time - self.start_time).total_seconds()
-        
-        if elapsed >= self.duration:
-            self.is_active = False
-            return len(self.particles) > 0  # Keep alive while particles exist
-        
-        # Emit new particles
-        if elapsed < self.duration - self.particle_lifetime:
-            time_since_emission = (current_time - self.last_emission).total_seconds()
-            if time_since_emission >= (1.0 / self.emission_rate):
-                self._emit_particle()
-                self.last_emission = current_time
-        
-        # Update existing particles
-        active_particles = []
-        for particle in self.particles:
-            if self._update_particle(particle, delta_time):
-                active_particles.append(particle)
-        
-        self.particles = active_particles
-        return self.is_active or len(self.particles) > 0
-    
-    def _emit_particle(self):
-        """Emit a new particle"""
-        import random
-        
-        # Random position within spread radius
-        angle = random.uniform(0, 2 * math.pi)
-        radius = random.uniform(0, self.spread_radius)
-        offset_x = math.cos(angle) * radius
-        offset_z = math.sin(angle) * radius
-        
-        # Random velocity
-        velocity_magnitude = random.uniform(*self.velocity_range)
-        velocity_angle = random.uniform(0, 2 * math.pi)
-        velocity_x = math.cos(velocity_angle) * velocity_magnitude
-        velocity_y = random.uniform(1.0, 3.0)
-        velocity_z = math.sin(velocity_angle) * velocity_magnitude
-        
-        particle = {
-            "position": Vector3(
-                self.position.x + offset_x,
-                self.position.y,
-                self.position.z + offset_z
-            ),
-            "velocity": Vector3(velocity_x, velocity_y, velocity_z),
-            "life": self.particle_lifetime,
-            "max_life": self.particle_lifetime,
-            "size": self.particle_size,
-            "color": self.particle_color
-        }
-        
-        self.particles.append(particle)
-    
-    def _update_particle(self, particle: Dict[str, Any], delta_time: float) -> bool:
-        """Update individual particle, return False if expired"""
-        particle["life"] -= delta_time
-        
-        if particle["life"] <= 0:
-            return False
-        
-        # Update position
-        particle["position"].x += particle["velocity"].x * delta_time
-        particle["position"].y += particle["velocity"].y * delta_time
-        particle["position"].z += particle["velocity"].z * delta_time
-        
-        # Apply gravity
-        particle["velocity"].y += self.gravity * delta_time
-        
-        # Update size and alpha based on lifetime
-        life_ratio = particle["life"] / particle["max_life"]
-        particle["size"] = self.particle_size * life_ratio
-        
-        return True
+        """Update particle system, return False once all particles have expired"""
+        alive = self.emitter.update(delta_time)
+        self.is_active = self.emitter.is_emitting
+        return alive
+    
+    def to_wire(self) -> Dict[str, Any]:
+        """Emitter parameters, seed and elapsed time for client-side regeneration"""
+        data = self.emitter.to_wire()
+        data["system_id"] = self.system_id
+        return data
 
 
 class VisualEffectsManager:
@@ -628,27 +586,19 @@ class VisualEffectsManager:
                 "icon": effect.icon
             })
         
-        # Particle systems
+        # Particle systems are sent as emitters; clients regenerate the particles
         for particle_system in self.active_particles.values():
-            for particle in particle_system.particles:
-                effects_data.append({
-                    "id": f"{particle_system.system_id}_particle",
-                    "type": "particle",
-                    "position": {
-                        "x": particle["position"].x,
-                        "y": particle["position"].y,
-                        "z": particle["position"].z
-                    },
-                    "color": particle["color"],
-                    "size": particle["size"],
-                    "life_ratio": particle["life"] / particle["max_life"]
-                })
+            effects_data.append({
+                "id": particle_system.system_id,
+                "type": "particle_emitter",
+                "emitter": particle_system.to_wire()
+            })
         
         return effects_data
     
     def get_stats(self) -> Dict[str, Any]:
         """Get visual effects statistics"""
-        total_particles = sum(len(ps.particles) for ps in self.active_particles.values())
+        total_particles = sum(ps.live_particles for ps in self.active_particles.values())
         
         return {
             "active_effects": len(self.active_effects),
@@ -10,7 +10,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 import json
 
-from ..effects.effect_system import Effect, EffectFactory
+from ..effects.effect_system import (Effect, EffectFactory, EffectSpec, apply_effects, can_batch_apply,
+                                     next_revision)
 
 
 class ActionType(Enum):
@@ -127,6 +128,8 @@ class Action:
         
         # Core functionality
         self.effects: List[Effect] = []
+        self._specs_version: Optional[Tuple[int, ...]] = None
+        self._effect_specs: Optional[Tuple[EffectSpec, ...]] = ()
         self.targeting = TargetingData()
         self.costs = ActionCosts()
         
@@ -153,14 +156,37 @@ class Action:
         self.can_critical = True
         self.interrupts_movement = True
     
+    def __setattr__(self, name: str, value: Any):
+        # Public fields (accuracy, guaranteed_hit, ...) feed predictions; restamp on change
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_revision', next_revision())
+    
+    @property
+    def version(self) -> Tuple[int, ...]:
+        """Changes whenever this action, its effect list or any of its effects is modified."""
+        return (self._revision, *(effect.revision for effect in self.effects))
+    
     def add_effect(self, effect: Effect):
         """Add an effect to this action."""
         self.effects.append(effect)
+        self._revision = next_revision()
     
     def remove_effect(self, effect: Effect):
         """Remove an effect from this action."""
         if effect in self.effects:
             self.effects.remove(effect)
+            self._revision = next_revision()
+    
+    @property
+    def effect_specs(self) -> Optional[Tuple[EffectSpec, ...]]:
+        """Effects as descriptors for batch application, or None if any lacks one."""
+        version = self.version
+        if version != self._specs_version:
+            specs = tuple(effect.to_spec() for effect in self.effects)
+            self._effect_specs = specs if can_batch_apply(specs) else None
+            self._specs_version = version
+        return self._effect_specs
     
     def can_execute(self, caster: Any, targets: List[Any], game_state: Dict[str, Any]) -> Tuple[bool, str]:
         """
@@ -218,15 +244,22 @@ class Action:
         # Consume costs
         self._consume_costs(caster)
         
-        # Apply effects
-        effect_results = []
-        for effect in self.effects:
-            for target in targets:
-                if effect.can_apply(target, game_state):
-                    result = effect.apply(target, game_state)
-                    result['effect_type'] = effect.type.value
-                    result['target'] = target
-                    effect_results.append(result)
+        # Apply effects, in one pass when every effect has a descriptor
+        effect_specs = self.effect_specs
+        effect_changes = []
+        if effect_specs is not None:
+            batch = apply_effects(effect_specs, targets, game_state)
+            effect_results = batch.results
+            effect_changes = batch.changes
+        else:
+            effect_results = []
+            for effect in self.effects:
+                for target in targets:
+                    if effect.can_apply(target, game_state):
+                        result = effect.apply(target, game_state)
+                        result['effect_type'] = effect.type.value
+                        result['target'] = target
+                        effect_results.append(result)
         
         # Set cooldown
         if hasattr(caster, 'action_cooldowns'):
@@ -239,6 +272,7 @@ class Action:
             'caster': caster,
             'targets': targets,
             'effect_results': effect_results,
+            'effect_changes': effect_changes,
             'costs_consumed': self.costs.to_dict()
         }
     
@@ -8,6 +8,9 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import List, Optional, Callable, Any
 from core.math.vector import Vector3
+from core.utils.logging import Logger
+
+logger = Logger.get_logger(__name__)
 
 
 class ActionType(Enum):
@@ -139,7 +142,7 @@ class ActionQueue:
             try:
                 action.execute_callback(action)
             except Exception as e:
-                print(f"Error executing action: {e}")
+                logger.error("Error executing action", error=str(e))
         
         return action
     
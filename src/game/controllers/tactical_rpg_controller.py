@@ -39,6 +39,7 @@ from core.assets.talent_type_config import get_talent_type_config
 from ui.camera.camera_controller import CameraController
 from ui.visual.grid_visualizer import GridVisualizer
 from ui.visual.tile_highlighter import TileHighlighter
+from ui.visual.highlight_layers import LayeredTileHighlighter, LayerStyle
 from ui.visual.unit_renderer import UnitEntity
 from ui.battlefield.grid_tile import GridTile
 from ui.interaction.interaction_manager import InteractionManager
@@ -230,8 +231,13 @@ class TacticalRPG:
             print("⚠ Skipping InteractionManager - missing dependencies")
             self.interaction_manager = None
         
-        # Initialize highlight entities list for cleanup
-        self.highlight_entities: List[Entity] = []
+        # Tile highlights as prioritized layers, drawn with pooled entities
+        highlight_styles = {
+            name: LayerStyle.from_config(style_data)
+            for name, style_data in self.highlighting_config.get('highlight_styles', {}).items()
+        }
+        highlight_styles.setdefault('target', LayerStyle(position_offset=(0.5, 0.1, 0.5), alpha=0.8))
+        self.tile_layers = LayeredTileHighlighter(highlight_styles)
         
         # Use passed control panel or create one if none provided
         if control_panel:
@@ -331,21 +337,6 @@ class TacticalRPG:
         
         return fallback_color
     
-    def _create_highlight_entity(self, x: int, y: int, highlight_color, style_name: str = 'movement'):
-        """Create a highlight entity with configurable style."""
-        style_data = self.highlighting_config.get('highlight_styles', {}).get(style_name, {})
-        scale = style_data.get('scale', [0.9, 0.2, 0.9])
-        position_offset = style_data.get('position_offset', [0.5, 0, 0.5])
-        alpha = style_data.get('alpha', 1.0)
-        
-        return Entity(
-            model='cube',
-            color=highlight_color,
-            scale=tuple(scale),
-            position=(x + position_offset[0], position_offset[1], y + position_offset[2]),
-            alpha=alpha
-        )
-    
     def end_current_turn(self):
         """End the current unit's turn and move to next unit."""
         if self.turn_manager:
@@ -513,11 +504,8 @@ class TacticalRPG:
         for entity in self.unit_entities:
             entity.unhighlight()
         
-        # Clear tile highlight entities
-        if hasattr(self, 'highlight_entities'):
-            for highlight in self.highlight_entities:
-                destroy(highlight)
-            self.highlight_entities = []
+        # Clear tile highlight layers (entities go back to the pool)
+        self.tile_layers.clear()
         
         # Clear tile highlighting through modular system (if available)
         if self.tile_highlighter:
@@ -539,13 +527,11 @@ class TacticalRPG:
         # Clear existing highlight entities
         self.clear_highlights()
         
-        highlight_count = 0
         # Get AP-based movement limit
-        from game.config.action_costs import ACTION_COSTS
         current_ap = getattr(self.active_unit, 'ap', 0)
         max_ap_distance = current_ap  # Since movement costs 1 AP per tile
         
-        # Create highlight entities for movement range
+        movement_tiles = []
         for x in range(self.grid.width):
             for y in range(self.grid.height):
                 distance = abs(x - self.active_unit.x) + abs(y - self.active_unit.y)
@@ -557,19 +543,14 @@ class TacticalRPG:
                 if within_move_points and within_ap_limit and self.grid.is_valid(x, y):
                     if distance == 0:
                         # Current position - different color
-                        highlight_color = self._get_highlight_style('selection', color.white)
+                        self.tile_layers.layers.set_layer(
+                            'selection', [(x, y)], self._get_highlight_style('selection', color.white))
                     else:
-                        # Valid movement range
-                        highlight_color = self._get_highlight_style('movement', color.green)
-                    
-                    # Create highlight overlay entity
-                    style_name = 'selection' if distance == 0 else 'movement'
-                    highlight = self._create_highlight_entity(x, y, highlight_color, style_name)
-                    # Store in a list for cleanup
-                    if not hasattr(self, 'highlight_entities'):
-                        self.highlight_entities = []
-                    self.highlight_entities.append(highlight)
-                    highlight_count += 1
+                        movement_tiles.append((x, y))
+        
+        self.tile_layers.layers.set_layer(
+            'movement', movement_tiles, self._get_highlight_style('movement', color.green))
+        self.tile_layers.render()
     
     def handle_path_movement(self, direction: str):
         """Handle path movement and confirmation."""
@@ -854,32 +835,18 @@ class TacticalRPG:
         
         effect_radius = self.active_unit.attack_effect_area
         
+        effect_tiles = {}
         for x in range(self.grid.width):
             for y in range(self.grid.height):
                 # Calculate Manhattan distance from target tile to this tile
                 distance = abs(x - target_x) + abs(y - target_y)
                 
-                # Highlight tiles within effect area
+                # Highlight tiles within effect area; the target tile gets a special color
                 if distance <= effect_radius:
-                    if (x, y) == (target_x, target_y):
-                        # Target tile gets special color
-                        highlight_color = color.orange
-                    else:
-                        # Effect area tiles
-                        highlight_color = color.yellow
-                    
-                    # Create highlight overlay entity
-                    highlight = Entity(
-                        model='cube',
-                        color=highlight_color,
-                        scale=(0.9, 0.2, 0.9),
-                        position=(x + 0.5, 0, y + 0.5),  # Same height as grid tiles
-                        alpha=1.0  # Same transparency as grid
-                    )
-                    # Store in a list for cleanup
-                    if not hasattr(self, 'highlight_entities'):
-                        self.highlight_entities = []
-                    self.highlight_entities.append(highlight)
+                    effect_tiles[(x, y)] = color.orange if (x, y) == (target_x, target_y) else color.yellow
+        
+        self.tile_layers.layers.add_tiles('effect_area', effect_tiles)
+        self.tile_layers.render()
     
     def show_attack_confirmation(self, target_x: int, target_y: int):
         """Show modal to confirm attack on target tile."""
@@ -945,17 +912,14 @@ class TacticalRPG:
         affected_units = []
         effect_radius = self.active_unit.attack_effect_area
         
-        for x in range(self.grid.width):
-            for y in range(self.grid.height):
-                # Calculate distance from target tile
-                distance = abs(x - target_x) + abs(y - target_y)
-                
-                # Check if tile is within effect area and has a unit
-                if distance <= effect_radius and (x, y) in self.grid.units:
-                    unit = self.grid.units[(x, y)]
-                    # Don't include the attacking unit itself
-                    if unit != self.active_unit:
-                        affected_units.append(unit)
+        # Only visit tiles inside the effect diamond, clipped to the grid
+        for x in range(max(0, target_x - effect_radius), min(self.grid.width, target_x + effect_radius + 1)):
+            reach = effect_radius - abs(x - target_x)
+            for y in range(max(0, target_y - reach), min(self.grid.height, target_y + reach + 1)):
+                unit = self.grid.units.get((x, y))
+                # Don't include the attacking unit itself
+                if unit is not None and unit != self.active_unit:
+                    affected_units.append(unit)
         
         return affected_units
     
@@ -1054,32 +1018,18 @@ class TacticalRPG:
         target_color = talent_config.get_target_color(talent_type)
         area_color = talent_config.get_area_color(talent_type)
         
+        effect_tiles = {}
         for x in range(self.grid.width):
             for y in range(self.grid.height):
                 # Calculate Manhattan distance from target tile to this tile
                 distance = abs(x - target_x) + abs(y - target_y)
                 
-                # Highlight tiles within effect area
+                # Highlight tiles within effect area; bright color for the target, lighter for the area
                 if distance <= effect_radius:
-                    if (x, y) == (target_x, target_y):
-                        # Target tile gets special color (bright color for target)
-                        highlight_color = target_color
-                    else:
-                        # Effect area tiles (lighter color for area)
-                        highlight_color = area_color
-                    
-                    # Create highlight overlay entity
-                    highlight = Entity(
-                        model='cube',
-                        color=highlight_color,
-                        scale=(0.9, 0.2, 0.9),
-                        position=(x + 0.5, 0, y + 0.5),  # Same height as grid tiles
-                        alpha=1.0  # Same transparency as grid
-                    )
-                    # Store in a list for cleanup
-                    if not hasattr(self, 'highlight_entities'):
-                        self.highlight_entities = []
-                    self.highlight_entities.append(highlight)
+                    effect_tiles[(x, y)] = target_color if (x, y) == (target_x, target_y) else area_color
+        
+        self.tile_layers.layers.add_tiles('effect_area', effect_tiles)
+        self.tile_layers.render()
     
     def show_magic_confirmation(self, target_x: int, target_y: int):
         """Show modal to confirm magic on target tile."""
@@ -1347,36 +1297,11 @@ class TacticalRPG:
         if self.current_mode == "move":
             self.highlight_movement_range()
         
-        # Highlight current path in blue (but not the last tile - that will be yellow)
-        for pos in self.current_path:
-            # Skip highlighting the last tile in path if it's the cursor (will be yellow)
-            if self.path_cursor and pos == self.path_cursor:
-                continue
-                
-            highlight = Entity(
-                model='cube',
-                color=color.blue,
-                scale=(0.9, 0.2, 0.9),
-                position=(pos[0] + 0.5, 0, pos[1] + 0.5),  # Center on tile, same level as grid
-                alpha=1.0  # Same transparency as grid
-            )
-            # Store in a list for cleanup
-            if not hasattr(self, 'highlight_entities'):
-                self.highlight_entities = []
-            self.highlight_entities.append(highlight)
-        
-        # Highlight cursor position in yellow (always last, overrides blue)
+        # Highlight current path in blue; the cursor layer draws over it in yellow
+        self.tile_layers.layers.set_layer('path', [tuple(pos) for pos in self.current_path], color.blue)
         if self.path_cursor:
-            highlight = Entity(
-                model='cube',
-                color=color.yellow,
-                scale=(0.9, 0.2, 0.9),
-                position=(self.path_cursor[0] + 0.5, 0, self.path_cursor[1] + 0.5),  # Center on tile, same level as grid
-                alpha=1.0  # Same transparency as grid
-            )
-            if not hasattr(self, 'highlight_entities'):
-                self.highlight_entities = []
-            self.highlight_entities.append(highlight)
+            self.tile_layers.layers.set_layer('path_cursor', [tuple(self.path_cursor)], color.yellow)
+        self.tile_layers.render()
                     
     def highlight_attack_range(self, unit):
         """Highlight all tiles within the unit's attack range in red."""
@@ -1392,6 +1317,7 @@ class TacticalRPG:
         else:
             attack_range = unit.attack_range
         
+        attack_tiles = []
         for x in range(self.grid.width):
             for y in range(self.grid.height):
                 # Calculate Manhattan distance from unit to tile
@@ -1399,20 +1325,10 @@ class TacticalRPG:
                 
                 # Highlight tiles within attack range (excluding unit's own tile)
                 if distance <= attack_range and distance > 0:
-                    # Check if tile is within grid bounds
-                    if 0 <= x < self.grid.width and 0 <= y < self.grid.height:
-                        # Create highlight overlay entity
-                        highlight = Entity(
-                            model='cube',
-                            color=color.red,
-                            scale=(0.9, 0.2, 0.9),
-                            position=(x + 0.5, 0, y + 0.5),  # Same height as grid tiles
-                            alpha=1.0  # Same transparency as grid
-                        )
-                        # Store in a list for cleanup
-                        if not hasattr(self, 'highlight_entities'):
-                            self.highlight_entities = []
-                        self.highlight_entities.append(highlight)
+                    attack_tiles.append((x, y))
+        
+        self.tile_layers.layers.set_layer('attack', attack_tiles, color.red)
+        self.tile_layers.render()
     
     def highlight_magic_range(self, unit):
         """Highlight all tiles within the unit's magic range in blue."""
@@ -1422,6 +1338,7 @@ class TacticalRPG:
         # Clear existing highlights first
         self.clear_highlights()
         
+        magic_tiles = []
         for x in range(self.grid.width):
             for y in range(self.grid.height):
                 # Calculate Manhattan distance from unit to tile
@@ -1429,20 +1346,10 @@ class TacticalRPG:
                 
                 # Highlight tiles within magic range (excluding unit's own tile)
                 if distance <= unit.magic_range and distance > 0:
-                    # Check if tile is within grid bounds
-                    if 0 <= x < self.grid.width and 0 <= y < self.grid.height:
-                        # Create highlight overlay entity
-                        highlight = Entity(
-                            model='cube',
-                            color=color.blue,
-                            scale=(0.9, 0.2, 0.9),
-                            position=(x + 0.5, 0, y + 0.5),  # Same height as grid tiles
-                            alpha=1.0  # Same transparency as grid
-                        )
-                        # Store in a list for cleanup
-                        if not hasattr(self, 'highlight_entities'):
-                            self.highlight_entities = []
-                        self.highlight_entities.append(highlight)
+                    magic_tiles.append((x, y))
+        
+        self.tile_layers.layers.set_layer('magic', magic_tiles, color.blue)
+        self.tile_layers.render()
     
     def get_tile_at(self, x: int, y: int):
         """Get tile at position (legacy compatibility)."""
@@ -2409,22 +2316,11 @@ class TacticalRPG:
     def _highlight_target_unit(self, target_unit):
         """Add special highlighting for a targeted unit"""
         try:
-            if hasattr(self, 'highlight_entities'):
-                # Create a target highlight overlay
-                target_highlight = Entity(
-                    model='cube',
-                    color=color.orange,  # Orange color for targets
-                    scale=(0.9, 0.2, 0.9),
-                    position=(target_unit.x + 0.5, 0.1, target_unit.y + 0.5),  # Slightly above ground
-                    alpha=0.8
-                )
-                
-                # Store in highlight entities for cleanup
-                if not hasattr(self, 'highlight_entities'):
-                    self.highlight_entities = []
-                self.highlight_entities.append(target_highlight)
-                
-                print(f"🎯 Highlighted target: {target_unit.name} at ({target_unit.x}, {target_unit.y})")
+            # Target layer sits slightly above ground, orange for targets
+            self.tile_layers.layers.add_tiles('target', [(target_unit.x, target_unit.y)], color.orange)
+            self.tile_layers.render()
+            
+            print(f"🎯 Highlighted target: {target_unit.name} at ({target_unit.x}, {target_unit.y})")
                 
         except Exception as e:
             print(f"⚠️ Failed to highlight target: {e}")
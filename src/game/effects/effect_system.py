@@ -3,13 +3,30 @@ Unified Effect System
 
 Base classes for all game effects that can be applied to units, terrain, or game state.
 Replaces separate damage, healing, buff, and debuff systems with unified approach.
+
+Talent effects are also compiled once into immutable ``EffectSpec``
+descriptors. ``apply_effects`` applies a tuple of specs to a set of targets
+in one pass and returns the same result dictionaries as calling each
+``Effect.apply`` per target, plus a compact change list for delta
+broadcasts and undo.
 """
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from enum import Enum
+import itertools
 import json
 
+# Revision stamps for mutable effects and actions. One shared counter, so a
+# stamp is never reused, not even by a new object at a recycled address.
+_revisions = itertools.count(1)
+
+
+def next_revision() -> int:
+    """A revision stamp no object has had before."""
+    return next(_revisions)
+
 
 class EffectType(Enum):
     """Types of effects that can be applied."""
@@ -48,6 +65,52 @@ class ResourceType(Enum):
     KWAN = "kwan"
 
 
+@dataclass(frozen=True, slots=True)
+class EffectSpec:
+    """Immutable, pure-data description of one effect."""
+    effect_type: EffectType
+    magnitude: Union[int, float]
+    duration: int = 0
+    source_id: Optional[str] = None
+    damage_type: Optional[DamageType] = None
+    resource_type: Optional[ResourceType] = None
+    stat_name: Optional[str] = None
+    is_percentage: bool = False
+    
+    def to_effect(self) -> 'Effect':
+        """Build the equivalent Effect object."""
+        if self.effect_type == EffectType.DAMAGE:
+            return DamageEffect(self.magnitude, self.duration, self.source_id, self.damage_type)
+        elif self.effect_type == EffectType.HEALING:
+            return HealingEffect(self.magnitude, self.duration, self.source_id)
+        elif self.effect_type == EffectType.STAT_MODIFIER:
+            return StatModifierEffect(self.stat_name, self.magnitude, self.duration,
+                                      self.source_id, self.is_percentage)
+        elif self.effect_type == EffectType.RESOURCE_CHANGE:
+            return ResourceEffect(self.resource_type, self.magnitude, self.duration, self.source_id)
+        raise ValueError(f"No effect class for {self.effect_type.value}")
+
+
+@dataclass(frozen=True, slots=True)
+class EffectChange:
+    """One attribute change made by ``apply_effects``."""
+    target: Any
+    attribute: str
+    old_value: Any
+    new_value: Any
+    effect_index: int  # Position of the causing spec in the applied tuple
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for delta broadcasts, identifying the target by id or name."""
+        return {
+            'target_id': getattr(self.target, 'id', None) or getattr(self.target, 'name', None),
+            'attribute': self.attribute,
+            'old': self.old_value,
+            'new': self.new_value,
+            'effect_index': self.effect_index
+        }
+
+
 class Effect(ABC):
     """
     Base class for all game effects.
@@ -82,6 +145,12 @@ class Effect(ABC):
         self.requirements = {}
         self.restrictions = {}
     
+    def __setattr__(self, name: str, value: Any):
+        # Any change gets a fresh revision, so whatever is cached under
+        # Action.version goes stale after e.g. a magnitude edit
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, 'revision', next_revision())
+    
     @abstractmethod
     def can_apply(self, target: Any, context: Dict[str, Any]) -> bool:
         """
@@ -114,6 +183,10 @@ class Effect(ABC):
         """Get human-readable preview of effect."""
         return self.description or f"{self.type.value}: {self.magnitude}"
     
+    def to_spec(self) -> Optional[EffectSpec]:
+        """Pure-data form for ``apply_effects``, or None if this effect has none."""
+        return None
+    
     def to_dict(self) -> Dict[str, Any]:
         """Serialize effect to dictionary."""
         return {
@@ -159,6 +232,10 @@ class DamageEffect(Effect):
         self.damage_type = damage_type
         self.description = f"Deals {damage} {damage_type.value} damage"
     
+    def to_spec(self) -> Optional[EffectSpec]:
+        return EffectSpec(self.type, self.magnitude, self.duration, self.source_id,
+                          damage_type=self.damage_type)
+    
     def can_apply(self, target: Any, context: Dict[str, Any]) -> bool:
         """Check if damage can be applied to target."""
         # Must be a unit with HP
@@ -220,6 +297,9 @@ class HealingEffect(Effect):
         super().__init__(EffectType.HEALING, healing, duration, source_id)
         self.description = f"Restores {healing} HP"
     
+    def to_spec(self) -> Optional[EffectSpec]:
+        return EffectSpec(self.type, self.magnitude, self.duration, self.source_id)
+    
     def can_apply(self, target: Any, context: Dict[str, Any]) -> bool:
         """Check if healing can be applied to target."""
         # Must be a unit with HP
@@ -261,6 +341,10 @@ class StatModifierEffect(Effect):
         modifier_text = f"{modifier}%" if is_percentage else f"{modifier:+d}"
         self.description = f"{modifier_text} {stat_name} for {duration} turns"
     
+    def to_spec(self) -> Optional[EffectSpec]:
+        return EffectSpec(self.type, self.magnitude, self.duration, self.source_id,
+                          stat_name=self.stat_name, is_percentage=self.is_percentage)
+    
     def can_apply(self, target: Any, context: Dict[str, Any]) -> bool:
         """Check if stat modifier can be applied."""
         # Must be a unit with the specified stat
@@ -292,6 +376,10 @@ class ResourceEffect(Effect):
         action = "restores" if amount > 0 else "drains"
         self.description = f"{action.title()} {abs(amount)} {resource_type.value.upper()}"
     
+    def to_spec(self) -> Optional[EffectSpec]:
+        return EffectSpec(self.type, self.magnitude, self.duration, self.source_id,
+                          resource_type=self.resource_type)
+    
     def can_apply(self, target: Any, context: Dict[str, Any]) -> bool:
         """Check if resource effect can be applied."""
         resource_attr = self.resource_type.value
@@ -325,6 +413,248 @@ class ResourceEffect(Effect):
         }
 
 
+class _TargetProbe:
+    """Caches which attributes a target has for the length of one batch."""
+    
+    __slots__ = ('target', '_has')
+    
+    def __init__(self, target: Any):
+        self.target = target
+        self._has: Dict[str, bool] = {}
+    
+    def has(self, attribute: str) -> bool:
+        has = self._has.get(attribute)
+        if has is None:
+            has = self._has[attribute] = hasattr(self.target, attribute)
+        return has
+
+
+_DEFENSE_ATTRIBUTES = {
+    DamageType.PHYSICAL: 'physical_defense',
+    DamageType.MAGICAL: 'magical_defense',
+    DamageType.SPIRITUAL: 'spiritual_defense',
+}
+
+
+def _apply_damage(spec: EffectSpec, index: int, probe: _TargetProbe, changes: List[EffectChange]):
+    target = probe.target
+    if not probe.has('hp') or not probe.has('alive') or not target.alive:
+        return None
+    
+    actual_damage = spec.magnitude
+    if spec.damage_type != DamageType.TRUE:
+        defense_attribute = _DEFENSE_ATTRIBUTES.get(spec.damage_type)
+        defense = getattr(target, defense_attribute) if defense_attribute and probe.has(defense_attribute) else 0
+        actual_damage = max(1, spec.magnitude - defense)
+    
+    old_hp = target.hp
+    old_alive = target.alive
+    target.take_damage(actual_damage, spec.damage_type)
+    if target.hp != old_hp:
+        changes.append(EffectChange(target, 'hp', old_hp, target.hp, index))
+    if target.alive != old_alive:
+        changes.append(EffectChange(target, 'alive', old_alive, target.alive, index))
+    
+    return {
+        'success': True,
+        'damage_dealt': old_hp - target.hp,
+        'target_hp': target.hp,
+        'target_alive': target.alive,
+        'damage_type': spec.damage_type.value
+    }
+
+
+def _apply_healing(spec: EffectSpec, index: int, probe: _TargetProbe, changes: List[EffectChange]):
+    target = probe.target
+    if not probe.has('hp') or not probe.has('max_hp'):
+        return None
+    old_hp = target.hp
+    if not getattr(target, 'alive', True) or old_hp >= target.max_hp:
+        return None
+    
+    target.hp = min(target.max_hp, old_hp + spec.magnitude)
+    if target.hp != old_hp:
+        changes.append(EffectChange(target, 'hp', old_hp, target.hp, index))
+    
+    return {
+        'success': True,
+        'healing_done': target.hp - old_hp,
+        'target_hp': target.hp,
+        'target_max_hp': target.max_hp
+    }
+
+
+def _apply_stat_modifier(spec: EffectSpec, index: int, probe: _TargetProbe, changes: List[EffectChange]):
+    if not probe.has(spec.stat_name):
+        return None
+    # Mirrors StatModifierEffect.apply until temporary modifiers exist
+    return {
+        'success': True,
+        'stat_modified': spec.stat_name,
+        'modifier': spec.magnitude,
+        'duration': spec.duration,
+        'note': 'Stat modifier system not yet implemented'
+    }
+
+
+def _apply_resource(spec: EffectSpec, index: int, probe: _TargetProbe, changes: List[EffectChange]):
+    resource_attr = spec.resource_type.value
+    max_resource_attr = f"max_{resource_attr}"
+    if not probe.has(resource_attr) or not probe.has(max_resource_attr):
+        return None
+    
+    target = probe.target
+    old_value = getattr(target, resource_attr)
+    max_value = getattr(target, max_resource_attr)
+    new_value = max(0, min(max_value, old_value + spec.magnitude))
+    setattr(target, resource_attr, new_value)
+    if new_value != old_value:
+        changes.append(EffectChange(target, resource_attr, old_value, new_value, index))
+    
+    return {
+        'success': True,
+        'resource_type': resource_attr,
+        'change': new_value - old_value,
+        'new_value': new_value,
+        'max_value': max_value
+    }
+
+
+_APPLIERS = {
+    EffectType.DAMAGE: _apply_damage,
+    EffectType.HEALING: _apply_healing,
+    EffectType.STAT_MODIFIER: _apply_stat_modifier,
+    EffectType.RESOURCE_CHANGE: _apply_resource,
+}
+
+
+def can_batch_apply(specs: Tuple[Optional[EffectSpec], ...]) -> bool:
+    """Check that every spec has a batch applier."""
+    return all(spec is not None and spec.effect_type in _APPLIERS for spec in specs)
+
+
+@dataclass
+class EffectBatchResult:
+    """Outcome of ``apply_effects``."""
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    changes: List[EffectChange] = field(default_factory=list)
+    
+    def to_delta(self) -> List[Dict[str, Any]]:
+        """Change list in broadcastable form."""
+        return [change.to_dict() for change in self.changes]
+    
+    def undo(self):
+        """Restore every changed attribute, newest change first."""
+        for change in reversed(self.changes):
+            setattr(change.target, change.attribute, change.old_value)
+
+
+def apply_effects(specs: Tuple[EffectSpec, ...], targets: List[Any],
+                  context: Dict[str, Any]) -> EffectBatchResult:
+    """
+    Apply effects to a set of targets in one pass.
+    
+    Effects are applied in spec order and, within each spec, target order,
+    so results match applying each Effect to each target in turn. Targets
+    an effect cannot apply to are skipped, as ``Action.execute`` does.
+    
+    Args:
+        specs: Effect descriptors, e.g. from ``compile_talent_effects``
+        targets: Units to apply them to
+        context: Game context
+        
+    Returns:
+        Per-application results (with 'effect_type' and 'target') and changes
+    """
+    batch = EffectBatchResult()
+    probes = [_TargetProbe(target) for target in targets]
+    
+    for index, spec in enumerate(specs):
+        applier = _APPLIERS[spec.effect_type]
+        effect_type = spec.effect_type.value
+        for probe in probes:
+            result = applier(spec, index, probe, batch.changes)
+            if result is not None:
+                result['effect_type'] = effect_type
+                result['target'] = probe.target
+                batch.results.append(result)
+    
+    return batch
+
+
+def describe_talent_effect(effect_name: str, effect_data: Any,
+                           source_id: str = None) -> Optional[EffectSpec]:
+    """
+    Describe one talent effect entry.
+    
+    Args:
+        effect_name: Name of the effect (e.g., 'base_damage', 'healing_amount')
+        effect_data: Effect value or configuration
+        source_id: Source talent/action ID
+        
+    Returns:
+        EffectSpec, or None for entries that are not effects (range, area, ...)
+    """
+    effect_data = int(effect_data) if isinstance(effect_data, str) and effect_data.isdigit() else effect_data
+    name = effect_name.lower()
+    
+    # Damage effects
+    if 'damage' in name:
+        damage_type = DamageType.PHYSICAL
+        if 'magical' in name:
+            damage_type = DamageType.MAGICAL
+        elif 'spiritual' in name:
+            damage_type = DamageType.SPIRITUAL
+        return EffectSpec(EffectType.DAMAGE, effect_data, source_id=source_id, damage_type=damage_type)
+    
+    # Healing effects
+    elif 'heal' in name:
+        return EffectSpec(EffectType.HEALING, effect_data, source_id=source_id)
+    
+    # Resource effects
+    elif 'mp_restoration' in name:
+        return EffectSpec(EffectType.RESOURCE_CHANGE, effect_data, source_id=source_id,
+                          resource_type=ResourceType.MP)
+    elif 'hp_restoration' in name:
+        return EffectSpec(EffectType.HEALING, effect_data, source_id=source_id)
+    
+    # Stat modifiers need a stat name and duration, handled by specific talent parsing
+    return None
+
+
+# Compiled talent effects keyed by (source_id, effect items)
+_compiled_effects: Dict[Tuple[Any, ...], Tuple[EffectSpec, ...]] = {}
+
+
+def compile_talent_effects(talent_data) -> Tuple[EffectSpec, ...]:
+    """
+    Compile a talent's effects into descriptors, once per distinct talent.
+    
+    Args:
+        talent_data: Object with ``effects`` mapping and optional ``id``
+    """
+    effects: Mapping[str, Any] = getattr(talent_data, 'effects', None)
+    if not effects:
+        return ()
+    
+    source_id = getattr(talent_data, 'id', 'unknown')
+    key = (source_id, *effects.items())
+    try:
+        specs = _compiled_effects.get(key)
+    except TypeError:
+        key, specs = None, None  # Unhashable effect values; compile uncached
+    
+    if specs is None:
+        specs = tuple(
+            spec for spec in (describe_talent_effect(name, value, source_id)
+                              for name, value in effects.items())
+            if spec is not None
+        )
+        if key is not None:
+            _compiled_effects[key] = specs
+    return specs
+
+
 class EffectFactory:
     """Factory for creating effects from configuration data."""
     
@@ -341,47 +671,10 @@ class EffectFactory:
         Returns:
             Effect object or None if unrecognized
         """
-        effect_data = int(effect_data) if isinstance(effect_data, str) and effect_data.isdigit() else effect_data
-        
-        # Damage effects
-        if 'damage' in effect_name.lower():
-            damage_type = DamageType.PHYSICAL
-            if 'magical' in effect_name.lower():
-                damage_type = DamageType.MAGICAL
-            elif 'spiritual' in effect_name.lower():
-                damage_type = DamageType.SPIRITUAL
-            return DamageEffect(effect_data, source_id=source_id, damage_type=damage_type)
-        
-        # Healing effects
-        elif 'heal' in effect_name.lower():
-            return HealingEffect(effect_data, source_id=source_id)
-        
-        # Resource effects
-        elif 'mp_restoration' in effect_name.lower():
-            return ResourceEffect(ResourceType.MP, effect_data, source_id=source_id)
-        elif 'hp_restoration' in effect_name.lower():
-            return HealingEffect(effect_data, source_id=source_id)
-        
-        # Stat modifiers
-        elif 'stat_bonus' in effect_name.lower():
-            # Need additional data for stat name and duration
-            return None  # Will be handled by specific talent parsing
-        
-        return None
+        spec = describe_talent_effect(effect_name, effect_data, source_id)
+        return spec.to_effect() if spec else None
     
     @staticmethod
     def create_multiple_from_talent(talent_data) -> List[Effect]:
         """Create all effects from talent data."""
-        effects = []
-        
-        if not hasattr(talent_data, 'effects'):
-            return effects
-        
-        source_id = getattr(talent_data, 'id', 'unknown')
-        
-        for effect_name, effect_value in talent_data.effects.items():
-            effect = EffectFactory.create_from_talent_data(effect_name, effect_value, source_id)
-            if effect:
-                effects.append(effect)
-        
-        return effects
\ No newline at end of file
+        return [spec.to_effect() for spec in compile_talent_effects(talent_data)]
@@ -8,11 +8,16 @@ Supports multiple actions per character per turn with intelligent sequencing.
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-import heapq
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from operator import attrgetter
+
+from core.utils.logging import Logger
 
 from ..actions.action_system import Action
 
+logger = Logger.get_logger(__name__)
+
 
 class ActionPriority(Enum):
     """Priority levels for action execution."""
@@ -80,9 +85,35 @@ class ExecutionEvent:
     order: int  # Execution order (lower = earlier)
     queued_action: QueuedAction
     
+    # Tie-breakers: the unit's first-queued rank, then position in its queue
+    unit_rank: int = 0
+    sequence: int = 0
+    preview: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+    
     def __lt__(self, other):
-        """For heapq ordering."""
-        return self.order < other.order
+        """Execution ordering."""
+        return (self.order, self.unit_rank, self.sequence) < (other.order, other.unit_rank, other.sequence)
+    
+    def preview_entry(self) -> Dict[str, Any]:
+        """Timeline preview fields for this event, built once per event."""
+        if self.preview is None:
+            queued_action = self.queued_action
+            self.preview = {
+                'unit_id': queued_action.unit_id,
+                'action_name': queued_action.action.name,
+                'action_type': queued_action.action.type.value,
+                'targets': len(queued_action.targets),
+                'priority': queued_action.priority.name,
+                'execution_order': self.order,
+                'player_prediction': queued_action.player_prediction
+            }
+        return self.preview
+
+
+_event_key = attrgetter('order', 'unit_rank', 'sequence')
+
+
+DEFAULT_INITIATIVE = 50
 
 
 class ActionQueue:
@@ -94,14 +125,27 @@ class ActionQueue:
     - Initiative-based execution order
     - Prediction and planning support
     - Timeline preview for strategic planning
+    
+    The timeline is a sorted list kept in step with the unit queues:
+    queueing, removing, reordering and initiative changes insert or remove
+    each affected event by binary search, so it is never re-sorted. Preview
+    rows are kept alongside it and only renumbered after a change.
     """
     
     def __init__(self):
         # Action storage
         self.unit_queues: Dict[str, List[QueuedAction]] = defaultdict(list)
-        self.execution_timeline: List[ExecutionEvent] = []
         self.timeline_resolved = False
         
+        # Ordered timeline, its preview rows, and the event for each queued action (by id)
+        self._timeline: List[ExecutionEvent] = []
+        self._preview_rows: List[Dict[str, Any]] = []
+        self._renumber_from: Optional[int] = None  # First preview row with a stale sequence
+        self._events: Dict[int, ExecutionEvent] = {}
+        self._unit_ranks: Dict[str, int] = {}
+        self._unit_initiative: Dict[str, int] = {}
+        self._next_sequence = 0
+        
         # Turn management
         self.current_turn = 0
         self.turn_in_progress = False
@@ -113,6 +157,78 @@ class ActionQueue:
         # Prediction engine will be added later
         self.prediction_engine = None
     
+    # Timeline maintenance
+    
+    def _push_event(self, queued_action: QueuedAction, sequence: Optional[int] = None):
+        """Add or replace the timeline event for a queued action."""
+        unit_id = queued_action.unit_id
+        previous = self._events.get(id(queued_action))
+        if previous is not None:
+            self._remove(previous)
+            if sequence is None:
+                sequence = previous.sequence
+        if sequence is None:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+        
+        initiative = self._unit_initiative.get(unit_id, DEFAULT_INITIATIVE)
+        event = ExecutionEvent(
+            queued_action.get_execution_order(initiative),
+            queued_action,
+            self._unit_ranks.setdefault(unit_id, len(self._unit_ranks)),
+            sequence
+        )
+        self._events[id(queued_action)] = event
+        self._insert(event)
+        self.timeline_resolved = False
+    
+    def _drop_event(self, queued_action: QueuedAction):
+        """Remove the timeline event for a queued action."""
+        event = self._events.pop(id(queued_action), None)
+        if event is not None:
+            self._remove(event)
+            self.timeline_resolved = False
+    
+    def _insert(self, event: ExecutionEvent):
+        index = bisect_right(self._timeline, _event_key(event), key=_event_key)
+        self._timeline.insert(index, event)
+        self._preview_rows.insert(index, {'sequence': 0, **event.preview_entry()})
+        self._mark_renumber(index)
+    
+    def _remove(self, event: ExecutionEvent):
+        # Keys can tie briefly while a reorder hands sequences around
+        index = bisect_left(self._timeline, _event_key(event), key=_event_key)
+        while self._timeline[index] is not event:
+            index += 1
+        del self._timeline[index]
+        del self._preview_rows[index]
+        self._mark_renumber(index)
+    
+    def _mark_renumber(self, index: int):
+        if self._renumber_from is None or index < self._renumber_from:
+            self._renumber_from = index
+    
+    def set_unit_initiative(self, unit_id: str, initiative: int):
+        """
+        Update a unit's initiative, re-keying only that unit's actions.
+        
+        Args:
+            unit_id: Unit ID
+            initiative: New initiative value
+        """
+        previous = self._unit_initiative.get(unit_id, DEFAULT_INITIATIVE)
+        self._unit_initiative[unit_id] = initiative
+        if previous != initiative:
+            for queued_action in self.unit_queues.get(unit_id, ()):
+                self._push_event(queued_action)
+    
+    @property
+    def execution_timeline(self) -> List[ExecutionEvent]:
+        """Pending events in execution order."""
+        return self._timeline
+    
+    # Queue operations
+    
     def queue_action(self, unit_id: str, action: Action, targets: List[Any], 
                     priority: ActionPriority = ActionPriority.NORMAL,
                     player_prediction: Optional[str] = None) -> QueuedAction:
@@ -140,9 +256,9 @@ class ActionQueue:
         
         self.unit_queues[unit_id].append(queued_action)
         self.action_count += 1
-        self.timeline_resolved = False  # Need to re-resolve timeline
+        self._push_event(queued_action)
         
-        print(f"⏳ Queued action: {action.name} for unit {unit_id}")
+        logger.debug("Queued action", action=action.name, unit_id=unit_id)
         return queued_action
     
     def remove_action(self, unit_id: str, action_index: int) -> bool:
@@ -158,8 +274,8 @@ class ActionQueue:
         """
         if unit_id in self.unit_queues and 0 <= action_index < len(self.unit_queues[unit_id]):
             removed_action = self.unit_queues[unit_id].pop(action_index)
-            self.timeline_resolved = False
-            print(f"❌ Removed action: {removed_action.action.name} from unit {unit_id}")
+            self._drop_event(removed_action)
+            logger.debug("Removed action", action=removed_action.action.name, unit_id=unit_id)
             return True
         return False
     
@@ -180,29 +296,38 @@ class ActionQueue:
         
         reordered_actions = [current_actions[i] for i in new_order]
         self.unit_queues[unit_id] = reordered_actions
-        self.timeline_resolved = False
         
-        print(f"🔄 Reordered actions for unit {unit_id}")
+        # Hand the unit's existing sequence numbers out in the new order
+        sequences = sorted(self._events[id(a)].sequence for a in reordered_actions)
+        for queued_action, sequence in zip(reordered_actions, sequences):
+            if self._events[id(queued_action)].sequence != sequence:
+                self._push_event(queued_action, sequence)
+        
+        logger.debug("Reordered actions", unit_id=unit_id)
     
     def clear_unit_queue(self, unit_id: str):
         """Clear all queued actions for a unit."""
         if unit_id in self.unit_queues:
             count = len(self.unit_queues[unit_id])
+            for queued_action in self.unit_queues[unit_id]:
+                self._drop_event(queued_action)
             self.unit_queues[unit_id].clear()
-            self.timeline_resolved = False
-            print(f"🧹 Cleared {count} actions for unit {unit_id}")
+            logger.debug("Cleared unit actions", unit_id=unit_id, count=count)
     
     def clear_all_queues(self):
         """Clear all queued actions."""
-        total_actions = sum(len(queue) for queue in self.unit_queues.values())
+        total_actions = len(self._events)
         self.unit_queues.clear()
-        self.execution_timeline.clear()
+        self._timeline.clear()
+        self._preview_rows.clear()
+        self._renumber_from = None
+        self._events.clear()
         self.timeline_resolved = False
-        print(f"🧹 Cleared all {total_actions} queued actions")
+        logger.debug("Cleared all queued actions", count=total_actions)
     
     def resolve_timeline(self, unit_stats: Dict[str, Any]) -> List[ExecutionEvent]:
         """
-        Convert all queued actions into execution timeline.
+        Get the execution timeline, applying any initiative changes.
         
         Args:
             unit_stats: Dictionary mapping unit_id to unit stats (for initiative)
@@ -210,27 +335,14 @@ class ActionQueue:
         Returns:
             List of ExecutionEvent objects in execution order
         """
-        if self.timeline_resolved and self.execution_timeline:
-            return self.execution_timeline
+        for unit_id in self.unit_queues:
+            initiative = unit_stats.get(unit_id, {}).get('initiative', DEFAULT_INITIATIVE)
+            if self._unit_initiative.get(unit_id) != initiative:
+                self.set_unit_initiative(unit_id, initiative)
         
-        events = []
-        
-        for unit_id, actions in self.unit_queues.items():
-            unit_initiative = unit_stats.get(unit_id, {}).get('initiative', 50)
-            
-            for queued_action in actions:
-                execution_order = queued_action.get_execution_order(unit_initiative)
-                event = ExecutionEvent(execution_order, queued_action)
-                events.append(event)
-        
-        # Sort events by execution order
-        events.sort(key=lambda e: e.order)
-        
-        self.execution_timeline = events
+        timeline = self.execution_timeline
         self.timeline_resolved = True
-        
-        print(f"📅 Resolved timeline: {len(events)} actions in execution order")
-        return events
+        return timeline
     
     def execute_next_action(self, game_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -242,21 +354,24 @@ class ActionQueue:
         Returns:
             Execution result or None if no actions
         """
-        if not self.execution_timeline:
-            return None
-        
-        # Get next action
-        next_event = self.execution_timeline.pop(0)
-        queued_action = next_event.queued_action
-        
-        # Find the actual unit object
-        unit = game_state.get('units', {}).get(queued_action.unit_id)
-        if not unit:
-            print(f"❌ Cannot execute action: Unit {queued_action.unit_id} not found")
+        units = game_state.get('units', {})
+        while self._timeline:
+            # Take the next action off the timeline and its unit's queue
+            queued_action = self._timeline[0].queued_action
+            self._drop_event(queued_action)
+            unit_queue = self.unit_queues[queued_action.unit_id]
+            del unit_queue[next(i for i, a in enumerate(unit_queue) if a is queued_action)]
+            
+            # Find the actual unit object; actions of missing units are skipped
+            unit = units.get(queued_action.unit_id)
+            if unit:
+                break
+            logger.warning("Cannot execute action: unit not found", unit_id=queued_action.unit_id)
+        else:
             return None
         
         # Execute the action
-        print(f"▶️  Executing: {queued_action.action.name} by {queued_action.unit_id}")
+        logger.debug("Executing action", action=queued_action.action.name, unit_id=queued_action.unit_id)
         result = queued_action.action.execute(unit, queued_action.targets, game_state)
         
         # Record execution
@@ -282,43 +397,38 @@ class ActionQueue:
         """
         results = []
         
-        while self.execution_timeline:
+        while self._events:
             result = self.execute_next_action(game_state)
             if result:
                 results.append(result)
             else:
                 break
         
-        print(f"✅ Executed {len(results)} actions")
+        logger.debug("Executed actions", count=len(results))
         return results
     
     def preview_timeline(self, unit_stats: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Get preview of execution timeline without executing actions.
         
+        The row dicts are the queue's own and are renumbered in place after
+        later changes; copy them to keep a snapshot.
+        
         Args:
             unit_stats: Unit statistics for timeline resolution
             
         Returns:
             List of timeline preview data
         """
-        timeline = self.resolve_timeline(unit_stats)
-        
-        preview = []
-        for i, event in enumerate(timeline):
-            queued_action = event.queued_action
-            preview.append({
-                'sequence': i + 1,
-                'unit_id': queued_action.unit_id,
-                'action_name': queued_action.action.name,
-                'action_type': queued_action.action.type.value,
-                'targets': len(queued_action.targets),
-                'priority': queued_action.priority.name,
-                'execution_order': event.order,
-                'player_prediction': queued_action.player_prediction
-            })
-        
-        return preview
+        self.resolve_timeline(unit_stats)
+        
+        # Rows are renumbered in place from the first changed position
+        rows = self._preview_rows
+        if self._renumber_from is not None:
+            for index in range(self._renumber_from, len(rows)):
+                rows[index]['sequence'] = index + 1
+            self._renumber_from = None
+        return list(rows)
     
     def get_unit_queue_preview(self, unit_id: str) -> List[Dict[str, Any]]:
         """
@@ -349,15 +459,14 @@ class ActionQueue:
     
     def get_queue_statistics(self) -> Dict[str, Any]:
         """Get statistics about the action queue."""
-        total_queued = sum(len(queue) for queue in self.unit_queues.values())
-        
         return {
-            'total_queued_actions': total_queued,
+            'total_queued_actions': len(self._events),
             'units_with_actions': len([uid for uid, queue in self.unit_queues.items() if queue]),
             'timeline_resolved': self.timeline_resolved,
             'executed_actions': len(self.executed_actions),
             'current_turn': self.current_turn,
-            'turn_in_progress': self.turn_in_progress
+            'turn_in_progress': self.turn_in_progress,
+            'timeline_size': len(self._timeline)
         }
     
     def _calculate_prediction_bonus(self, queued_action: QueuedAction, result: Dict[str, Any]) -> Dict[str, Any]:
@@ -385,16 +494,15 @@ class ActionQueue:
         """Start a new turn."""
         self.current_turn = turn_number
         self.turn_in_progress = True
-        print(f"🎯 Started turn {turn_number}")
+        logger.info("Started turn", turn=turn_number)
     
     def end_turn(self):
         """End the current turn and cleanup."""
         # Move executed actions to history
         if self.executed_actions:
-            print(f"📜 Turn {self.current_turn} completed: {len(self.executed_actions)} actions executed")
+            logger.info("Turn completed", turn=self.current_turn, actions_executed=len(self.executed_actions))
         
-        # Reset for next turn
+        # Reset for next turn; actions still queued carry over
         self.executed_actions.clear()
-        self.execution_timeline.clear()
         self.timeline_resolved = False
         self.turn_in_progress = False
\ No newline at end of file
@@ -271,6 +271,7 @@ def highlight_talent_range(self, unit, talent_type: str, highlight_color):
     # Clear existing highlights first
     self.clear_highlights()
 
+    range_tiles = []
     for x in range(self.grid.width):
         for y in range(self.grid.height):
             # Calculate Manhattan distance from unit to tile
@@ -278,17 +279,8 @@ def highlight_talent_range(self, unit, talent_type: str, highlight_color):
 
             # Highlight tiles within talent range (excluding unit's own tile)
             if distance <= talent_range and distance > 0:
-                # Check if tile is within grid bounds
-                if 0 <= x < self.grid.width and 0 <= y < self.grid.height:
-                    # Create highlight overlay entity with type-specific color
-                    highlight = Entity(
-                        model='cube',
-                        color=highlight_color,
-                        scale=(0.9, 0.2, 0.9),
-                        position=(x + 0.5, 0, y + 0.5),  # Same height as grid tiles
-                        alpha=1.0  # Same transparency as standard highlighting
-                    )
-                    # Store in a list for cleanup
-                    if not hasattr(self, 'highlight_entities'):
-                        self.highlight_entities = []
-                    self.highlight_entities.append(highlight)
+                range_tiles.append((x, y))
+
+    # Talent ranges share the magic layer, with the type-specific color
+    self.tile_layers.layers.set_layer('magic', range_tiles, highlight_color)
+    self.tile_layers.render()
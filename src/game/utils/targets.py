@@ -148,6 +148,7 @@ def target_highlight_magic_range_no_clear(self, unit):
     if not unit:
         return
         
+    range_tiles = []
     for x in range(self.grid.width):
         for y in range(self.grid.height):
             # Calculate Manhattan distance from unit to tile
@@ -155,20 +156,10 @@ def target_highlight_magic_range_no_clear(self, unit):
                 
             # Highlight tiles within magic range (excluding unit's own tile)
             if distance <= unit.magic_range and distance > 0:
-                # Check if tile is within grid bounds
-                if 0 <= x < self.grid.width and 0 <= y < self.grid.height:
-                    # Create highlight overlay entity
-                    highlight = Entity(
-                        model='cube',
-                        color=color.blue,
-                        scale=(0.9, 0.2, 0.9),
-                        position=(x + 0.5, 0, y + 0.5),  # Same height as grid tiles
-                        alpha=1.0  # Same transparency as grid
-                    )
-                    # Store in a list for cleanup
-                    if not hasattr(self, 'highlight_entities'):
-                        self.highlight_entities = []
-                    self.highlight_entities.append(highlight)
+                range_tiles.append((x, y))
+    
+    self.tile_layers.layers.add_tiles('magic', range_tiles, color.blue)
+    self.tile_layers.render()
     
 def target_highlight_talent_range_no_clear(self, unit, talent_type: str, highlight_color):
     """Highlight the talent-specific range around the unit (without clearing existing highlights)."""
@@ -179,6 +170,7 @@ def target_highlight_talent_range_no_clear(self, unit, talent_type: str, highlig
     talent_config = get_talent_type_config()
     talent_range = getattr(unit, '_talent_magic_range', talent_config.get_default_range(talent_type))
         
+    range_tiles = []
     for x in range(self.grid.width):
         for y in range(self.grid.height):
             # Calculate Manhattan distance from unit to tile
@@ -186,17 +178,7 @@ def target_highlight_talent_range_no_clear(self, unit, talent_type: str, highlig
                 
             # Highlight tiles within talent range (excluding unit's own tile)
             if distance <= talent_range and distance > 0:
-                # Check if tile is within grid bounds
-                if 0 <= x < self.grid.width and 0 <= y < self.grid.height:
-                    # Create highlight overlay entity with type-specific color
-                    highlight = Entity(
-                        model='cube',
-                        color=highlight_color,
-                        scale=(0.9, 0.2, 0.9),
-                        position=(x + 0.5, 0, y + 0.5),  # Same height as grid tiles
-                        alpha=1.0  # Same transparency as standard highlighting
-                    )
-                    # Store in a list for cleanup
-                    if not hasattr(self, 'highlight_entities'):
-                        self.highlight_entities = []
-                    self.highlight_entities.append(highlight)
+                range_tiles.append((x, y))
+    
+    self.tile_layers.layers.add_tiles('magic', range_tiles, highlight_color)
+    self.tile_layers.render()
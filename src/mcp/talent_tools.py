@@ -22,7 +22,7 @@ try:
         ErrorResponse, GameStateResponse
     )
     from ..game.controllers.tactical_rpg_controller import TacticalRPG
-    from ..core.assets.data_manager import get_data_manager
+    from ..core.assets.catalog import get_catalog
     MODELS_AVAILABLE = True
 except ImportError:
     MODELS_AVAILABLE = False
@@ -270,24 +270,13 @@ async def get_talent_synergies_mcp(
 async def _get_talent_data(talent_id: str) -> Optional[Dict[str, Any]]:
     """Get talent data from asset system."""
     try:
-        data_manager = get_data_manager()
-        all_talents = data_manager.get_all_talents()
+        talent = get_catalog().talent(talent_id)
+        if talent is None:
+            return None
         
-        for talent in all_talents:
-            if talent.id == talent_id:
-                return {
-                    'id': talent.id,
-                    'name': talent.name,
-                    'action_type': talent.action_type,
-                    'level': talent.level,
-                    'tier': talent.tier,
-                    'description': talent.description,
-                    'effects': talent.effects,
-                    'cost': talent.cost,
-                    'requirements': talent.requirements
-                }
-        
-        return None
+        talent_data = talent.to_dict()
+        del talent_data['tree']
+        return talent_data
         
     except Exception as e:
         print(f"⚠️ Error getting talent data: {e}")
@@ -9,12 +9,15 @@ import time
 import threading
 import weakref
 from typing import Any, Dict, List, Optional, Callable, Tuple, Union
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, is_dataclass, fields
 from enum import Enum
 from collections import OrderedDict, defaultdict
 import hashlib
+import heapq
+import itertools
 import pickle
 import functools
+import sys
 
 
 class CacheStrategy(Enum):
@@ -38,6 +41,11 @@ class CacheEntry:
     ttl: Optional[float] = None
     dependencies: List[str] = field(default_factory=list)
     
+    @property
+    def expires_at(self) -> float:
+        """Absolute expiry time (infinite without a TTL)."""
+        return self.created_time + self.ttl if self.ttl is not None else float('inf')
+    
     @property
     def is_expired(self) -> bool:
         """Check if entry has expired."""
@@ -60,6 +68,7 @@ class CacheStats:
     invalidations: int = 0
     memory_used: int = 0
     total_entries: int = 0
+    uncacheable_calls: int = 0  # Calls that bypassed the cache (no value-based key)
     
     @property
     def hit_ratio(self) -> float:
@@ -68,6 +77,86 @@ class CacheStats:
         return self.hits / total if total > 0 else 0.0
 
 
+# Samples per container when estimating size
+SIZE_SAMPLE = 4
+
+# Candidates scored per adaptive eviction
+ADAPTIVE_SAMPLE = 8
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Cheap size estimate: shallow size plus a sampled average of the first
+    few items for containers. Constant time regardless of value size.
+    """
+    size = sys.getsizeof(value)
+    
+    if isinstance(value, dict):
+        count = len(value)
+        if count:
+            sampled = sum(map(sys.getsizeof, itertools.islice(value, SIZE_SAMPLE)))
+            sampled += sum(map(sys.getsizeof, itertools.islice(value.values(), SIZE_SAMPLE)))
+            size += sampled * count // min(count, SIZE_SAMPLE)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        count = len(value)
+        if count:
+            sampled = sum(map(sys.getsizeof, itertools.islice(value, SIZE_SAMPLE)))
+            size += sampled * count // min(count, SIZE_SAMPLE)
+    elif hasattr(value, '__dict__'):
+        size += sys.getsizeof(value.__dict__)
+    return size
+
+
+def pickled_size(value: Any) -> int:
+    """Exact serialized size; slow, for callers that need precise accounting."""
+    try:
+        return len(pickle.dumps(value))
+    except Exception:
+        # Fallback for non-pickleable objects
+        return 64  # Rough estimate
+
+
+_PRIMITIVES = (str, int, float, bool, bytes, type(None))
+
+
+class UncacheableArgument(TypeError):
+    """A call argument has no value-based cache key."""
+
+
+def _stable_token(value: Any) -> Any:
+    """
+    Normalize a call argument into a value with a stable repr.
+    
+    Primitives and containers are kept structurally; enums use their value,
+    dataclasses their fields, classes their qualified name. Anything else is
+    refused with UncacheableArgument: a hash alone can't tell unequal
+    objects apart, and an identity hash hits whatever object reuses the
+    address.
+    """
+    if isinstance(value, _PRIMITIVES):
+        return value
+    if isinstance(value, Enum):
+        return (type(value).__qualname__, value.value)
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(_stable_token(item) for item in value)
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted(
+            ((_stable_token(k), _stable_token(v)) for k, v in value.items()), key=repr
+        ))
+    if isinstance(value, (set, frozenset)):
+        return ('set',) + tuple(sorted((_stable_token(item) for item in value), key=repr))
+    if is_dataclass(value) and not isinstance(value, type):
+        return (type(value).__qualname__,) + tuple(
+            _stable_token(getattr(value, f.name)) for f in fields(value)
+        )
+    if isinstance(value, type):
+        return ('type', value.__module__, value.__qualname__)
+    raise UncacheableArgument(
+        f"{type(value).__qualname__} argument has no value-based cache key; "
+        f"pass key= to cached_function"
+    )
+
+
 class CacheManager:
     """
     Advanced cache manager with multiple strategies and intelligent features.
@@ -86,16 +175,25 @@ class CacheManager:
                  strategy: CacheStrategy = CacheStrategy.LRU,
                  max_size: int = 1000,
                  max_memory_mb: int = 100,
-                 default_ttl: Optional[float] = None):
+                 default_ttl: Optional[float] = None,
+                 size_estimator: Optional[Callable[[Any], int]] = estimate_size):
         self.strategy = strategy
         self.max_size = max_size
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.default_ttl = default_ttl
+        self.size_estimator = size_estimator  # None disables memory accounting
         
         # Storage
         self.cache: Dict[str, CacheEntry] = {}
-        self.access_order: OrderedDict = OrderedDict()  # For LRU
-        self.access_frequency: Dict[str, int] = defaultdict(int)  # For LFU
+        self.access_order: OrderedDict = OrderedDict()  # Insertion order; recency order for LRU
+        
+        # LFU: access count -> keys at that count (oldest first)
+        self.frequency_buckets: Dict[int, OrderedDict] = defaultdict(OrderedDict)
+        self.min_frequency = 0
+        
+        # Expiry heap of (expires_at, sequence, key); stale items are skipped lazily
+        self.expiry_heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
         
         # Dependency tracking
         self.dependencies: Dict[str, List[str]] = defaultdict(list)  # key -> dependents
@@ -126,50 +224,67 @@ class CacheManager:
         self._cleanup_thread.start()
     
     def _cleanup_expired(self):
-        """Remove expired entries."""
+        """Remove expired entries, popping only the expired prefix of the heap."""
         with self.lock:
-            expired_keys = [
-                key for key, entry in self.cache.items()
-                if entry.is_expired
-            ]
-            
-            for key in expired_keys:
-                self._remove_entry(key)
-                self.stats.evictions += 1
+            now = time.time()
+            while self.expiry_heap and self.expiry_heap[0][0] <= now:
+                expires_at, _, key = heapq.heappop(self.expiry_heap)
+                entry = self.cache.get(key)
+                if entry is not None and entry.expires_at == expires_at:
+                    self._remove_entry(key)
+                    self.stats.evictions += 1
     
     def _calculate_size(self, value: Any) -> int:
         """Estimate memory size of value."""
-        try:
-            return len(pickle.dumps(value))
-        except:
-            # Fallback for non-pickleable objects
-            return 64  # Rough estimate
+        if self.size_estimator is None:
+            return 0
+        return self.size_estimator(value)
     
-    def _generate_key(self, func: Callable, args: tuple, kwargs: dict) -> str:
-        """Generate cache key for function call."""
-        # Create a hashable representation
-        key_data = {
-            'func': f"{func.__module__}.{func.__name__}",
-            'args': args,
-            'kwargs': sorted(kwargs.items())
-        }
-        
-        # Use hash for compact key
-        key_str = str(key_data)
-        return hashlib.md5(key_str.encode()).hexdigest()
+    def _generate_key(self, func: Callable, args: tuple, kwargs: dict,
+                      key_func: Optional[Callable[..., Any]] = None) -> str:
+        """
+        Generate cache key for function call.
+        
+        Keys are ``module.qualname:<args>``, with the argument part hashed
+        once it gets long. Arguments (or ``key_func``'s result) are normalized
+        first so keys do not depend on object addresses; raises
+        UncacheableArgument when they can't be.
+        """
+        prefix = f"{func.__module__}.{func.__qualname__}:"
+        if key_func is not None:
+            token = repr(_stable_token(key_func(*args, **kwargs)))
+        elif kwargs:
+            token = repr((_stable_token(args), _stable_token(kwargs)))
+        else:
+            token = repr(_stable_token(args))
+        
+        if len(token) > 96:
+            token = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+        return prefix + token
     
     def _update_access_tracking(self, key: str):
         """Update access tracking for different strategies."""
         entry = self.cache[key]
         entry.last_accessed = time.time()
-        entry.access_count += 1
         
         # Update strategy-specific tracking
-        if self.strategy == CacheStrategy.LRU:
+        if self.strategy in (CacheStrategy.LRU, CacheStrategy.ADAPTIVE):
             # Move to end (most recently used)
             self.access_order.move_to_end(key)
         elif self.strategy == CacheStrategy.LFU:
-            self.access_frequency[key] += 1
+            self._bump_frequency(key, entry.access_count)
+        
+        entry.access_count += 1
+    
+    def _bump_frequency(self, key: str, count: int):
+        """Move a key to the next LFU bucket."""
+        bucket = self.frequency_buckets[count]
+        bucket.pop(key, None)
+        if not bucket:
+            del self.frequency_buckets[count]
+            if self.min_frequency == count:
+                self.min_frequency = count + 1
+        self.frequency_buckets[count + 1][key] = None
     
     def _should_evict(self) -> bool:
         """Check if eviction is needed."""
@@ -186,19 +301,24 @@ class CacheManager:
             return next(iter(self.access_order))
         
         elif self.strategy == CacheStrategy.LFU:
-            # Remove least frequently used
-            return min(self.cache.keys(), 
-                      key=lambda k: self.access_frequency[k])
+            # Oldest key in the lowest non-empty frequency bucket
+            if self.min_frequency not in self.frequency_buckets:
+                self.min_frequency = min(self.frequency_buckets)
+            return next(iter(self.frequency_buckets[self.min_frequency]))
         
         elif self.strategy == CacheStrategy.FIFO:
             # Remove oldest entry
-            return min(self.cache.keys(), 
-                      key=lambda k: self.cache[k].created_time)
+            return next(iter(self.access_order))
         
         elif self.strategy == CacheStrategy.TTL:
-            # Remove entry closest to expiration
-            return min(self.cache.keys(), 
-                      key=lambda k: self.cache[k].created_time + (self.cache[k].ttl or float('inf')))
+            # Remove entry closest to expiration; entries without TTL go oldest-first
+            while self.expiry_heap:
+                expires_at, _, key = self.expiry_heap[0]
+                entry = self.cache.get(key)
+                if entry is not None and entry.expires_at == expires_at:
+                    return key
+                heapq.heappop(self.expiry_heap)
+            return next(iter(self.access_order))
         
         elif self.strategy == CacheStrategy.ADAPTIVE:
             # Adaptive strategy based on access patterns
@@ -207,13 +327,19 @@ class CacheManager:
         return next(iter(self.cache))  # Fallback
     
     def _adaptive_eviction_key(self) -> str:
-        """Adaptive eviction based on access patterns."""
+        """
+        Adaptive eviction based on access patterns.
+        
+        Scores only the least recently used few entries instead of the
+        whole cache, which approximates the full scan in constant time.
+        """
         current_time = time.time()
         
         # Score entries based on recency, frequency, and size
         scored_keys = []
         
-        for key, entry in self.cache.items():
+        for key in itertools.islice(self.access_order, ADAPTIVE_SAMPLE):
+            entry = self.cache[key]
             recency_score = 1.0 / (current_time - entry.last_accessed + 1)
             frequency_score = entry.access_count / max(entry.age, 1)
             size_penalty = entry.size_bytes / (1024 * 1024)  # MB penalty
@@ -225,6 +351,14 @@ class CacheManager:
         # Return key with lowest score
         return min(scored_keys)[1]
     
+    def _compact_expiry_heap(self):
+        """Drop stale heap items left behind by removed or replaced entries."""
+        self.expiry_heap = [
+            item for item in self.expiry_heap
+            if item[2] in self.cache and self.cache[item[2]].expires_at == item[0]
+        ]
+        heapq.heapify(self.expiry_heap)
+    
     def _remove_entry(self, key: str):
         """Remove entry and clean up tracking."""
         if key not in self.cache:
@@ -234,10 +368,15 @@ class CacheManager:
         self.stats.memory_used -= entry.size_bytes
         self.stats.total_entries -= 1
         
-        # Clean up tracking
+        # Clean up tracking; stale expiry heap items are skipped when popped
         del self.cache[key]
         self.access_order.pop(key, None)
-        self.access_frequency.pop(key, None)
+        if self.strategy == CacheStrategy.LFU:
+            bucket = self.frequency_buckets.get(entry.access_count)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self.frequency_buckets[entry.access_count]
         
         # Clean up dependencies
         self._remove_dependencies(key)
@@ -293,6 +432,10 @@ class CacheManager:
             True if successfully cached
         """
         with self.lock:
+            # Remove existing entry if present
+            if key in self.cache:
+                self._remove_entry(key)
+            
             # Check if eviction is needed
             while self._should_evict():
                 evict_key = self._select_eviction_key()
@@ -317,16 +460,20 @@ class CacheManager:
                 dependencies=dependencies or []
             )
             
-            # Remove existing entry if present
-            if key in self.cache:
-                self._remove_entry(key)
-            
             # Add new entry
             self.cache[key] = entry
             self.access_order[key] = True
             self.stats.memory_used += size_bytes
             self.stats.total_entries += 1
             
+            if self.strategy == CacheStrategy.LFU:
+                self.frequency_buckets[0][key] = None
+                self.min_frequency = 0
+            if entry.ttl is not None:
+                heapq.heappush(self.expiry_heap, (entry.expires_at, next(self._sequence), key))
+                if len(self.expiry_heap) > 2 * len(self.cache) + 64:
+                    self._compact_expiry_heap()
+            
             # Set up dependencies
             if dependencies:
                 self.dependents[key] = dependencies.copy()
@@ -391,6 +538,26 @@ class CacheManager:
             
             return count
     
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Invalidate all keys starting with prefix.
+        
+        Args:
+            prefix: Key prefix, e.g. a cached function's ``module.qualname:``
+            
+        Returns:
+            Number of entries invalidated
+        """
+        with self.lock:
+            matching_keys = [key for key in self.cache.keys() if key.startswith(prefix)]
+            
+            count = 0
+            for key in matching_keys:
+                if self.invalidate(key):
+                    count += 1
+            
+            return count
+    
     def warm_cache(self, func: Callable, param_sets: List[Tuple[tuple, dict]]):
         """
         Warm cache by pre-computing function results.
@@ -416,19 +583,31 @@ class CacheManager:
     
     def cached_function(self, 
                        ttl: Optional[float] = None,
-                       dependencies: Optional[List[str]] = None):
+                       dependencies: Optional[List[str]] = None,
+                       key: Optional[Callable[..., Any]] = None):
         """
         Decorator for caching function results.
         
+        Calls whose arguments have no value-based key run uncached unless
+        ``key`` maps the arguments to one.
+        
         Args:
             ttl: Time to live for cached results
             dependencies: Static dependencies for all calls
+            key: Maps the call's arguments to a value-based cache key
         """
+        key_func = key
+        
         def decorator(func: Callable) -> Callable:
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
                 # Generate cache key
-                key = self._generate_key(func, args, kwargs)
+                try:
+                    key = self._generate_key(func, args, kwargs, key_func)
+                except UncacheableArgument:
+                    with self.lock:
+                        self.stats.uncacheable_calls += 1
+                    return func(*args, **kwargs)
                 
                 # Try to get from cache
                 result = self.get(key)
@@ -444,10 +623,16 @@ class CacheManager:
                 return result
             
             # Add cache control methods to function
-            wrapper.cache_invalidate = lambda *args, **kwargs: self.invalidate(
-                self._generate_key(func, args, kwargs)
+            def cache_invalidate(*args, **kwargs) -> bool:
+                try:
+                    return self.invalidate(self._generate_key(func, args, kwargs, key_func))
+                except UncacheableArgument:
+                    return False
+            
+            wrapper.cache_invalidate = cache_invalidate
+            wrapper.cache_clear = lambda: self.invalidate_prefix(
+                f"{func.__module__}.{func.__qualname__}:"
             )
-            wrapper.cache_clear = lambda: self.invalidate_pattern(func.__name__)
             
             return wrapper
         return decorator
@@ -461,7 +646,8 @@ class CacheManager:
                 evictions=self.stats.evictions,
                 invalidations=self.stats.invalidations,
                 memory_used=self.stats.memory_used,
-                total_entries=len(self.cache)
+                total_entries=len(self.cache),
+                uncacheable_calls=self.stats.uncacheable_calls
             )
     
     def clear(self):
@@ -469,7 +655,9 @@ class CacheManager:
         with self.lock:
             self.cache.clear()
             self.access_order.clear()
-            self.access_frequency.clear()
+            self.frequency_buckets.clear()
+            self.min_frequency = 0
+            self.expiry_heap.clear()
             self.dependencies.clear()
             self.dependents.clear()
             self.stats = CacheStats()
@@ -9,10 +9,13 @@ Provides visual previews and predictions for actions in the queue:
 - AI confidence indicators
 """
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 import math
+import random
+import threading
 
 try:
     from ursina import *
@@ -28,9 +31,23 @@ except ImportError:
         def __init__(self, **kwargs): 
             self.text = kwargs.get('text', '')
 
-from game.managers.action_manager import ActionManager
 from game.actions.action_system import Action
 from game.effects.effect_system import EffectType, DamageType
+from core.utils.logging import Logger
+from core.utils.lru_cache import LRUCache
+from core.utils.stat_cache import DerivedStatCache
+
+if TYPE_CHECKING:
+    # Not in the tree yet; the engine only needs action_registry and game_controller
+    from game.managers.action_manager import ActionManager
+
+logger = Logger.get_logger(__name__)
+
+# Unit attributes predictions read; fingerprinted for units without a stat_version
+PREDICTION_INPUTS = (
+    'hp', 'max_hp', 'mp', 'max_mp', 'rage', 'max_rage', 'kwan', 'max_kwan', 'alive',
+    'physical_defense', 'magical_defense', 'spiritual_defense'
+)
 
 
 class PredictionType(Enum):
@@ -76,6 +93,10 @@ class BattleStatePrediction:
     victory_probability: float = 0.5
     estimated_turns_remaining: int = 10
     key_changes: List[str] = field(default_factory=list)
+    
+    # Monte Carlo refinement progress
+    samples: int = 0
+    complete: bool = False
 
 
 class ActionPredictionEngine:
@@ -88,9 +109,16 @@ class ActionPredictionEngine:
     - Resource cost/benefit analysis
     - Multi-step battle outcome projections
     - AI confidence integration
+    
+    Effect predictions are cached under the action and its version, caster
+    and target together with each unit's stat_version and the derived-stat
+    generation (bumped on configuration reload), so a hover is a cache hit
+    until one of those inputs changes. Battle outcomes come from Monte Carlo
+    rollouts on a background worker that publishes progressively refined
+    estimates; predict_battle_state only reads the latest one.
     """
     
-    def __init__(self, action_manager: ActionManager):
+    def __init__(self, action_manager: 'ActionManager'):
         self.action_manager = action_manager
         self.game_controller = action_manager.game_controller
         
@@ -100,8 +128,18 @@ class ActionPredictionEngine:
         self.confidence_threshold = 0.7
         
         # Cache for expensive calculations
-        self.prediction_cache: Dict[str, ActionPrediction] = {}
-        self.battle_state_cache: Dict[str, BattleStatePrediction] = {}
+        self.prediction_cache = LRUCache(max_size=512)
+        self.battle_state_cache: Dict[Tuple, BattleStatePrediction] = {}
+        
+        # Monte Carlo battle rollouts
+        self.rollout_batch = 32      # Rollouts per published refinement
+        self.max_rollouts = 512      # Rollouts before an estimate is complete
+        self.max_battle_states = 16  # Battle states whose estimates are kept
+        self._rollout_lock = threading.Lock()
+        self._rollout_executor: Optional[ThreadPoolExecutor] = None
+        self._rollout_future: Optional[Future] = None
+        self._rollout_key: Optional[Tuple] = None
+        self._rollout_generation = 0
         
         print("🔮 Action Prediction Engine initialized")
     
@@ -129,17 +167,30 @@ class ActionPredictionEngine:
         if not caster:
             return predictions
         
-        # Predict for each target
+        # Predict for each target, reusing predictions whose inputs are unchanged
         for target_id in target_ids:
             target = self.game_controller.units.get(target_id)
             if not target:
                 continue
             
-            target_predictions = self._predict_for_target(action, caster, target)
+            key = (action_id, action.version, self.damage_variance, DerivedStatCache.generation,
+                   caster_id, self._unit_version(caster), target_id, self._unit_version(target))
+            target_predictions = self.prediction_cache.get(key)
+            if target_predictions is None:
+                target_predictions = self._predict_for_target(action, caster, target)
+                self.prediction_cache.put(key, target_predictions)
             predictions.extend(target_predictions)
         
         return predictions
     
+    @staticmethod
+    def _unit_version(unit: Any) -> Any:
+        """Version of the unit inputs predictions read"""
+        version = getattr(unit, 'stat_version', None)
+        if version is not None:
+            return version
+        return tuple(getattr(unit, name, None) for name in PREDICTION_INPUTS)
+    
     def _predict_for_target(self, action: Action, caster: Any, target: Any) -> List[ActionPrediction]:
         """Predict action effects for a specific target."""
         predictions = []
@@ -293,51 +344,120 @@ class ActionPredictionEngine:
         """
         Predict battle state after executing queued actions.
         
+        Never blocks: returns the latest Monte Carlo estimate for the current
+        battle state and starts or continues refining it in the background.
+        Until the first batch lands, the estimate reflects the current state
+        with ``samples == 0``.
+        
         Args:
             turns_ahead: How many turns to simulate ahead
             
         Returns:
             BattleStatePrediction with projected outcomes
         """
-        # Create a copy of current game state for simulation
-        simulated_states = self._simulate_battle_turns(turns_ahead)
-        
-        if not simulated_states:
-            return BattleStatePrediction(turn_number=0)
-        
-        final_state = simulated_states[-1]
-        
-        # Analyze final state
-        victory_prob = self._calculate_victory_probability(final_state)
-        estimated_turns = self._estimate_remaining_turns(final_state)
-        key_changes = self._identify_key_changes(final_state)
-        
+        state = self._get_current_battle_state()
+        key = (turns_ahead, self._state_fingerprint(state))
+        
+        with self._rollout_lock:
+            estimate = self.battle_state_cache.get(key)
+        
+        if estimate is None or not estimate.complete:
+            self._ensure_rollout(key, state, turns_ahead)
+        
+        if estimate is None:
+            return BattleStatePrediction(
+                turn_number=0,
+                unit_states=state,
+                victory_probability=self._calculate_victory_probability(state),
+                estimated_turns_remaining=self._estimate_remaining_turns(state),
+                key_changes=self._identify_key_changes(state)
+            )
+        return estimate
+    
+    def _state_fingerprint(self, state: Dict[str, Any]) -> Tuple:
+        return tuple(sorted(
+            (unit_id, data['hp'], data['mp'], data['alive'], data['attack'], data['defense'])
+            for unit_id, data in state.items()
+        ))
+    
+    def _ensure_rollout(self, key: Tuple, state: Dict[str, Any], turns: int):
+        """Start a background rollout for ``key`` unless one is already running."""
+        with self._rollout_lock:
+            if self._rollout_key == key and self._rollout_future and not self._rollout_future.done():
+                return
+            
+            # A newer battle state supersedes any rollout in progress
+            self._rollout_generation += 1
+            self._rollout_key = key
+            if self._rollout_executor is None:
+                self._rollout_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="battle-rollout")
+            self._rollout_future = self._rollout_executor.submit(
+                self._run_rollouts, key, state, turns, self._rollout_generation
+            )
+    
+    def _run_rollouts(self, key: Tuple, state: Dict[str, Any], turns: int, generation: int):
+        """Worker: run rollouts, logging failures nobody reads from the Future."""
+        try:
+            self._refine_estimate(key, state, turns, generation)
+        except Exception as e:
+            logger.error("Battle rollout failed", turns=turns, units=len(state), error=repr(e))
+            raise
+    
+    def _refine_estimate(self, key: Tuple, state: Dict[str, Any], turns: int, generation: int):
+        """Run rollouts in batches, publishing a refined estimate after each."""
+        rng = random.Random(hash(key))
+        totals = _RolloutTotals(state)
+        
+        while totals.samples < self.max_rollouts:
+            if generation != self._rollout_generation:
+                return
+            
+            for _ in range(self.rollout_batch):
+                totals.add(self._simulate_battle_turns(state, turns, rng))
+            
+            estimate = self._summarize_rollouts(totals, complete=totals.samples >= self.max_rollouts)
+            with self._rollout_lock:
+                if generation != self._rollout_generation:
+                    return
+                self.battle_state_cache.pop(key, None)
+                self.battle_state_cache[key] = estimate
+                while len(self.battle_state_cache) > self.max_battle_states:
+                    del self.battle_state_cache[next(iter(self.battle_state_cache))]
+    
+    def _summarize_rollouts(self, totals: '_RolloutTotals', complete: bool) -> BattleStatePrediction:
+        expected_state = totals.expected_state()
         return BattleStatePrediction(
-            turn_number=len(simulated_states),
-            unit_states=final_state,
-            victory_probability=victory_prob,
-            estimated_turns_remaining=estimated_turns,
-            key_changes=key_changes
+            turn_number=round(totals.turns / totals.samples),
+            unit_states=expected_state,
+            victory_probability=totals.victory_score / totals.samples,
+            estimated_turns_remaining=round(totals.remaining_turns / totals.samples),
+            key_changes=self._identify_key_changes(expected_state),
+            samples=totals.samples,
+            complete=complete
         )
     
-    def _simulate_battle_turns(self, turns: int) -> List[Dict[str, Any]]:
-        """Simulate battle turns to predict outcomes."""
-        simulated_states = []
+    def _simulate_battle_turns(self, state: Dict[str, Any], turns: int,
+                               rng: random.Random) -> Tuple[Dict[str, Any], int, float, int]:
+        """
+        One rollout of up to ``turns`` turns from ``state``.
         
-        # Get current state
-        current_state = self._get_current_battle_state()
+        Returns:
+            (final state, turns simulated, victory score, estimated turns remaining)
+        """
+        current_state = {unit_id: dict(data) for unit_id, data in state.items()}
         
+        simulated = 0
         for turn in range(turns):
-            # Simulate action execution
-            new_state = self._simulate_turn_actions(current_state)
-            simulated_states.append(new_state)
-            current_state = new_state
+            self._simulate_turn_actions(current_state, rng)
+            simulated += 1
             
             # Check for battle end conditions
-            if self._is_battle_ended(new_state):
-                break
+            if self._is_battle_ended(current_state):
+                player_alive = any(unit['alive'] for unit in current_state.values() if unit['team'] == 'player')
+                return current_state, simulated, 1.0 if player_alive else 0.0, 0
         
-        return simulated_states
+        return (current_state, simulated, self._calculate_victory_probability(current_state),
+                self._estimate_remaining_turns(current_state))
     
     def _get_current_battle_state(self) -> Dict[str, Any]:
         """Get current battle state for simulation."""
@@ -350,29 +470,32 @@ class ActionPredictionEngine:
                 'mp': getattr(unit, 'mp', 0),
                 'max_mp': getattr(unit, 'max_mp', 0),
                 'alive': getattr(unit, 'alive', True),
-                'team': 'player' if unit in self.game_controller.player_units else 'enemy'
+                'team': 'player' if unit in self.game_controller.player_units else 'enemy',
+                'attack': max(getattr(unit, 'physical_attack', 0), getattr(unit, 'magical_attack', 0),
+                              getattr(unit, 'spiritual_attack', 0)),
+                'defense': (getattr(unit, 'physical_defense', 0) + getattr(unit, 'magical_defense', 0)
+                            + getattr(unit, 'spiritual_defense', 0)) / 3
             }
         
         return state
     
-    def _simulate_turn_actions(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Simulate the execution of one turn's actions."""
-        # This is a simplified simulation
-        # In a full implementation, this would execute queued actions
-        # and apply their effects to the simulated state
-        
-        new_state = state.copy()
-        
-        # Apply some damage to simulate combat
-        for unit_id, unit_data in new_state.items():
-            if unit_data['alive'] and unit_data['team'] == 'player':
-                # Simulate taking damage
-                damage = 10  # Simplified damage
-                unit_data['hp'] = max(0, unit_data['hp'] - damage)
-                if unit_data['hp'] <= 0:
-                    unit_data['alive'] = False
-        
-        return new_state
+    def _simulate_turn_actions(self, state: Dict[str, Any], rng: random.Random):
+        """Simulate one turn in place: each living unit attacks a random living enemy."""
+        for unit_id, unit_data in state.items():
+            if not unit_data['alive']:
+                continue
+            
+            enemies = [data for data in state.values()
+                       if data['alive'] and data['team'] != unit_data['team']]
+            if not enemies:
+                return
+            
+            target = rng.choice(enemies)
+            base_damage = max(1, unit_data['attack'] - target['defense']) if unit_data['attack'] else 10
+            damage = base_damage * rng.uniform(1 - self.damage_variance, 1 + self.damage_variance)
+            target['hp'] = max(0, target['hp'] - damage)
+            if target['hp'] <= 0:
+                target['alive'] = False
     
     def _calculate_victory_probability(self, state: Dict[str, Any]) -> float:
         """Calculate probability of player victory based on state."""
@@ -384,7 +507,7 @@ class ActionPredictionEngine:
                 continue
             
             # Simple strength calculation based on HP percentage
-            strength = unit_data['hp'] / unit_data['max_hp']
+            strength = unit_data['hp'] / unit_data['max_hp'] if unit_data['max_hp'] else 0
             
             if unit_data['team'] == 'player':
                 player_strength += strength
@@ -419,7 +542,7 @@ class ActionPredictionEngine:
         
         # Check for low health units
         for unit_id, unit_data in state.items():
-            if unit_data['alive'] and unit_data['hp'] / unit_data['max_hp'] < 0.3:
+            if unit_data['alive'] and unit_data['max_hp'] and unit_data['hp'] / unit_data['max_hp'] < 0.3:
                 changes.append(f"{unit_id} critically wounded")
         
         return changes
@@ -434,8 +557,65 @@ class ActionPredictionEngine:
     def clear_cache(self):
         """Clear prediction cache."""
         self.prediction_cache.clear()
-        self.battle_state_cache.clear()
+        with self._rollout_lock:
+            self._rollout_generation += 1
+            self._rollout_key = None
+            self.battle_state_cache.clear()
         print("🔮 Prediction cache cleared")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prediction cache and rollout statistics."""
+        with self._rollout_lock:
+            rollout_running = bool(self._rollout_future and not self._rollout_future.done())
+            battle_states = len(self.battle_state_cache)
+        return {
+            'predictions': self.prediction_cache.get_stats(),
+            'battle_states_cached': battle_states,
+            'rollout_running': rollout_running
+        }
+    
+    def shutdown(self):
+        """Stop the background rollout worker."""
+        with self._rollout_lock:
+            self._rollout_generation += 1
+            executor, self._rollout_executor = self._rollout_executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+
+class _RolloutTotals:
+    """Running sums over Monte Carlo rollouts of one battle state"""
+    
+    def __init__(self, state: Dict[str, Any]):
+        self.initial = state
+        self.samples = 0
+        self.turns = 0
+        self.victory_score = 0.0
+        self.remaining_turns = 0
+        self.hp = {unit_id: 0.0 for unit_id in state}
+        self.alive = {unit_id: 0 for unit_id in state}
+    
+    def add(self, rollout: Tuple[Dict[str, Any], int, float, int]):
+        final_state, turns, victory_score, remaining = rollout
+        self.samples += 1
+        self.turns += turns
+        self.victory_score += victory_score
+        self.remaining_turns += remaining
+        for unit_id, data in final_state.items():
+            self.hp[unit_id] += data['hp']
+            self.alive[unit_id] += data['alive']
+    
+    def expected_state(self) -> Dict[str, Any]:
+        """Mean HP per unit; alive if it survived at least half the rollouts"""
+        return {
+            unit_id: {
+                **data,
+                'hp': self.hp[unit_id] / self.samples,
+                'alive': self.alive[unit_id] * 2 >= self.samples,
+                'survival_probability': self.alive[unit_id] / self.samples
+            }
+            for unit_id, data in self.initial.items()
+        }
 
 
 class PredictionDisplayWidget:
@@ -18,6 +18,7 @@ from core.ecs.entity import Entity as GameEntity
 from core.math.vector import Vector2Int, Vector3
 from core.math.grid import TacticalGrid
 from core.math.pathfinding import AStarPathfinder
+from core.math.reachability import RangeCache, TileMask, attack_mask, reachable_mask
 
 from .interactive_tile import InteractiveTile, TileState
 from .action_modal import ActionModal, ActionModalManager, ActionOption
@@ -61,6 +62,10 @@ class InteractionManager:
         self.tiles: Dict[Vector2Int, InteractiveTile] = {}
         self.unit_positions: Dict[GameEntity, Vector2Int] = {}
         
+        # Range masks per unit, valid until the grid or a unit position changes
+        self._range_cache = RangeCache()
+        self._positions_version = 0
+        
         # Modal management
         self.modal_manager = ActionModalManager()
         
@@ -218,47 +223,53 @@ class InteractionManager:
         if not unit_pos:
             return
         
-        # Get movement range
         movement_comp = unit.get_component('MovementComponent')
-        if movement_comp:
-            movement_range = getattr(movement_comp, 'movement_range', 3)
-            self._highlight_movement_range(unit_pos, movement_range)
-        
-        # Get attack range  
         attack_comp = unit.get_component('AttackComponent')
+        movement_range = getattr(movement_comp, 'movement_range', 3) if movement_comp else 0
+        attack_range = getattr(attack_comp, 'attack_range', 2) if attack_comp else 0
+        
+        movement_mask, attack_reach = self._get_unit_ranges(unit, unit_pos, movement_range, attack_range)
+        if movement_comp:
+            self._highlight_movement_range(movement_mask)
         if attack_comp:
-            attack_range = getattr(attack_comp, 'attack_range', 2)
-            self._highlight_attack_range(unit_pos, attack_range)
-    
-    def _highlight_movement_range(self, center: Vector2Int, range_distance: int):
-        """Highlight tiles within movement range"""
-        for x in range(max(0, center.x - range_distance), 
-                      min(self.grid_system.width, center.x + range_distance + 1)):
-            for y in range(max(0, center.y - range_distance),
-                          min(self.grid_system.height, center.y + range_distance + 1)):
-                pos = Vector2Int(x, y)
-                distance = abs(pos.x - center.x) + abs(pos.y - center.y)
-                
-                if distance <= range_distance and distance > 0:
-                    tile = self.tiles.get(pos)
-                    if tile and self._is_valid_movement_tile(tile):
-                        tile.set_state(TileState.MOVEMENT_RANGE)
-    
-    def _highlight_attack_range(self, center: Vector2Int, range_distance: int):
-        """Highlight tiles within attack range"""
-        for x in range(max(0, center.x - range_distance),
-                      min(self.grid_system.width, center.x + range_distance + 1)):
-            for y in range(max(0, center.y - range_distance),
-                          min(self.grid_system.height, center.y + range_distance + 1)):
-                pos = Vector2Int(x, y)
-                distance = abs(pos.x - center.x) + abs(pos.y - center.y)
-                
-                if distance <= range_distance and distance > 0:
-                    tile = self.tiles.get(pos)
-                    if tile:
-                        # Don't override movement range highlighting
-                        if tile.current_state == TileState.NORMAL:
-                            tile.set_state(TileState.ATTACK_RANGE)
+            self._highlight_attack_range(attack_reach)
+    
+    def _get_unit_ranges(self, unit: GameEntity, center: Vector2Int,
+                         movement_range: int, attack_range: int):
+        """Movement and attack masks for a unit, cached until the board changes"""
+        def compute():
+            costs, _, occupied = self.grid_system.get_range_inputs()
+            occupied = occupied.copy()
+            for position in self.unit_positions.values():
+                if self.grid_system.is_valid_position(position):
+                    occupied[position.x, position.y] = True
+            
+            origin = (center.x, center.y)
+            shape = (self.grid_system.width, self.grid_system.height)
+            line_of_sight = lambda a, b: self.grid_system.get_line_of_sight(Vector2Int(*a), Vector2Int(*b))
+            return (
+                reachable_mask(costs, origin, movement_range, occupied, self.grid_system.height_step_cost),
+                attack_mask(origin, attack_range, shape, line_of_sight=line_of_sight)
+            )
+        
+        key = (unit.id, center.x, center.y, movement_range, attack_range)
+        version = (self.grid_system.version, self._positions_version)
+        return self._range_cache.get_or_compute(key, version, compute)
+    
+    def _highlight_movement_range(self, mask: TileMask):
+        """Highlight tiles the unit can reach"""
+        for x, y in mask.positions():
+            tile = self.tiles.get(Vector2Int(x, y))
+            if tile and self._is_valid_movement_tile(tile):
+                tile.set_state(TileState.MOVEMENT_RANGE)
+    
+    def _highlight_attack_range(self, mask: TileMask):
+        """Highlight tiles the unit can attack"""
+        for x, y in mask.positions():
+            tile = self.tiles.get(Vector2Int(x, y))
+            # Don't override movement range highlighting
+            if tile and tile.current_state == TileState.NORMAL:
+                tile.set_state(TileState.ATTACK_RANGE)
     
     def _clear_all_tile_highlights(self):
         """Clear highlighting from all tiles"""
@@ -452,6 +463,7 @@ class InteractionManager:
         
         # Set new position
         self.unit_positions[unit] = position
+        self._positions_version += 1
         if position in self.tiles:
             self.tiles[position].set_occupant(unit)
     
@@ -539,6 +551,7 @@ class InteractionManager:
         
         if unit in self.unit_positions:
             del self.unit_positions[unit]
+            self._positions_version += 1
         
         if self.active_unit == unit:
             self._clear_selection()
@@ -10,6 +10,10 @@ import json
 from typing import Dict, Any, Optional, Callable
 from fastapi import WebSocket
 
+from core.utils.logging import Logger
+
+logger = Logger.get_logger(__name__)
+
 
 class GameBridge:
     """Bridge for communication between ReactPy UI and game engine"""
@@ -23,19 +27,19 @@ class GameBridge:
         """Set the WebSocket connection to the game"""
         self.websocket = websocket
         if websocket:
-            print("✅ Game bridge WebSocket connected")
+            logger.info("Game bridge WebSocket connected")
         else:
-            print("❌ Game bridge WebSocket disconnected")
+            logger.info("Game bridge WebSocket disconnected")
     
     def register_button_callback(self, button_id: str, callback: Callable):
         """Register a callback for button clicks"""
         self.button_callbacks[button_id] = callback
-        print(f"🔗 Registered callback for button: {button_id}")
+        logger.debug("Registered button callback", button_id=button_id)
     
     async def send_button_click(self, button_id: str, button_data: Dict[str, Any] = None):
         """Send button click event to the game"""
         if not self.websocket:
-            print(f"⚠️ No WebSocket connection - cannot send {button_id} click")
+            logger.warning("No WebSocket connection, cannot send click", button_id=button_id)
             return
         
         message = {
@@ -46,14 +50,14 @@ class GameBridge:
         
         try:
             await self.websocket.send_text(json.dumps(message))
-            print(f"📤 Sent {button_id} click to game")
+            logger.debug("Sent click to game", button_id=button_id)
         except Exception as e:
-            print(f"❌ Failed to send {button_id} click: {e}")
+            logger.error("Failed to send click", button_id=button_id, error=str(e))
     
     async def send_command(self, command: str, data: Dict[str, Any] = None):
         """Send generic command to the game"""
         if not self.websocket:
-            print(f"⚠️ No WebSocket connection - cannot send command: {command}")
+            logger.warning("No WebSocket connection, cannot send command", command=command)
             return
         
         message = {
@@ -64,14 +68,14 @@ class GameBridge:
         
         try:
             await self.websocket.send_text(json.dumps(message))
-            print(f"📤 Sent command to game: {command}")
+            logger.debug("Sent command to game", command=command)
         except Exception as e:
-            print(f"❌ Failed to send command {command}: {e}")
+            logger.error("Failed to send command", command=command, error=str(e))
     
     async def handle_game_state_update(self, state_data: Dict[str, Any]):
         """Handle game state updates from the game engine"""
         self.game_state.update(state_data)
-        print(f"🔄 Game state updated: {list(state_data.keys())}")
+        logger.debug("Game state updated", keys=list(state_data.keys()))
     
     async def handle_button_state_update(self, button_data: Dict[str, Any]):
         """Handle button state updates (enabled/disabled, etc.)"""
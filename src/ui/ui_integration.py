@@ -244,10 +244,6 @@ class ActionManagerUIBridge:
         """Handle turn started event."""
         print(f"🔗 Turn started: {event.data}")
         self.update_ui(force_update=True)
-        
-        # Clear prediction cache for new turn
-        if self.prediction_engine:
-            self.prediction_engine.clear_cache()
     
     def _on_turn_ended(self, event):
         """Handle turn ended event."""
@@ -382,6 +378,9 @@ class ActionManagerUIBridge:
         if self.prediction_widget:
             self.prediction_widget.destroy()
         
+        if self.prediction_engine:
+            self.prediction_engine.shutdown()
+        
         print("🔗 UI Integration shut down")
 
 
@@ -5,6 +5,8 @@ Real-time visual feedback components for tactical information display.
 """
 
 from .grid_visualizer import GridVisualizer
+from .highlight_layers import HighlightLayers, LayeredTileHighlighter, LayerStyle
+from .effect_scheduler import EffectScheduler, ScheduledEffect
 
 # Import Ursina-dependent components only if available
 try:
@@ -16,6 +18,11 @@ try:
     
     __all__ = [
         'GridVisualizer',
+        'HighlightLayers',
+        'LayeredTileHighlighter',
+        'LayerStyle',
+        'EffectScheduler',
+        'ScheduledEffect',
         'TileHighlighter', 
         'CombatAnimator',
         'UnitEntity'
@@ -24,5 +31,10 @@ except ImportError:
     URSINA_AVAILABLE = False
     
     __all__ = [
-        'GridVisualizer'
+        'GridVisualizer',
+        'HighlightLayers',
+        'LayeredTileHighlighter',
+        'LayerStyle',
+        'EffectScheduler',
+        'ScheduledEffect'
     ]
\ No newline at end of file
@@ -4,14 +4,15 @@ Combat Animation Framework
 Visual animation system for combat actions, effects, and unit movements.
 """
 
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from enum import Enum
 from dataclasses import dataclass
+import heapq
 import time
 import math
 
 try:
-    from ursina import Entity, Vec3, color, destroy, scene, Animation, Sequence, Func
+    from ursina import Entity, Text, Vec3, color, destroy, scene, Animation, Sequence, Func
     from ursina import camera, lerp, curve
     URSINA_AVAILABLE = True
 except ImportError:
@@ -19,6 +20,7 @@ except ImportError:
 
 from core.math.vector import Vector3, Vector2Int
 from core.ecs.entity import Entity as GameEntity
+from .effect_scheduler import DAMAGE_NUMBER, HEAL_NUMBER, EffectScheduler, ScheduledEffect
 
 
 class AnimationType(Enum):
@@ -44,6 +46,83 @@ class AnimationEvent:
     callback: Optional[Callable] = None
 
 
+@dataclass(frozen=True)
+class EffectStyle:
+    """How a pooled effect entity looks and animates over its lifetime"""
+    model: str
+    scale: float
+    end_scale: Optional[float] = None
+    scale_time: float = 1.0  # Fraction of the duration spent scaling
+    color: Tuple[float, float, float, float] = (1, 1, 1, 1)
+    offset: Tuple[float, float, float] = (0, 0, 0)
+    rise: Optional[float] = None  # Height to float up to, from the base position
+
+
+EFFECT_STYLES: Dict[str, EffectStyle] = {
+    'dust': EffectStyle('cube', 0.3, end_scale=0, color=(0.8, 0.7, 0.6, 0.5)),
+    'impact': EffectStyle('cube', 0.5, end_scale=0.1),
+    'spell': EffectStyle('sphere', 0.3, end_scale=1.0, scale_time=0.5, offset=(0, 1, 0)),
+    'heal': EffectStyle('sphere', 0.2, color=(0, 1, 0, 1), offset=(0, 0.5, 0), rise=2),
+    'death': EffectStyle('sphere', 0.5, end_scale=2.0, color=(0.2, 0.2, 0.2, 0.8)),
+    'level_up': EffectStyle('sphere', 0.1, end_scale=3.0, scale_time=0.3, color=(1, 0.84, 0, 1)),
+    'explosion': EffectStyle('sphere', 0.2, end_scale=2.5, scale_time=0.4, color=(1, 0.5, 0, 1)),
+    'projectile': EffectStyle('cube', 0.1, color=(1, 1, 0, 1)),
+    DAMAGE_NUMBER: EffectStyle('text', 15, offset=(0, 1, 0), rise=2),
+    HEAL_NUMBER: EffectStyle('text', 15, offset=(0, 1, 0), rise=2),
+}
+
+
+class UrsinaEffectRenderer:
+    """Draws scheduled effects with Ursina entities; numbers use billboard Text"""
+    
+    def create(self, kind: str) -> Entity:
+        style = EFFECT_STYLES[kind]
+        if style.model == 'text':
+            return Text(text='', parent=scene, billboard=True, origin=(0, 0), enabled=False)
+        return Entity(model=style.model, enabled=False)
+    
+    def show(self, entity: Entity, effect: ScheduledEffect):
+        style = EFFECT_STYLES[effect.kind]
+        self._stop(entity)
+        
+        base = Vec3(*effect.position) if isinstance(effect.position, tuple) else effect.position
+        effect_color = effect.color if effect.color is not None else color.Color(*style.color)
+        entity.position = base + Vec3(*style.offset)
+        entity.scale = style.scale
+        entity.color = effect_color
+        if effect.kind == DAMAGE_NUMBER:
+            entity.text = str(effect.amount)
+        elif effect.kind == HEAL_NUMBER:
+            entity.text = f"+{effect.amount}"
+        
+        # Fade out over the effect's lifetime
+        entity.animate_color(color.Color(effect_color.r, effect_color.g, effect_color.b, 0),
+                             duration=effect.duration)
+        if style.end_scale is not None:
+            entity.animate_scale(style.end_scale, duration=effect.duration * style.scale_time)
+        if style.rise is not None:
+            entity.animate_position(base + Vec3(0, style.rise, 0), duration=effect.duration)
+        target = effect.params.get('target')
+        if target is not None:
+            entity.animate_position(target, duration=effect.duration, curve=curve.linear)
+    
+    def hide(self, entity: Entity):
+        self._stop(entity)
+        entity.enabled = False
+    
+    def destroy(self, entity: Entity):
+        destroy(entity)
+    
+    @staticmethod
+    def _stop(entity: Entity):
+        """Kill animations left over from the entity's previous use"""
+        animations = getattr(entity, 'animations', None)
+        if animations:
+            for animation in animations:
+                animation.kill()
+            animations.clear()
+
+
 class CombatAnimator:
     """
     Combat animation system for visual feedback during battles.
@@ -52,21 +131,27 @@ class CombatAnimator:
     for all combat-related actions in the tactical RPG.
     """
     
-    def __init__(self, tile_size: float = 1.0):
+    def __init__(self, tile_size: float = 1.0, effect_budget_ms: float = 2.0,
+                 max_active_effects: int = 48):
         if not URSINA_AVAILABLE:
             raise ImportError("Ursina is required for CombatAnimator")
         
         self.tile_size = tile_size
         
-        # Animation queue and state
-        self.animation_queue: List[AnimationEvent] = []
+        # Animation queue (heap of start_time, sequence, event) and state
+        self.animation_queue: List[Tuple[float, int, AnimationEvent]] = []
         self.active_animations: Dict[str, AnimationEvent] = {}
         self.animation_id_counter = 0
         
         # Visual entities for animations
         self.unit_entities: Dict[int, Entity] = {}  # game_entity_id -> visual_entity
-        self.effect_entities: List[Entity] = []
-        self.projectile_entities: List[Entity] = []
+        
+        # Effects are pooled and started within a per-frame budget
+        self.effects = EffectScheduler(
+            UrsinaEffectRenderer(),
+            frame_budget=effect_budget_ms / 1000.0,
+            max_active=max_active_effects
+        )
         
         # Animation configuration
         self.animation_speeds = {
@@ -110,17 +195,15 @@ class CombatAnimator:
         # Update visual effects
         self._update_visual_effects(delta_time)
     
+    def _enqueue(self, animation: AnimationEvent):
+        heapq.heappush(self.animation_queue,
+                       (animation.start_time, self.animation_id_counter, animation))
+        self.animation_id_counter += 1
+    
     def _process_animation_queue(self, current_time: float):
-        """Process queued animations and start them if ready"""
-        animations_to_start = []
-        
-        for animation in self.animation_queue:
-            if current_time >= animation.start_time:
-                animations_to_start.append(animation)
-        
-        for animation in animations_to_start:
-            self._start_animation(animation)
-            self.animation_queue.remove(animation)
+        """Start queued animations whose start time has come"""
+        while self.animation_queue and self.animation_queue[0][0] <= current_time:
+            self._start_animation(heapq.heappop(self.animation_queue)[2])
     
     def _start_animation(self, animation_event: AnimationEvent):
         """Start a specific animation"""
@@ -232,36 +315,14 @@ class CombatAnimator:
         if not target:
             return
         
-        # Create projectile
-        projectile = Entity(
-            model='cube',
-            scale=0.1,
-            position=attacker.position + Vec3(0, 0.5, 0),
-            color=color.yellow
-        )
-        
-        self.projectile_entities.append(projectile)
-        
-        # Animate projectile to target
-        projectile.animate_position(
-            target.position + Vec3(0, 0.5, 0),
-            duration=duration * 0.7,
-            curve=curve.linear
-        )
-        
-        # Create impact effect when projectile reaches target
-        def create_impact():
-            self._create_impact_effect(target.position)
-            destroy(projectile)
-            if projectile in self.projectile_entities:
-                self.projectile_entities.remove(projectile)
-        
-        # Schedule impact effect
-        sequence = Sequence(
+        # Pooled projectile; the impact fires when it reaches the target
+        self.effects.spawn(
+            'projectile',
+            attacker.position + Vec3(0, 0.5, 0),
             duration * 0.7,
-            Func(create_impact)
+            params={'target': target.position + Vec3(0, 0.5, 0)},
+            on_finish=lambda: self._create_impact_effect(target.position)
         )
-        sequence.start()
     
     def _animate_spell_attack(self, caster: Entity, target: Optional[Entity], duration: float):
         """Animate spell/magical attack"""
@@ -318,7 +379,8 @@ class CombatAnimator:
         shake_sequence.start()
         
         # Create damage number popup
-        self._create_damage_number(visual_entity.position, damage_amount, damage_type)
+        self._create_damage_number(visual_entity.position, damage_amount, damage_type,
+                                   animation_event.target_entity.id)
     
     def _animate_heal(self, animation_id: str, animation_event: AnimationEvent):
         """Animate healing effect"""
@@ -337,7 +399,7 @@ class CombatAnimator:
         self._create_heal_effect(visual_entity.position, animation_event.duration)
         
         # Create heal number popup
-        self._create_heal_number(visual_entity.position, heal_amount)
+        self._create_heal_number(visual_entity.position, heal_amount, animation_event.target_entity.id)
     
     def _animate_ability(self, animation_id: str, animation_event: AnimationEvent):
         """Animate ability usage"""
@@ -393,216 +455,43 @@ class CombatAnimator:
     
     def _create_movement_effect(self, start_pos: Vec3, end_pos: Vec3):
         """Create dust cloud effect for movement"""
-        dust_effect = Entity(
-            model='cube',
-            scale=0.3,
-            position=start_pos,
-            color=color.Color(0.8, 0.7, 0.6, 0.5)
-        )
-        
-        self.effect_entities.append(dust_effect)
-        
-        # Animate and destroy
-        dust_effect.animate_scale(0, duration=1.0)
-        dust_effect.animate_color(color.Color(0.8, 0.7, 0.6, 0), duration=1.0)
-        
-        def cleanup():
-            destroy(dust_effect)
-            if dust_effect in self.effect_entities:
-                self.effect_entities.remove(dust_effect)
-        
-        sequence = Sequence(1.0, Func(cleanup))
-        sequence.start()
+        self.effects.spawn('dust', start_pos, 1.0)
     
     def _create_impact_effect(self, position: Vec3):
         """Create impact effect at position"""
-        impact = Entity(
-            model='cube',
-            scale=0.5,
-            position=position,
-            color=color.white
-        )
-        
-        self.effect_entities.append(impact)
-        
-        # Flash and disappear
-        impact.animate_scale(0.1, duration=0.2)
-        impact.animate_color(color.Color(1, 1, 1, 0), duration=0.2)
-        
-        def cleanup():
-            destroy(impact)
-            if impact in self.effect_entities:
-                self.effect_entities.remove(impact)
-        
-        sequence = Sequence(0.2, Func(cleanup))
-        sequence.start()
+        self.effects.spawn('impact', position, 0.2)
     
     def _create_spell_effect(self, position: Vec3, effect_color: color.Color, duration: float):
         """Create magical spell effect"""
-        spell_effect = Entity(
-            model='sphere',
-            scale=0.3,
-            position=position + Vec3(0, 1, 0),
-            color=effect_color
-        )
-        
-        self.effect_entities.append(spell_effect)
-        
-        # Grow and fade
-        spell_effect.animate_scale(1.0, duration=duration * 0.5)
-        spell_effect.animate_color(color.Color(effect_color.r, effect_color.g, effect_color.b, 0), 
-                                 duration=duration)
-        
-        def cleanup():
-            destroy(spell_effect)
-            if spell_effect in self.effect_entities:
-                self.effect_entities.remove(spell_effect)
-        
-        sequence = Sequence(duration, Func(cleanup))
-        sequence.start()
+        self.effects.spawn('spell', position, duration, color=effect_color)
     
     def _create_heal_effect(self, position: Vec3, duration: float):
         """Create healing effect"""
-        heal_effect = Entity(
-            model='sphere',
-            scale=0.2,
-            position=position + Vec3(0, 0.5, 0),
-            color=color.green
-        )
-        
-        self.effect_entities.append(heal_effect)
-        
-        # Float upward and fade
-        heal_effect.animate_position(position + Vec3(0, 2, 0), duration=duration)
-        heal_effect.animate_color(color.Color(0, 1, 0, 0), duration=duration)
-        
-        def cleanup():
-            destroy(heal_effect)
-            if heal_effect in self.effect_entities:
-                self.effect_entities.remove(heal_effect)
-        
-        sequence = Sequence(duration, Func(cleanup))
-        sequence.start()
+        self.effects.spawn('heal', position, duration)
     
-    def _create_damage_number(self, position: Vec3, damage: int, damage_type: str):
-        """Create floating damage number"""
-        # This would typically use text entities or billboards
-        # For now, create a simple colored cube representing damage
+    def _create_damage_number(self, position: Vec3, damage: int, damage_type: str,
+                              unit_id: Optional[int] = None):
+        """Create floating damage number, merged with the unit's other hits this frame"""
         damage_color = color.red if damage_type == 'physical' else color.blue
-        
-        damage_indicator = Entity(
-            model='cube',
-            scale=0.1,
-            position=position + Vec3(0, 1, 0),
-            color=damage_color
-        )
-        
-        self.effect_entities.append(damage_indicator)
-        
-        # Float up and fade
-        damage_indicator.animate_position(position + Vec3(0, 2, 0), duration=1.5)
-        damage_indicator.animate_color(color.Color(damage_color.r, damage_color.g, damage_color.b, 0), 
-                                     duration=1.5)
-        
-        def cleanup():
-            destroy(damage_indicator)
-            if damage_indicator in self.effect_entities:
-                self.effect_entities.remove(damage_indicator)
-        
-        sequence = Sequence(1.5, Func(cleanup))
-        sequence.start()
+        self.effects.spawn(DAMAGE_NUMBER, position, 1.5, color=damage_color,
+                           unit_id=unit_id, amount=damage)
     
-    def _create_heal_number(self, position: Vec3, heal_amount: int):
-        """Create floating heal number"""
-        heal_indicator = Entity(
-            model='cube',
-            scale=0.1,
-            position=position + Vec3(0, 1, 0),
-            color=color.lime
-        )
-        
-        self.effect_entities.append(heal_indicator)
-        
-        # Float up and fade
-        heal_indicator.animate_position(position + Vec3(0, 2, 0), duration=1.5)
-        heal_indicator.animate_color(color.Color(0, 1, 0.5, 0), duration=1.5)
-        
-        def cleanup():
-            destroy(heal_indicator)
-            if heal_indicator in self.effect_entities:
-                self.effect_entities.remove(heal_indicator)
-        
-        sequence = Sequence(1.5, Func(cleanup))
-        sequence.start()
+    def _create_heal_number(self, position: Vec3, heal_amount: int, unit_id: Optional[int] = None):
+        """Create floating heal number, merged with the unit's other heals this frame"""
+        self.effects.spawn(HEAL_NUMBER, position, 1.5, color=color.lime,
+                           unit_id=unit_id, amount=heal_amount)
     
     def _create_death_effect(self, position: Vec3):
         """Create death effect"""
-        death_effect = Entity(
-            model='sphere',
-            scale=0.5,
-            position=position,
-            color=color.Color(0.2, 0.2, 0.2, 0.8)
-        )
-        
-        self.effect_entities.append(death_effect)
-        
-        # Expand and fade
-        death_effect.animate_scale(2.0, duration=2.0)
-        death_effect.animate_color(color.Color(0.2, 0.2, 0.2, 0), duration=2.0)
-        
-        def cleanup():
-            destroy(death_effect)
-            if death_effect in self.effect_entities:
-                self.effect_entities.remove(death_effect)
-        
-        sequence = Sequence(2.0, Func(cleanup))
-        sequence.start()
+        self.effects.spawn('death', position, 2.0)
     
     def _create_level_up_effect(self, position: Vec3, duration: float):
         """Create level up effect"""
-        level_effect = Entity(
-            model='sphere',
-            scale=0.1,
-            position=position,
-            color=color.gold
-        )
-        
-        self.effect_entities.append(level_effect)
-        
-        # Burst effect
-        level_effect.animate_scale(3.0, duration=duration * 0.3)
-        level_effect.animate_color(color.Color(1, 0.8, 0, 0), duration=duration)
-        
-        def cleanup():
-            destroy(level_effect)
-            if level_effect in self.effect_entities:
-                self.effect_entities.remove(level_effect)
-        
-        sequence = Sequence(duration, Func(cleanup))
-        sequence.start()
+        self.effects.spawn('level_up', position, duration)
     
     def _create_explosion_effect(self, position: Vec3, duration: float):
         """Create explosion effect"""
-        explosion = Entity(
-            model='sphere',
-            scale=0.2,
-            position=position,
-            color=color.orange
-        )
-        
-        self.effect_entities.append(explosion)
-        
-        # Explosive growth and fade
-        explosion.animate_scale(2.5, duration=duration * 0.4)
-        explosion.animate_color(color.Color(1, 0.5, 0, 0), duration=duration)
-        
-        def cleanup():
-            destroy(explosion)
-            if explosion in self.effect_entities:
-                self.effect_entities.remove(explosion)
-        
-        sequence = Sequence(duration, Func(cleanup))
-        sequence.start()
+        self.effects.spawn('explosion', position, duration)
     
     def _create_area_spell_effect(self, center: Vec3, duration: float):
         """Create area effect spell"""
@@ -647,9 +536,8 @@ class CombatAnimator:
                 self.camera_shake_intensity = 0
     
     def _update_visual_effects(self, delta_time: float):
-        """Update any persistent visual effects"""
-        # This could include particle systems, environmental effects, etc.
-        pass
+        """Retire finished effects and start queued ones within the frame budget"""
+        self.effects.update()
     
     # Public animation interface
     
@@ -669,7 +557,7 @@ class CombatAnimator:
             callback=callback
         )
         
-        self.animation_queue.append(animation)
+        self._enqueue(animation)
     
     def queue_attack_animation(self, attacker: GameEntity, target: Optional[GameEntity] = None,
                               attack_type: str = 'melee', duration: Optional[float] = None,
@@ -692,7 +580,7 @@ class CombatAnimator:
             callback=callback
         )
         
-        self.animation_queue.append(animation)
+        self._enqueue(animation)
     
     def queue_damage_animation(self, target: GameEntity, damage_amount: int, 
                               damage_type: str = 'physical', duration: Optional[float] = None,
@@ -715,7 +603,7 @@ class CombatAnimator:
             callback=callback
         )
         
-        self.animation_queue.append(animation)
+        self._enqueue(animation)
     
     def queue_heal_animation(self, target: GameEntity, heal_amount: int,
                             duration: Optional[float] = None, delay: float = 0.0,
@@ -735,29 +623,23 @@ class CombatAnimator:
             callback=callback
         )
         
-        self.animation_queue.append(animation)
+        self._enqueue(animation)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get animation system statistics"""
         return {
             'queued_animations': len(self.animation_queue),
             'active_animations': len(self.active_animations),
-            'visual_effects': len(self.effect_entities),
-            'projectiles': len(self.projectile_entities),
-            'registered_units': len(self.unit_entities)
+            'visual_effects': self.effects.active_count(),
+            'projectiles': self.effects.active_count('projectile'),
+            'registered_units': len(self.unit_entities),
+            'effects': self.effects.get_stats()
         }
     
     def cleanup(self):
         """Clean up all animation entities"""
-        # Clean up effect entities
-        for effect in self.effect_entities:
-            destroy(effect)
-        self.effect_entities.clear()
-        
-        # Clean up projectiles
-        for projectile in self.projectile_entities:
-            destroy(projectile)
-        self.projectile_entities.clear()
+        # Clean up effects and their pooled entities
+        self.effects.shutdown()
         
         # Clear queues
         self.animation_queue.clear()
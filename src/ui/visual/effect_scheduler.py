@@ -0,0 +1,253 @@
+"""
+Combat Effect Scheduling
+
+Frame-budgeted queue for short-lived combat effects (impacts, spells, damage
+and heal numbers, deaths, level-ups, ...). Effects are requested at any time
+and started in ``update()`` while the frame's time budget and the on-screen
+cap allow; the rest wait for later frames. Damage and heal numbers for the
+same unit and color (damage type) are merged into one number instead of
+stacking, and every effect is drawn with a pooled renderer object that goes
+back to its pool when the effect ends, so a busy AoE turn allocates nothing
+once the pools have warmed up.
+
+The scheduler is plain Python. Drawing goes through a renderer with
+``create(kind)``, ``show(handle, effect)``, ``hide(handle)`` and
+``destroy(handle)``; CombatAnimator supplies the Ursina one.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .highlight_layers import HighlightEntityPool
+
+DAMAGE_NUMBER = 'damage_number'
+HEAL_NUMBER = 'heal_number'
+NUMBER_KINDS = frozenset({DAMAGE_NUMBER, HEAL_NUMBER})
+
+
+def number_key(kind: str, unit_id: Any, color: Any) -> Tuple[str, Any, Any]:
+    """Numbers sharing this key merge; colors (Vec4, lists) are keyed by value."""
+    if color is not None and not isinstance(color, (str, tuple)):
+        color = tuple(color)
+    return kind, unit_id, color
+
+
+@dataclass(slots=True)
+class ScheduledEffect:
+    """One requested effect; ``handle`` is the pooled object drawing it."""
+    kind: str
+    position: Any
+    duration: float
+    color: Any = None
+    unit_id: Any = None
+    amount: int = 0
+    params: Dict[str, Any] = field(default_factory=dict)
+    on_finish: Optional[Callable[[], None]] = None
+    requested_at: float = 0.0
+    started_at: Optional[float] = None
+    hits: int = 1
+    handle: Any = None
+
+    @property
+    def ends_at(self) -> float:
+        return self.started_at + self.duration
+
+    @property
+    def key(self) -> Tuple[str, Any, Any]:
+        return number_key(self.kind, self.unit_id, self.color)
+
+
+class EffectScheduler:
+    """
+    Starts queued effects within a per-frame time budget and on-screen cap.
+
+    Numbers for a unit are merged while still queued, and into the unit's
+    number of the same color on screen if that started less than
+    ``merge_window`` seconds ago. Other effects still queued after
+    ``max_delay`` seconds are dropped, since a late impact or flash is worse
+    than none; a dropped effect still gets its ``on_finish`` so follow-ups
+    chained to it (a projectile's impact) are not lost.
+    """
+
+    def __init__(self, renderer: Any, frame_budget: float = 0.002, max_active: int = 48,
+                 max_pending: int = 256, max_delay: float = 0.5, merge_window: float = 0.15,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.renderer = renderer
+        self.frame_budget = frame_budget
+        self.max_active = max_active
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.merge_window = merge_window
+        self._clock = clock
+
+        self.pools: Dict[str, HighlightEntityPool] = {}
+        self._pending: deque = deque()
+        self._pending_numbers: Dict[Tuple[str, Any, Any], ScheduledEffect] = {}
+        self._active: List[ScheduledEffect] = []
+        self._active_numbers: Dict[Tuple[str, Any, Any], ScheduledEffect] = {}
+
+        # Statistics
+        self.requested = 0
+        self.started = 0
+        self.merged = 0
+        self.dropped = 0
+        self.deferred_frames = 0
+        self.peak_active = 0
+        self.last_frame_seconds = 0.0
+
+    def spawn(self, kind: str, position: Any, duration: float, color: Any = None,
+              unit_id: Any = None, amount: int = 0, params: Optional[Dict[str, Any]] = None,
+              on_finish: Optional[Callable[[], None]] = None) -> ScheduledEffect:
+        """Queue an effect; numbers with a ``unit_id`` merge with that unit's number of the same color."""
+        now = self._clock()
+        self.requested += 1
+
+        key = number_key(kind, unit_id, color)
+        if kind in NUMBER_KINDS and unit_id is not None:
+            effect = self._pending_numbers.get(key)
+            if effect is None:
+                effect = self._active_numbers.get(key)
+                if effect is not None and now - effect.started_at > self.merge_window:
+                    effect = None
+            if effect is not None:
+                self._merge(effect, amount, now)
+                return effect
+
+        effect = ScheduledEffect(kind, position, duration, color, unit_id, amount,
+                                 params or {}, on_finish, requested_at=now)
+        if len(self._pending) >= self.max_pending:
+            self._drop(self._pending.popleft())
+        self._pending.append(effect)
+        if kind in NUMBER_KINDS and unit_id is not None:
+            self._pending_numbers[key] = effect
+        return effect
+
+    def _merge(self, effect: ScheduledEffect, amount: int, now: float):
+        effect.amount += amount
+        effect.hits += 1
+        self.merged += 1
+        if effect.handle is not None:
+            # Already on screen: show the new total and restart its float
+            effect.started_at = now
+            self.renderer.show(effect.handle, effect)
+
+    def update(self):
+        """Retire finished effects, then start queued ones within the budget."""
+        start = self._clock()
+        self._retire(start)
+
+        started = 0
+        while self._pending and len(self._active) < self.max_active:
+            if started and self._clock() - start >= self.frame_budget:
+                break
+            effect = self._pending.popleft()
+            if effect.kind not in NUMBER_KINDS and start - effect.requested_at > self.max_delay:
+                self._drop(effect)
+                continue
+            self._forget(effect)
+            self._start(effect)
+            started += 1
+
+        if self._pending:
+            self.deferred_frames += 1
+        self.last_frame_seconds = self._clock() - start
+
+    def _start(self, effect: ScheduledEffect):
+        effect.started_at = self._clock()
+        effect.handle = self._pool(effect.kind).acquire()
+        self.renderer.show(effect.handle, effect)
+        self._active.append(effect)
+        if effect.kind in NUMBER_KINDS and effect.unit_id is not None:
+            self._active_numbers[effect.key] = effect
+        self.started += 1
+        self.peak_active = max(self.peak_active, len(self._active))
+
+    def _retire(self, now: float):
+        finished = [effect for effect in self._active if now >= effect.ends_at]
+        if not finished:
+            return
+        self._active = [effect for effect in self._active if now < effect.ends_at]
+        for effect in finished:
+            self._release(effect)
+            if effect.on_finish:
+                effect.on_finish()
+
+    def _release(self, effect: ScheduledEffect):
+        key = effect.key
+        if self._active_numbers.get(key) is effect:
+            del self._active_numbers[key]
+        self.renderer.hide(effect.handle)
+        self.pools[effect.kind].release(effect.handle)
+        effect.handle = None
+
+    def _forget(self, effect: ScheduledEffect):
+        key = effect.key
+        if self._pending_numbers.get(key) is effect:
+            del self._pending_numbers[key]
+
+    def _drop(self, effect: ScheduledEffect):
+        """Skip a queued effect without drawing it, still running its follow-up."""
+        self._forget(effect)
+        self.dropped += 1
+        if effect.on_finish:
+            effect.on_finish()
+
+    def _pool(self, kind: str) -> HighlightEntityPool:
+        pool = self.pools.get(kind)
+        if pool is None:
+            pool = self.pools[kind] = HighlightEntityPool(lambda: self.renderer.create(kind))
+        return pool
+
+    def prewarm(self, counts: Dict[str, int]):
+        """Allocate pooled objects per kind up front."""
+        for kind, count in counts.items():
+            self._pool(kind).prewarm(count)
+
+    def active_count(self, kind: Optional[str] = None) -> int:
+        if kind is None:
+            return len(self._active)
+        return sum(1 for effect in self._active if effect.kind == kind)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def clear(self):
+        """
+        Hide every effect on screen and drop everything queued.
+
+        Cleared effects still run their ``on_finish``, like dropped ones;
+        effects those follow-ups spawn are cleared in turn.
+        """
+        while self._active or self._pending:
+            active, self._active = self._active, []
+            pending, self._pending = self._pending, deque()
+            self._pending_numbers.clear()
+            for effect in active:
+                self._release(effect)
+            for effect in active + list(pending):
+                if effect.on_finish:
+                    effect.on_finish()
+
+    def shutdown(self):
+        """Clear, then destroy every pooled object."""
+        self.clear()
+        for pool in self.pools.values():
+            for handle in pool.drain():
+                self.renderer.destroy(handle)
+        self.pools.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pending': len(self._pending),
+            'active': len(self._active),
+            'peak_active': self.peak_active,
+            'requested': self.requested,
+            'started': self.started,
+            'merged': self.merged,
+            'dropped': self.dropped,
+            'deferred_frames': self.deferred_frames,
+            'last_frame_ms': round(self.last_frame_seconds * 1e3, 3),
+            'pools': {kind: pool.get_stats() for kind, pool in self.pools.items()}
+        }
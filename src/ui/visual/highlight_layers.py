@@ -0,0 +1,239 @@
+"""
+Layered Tile Highlights
+
+Stacked highlight layers (movement, attack, effect area, path, ...) resolved
+to one color per tile by layer priority, and a renderer that draws the result
+with a pool of reusable entities. Changing the selection recolors, moves or
+hides pooled entities in place; entities are only allocated when more tiles
+are lit at once than ever before, so steady-state selection allocates nothing.
+
+The layer stack and pool are plain Python; Ursina is only needed by the
+default entity factory.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+Coord = Tuple[int, int]
+
+# Higher priority wins where layers overlap
+DEFAULT_LAYER_PRIORITIES: Dict[str, int] = {
+    'movement': 10,
+    'attack': 20,
+    'magic': 20,
+    'effect_area': 30,
+    'path': 40,
+    'path_cursor': 50,
+    'target': 55,
+    'selection': 60,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class LayerStyle:
+    """How a layer's tiles are drawn, as in highlighting_config.json."""
+    scale: Tuple[float, float, float] = (0.9, 0.2, 0.9)
+    position_offset: Tuple[float, float, float] = (0.5, 0, 0.5)
+    alpha: float = 1.0
+
+    @classmethod
+    def from_config(cls, style_data: Dict[str, Any]) -> 'LayerStyle':
+        default = cls()
+        return cls(
+            scale=tuple(style_data.get('scale', default.scale)),
+            position_offset=tuple(style_data.get('position_offset', default.position_offset)),
+            alpha=style_data.get('alpha', default.alpha)
+        )
+
+
+class HighlightLayers:
+    """
+    Named highlight layers, each mapping tiles to a color.
+
+    ``resolve()`` gives the topmost (layer, color) per tile. Layers without a
+    registered priority rank below every registered layer.
+    """
+
+    def __init__(self, priorities: Optional[Dict[str, int]] = None):
+        self.priorities = dict(DEFAULT_LAYER_PRIORITIES if priorities is None else priorities)
+        self._layers: Dict[str, Dict[Coord, Any]] = {}
+        self.version = 0  # Bumped on every change
+        self._resolved: Optional[Dict[Coord, Tuple[str, Any]]] = None
+
+    def set_layer(self, layer: str, tiles: Union[Iterable[Coord], Mapping[Coord, Any]],
+                  color: Any = None):
+        """Replace a layer's tiles; ``tiles`` maps tiles to colors unless ``color`` is given."""
+        self._layers[layer] = self._colored(tiles, color)
+        self._changed()
+
+    def add_tiles(self, layer: str, tiles: Union[Iterable[Coord], Mapping[Coord, Any]],
+                  color: Any = None):
+        """Add tiles to a layer, recoloring any it already holds."""
+        self._layers.setdefault(layer, {}).update(self._colored(tiles, color))
+        self._changed()
+
+    def clear_layer(self, layer: str):
+        if self._layers.pop(layer, None):
+            self._changed()
+
+    def clear(self):
+        if any(self._layers.values()):
+            self._changed()
+        self._layers.clear()
+
+    def get_layer(self, layer: str) -> Dict[Coord, Any]:
+        return dict(self._layers.get(layer, {}))
+
+    def resolve(self) -> Dict[Coord, Tuple[str, Any]]:
+        """Topmost (layer, color) for every lit tile."""
+        if self._resolved is None:
+            resolved = {}
+            for layer in sorted(self._layers, key=lambda name: self.priorities.get(name, -1)):
+                for tile, color in self._layers[layer].items():
+                    resolved[tile] = (layer, color)
+            self._resolved = resolved
+        return self._resolved
+
+    def _changed(self):
+        self.version += 1
+        self._resolved = None
+
+    @staticmethod
+    def _colored(tiles, color) -> Dict[Coord, Any]:
+        if color is None and isinstance(tiles, Mapping):
+            return {tuple(tile): tile_color for tile, tile_color in tiles.items()}
+        return {tuple(tile): color for tile in tiles}
+
+
+class HighlightEntityPool:
+    """
+    Free list of reusable entities with allocation accounting.
+
+    Used for highlights, combat effects and the client's battlefield tiles
+    and units; ``acquire`` enables an entity and ``release`` disables it.
+
+    ``allocations_per_second`` covers the last second, so a steady selection
+    loop should report zero once the pool has warmed up.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self._free: List[Any] = []
+        self.allocations = 0
+        self.reuses = 0
+        self._allocation_times: deque = deque()
+
+    def acquire(self) -> Any:
+        if self._free:
+            entity = self._free.pop()
+            self.reuses += 1
+        else:
+            entity = self.factory()
+            self.allocations += 1
+            self._allocation_times.append(time.perf_counter())
+        entity.enabled = True
+        return entity
+
+    def release(self, entity: Any):
+        entity.enabled = False
+        self._free.append(entity)
+
+    def prewarm(self, count: int):
+        """Allocate entities up front so later acquires never allocate."""
+        while len(self._free) < count:
+            entity = self.factory()
+            entity.enabled = False
+            self.allocations += 1
+            self._allocation_times.append(time.perf_counter())
+            self._free.append(entity)
+
+    def drain(self) -> List[Any]:
+        """Hand back the free entities (e.g. to destroy them) and empty the pool."""
+        free, self._free = self._free, []
+        return free
+
+    def allocations_per_second(self) -> int:
+        cutoff = time.perf_counter() - 1.0
+        while self._allocation_times and self._allocation_times[0] < cutoff:
+            self._allocation_times.popleft()
+        return len(self._allocation_times)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'free': len(self._free),
+            'allocations': self.allocations,
+            'reuses': self.reuses,
+            'allocations_per_second': self.allocations_per_second()
+        }
+
+
+def _create_highlight_entity():
+    from ursina import Entity
+    return Entity(model='cube')
+
+
+class LayeredTileHighlighter:
+    """
+    Draws resolved highlight layers with pooled entities.
+
+    Change layers through ``layers``, then call ``render()``; only tiles whose
+    topmost layer or color changed are touched.
+    """
+
+    def __init__(self, styles: Optional[Dict[str, LayerStyle]] = None,
+                 priorities: Optional[Dict[str, int]] = None,
+                 entity_factory: Callable[[], Any] = _create_highlight_entity):
+        self.layers = HighlightLayers(priorities)
+        self.styles = styles or {}
+        self.pool = HighlightEntityPool(entity_factory)
+        self._shown: Dict[Coord, Any] = {}
+        self._rendered_version = -1
+        self.renders = 0
+        self.tiles_updated = 0
+
+    def render(self):
+        """Bring the drawn entities in line with the layers."""
+        if self._rendered_version == self.layers.version:
+            return
+        self._rendered_version = self.layers.version
+        self.renders += 1
+
+        resolved = self.layers.resolve()
+        for tile in [tile for tile in self._shown if tile not in resolved]:
+            self.pool.release(self._shown.pop(tile))
+
+        for tile, key in resolved.items():
+            entity = self._shown.get(tile)
+            if entity is None:
+                entity = self._shown[tile] = self.pool.acquire()
+            elif entity.highlight_key == key:
+                continue
+            self._apply(entity, tile, key)
+
+    def clear(self):
+        """Hide every highlight."""
+        self.layers.clear()
+        self.render()
+
+    def _apply(self, entity, tile: Coord, key: Tuple[str, Any]):
+        layer, color = key
+        style = self.styles.get(layer) or LayerStyle()
+        x, y = tile
+        offset_x, offset_y, offset_z = style.position_offset
+        entity.scale = style.scale
+        entity.position = (x + offset_x, offset_y, y + offset_z)
+        entity.color = color
+        entity.alpha = style.alpha
+        entity.highlight_key = key
+        entity.tile_pos = tile
+        self.tiles_updated += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'lit_tiles': len(self._shown),
+            'renders': self.renders,
+            'tiles_updated': self.tiles_updated,
+            'pool': self.pool.get_stats()
+        }
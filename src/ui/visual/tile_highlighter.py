@@ -16,6 +16,7 @@ except ImportError:
 
 from core.math.vector import Vector2Int, Vector3
 from .grid_visualizer import GridVisualizer, HighlightType
+from .highlight_layers import HighlightEntityPool
 
 
 class TileHighlighter:
@@ -23,6 +24,8 @@ class TileHighlighter:
     Ursina-based tile highlighting renderer.
     
     Creates and manages visual tile highlight entities in the Ursina scene.
+    Entities come from per-mesh pools and are hidden rather than destroyed
+    when a tile stops being highlighted.
     """
     
     def __init__(self, grid_visualizer: GridVisualizer, tile_size: float = 1.0):
@@ -45,6 +48,12 @@ class TileHighlighter:
         
         # Create highlight mesh templates
         self._create_highlight_meshes()
+        
+        # Reusable highlight entities per mesh
+        self.entity_pools = {
+            'tile': HighlightEntityPool(lambda: self._new_highlight_entity(self.tile_mesh)),
+            'border': HighlightEntityPool(lambda: self._new_highlight_entity(self.border_mesh))
+        }
     
     def _create_highlight_meshes(self):
         """Create reusable mesh templates for different highlight types"""
@@ -177,39 +186,36 @@ class TileHighlighter:
         else:
             self._update_existing_entity(tile_pos, visual_data)
     
-    def _create_highlight_entity(self, tile_pos: Vector2Int, visual_data: Dict[str, Any]):
-        """Create a new highlight entity"""
-        world_pos = visual_data['position']
-        highlight_types = visual_data['highlight_types']
-        
-        # Choose appropriate mesh based on highlight types
-        if HighlightType.SELECTION in highlight_types:
-            mesh = self.border_mesh
-            y_offset = self.border_height
-        else:
-            mesh = self.tile_mesh
-            y_offset = self.highlight_height
-        
-        # Create the entity
+    def _new_highlight_entity(self, mesh: Mesh) -> Entity:
+        """Allocate a pooled highlight entity for a mesh"""
         entity = Entity(
             model=mesh,
-            position=Vec3(world_pos.x, world_pos.y + y_offset, world_pos.z),
-            color=self._convert_color(visual_data['color']),
             shader=lit_with_shadows_shader,
             parent=scene
         )
-        
-        # Store additional data for animations
-        entity.base_intensity = visual_data['intensity']
-        entity.highlight_types = highlight_types
+        entity.mesh_kind = 'border' if mesh is self.border_mesh else 'tile'
+        return entity
+    
+    def _create_highlight_entity(self, tile_pos: Vector2Int, visual_data: Dict[str, Any]):
+        """Take a highlight entity from the pool for a tile"""
+        mesh_kind = 'border' if HighlightType.SELECTION in visual_data['highlight_types'] else 'tile'
+        entity = self.entity_pools[mesh_kind].acquire()
         entity.tile_pos = tile_pos
         
         self.highlight_entities[tile_pos] = entity
+        self._update_existing_entity(tile_pos, visual_data)
     
     def _update_existing_entity(self, tile_pos: Vector2Int, visual_data: Dict[str, Any]):
         """Update properties of existing highlight entity"""
         entity = self.highlight_entities[tile_pos]
         
+        # Selection switches between the border and tile meshes
+        is_selection = HighlightType.SELECTION in visual_data['highlight_types']
+        if entity.mesh_kind != ('border' if is_selection else 'tile'):
+            self._remove_highlight_entity(tile_pos)
+            self._create_highlight_entity(tile_pos, visual_data)
+            return
+        
         # Update color and intensity
         entity.color = self._convert_color(visual_data['color'])
         entity.base_intensity = visual_data['intensity']
@@ -217,19 +223,14 @@ class TileHighlighter:
         
         # Update position if needed
         world_pos = visual_data['position']
-        if HighlightType.SELECTION in visual_data['highlight_types']:
-            y_offset = self.border_height
-        else:
-            y_offset = self.highlight_height
-        
+        y_offset = self.border_height if is_selection else self.highlight_height
         entity.position = Vec3(world_pos.x, world_pos.y + y_offset, world_pos.z)
     
     def _remove_highlight_entity(self, tile_pos: Vector2Int):
-        """Remove highlight entity for a tile"""
-        if tile_pos in self.highlight_entities:
-            entity = self.highlight_entities[tile_pos]
-            destroy(entity)
-            del self.highlight_entities[tile_pos]
+        """Return a tile's highlight entity to its pool"""
+        entity = self.highlight_entities.pop(tile_pos, None)
+        if entity is not None:
+            self.entity_pools[entity.mesh_kind].release(entity)
     
     def _update_animations(self):
         """Update animation effects on highlight entities"""
@@ -259,10 +260,9 @@ class TileHighlighter:
     
     def clear_all_highlights(self):
         """Clear all highlight entities"""
-        for entity in self.highlight_entities.values():
-            destroy(entity)
+        for tile_pos in list(self.highlight_entities):
+            self._remove_highlight_entity(tile_pos)
         
-        self.highlight_entities.clear()
         self.grid_visualizer.clear_all_highlights()
     
     def set_active_unit(self, unit):
@@ -345,12 +345,16 @@ class TileHighlighter:
         return {
             'active_highlight_entities': len(self.highlight_entities),
             'active_effect_entities': len(self.effect_entities),
+            'highlight_pools': {kind: pool.get_stats() for kind, pool in self.entity_pools.items()},
             'grid_visualizer_stats': self.grid_visualizer.get_performance_stats()
         }
     
     def cleanup(self):
         """Clean up all visual entities"""
         self.clear_all_highlights()
+        for pool in self.entity_pools.values():
+            for entity in pool.drain():
+                destroy(entity)
         
         # Clean up floating effects
         for effect in self.effect_entities:
@@ -6,14 +6,31 @@ Tests complete end-to-end scenarios involving all systems working together.
 
 import pytest
 import asyncio
+import dataclasses
 import json
+import os
+import sys
 import time
 from datetime import datetime
+from pathlib import Path
 
 import httpx
+import numpy as np
 import websockets
 import structlog
 
+# Load the cache module directly; the performance package imports optional modules
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src" / "performance"))
+from cache_manager import CacheManager, CacheStrategy
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+from ai.simple_mcp_tools import SimpleMCPToolRegistry
+import core.assets.asset_bundle as asset_bundle
+from core.assets.asset_bundle import AssetBundle, BundleError, build_bundle, load_json
+from core.assets.catalog import Catalog, ItemEntry, TalentEntry, get_catalog
+from core.assets.config_manager import ConfigManager
+from core.assets.formula import MAX_EXPONENT, FormulaError, compile_formula
+from core.utils.stat_cache import DerivedStatCache
+
 logger = structlog.get_logger()
 
 
@@ -680,4 +697,408 @@ class TestSystemIntegrationScenarios:
                     assert final_data.get("status") in ["healthy", "running"]
                 
         except Exception as e:
-            pytest.skip(f"Stress testing not available: {e}")
\ No newline at end of file
+            pytest.skip(f"Stress testing not available: {e}")
+
+
+class Token:
+    """Plain object: identity hash only"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Point:
+    """Value-equal object whose hash collides across unequal values"""
+
+    def __init__(self, x, label):
+        self.x, self.label = x, label
+
+    def __eq__(self, other):
+        return isinstance(other, Point) and (self.x, self.label) == (other.x, other.label)
+
+    def __hash__(self):
+        return hash(self.x)
+
+
+class TestCacheManagerKeys:
+    """Cache keys must identify argument values, not object addresses"""
+
+    def make_cache(self) -> CacheManager:
+        cache = CacheManager(strategy=CacheStrategy.LRU, max_size=100)
+        cache._stop_cleanup = True
+        return cache
+
+    def test_identity_hashed_arguments_bypass_cache(self):
+        """A new object at a reused address never gets an old object's result"""
+        cache = self.make_cache()
+
+        @cache.cached_function()
+        def read(token):
+            return token.value
+
+        # Freed objects' addresses are reused immediately by CPython
+        results = [read(Token(i)) for i in range(20)]
+
+        assert results == list(range(20))
+        stats = cache.get_stats()
+        assert stats.total_entries == 0
+        assert stats.uncacheable_calls == 20
+
+    def test_explicit_key_function_enables_caching(self):
+        """key= maps arguments to a value-based key"""
+        cache = self.make_cache()
+        calls = []
+
+        @cache.cached_function(key=lambda token: token.value)
+        def read(token):
+            calls.append(token.value)
+            return token.value * 2
+
+        assert [read(Token(i % 3)) for i in range(9)] == [0, 2, 4] * 3
+        assert calls == [0, 1, 2]
+        assert read.cache_invalidate(Token(1)) is True
+
+    def test_hash_alone_is_never_a_key(self):
+        """Unequal objects with equal hashes never share an entry"""
+        cache = self.make_cache()
+
+        @cache.cached_function()
+        def label(point):
+            return point.label
+
+        assert label(Point(1, "x")) == "x"
+        assert label(Point(1, "y")) == "y"
+        assert cache.get_stats().total_entries == 0
+
+    def test_cache_clear_matches_function_prefix_only(self):
+        """Clearing one function keeps a same-named function's entries"""
+        cache = self.make_cache()
+
+        @cache.cached_function()
+        def foo(value):
+            return value
+
+        @cache.cached_function()
+        def foo_bar(value):
+            return value
+
+        foo(1)
+        foo_bar(1)
+        assert foo.cache_clear() == 1
+        assert cache.get_stats().total_entries == 1
+
+    def test_value_arguments_are_cached(self):
+        """Primitives, classes and containers of them are cacheable"""
+        cache = self.make_cache()
+        calls = []
+
+        @cache.cached_function()
+        def describe(kind, value, point):
+            calls.append(1)
+            return f"{kind.__name__}:{value}:{point}"
+
+        for _ in range(3):
+            assert describe(int, "x", frozenset({1, 2})) == "int:x:frozenset({1, 2})"
+        assert len(calls) == 1
+
+
+class TestFormulaEngine:
+    """Config formulas: restricted grammar, bounded powers, scalar/batch parity"""
+
+    @pytest.mark.parametrize("source", [
+        "__import__('os').system('true')",
+        "__import__",
+        "damage.__class__",
+        "(1).real",
+        "values[0]",
+        "(lambda: 1)()",
+        "'text'",
+        "len(damage)",
+        "max(damage, key=abs)",
+        "[damage for damage in values]",
+        "damage := 3",
+    ])
+    def test_rejects_unsafe_syntax(self, source):
+        with pytest.raises(FormulaError):
+            compile_formula(source)
+
+    def test_power_is_bounded(self):
+        assert compile_formula("base ** 3").evaluate({"base": 2}) == 8
+        for formula in ("2 ** 100", "base ** exponent", "10 ** 10 ** 10"):
+            with pytest.raises(FormulaError):
+                compile_formula(formula).evaluate({"base": 2, "exponent": MAX_EXPONENT + 1})
+        with pytest.raises(FormulaError):
+            compile_formula("base ** exponent").evaluate_batch(
+                {"base": 2.0, "exponent": np.array([1, MAX_EXPONENT + 1])})
+
+    def test_missing_variables_are_reported(self):
+        with pytest.raises(FormulaError, match="defense"):
+            compile_formula("damage - defense").evaluate({"damage": 3})
+
+    @pytest.mark.parametrize("source", [
+        "(speed + strength + finesse) // 2",
+        "max(min_damage, damage - defense)",
+        "min(damage, 20, defense * 3)",
+        "damage * 2 if defense < 5 else damage / 2",
+        "clamp(damage - defense, 1, 15)",
+        "1 if 2 < defense <= 6 and not damage > 18 else 0",
+        "floor(sqrt(damage * defense + 1)) + abs(min_damage - defense) % 4",
+    ])
+    def test_scalar_and_batch_agree(self, source):
+        formula = compile_formula(source)
+        rng = np.random.default_rng(7)
+        batch = {
+            "damage": rng.integers(1, 25, 64).astype(float),
+            "defense": rng.integers(0, 10, 64).astype(float),
+            "min_damage": 1.0, "speed": 7.0, "strength": 9.0, "finesse": 4.0,
+        }
+        results = np.broadcast_to(formula.evaluate_batch(batch), (64,))
+
+        for i in range(64):
+            scalar = {name: (value[i] if isinstance(value, np.ndarray) else value)
+                      for name, value in batch.items()}
+            assert results[i] == pytest.approx(float(formula.evaluate(scalar)))
+
+    def test_formulas_are_compiled_once(self):
+        assert compile_formula("damage - defense") is compile_formula("damage - defense")
+
+
+class TestAssetBundle:
+    """Building the bundle, staleness checks and the fallback to JSON sources"""
+
+    def write_assets(self, root: Path):
+        items = root / "data" / "items" / "base_items.json"
+        items.parent.mkdir(parents=True)
+        items.write_text(json.dumps({"items": [
+            {"id": "sword", "name": "Sword", "type": "Weapons", "tier": "BASE",
+             "stats": {"physical_attack": 5}, "requirements": {}, "value": 10}
+        ]}))
+        combat = root / "data" / "gameplay" / "combat_values.json"
+        combat.parent.mkdir(parents=True)
+        combat.write_text(json.dumps({"combat_values": {"crit": 2}}))
+        return items, combat
+
+    def build(self, root: Path) -> AssetBundle:
+        summary = build_bundle(root)
+        assert summary["entries"] == 2
+        return AssetBundle(summary["path"], assets_root=root)
+
+    def test_build_round_trips_every_file(self, tmp_path):
+        items, combat = self.write_assets(tmp_path)
+        bundle = self.build(tmp_path)
+        try:
+            assert bundle.get("data/gameplay/combat_values.json") == {"combat_values": {"crit": 2}}
+            assert bundle.get(bundle.relpath(items)) == json.loads(items.read_text())
+            assert bundle.get("data/missing.json") is None
+            assert bundle.get_stats()["hits"] == 2
+        finally:
+            bundle.close()
+
+    def test_invalid_assets_write_nothing(self, tmp_path):
+        items, _ = self.write_assets(tmp_path)
+        items.write_text(json.dumps({"items": [{"id": "sword"}]}))
+        with pytest.raises(BundleError, match="missing 'name'"):
+            build_bundle(tmp_path)
+        assert not (tmp_path / "assets.bundle").exists()
+
+    def test_staleness_checks_size_then_content(self, tmp_path):
+        _, combat = self.write_assets(tmp_path)
+        relpath = "data/gameplay/combat_values.json"
+        bundle = self.build(tmp_path)
+        try:
+            # Touched without a change: the content hash keeps the entry fresh
+            stat = combat.stat()
+            os.utime(combat, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            assert bundle.is_fresh(relpath)
+
+            # Same size, different content
+            combat.write_text(json.dumps({"combat_values": {"crit": 3}}))
+            os.utime(combat, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+            assert not bundle.is_fresh(relpath)
+
+            combat.write_text(json.dumps({"combat_values": {"crit": 30}}))
+            assert not bundle.is_fresh(relpath)
+            assert bundle.get(relpath) is None
+            assert bundle.get_stats()["stale_reads"] == 1
+
+            combat.unlink()
+            assert not bundle.is_fresh(relpath)
+        finally:
+            bundle.close()
+
+    def test_edited_source_falls_back_to_json(self, tmp_path, monkeypatch):
+        _, combat = self.write_assets(tmp_path)
+        bundle = self.build(tmp_path)
+        monkeypatch.setattr(asset_bundle, "_bundle", bundle)
+        try:
+            assert load_json(combat) == {"combat_values": {"crit": 2}}
+            assert bundle.hits == 1
+
+            combat.write_text(json.dumps({"combat_values": {"crit": 4, "edited": True}}))
+            assert load_json(combat) == {"combat_values": {"crit": 4, "edited": True}}
+            assert bundle.hits == 1 and bundle.stale_reads == 1
+        finally:
+            bundle.close()
+
+    def test_bundle_from_another_python_is_refused(self, tmp_path):
+        self.write_assets(tmp_path)
+        path = Path(build_bundle(tmp_path)["path"])
+        data = bytearray(path.read_bytes())
+        data[7] = (data[7] + 1) % 256  # Python minor version byte
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(BundleError, match="built for Python"):
+            AssetBundle(path, assets_root=tmp_path)
+
+
+class TestConfigHotReload:
+    """A configuration reload reaches every cached derived stat"""
+
+    def write_combat(self, root: Path, multiplier: int):
+        path = root / "data" / "gameplay" / "combat_values.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"stat_calculations": {"hp_multiplier": multiplier}}))
+
+    def test_hot_reload_invalidates_derived_stat_caches(self, tmp_path):
+        """Stats cached before hot_reload are recomputed from the new values"""
+        self.write_combat(tmp_path, 5)
+        config = ConfigManager(str(tmp_path))
+        caches = [DerivedStatCache() for _ in range(3)]
+
+        def max_hp():
+            return 10 * config.get_value("combat.stat_calculations.hp_multiplier", 1)
+
+        assert [cache.get("max_hp", max_hp, ("fortitude",)) for cache in caches] == [50] * 3
+        assert all(cache.is_cached("max_hp") for cache in caches)
+
+        self.write_combat(tmp_path, 7)
+        config.hot_reload("combat")
+
+        assert not any(cache.is_cached("max_hp") for cache in caches)
+        assert [cache.get("max_hp", max_hp, ("fortitude",)) for cache in caches] == [70] * 3
+        assert caches[0].get_stats()["recomputes"] == 2
+
+
+def talent_record(talent_id, ap, effects=None, action_type="Attack", name=None):
+    return {"id": talent_id, "name": name or talent_id.title(), "action_type": action_type,
+            "tier": "Novice", "cost": {"ap_cost": ap}, "effects": effects or {}}
+
+
+class TestCatalogIndexes:
+    """Range, cost and tier indexes, footprints and frozen entries"""
+
+    def make_catalog(self) -> Catalog:
+        talents = [
+            TalentEntry.from_dict(talent_record("jab", 1, {"base_damage": 5, "range": 1})),
+            TalentEntry.from_dict(talent_record("bolt", 2, {"magical_damage": 8, "range": 4,
+                                                            "area_of_effect": 2}), "Magical"),
+            TalentEntry.from_dict(talent_record("meteor", 9, {"magical_damage": 30, "range": 6,
+                                                              "area_of_effect": "adjacent"}), "Magical"),
+            TalentEntry.from_dict(talent_record("meditate", 0, {"mp_restoration": 3},
+                                                action_type="Spirit", name="Meditate"), "Spiritual"),
+        ]
+        items = [ItemEntry.from_dict({"id": "sword", "name": "Sword", "type": "Weapons", "tier": "BASE",
+                                      "stats": {"attack": 5}, "tags": ["sharp"]}),
+                 ItemEntry.from_dict({"id": "relic", "name": "Relic", "type": "Accessories",
+                                      "tier": "LEGENDARY"})]
+        return Catalog(talents, items)
+
+    @staticmethod
+    def ids(entries) -> list:
+        return [entry.id for entry in entries]
+
+    def test_range_and_cost_indexes(self):
+        """talents_in_range and talents_affordable match a scan; buckets cap at the top"""
+        catalog = self.make_catalog()
+
+        for distance in range(-1, 9):
+            expected = [t.id for t in catalog.talents if t.range >= max(distance, 0)]
+            assert self.ids(catalog.talents_in_range(distance)) == expected
+        assert self.ids(catalog.talents_in_range(5)) == ["meteor"]
+        assert catalog.talents_in_range(7) == ()
+
+        assert catalog.talents_affordable(-1) == ()
+        assert self.ids(catalog.talents_affordable(1)) == ["jab", "meditate"]
+        assert len(catalog.talents_affordable(50)) == 4
+        assert self.ids(catalog.talents_by_cost_bucket(5)) == ["meteor"]
+        assert self.ids(catalog.talents_by_cost_bucket(0)) == ["meditate"]
+        assert self.ids(catalog.talents_by_tree("Magical")) == ["bolt", "meteor"]
+        assert self.ids(catalog.items_by_tier("LEGENDARY")) == ["relic"]
+        assert catalog.items_by_tier("EPIC") == ()
+
+    def test_footprints_and_classification(self):
+        """Footprints hold target offsets nearest first; offensive comes from effects and type"""
+        catalog = self.make_catalog()
+        jab, bolt, meteor, meditate = (catalog.talent(i) for i in ("jab", "bolt", "meteor", "meditate"))
+
+        assert set(jab.range_footprint) == {(1, 0), (-1, 0), (0, 1), (0, -1)}
+        assert len(bolt.range_footprint) == 40
+        distances = [abs(dx) + abs(dy) for dx, dy in bolt.range_footprint]
+        assert distances == sorted(distances) and max(distances) == 4
+        assert bolt.area_footprint[0] == (0, 0) and len(bolt.area_footprint) == 5
+        assert len(meteor.area_footprint) == 8 and (0, 0) not in meteor.area_footprint
+        assert meditate.range_footprint == ((0, 0),)
+        assert meditate.area_footprint == ((0, 0),)
+
+        assert jab.offensive and bolt.offensive and not meditate.offensive
+        assert meditate.target_type == "self" and jab.target_type == "enemy"
+
+    def test_entries_are_frozen(self):
+        """Entries and their nested data are read-only; to_dict hands out a mutable copy"""
+        catalog = self.make_catalog()
+        bolt, sword = catalog.talent("bolt"), catalog.item("sword")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            bolt.range = 10
+        with pytest.raises(TypeError):
+            bolt.effects["range"] = 10
+        with pytest.raises(TypeError):
+            sword.stats["attack"] = 50
+        assert sword.data["tags"] == ("sharp",)
+
+        copy = bolt.to_dict()
+        copy["effects"]["range"] = 10
+        assert bolt.effects["range"] == 4
+        assert sword.to_dict()["tags"] == ["sharp"]
+
+
+class StubHotkeyCharacter:
+    def __init__(self, hotkey_abilities):
+        self.hotkey_abilities = hotkey_abilities
+
+
+class TestAITalentProfiles:
+    """The AI's talent options come from catalog classification and range"""
+
+    def make_registry(self, hotkey_abilities):
+        character = StubHotkeyCharacter(hotkey_abilities)
+        controller = type("Controller", (), {})()
+        controller.character_state_manager = type("Characters", (), {
+            "get_character_instance": staticmethod(lambda instance_id: character)
+        })()
+        return SimpleMCPToolRegistry(controller)
+
+    def test_offensive_talents_and_range(self):
+        """Support talents are skipped; catalog ranges decide which enemies a talent reaches"""
+        fireball = get_catalog().talent("fireball")
+        assert fireball is not None and fireball.range > 2
+        registry = self.make_registry([
+            {"talent_id": "fireball", "name": "Fireball"},
+            None,
+            {"talent_id": "ward", "name": "Ward", "action_type": "Support",
+             "effects": {"note": "reduces damage taken"}},
+        ])
+        unit = type("Unit", (), {"character_instance_id": "c1", "magic_range": 2,
+                                 "physical_attack": 10, "magical_attack": 14})()
+
+        profiles = registry._get_combat_talent_profiles(unit)
+        assert [(p["talent_id"], p["slot_index"], p["ap_cost"]) for p in profiles] == \
+            [("fireball", 0, fireball.ap_cost)]
+
+        enemy = {"name": "Orc", "position": {"x": 0, "y": 0}, "hp": 30,
+                 "physical_defense": 2, "magical_defense": 4}
+        ap = fireball.ap_cost
+        in_range = registry._get_talent_damage_options(unit, enemy, fireball.range, ap, profiles)
+        assert [option["talent_id"] for option in in_range] == ["fireball"]
+        assert registry._get_talent_damage_options(unit, enemy, fireball.range + 1, ap, profiles) == []
+        assert registry._get_talent_damage_options(unit, enemy, 1, ap - 1, profiles) == []
@@ -7,10 +7,45 @@ Tests the complete game flow from session creation to gameplay mechanics.
 import pytest
 import asyncio
 import json
+import math
+import random
+import sys
+import time
 from datetime import datetime
+from pathlib import Path
 
+import numpy as np
 import structlog
 
+from src.core.session_registry import SessionRegistry, SessionRegistryConfig
+from src.core.utils.profiler import PerformanceProfiler
+from src.core.utils.tracing import Tracer
+from src.core.math import GridPosition
+from src.core.math.reachability import (
+    RangeCache, TileMask, _line_between, attack_mask, movement_costs, reachable_mask
+)
+from src.engine.battlefield import BattlefieldManager, TerrainType
+from src.engine.components.position_component import PositionComponent
+from src.engine.ui.game_ui_manager import GameUIManager, UIEventType
+from src.core.ecs import ECSManager
+from src.core.events import EventBus
+from src.engine.headless_simulator import (
+    HeadlessBattle, SimulationConfig, TeamSetup, aggregate_results, run_batch, run_battle
+)
+
+# Game modules import relative to src, as the launcher does
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+from game.actions.action_system import Action, ActionType
+from game.effects.effect_system import (
+    DamageEffect, DamageType, HealingEffect, ResourceEffect, ResourceType, StatModifierEffect, apply_effects
+)
+from game.queue.action_queue import ActionPriority, ActionQueue
+from core.models.unit import Unit
+from core.models.unit_types import UnitType
+from core.utils.stat_cache import DerivedStatCache
+import ui.action_prediction as action_prediction
+from ui.action_prediction import ActionPredictionEngine
+
 logger = structlog.get_logger()
 
 
@@ -242,4 +277,750 @@ class TestGameEngineIntegration:
         # Verify event was emitted
         assert len(events_received) > 0
         move_event = events_received[-1]
-        assert move_event.type == EventType.UNIT_MOVED
\ No newline at end of file
+        assert move_event.type == EventType.UNIT_MOVED
+
+
+class TestHeadlessSimulator:
+    """Seeded AI-vs-AI battles without the real-time loop"""
+    
+    def small_config(self) -> SimulationConfig:
+        return SimulationConfig(
+            teams=[TeamSetup(team="team_a", unit_count=2), TeamSetup(team="team_b", unit_count=2)],
+            battlefield_size=(6, 6),
+            max_turns=40
+        )
+    
+    async def test_small_battle_runs_to_completion(self):
+        """A 2v2 battle deploys its units and ends with a winner or at the turn limit"""
+        config = self.small_config()
+        battle = HeadlessBattle(config, seed=7)
+        result = await battle.run()
+        
+        assert len(battle.entities) == 4
+        assert result.actions > 0
+        assert 1 <= result.turns <= config.max_turns
+        if result.winner is not None:
+            assert result.survivors[result.winner] > 0
+            assert sum(result.survivors.values()) == result.survivors[result.winner]
+    
+    async def test_deployed_units_move_in_spatial_index(self):
+        """Deployed position components are bound, so move_to updates the SpatialIndex"""
+        battle = HeadlessBattle(self.small_config(), seed=11)
+        await battle.battlefield.initialize_for_session(battle.session_id, (6, 6))
+        battle._deploy_units()
+        index = battle.battlefield.get_spatial_index(battle.session_id)
+        
+        for entity_id in battle.entities:
+            position = battle._component(entity_id, PositionComponent).position
+            assert index.position_of(entity_id) == (position.x, position.y)
+        
+        entity_id = battle.units_by_team["team_a"][0]
+        position_component = battle._component(entity_id, PositionComponent)
+        start = position_component.position
+        destination = GridPosition(start.x + 1, start.y)
+        version = index.version
+        
+        assert position_component.move_to(destination)
+        assert index.position_of(entity_id) == (destination.x, destination.y)
+        assert index.entity_at(start.x, start.y) is None
+        assert index.team_of(entity_id) == "team_a"
+        assert index.version > version
+    
+    async def test_units_move_in_index_restored_after_page_in(self):
+        """After page-out and page-in, bound components move the rebuilt index"""
+        battle = HeadlessBattle(self.small_config(), seed=11)
+        await battle.battlefield.initialize_for_session(battle.session_id, (6, 6))
+        battle._deploy_units()
+        registry = SessionRegistry(SessionRegistryConfig())
+        registry.register_subsystem(
+            "battlefield", battle.battlefield.cleanup_session,
+            state_getter=battle.battlefield.get_session_snapshot,
+            restore=battle.battlefield.restore_session
+        )
+        registry.track(battle.session_id)
+        old_index = battle.battlefield.get_spatial_index(battle.session_id)
+        
+        assert await registry.page_out(battle.session_id)
+        assert await registry.ensure_resident(battle.session_id)
+        index = battle.battlefield.get_spatial_index(battle.session_id)
+        assert index is not old_index
+        
+        entity_id = battle.units_by_team["team_a"][0]
+        position_component = battle._component(entity_id, PositionComponent)
+        assert position_component.spatial_index is index
+        start = position_component.position
+        destination = GridPosition(start.x + 1, start.y)
+        assert index.team_of(entity_id) == "team_a"
+        
+        assert position_component.move_to(destination)
+        assert index.position_of(entity_id) == (destination.x, destination.y)
+        assert index.entity_at(start.x, start.y) is None
+        movement, _ = battle.battlefield.get_unit_ranges(
+            battle.session_id, "probe", GridPosition(0, 0), 10, 1)
+        assert (start.x, start.y) in movement
+        assert (destination.x, destination.y) not in movement
+    
+    async def test_refused_move_leaves_component_in_place(self):
+        """A move onto an occupied tile changes neither the component nor the index"""
+        battle = HeadlessBattle(self.small_config(), seed=11)
+        await battle.battlefield.initialize_for_session(battle.session_id, (6, 6))
+        battle._deploy_units()
+        index = battle.battlefield.get_spatial_index(battle.session_id)
+        mover, blocker = battle.units_by_team["team_a"][0], battle.units_by_team["team_b"][0]
+        position_component = battle._component(mover, PositionComponent)
+        position_component.movement_remaining = position_component.max_movement = 20
+        start = position_component.position
+        blocked = battle._component(blocker, PositionComponent).position
+        
+        assert not position_component.move_to(blocked)
+        assert not position_component.teleport_to(blocked)
+        assert position_component.position == start
+        assert position_component.movement_remaining == 20
+        assert index.position_of(mover) == (start.x, start.y)
+        assert index.entity_at(blocked.x, blocked.y) == blocker
+    
+    async def test_systems_see_only_their_sessions_entities(self):
+        """Entities on another session's battlefield are not processed"""
+        battle = HeadlessBattle(self.small_config(), seed=11)
+        await battle.battlefield.initialize_for_session(battle.session_id, (6, 6))
+        battle._deploy_units()
+        await battle.battlefield.initialize_for_session("other", (6, 6))
+        stranger = battle.ecs.create_entity(PositionComponent(position=GridPosition(2, 2))).id
+        battle.battlefield.occupy_tile("other", GridPosition(2, 2), stranger, "team_c")
+        
+        for system in (battle.combat_system, battle.turn_system):
+            own = system.get_entities_with_components(battle.session_id, PositionComponent)
+            assert set(own) == set(battle.entities)
+            assert system.get_entities_with_components("other", PositionComponent) == [stranger]
+    
+    def test_in_process_batch_keeps_logging_configuration(self):
+        """workers=1 leaves the caller's structlog configuration alone"""
+        before = structlog.get_config()["wrapper_class"]
+        results, stats = run_batch(self.small_config(), [5], workers=1)
+        
+        assert stats.battles == 1
+        assert structlog.get_config()["wrapper_class"] is before
+    
+    def test_battles_are_reproducible_by_seed(self):
+        """The same seed gives the same battle"""
+        config = self.small_config()
+        results = [run_battle(config, seed) for seed in (3, 3, 4)]
+        
+        assert results[0] == results[1]
+        stats = aggregate_results(config, results)
+        assert stats.battles == 3
+        assert stats.wins["team_a"] + stats.wins["team_b"] + stats.draws == 3
+
+
+class TestSessionRegistry:
+    """Idle page-out and eviction of per-session state"""
+    
+    def make_registry(self, state):
+        registry = SessionRegistry(SessionRegistryConfig(idle_timeout=60.0))
+        released = {"board": [], "ai": []}
+        registry.register_subsystem(
+            "board", lambda sid: (released["board"].append(sid), state.pop(sid, None)),
+            state_getter=state.get, restore=state.__setitem__
+        )
+        registry.register_subsystem("ai", released["ai"].append, evict_only=True)
+        return registry, released
+    
+    async def test_evict_only_subsystems_survive_page_out(self):
+        """Page-out releases pageable state but keeps evict-only registrations"""
+        state = {"s1": {"units": [1, 2, 3]}}
+        registry, released = self.make_registry(state)
+        registry.track("s1")
+        
+        assert await registry.page_out("s1")
+        assert released == {"board": ["s1"], "ai": []}
+        assert await registry.ensure_resident("s1")
+        assert state["s1"] == {"units": [1, 2, 3]}
+        
+        await registry.evict("s1")
+        assert released["ai"] == ["s1"]
+    
+    async def test_failed_page_out_keeps_session_resident(self):
+        """An unpicklable session stays live instead of being evicted"""
+        state = {"s1": {"callback": lambda: None}}
+        registry, released = self.make_registry(state)
+        record = registry.track("s1")
+        
+        outcome = await registry.sweep(now=record.last_activity + 120.0)
+        
+        assert outcome["kept"] == 1 and outcome["evicted"] == 0
+        assert "s1" in state and "s1" in registry.sessions
+        assert not registry.is_paged_out("s1")
+        assert released == {"board": [], "ai": []}
+        assert registry.get_stats()["page_out_failures"] == 1
+
+
+class RecordingAction(Action):
+    """Action whose execution only reports which unit ran it"""
+    
+    def execute(self, unit, targets, game_state):
+        return {'action': self.id, 'unit': unit}
+
+
+class TestActionQueueTimeline:
+    """Incrementally ordered action timeline"""
+    
+    def full_sort(self, queue: ActionQueue, unit_stats: dict) -> list:
+        """Reference order: every queued action sorted from scratch"""
+        entries = []
+        for unit_id, actions in queue.unit_queues.items():
+            initiative = unit_stats.get(unit_id, {}).get('initiative', 50)
+            for position, queued_action in enumerate(actions):
+                entries.append((queued_action.get_execution_order(initiative),
+                                queue._unit_ranks[unit_id], position, queued_action))
+        entries.sort(key=lambda entry: entry[:3])
+        return [entry[3] for entry in entries]
+    
+    def test_edits_keep_timeline_and_preview_in_order(self):
+        """Queue, remove, reorder and initiative edits match a full re-sort"""
+        rng = random.Random(5)
+        units = [f"unit_{i}" for i in range(8)]
+        actions = []
+        for i in range(12):
+            action = RecordingAction(f"action_{i}", f"Action {i}", ActionType.ATTACK)
+            action.cast_time = rng.randint(0, 10)
+            actions.append(action)
+        unit_stats = {unit_id: {'initiative': rng.randint(1, 100)} for unit_id in units}
+        queue = ActionQueue()
+        
+        for step in range(400):
+            unit_id = rng.choice(units)
+            queued = queue.unit_queues[unit_id]
+            roll = rng.random()
+            if roll < 0.5 or not queued:
+                queue.queue_action(unit_id, rng.choice(actions), [], rng.choice(list(ActionPriority)))
+            elif roll < 0.7:
+                queue.remove_action(unit_id, rng.randrange(len(queued)))
+            elif roll < 0.85:
+                order = list(range(len(queued)))
+                rng.shuffle(order)
+                queue.reorder_unit_actions(unit_id, order)
+            else:
+                unit_stats[unit_id] = {'initiative': rng.randint(1, 100)}
+            
+            if step % 10 == 0:
+                preview = queue.preview_timeline(unit_stats)
+                expected = self.full_sort(queue, unit_stats)
+                assert [event.queued_action for event in queue.execution_timeline] == expected
+                assert [row['sequence'] for row in preview] == list(range(1, len(expected) + 1))
+                assert [row['unit_id'] for row in preview] == [a.unit_id for a in expected]
+    
+    def test_missing_unit_action_is_dropped(self):
+        """An action whose unit is gone is skipped instead of blocking the timeline"""
+        queue = ActionQueue()
+        action = RecordingAction("strike", "Strike", ActionType.ATTACK)
+        queue.queue_action("dead", action, [], ActionPriority.IMMEDIATE)
+        queue.queue_action("alive", action, [], ActionPriority.NORMAL)
+        queue.queue_action("alive", action, [], ActionPriority.LOW)
+        game_state = {'units': {'alive': 'alive_unit'}}
+        
+        results = [queue.execute_next_action(game_state) for _ in range(3)]
+        
+        assert [r and r['unit'] for r in results] == ['alive_unit', 'alive_unit', None]
+        assert queue.get_queue_statistics()['total_queued_actions'] == 0
+        assert queue.unit_queues['dead'] == []
+
+
+class TestActionVersion:
+    """Action.version, the prediction cache's view of an action"""
+    
+    def test_version_changes_with_effects_and_fields(self):
+        """Adding, removing or editing effects and prediction inputs all change the version"""
+        action = Action("fireball", "Fireball", ActionType.MAGIC)
+        seen = [action.version]
+        
+        damage = DamageEffect(20, damage_type=DamageType.MAGICAL)
+        action.add_effect(damage)
+        seen.append(action.version)
+        heal = HealingEffect(5)
+        action.add_effect(heal)
+        seen.append(action.version)
+        action.remove_effect(heal)
+        seen.append(action.version)
+        damage.magnitude = 35
+        seen.append(action.version)
+        damage.damage_type = DamageType.SPIRITUAL
+        seen.append(action.version)
+        action.accuracy = 80
+        seen.append(action.version)
+        
+        assert len(set(seen)) == len(seen)
+        assert action.version == seen[-1]
+    
+    def test_rebuilt_action_never_reuses_a_version(self):
+        """A new action with the same id and effects does not match an old version"""
+        versions = set()
+        for _ in range(50):
+            action = Action("strike", "Strike")
+            action.add_effect(DamageEffect(10))
+            versions.add(action.version)
+            del action
+        assert len(versions) == 50
+
+
+class PredictionController:
+    """Just what the prediction engine reads from the game controller"""
+    
+    def __init__(self, player_units, enemy_units):
+        self.player_units = list(player_units)
+        self.units = {unit.name: unit for unit in self.player_units + list(enemy_units)}
+
+
+class PredictionActions:
+    """Action registry holder standing in for the action manager"""
+    
+    def __init__(self, controller, actions):
+        self.game_controller = controller
+        self.action_registry = {action.id: action for action in actions}
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.errors = []
+    
+    def error(self, message, **context):
+        self.errors.append((message, context))
+
+
+class TestActionPrediction:
+    """Versioned effect-prediction cache and background battle rollouts"""
+    
+    def make_engine(self):
+        hero = Unit("hero", UnitType.HEROMANCER, 0, 0, strength=10, speed=10, fortitude=10)
+        orc = Unit("orc", UnitType.HEROMANCER, 1, 0, strength=10, speed=10, fortitude=10)
+        strike = Action("strike", "Strike")
+        strike.add_effect(DamageEffect(30, damage_type=DamageType.PHYSICAL))
+        controller = PredictionController([hero], [orc])
+        engine = ActionPredictionEngine(PredictionActions(controller, [strike]))
+        return engine, hero, orc
+    
+    def predict(self, engine):
+        return engine.predict_action_outcome("strike", "hero", ["orc"])
+    
+    def test_repeat_hover_is_a_cache_hit(self):
+        engine, hero, orc = self.make_engine()
+        first = self.predict(engine)
+        
+        assert self.predict(engine)[0] is first[0]
+        stats = engine.get_stats()["predictions"]
+        assert stats["hits"] == 1 and stats["misses"] == 1
+    
+    def test_stat_changes_invalidate_predictions(self):
+        """A strength change, a stat reset or a config reload all recompute"""
+        engine, hero, orc = self.make_engine()
+        before = self.predict(engine)[0].expected_value
+        
+        orc.strength += 9
+        after = self.predict(engine)[0].expected_value
+        assert after < before
+        
+        orc.invalidate_stats()
+        self.predict(engine)
+        DerivedStatCache.invalidate_everywhere()
+        self.predict(engine)
+        assert engine.get_stats()["predictions"]["misses"] == 4
+    
+    def test_battle_state_never_blocks(self):
+        """predict_battle_state returns at once and is refined in the background"""
+        engine, hero, orc = self.make_engine()
+        try:
+            start = time.perf_counter()
+            estimate = engine.predict_battle_state(turns_ahead=3)
+            assert time.perf_counter() - start < 0.05
+            assert estimate.samples == 0
+            
+            deadline = time.perf_counter() + 10.0
+            while not estimate.complete and time.perf_counter() < deadline:
+                time.sleep(0.01)
+                estimate = engine.predict_battle_state(turns_ahead=3)
+            assert estimate.complete and estimate.samples == engine.max_rollouts
+            assert 0.0 <= estimate.victory_probability <= 1.0
+        finally:
+            engine.shutdown()
+    
+    def test_rollout_failures_are_logged(self, monkeypatch):
+        engine, hero, orc = self.make_engine()
+        recorder = RecordingLogger()
+        monkeypatch.setattr(action_prediction, "logger", recorder)
+        
+        def fail(state, turns, rng):
+            raise RuntimeError("bad state")
+        
+        engine._simulate_battle_turns = fail
+        try:
+            engine.predict_battle_state()
+            engine._rollout_future.exception(timeout=5.0)
+            assert recorder.errors and recorder.errors[0][0] == "Battle rollout failed"
+            assert "bad state" in recorder.errors[0][1]["error"]
+        finally:
+            engine.shutdown()
+
+
+class EffectTarget:
+    """Minimal unit: HP, defenses and MP, with damage already net of defense"""
+    
+    def __init__(self, rng: random.Random):
+        self.max_hp = rng.randint(20, 80)
+        self.hp = rng.randint(0, self.max_hp)
+        self.alive = self.hp > 0
+        self.max_mp = rng.randint(0, 30)
+        self.mp = rng.randint(0, self.max_mp)
+        self.physical_defense = rng.randint(0, 8)
+        self.magical_defense = rng.randint(0, 8)
+        self.spiritual_defense = rng.randint(0, 8)
+        self.strength = rng.randint(1, 20)
+    
+    def take_damage(self, damage, damage_type):
+        self.hp = max(0, self.hp - damage)
+        self.alive = self.hp > 0
+    
+    def state(self) -> tuple:
+        return (self.hp, self.alive, self.mp)
+
+
+class BareTarget:
+    """Target lacking most attributes, so effects are skipped for it"""
+    
+    def __init__(self, rng: random.Random):
+        self.hp = rng.randint(1, 10)
+        self.alive = True
+    
+    def take_damage(self, damage, damage_type):
+        self.hp = max(0, self.hp - damage)
+        self.alive = self.hp > 0
+    
+    def state(self) -> tuple:
+        return (self.hp, self.alive)
+
+
+class TestEffectBatchParity:
+    """apply_effects against applying each Effect per target"""
+    
+    def random_effects(self, rng: random.Random) -> list:
+        effects = []
+        for _ in range(rng.randint(1, 4)):
+            kind = rng.randrange(4)
+            if kind == 0:
+                effects.append(DamageEffect(rng.randint(1, 30), damage_type=rng.choice(list(DamageType))))
+            elif kind == 1:
+                effects.append(HealingEffect(rng.randint(1, 30)))
+            elif kind == 2:
+                effects.append(ResourceEffect(ResourceType.MP, rng.randint(-15, 15)))
+            else:
+                effects.append(StatModifierEffect('strength', rng.randint(-5, 5), 2))
+        return effects
+    
+    def random_targets(self, seed: int) -> list:
+        rng = random.Random(seed)
+        return [EffectTarget(rng) if rng.random() < 0.8 else BareTarget(rng)
+                for _ in range(rng.randint(1, 6))]
+    
+    @staticmethod
+    def per_target(effects: list, targets: list) -> list:
+        results = []
+        for effect in effects:
+            for target in targets:
+                if effect.can_apply(target, {}):
+                    result = effect.apply(target, {})
+                    result['effect_type'] = effect.type.value
+                    result['target'] = target
+                    results.append(result)
+        return results
+    
+    @staticmethod
+    def comparable(results: list, targets: list) -> list:
+        index = {id(target): i for i, target in enumerate(targets)}
+        return [{**result, 'target': index[id(result['target'])]} for result in results]
+    
+    def test_batch_matches_per_target_over_200_seeds(self):
+        """Same results and final state as the per-target loop; undo restores the start"""
+        for seed in range(200):
+            effects = self.random_effects(random.Random(seed))
+            specs = tuple(effect.to_spec() for effect in effects)
+            expected_targets = self.random_targets(seed)
+            batch_targets = self.random_targets(seed)
+            initial = [target.state() for target in batch_targets]
+            
+            expected = self.per_target(effects, expected_targets)
+            batch = apply_effects(specs, batch_targets, {})
+            
+            assert self.comparable(batch.results, batch_targets) == \
+                self.comparable(expected, expected_targets), f"seed {seed}"
+            assert [t.state() for t in batch_targets] == [t.state() for t in expected_targets]
+            batch.undo()
+            assert [target.state() for target in batch_targets] == initial
+    
+    def test_specs_follow_effect_edits(self):
+        """Editing an effect in place is picked up by the action's cached specs"""
+        action = Action("smite", "Smite", ActionType.SPIRIT)
+        damage = DamageEffect(10)
+        action.add_effect(damage)
+        assert action.effect_specs[0].magnitude == 10
+        
+        damage.magnitude = 25
+        damage.damage_type = DamageType.SPIRITUAL
+        assert action.effect_specs[0].magnitude == 25
+        assert action.effect_specs[0].damage_type == DamageType.SPIRITUAL
+        
+        action.effects.append(HealingEffect(5))
+        assert len(action.effect_specs) == 2
+
+
+class TestReachability:
+    """Movement costs, line-of-sight attack ranges, mask encoding and the range cache"""
+    
+    def board(self):
+        """4x4 board: forest at (1,0) costs 2, wall at (0,2), unit at (1,1)"""
+        costs = np.ones((4, 4))
+        costs[1, 0] = 2
+        costs[0, 2] = np.inf
+        occupied = np.zeros((4, 4), dtype=bool)
+        occupied[1, 1] = True
+        return costs, occupied
+    
+    def test_movement_costs_terrain_occupancy_and_bounds(self):
+        """Terrain costs add up, walls and units block, and the budget bounds the search"""
+        costs, occupied = self.board()
+        occupied[0, 0] = True  # The mover's own tile never blocks it
+        
+        best = movement_costs(costs, (0, 0), 3, occupied)
+        reached = {(x, y): best[x, y] for x, y in zip(*np.nonzero(np.isfinite(best)))}
+        assert reached == {(0, 0): 0, (0, 1): 1, (1, 0): 2, (2, 0): 3}
+        
+        # A bigger budget routes around the unit and the wall
+        best = movement_costs(costs, (0, 0), 8, occupied)
+        assert best[1, 2] == 6 and best[0, 3] == 8 and math.isinf(best[1, 1])
+        
+        assert np.isinf(movement_costs(costs, (5, 0), 3)).all()
+        mask = reachable_mask(costs, (0, 0), 3, occupied)
+        assert sorted(mask.positions()) == [(0, 1), (1, 0), (2, 0)]
+        
+        # A step cost of inf forbids that step
+        uphill = lambda a, b: np.inf if b == (0, 1) else 0.0
+        assert sorted(reachable_mask(costs, (0, 0), 3, occupied, uphill).positions()) == [(1, 0), (2, 0)]
+    
+    def test_attack_mask_line_of_sight(self):
+        """Blockers hide what lies behind them but not themselves"""
+        blockers = np.zeros((5, 5), dtype=bool)
+        blockers[1, 2] = True
+        blockers[3, 4] = True
+        
+        mask = attack_mask((0, 2), 4, (5, 5), blockers)
+        assert (1, 2) in mask and (0, 0) in mask and (0, 2) not in mask
+        assert (2, 2) not in mask and (4, 2) not in mask
+        
+        # Same result as walking each target's line
+        expected = set()
+        for x in range(5):
+            for y in range(5):
+                dx, dy = x, y - 2
+                if 0 < abs(dx) + abs(dy) <= 4 and not any(
+                        blockers[cx, 2 + cy] for cx, cy in _line_between(dx, dy)):
+                    expected.add((x, y))
+        assert set(mask.positions()) == expected
+        
+        assert len(attack_mask((0, 2), 0, (5, 5), blockers)) == 0
+        no_column = attack_mask((0, 2), 4, (5, 5), blockers, lambda a, b: b[0] != 0)
+        assert set(no_column.positions()) == {p for p in expected if p[0] != 0}
+    
+    def test_tile_mask_wire_round_trip(self):
+        """Sparse masks travel as runs, noisy ones as a bitset; both decode exactly"""
+        rng = np.random.default_rng(9)
+        sparse = np.zeros((12, 9), dtype=bool)
+        sparse[4, 2:7] = True
+        noisy = rng.random((12, 9)) < 0.5
+        starts_set = np.zeros((3, 3), dtype=bool)
+        starts_set[0, :2] = True
+        
+        wires = {}
+        for name, array in (("sparse", sparse), ("noisy", noisy), ("starts_set", starts_set),
+                            ("empty", np.zeros((4, 4), dtype=bool))):
+            mask = TileMask.from_array(array)
+            wire = json.loads(json.dumps(mask.to_wire()))
+            decoded = TileMask.from_wire(wire)
+            assert decoded == mask and (decoded.to_array() == array).all(), name
+            wires[name] = wire
+        
+        assert "rle" in wires["sparse"] and "bits" in wires["noisy"]
+        assert wires["starts_set"].get("rle", [0])[0] == 0
+    
+    def test_range_cache_invalidation(self):
+        """Entries are reused until the version changes; the oldest unit is evicted at capacity"""
+        cache = RangeCache(max_entries=2)
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+        
+        assert cache.get_or_compute("a", 1, compute) == 1
+        assert cache.get_or_compute("a", 1, compute) == 1
+        assert cache.get_or_compute("a", 2, compute) == 2
+        cache.get_or_compute("b", 2, compute)
+        cache.get_or_compute("c", 2, compute)
+        assert cache.get_or_compute("b", 2, compute) == 3
+        assert cache.get_or_compute("a", 2, compute) == 5
+        assert cache.get_stats() == {"entries": 2, "hits": 2, "misses": 5}
+    
+    async def test_battlefield_ranges_follow_terrain_and_units(self):
+        """Terrain edits and unit moves both invalidate a unit's cached ranges"""
+        battlefield = BattlefieldManager((6, 6))
+        await battlefield.initialize_for_session("s", (6, 6))
+        battlefield.occupy_tile("s", GridPosition(0, 0), "hero", "a")
+        
+        def ranges():
+            return battlefield.get_unit_ranges("s", "hero", GridPosition(0, 0), 2, 3)
+        
+        movement, attack = ranges()
+        assert ranges()[0] is movement and (1, 1) in movement
+        
+        battlefield.set_tile_terrain("s", GridPosition(1, 1), TerrainType.WALLS)
+        movement = ranges()[0]
+        assert (1, 1) not in movement
+        
+        battlefield.occupy_tile("s", GridPosition(0, 1), "orc", "b")
+        assert (0, 1) not in ranges()[0]
+        # A bound unit moving on its own frees its old tile
+        index = battlefield.get_spatial_index("s")
+        index.move("orc", 3, 3)
+        assert (0, 1) in ranges()[0]
+        assert battlefield.range_cache.get_stats()["hits"] == 1
+    
+    async def test_cleanup_drops_board_version_and_cached_ranges(self):
+        """An ended session leaves no version counter or range masks behind"""
+        battlefield = BattlefieldManager((6, 6))
+        for session_id in ("s", "t"):
+            await battlefield.initialize_for_session(session_id, (6, 6))
+            battlefield.occupy_tile(session_id, GridPosition(0, 0), "hero", "a")
+            battlefield.get_unit_ranges(session_id, "hero", GridPosition(0, 0), 2, 3)
+        
+        await battlefield.cleanup_session("s")
+        
+        assert "s" not in battlefield.board_versions and "t" in battlefield.board_versions
+        assert battlefield.range_cache.get_stats()["entries"] == 1
+
+
+class TestUIUpdateBatching:
+    """Per-session buffering, merge keys and the deadline flush of UI updates"""
+    
+    def manager(self, fail=False):
+        ui = GameUIManager(ECSManager(), EventBus())
+        sent = []
+        
+        async def callback(session_id, message):
+            if fail:
+                raise ConnectionError("socket closed")
+            sent.append(message)
+        
+        ui.set_websocket_callback(callback)
+        return ui, sent
+    
+    async def test_updates_coalesce_into_one_message(self):
+        ui, sent = self.manager()
+        for unit in ("a", "b", "c"):
+            await ui._send_ui_update("s", UIEventType.UNIT_SELECTED, {"unit_id": unit})
+        await ui.flush_updates()
+        
+        assert len(sent) == 1 and sent[0]["type"] == "ui_update_batch"
+        assert [u["data"]["unit_id"] for u in sent[0]["updates"]] == ["a", "b", "c"]
+        stats = ui.get_ui_stats()
+        assert stats["ui_messages_sent"] == 1
+        assert stats["ui_messages_saved"] == 2
+    
+    async def test_superseded_updates_are_merged(self):
+        ui, sent = self.manager()
+        await ui._send_ui_update("s", UIEventType.BATTLEFIELD_UPDATED, {"turn": 1})
+        await ui._send_ui_update("s", UIEventType.UNIT_SELECTED, {"unit_id": "a"})
+        await ui._send_ui_update("s", UIEventType.BATTLEFIELD_UPDATED, {"turn": 2})
+        await ui.flush_updates("s")
+        
+        updates = sent[0]["updates"]
+        assert [u["event_type"] for u in updates] == [
+            UIEventType.UNIT_SELECTED, UIEventType.BATTLEFIELD_UPDATED]
+        assert updates[1]["data"] == {"turn": 2}
+        stats = ui.get_ui_stats()
+        assert stats["ui_updates_merged"] == 1
+        assert stats["ui_messages_saved"] == 2
+    
+    async def test_deadline_flushes_without_engine_step(self):
+        ui, sent = self.manager()
+        ui.flush_deadline = 0.01
+        await ui._send_ui_update("s", UIEventType.UNIT_SELECTED, {"unit_id": "a"})
+        assert not sent
+        
+        await asyncio.sleep(0.05)
+        assert len(sent) == 1 and sent[0]["type"] == "ui_update"
+        assert not ui._flush_tasks
+        assert ui.get_ui_stats()["ui_messages_saved"] == 0
+    
+    async def test_step_flush_cancels_deadline(self):
+        ui, sent = self.manager()
+        ui.flush_deadline = 0.01
+        await ui._send_ui_update("s", UIEventType.UNIT_SELECTED, {"unit_id": "a"})
+        await ui.update(0.016)
+        await asyncio.sleep(0.05)
+        assert len(sent) == 1
+    
+    async def test_failed_send_is_not_saved(self):
+        ui, _ = self.manager(fail=True)
+        for unit in ("a", "b", "c"):
+            await ui._send_ui_update("s", UIEventType.UNIT_SELECTED, {"unit_id": unit})
+        await ui.flush_updates()
+        
+        stats = ui.get_ui_stats()
+        assert stats["ui_messages_sent"] == 0
+        assert stats["ui_messages_saved"] == 0
+        assert stats["ui_updates_failed"] == 3
+        assert stats["ui_updates_pending"] == 0
+
+
+class TestTracing:
+    """Per-turn span retention and profilers sharing one tracer"""
+    
+    def run_turn(self, tracer, session_id, turn, ticks):
+        for _ in range(ticks):
+            with tracer.span("engine.tick", session_id=session_id, turn=turn):
+                with tracer.span("engine.ecs_update"):
+                    pass
+    
+    def test_turn_survives_later_traffic(self):
+        """A busy later turn and untracked spans don't overwrite an earlier turn"""
+        tracer = Tracer(capacity=10, turn_capacity=1000, retained_turns=4)
+        self.run_turn(tracer, "s", 1, 50)
+        self.run_turn(tracer, "s", 2, 400)
+        for _ in range(100):
+            with tracer.span("loop.idle"):
+                pass
+        
+        spans = tracer.get_spans("s", 1)
+        assert len(spans) == 100
+        assert {span.turn for span in spans} == {1}
+        document = tracer.to_chrome_trace("s", 1)
+        assert sum(1 for event in document["traceEvents"] if event["ph"] == "X") == 100
+        assert len(tracer.get_spans()) == 100 + 800 + 10
+    
+    def test_only_recent_turns_are_retained(self):
+        """The oldest turn's buffer goes once more than retained_turns exist"""
+        tracer = Tracer(turn_capacity=8, retained_turns=2)
+        for turn in range(1, 4):
+            self.run_turn(tracer, "s", turn, 10)
+        
+        assert tracer.get_spans("s", 1) == []
+        assert len(tracer.get_spans("s", 3)) == 8
+        assert tracer.get_stats()["buffered_turns"] == 2
+    
+    def test_profiler_reset_keeps_other_measurements(self):
+        """A profiler clears its own operations, not the shared tracer"""
+        tracer = Tracer()
+        profiler = PerformanceProfiler(tracer)
+        with profiler.measure("pathfinding"):
+            pass
+        self.run_turn(tracer, "s", 1, 3)
+        
+        profiler.reset()
+        
+        assert profiler.get_stats("pathfinding") is None
+        assert tracer.get_histogram("engine.tick").total == 3
+        assert len(tracer.get_spans("s", 1)) == 6
+        assert tracer.enabled
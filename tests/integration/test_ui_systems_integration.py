@@ -7,12 +7,21 @@ Tests real-time visual feedback, notifications, and UI state management.
 import pytest
 import asyncio
 import json
+import sys
 from datetime import datetime
+from pathlib import Path
 
 import httpx
 import websockets
 import structlog
 
+# UI modules import relative to src, as the launcher does
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+from client.client_ui_bridge import ClientUIBridge
+from client.scene_diff import SceneModel, TileView, UnitView, build_scene_model, diff_scene
+from core.math.particles import EmitterParams
+from ui.visual.effect_scheduler import DAMAGE_NUMBER, HEAL_NUMBER, EffectScheduler
+
 logger = structlog.get_logger()
 
 
@@ -615,4 +624,390 @@ class TestUISystemsIntegrationScenarios:
                 assert valid_data["type"] == "ui_data"
                 
         except Exception as e:
-            pytest.skip(f"WebSocket server not available: {e}")
\ No newline at end of file
+            pytest.skip(f"WebSocket server not available: {e}")
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubEffect:
+    """Stands in for a pooled Ursina entity"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.enabled = False
+        self.text = None
+
+
+class StubRenderer:
+    """Records effect draws; each show costs ``show_cost`` seconds of the fake clock"""
+
+    def __init__(self, clock: FakeClock, show_cost: float = 0.0):
+        self.clock = clock
+        self.show_cost = show_cost
+        self.created = 0
+        self.shown = []
+        self.destroyed = 0
+
+    def create(self, kind: str) -> StubEffect:
+        self.created += 1
+        return StubEffect(kind)
+
+    def show(self, handle: StubEffect, effect):
+        self.clock.now += self.show_cost
+        handle.text = effect.amount
+        self.shown.append((effect.kind, effect.unit_id, effect.amount))
+
+    def hide(self, handle: StubEffect):
+        handle.text = None
+
+    def destroy(self, handle: StubEffect):
+        self.destroyed += 1
+
+
+class TestCombatEffectScheduler:
+    """Frame-budgeted, pooled combat effects, driven headlessly"""
+
+    def make_scheduler(self, show_cost: float = 0.0, **kwargs):
+        clock = FakeClock()
+        renderer = StubRenderer(clock, show_cost)
+        return EffectScheduler(renderer, clock=clock, **kwargs), renderer, clock
+
+    def test_simultaneous_numbers_merge_per_unit(self):
+        """An AoE hitting a unit several times in one frame shows one number"""
+        scheduler, renderer, clock = self.make_scheduler()
+
+        for unit_id in range(4):
+            for _ in range(3):
+                scheduler.spawn(DAMAGE_NUMBER, (unit_id, 0, 0), 1.5, unit_id=unit_id, amount=10)
+            scheduler.spawn(HEAL_NUMBER, (unit_id, 0, 0), 1.5, unit_id=unit_id, amount=5)
+        scheduler.update()
+
+        damage = [shown for shown in renderer.shown if shown[0] == DAMAGE_NUMBER]
+        assert sorted(damage) == [(DAMAGE_NUMBER, unit_id, 30) for unit_id in range(4)]
+        assert scheduler.active_count(HEAL_NUMBER) == 4
+        assert scheduler.get_stats()["merged"] == 8
+
+        # A hit shortly after folds into the number already on screen
+        clock.now += 0.05
+        scheduler.spawn(DAMAGE_NUMBER, (0, 0, 0), 1.5, unit_id=0, amount=7)
+        assert renderer.shown[-1] == (DAMAGE_NUMBER, 0, 37)
+        assert scheduler.active_count(DAMAGE_NUMBER) == 4
+
+        # Later hits get a number of their own
+        clock.now += 1.0
+        scheduler.spawn(DAMAGE_NUMBER, (0, 0, 0), 1.5, unit_id=0, amount=7)
+        scheduler.update()
+        assert scheduler.active_count(DAMAGE_NUMBER) == 5
+
+    def test_frame_budget_spreads_starts_across_frames(self):
+        """Starts stop once the frame's budget is spent; the rest follow next frame"""
+        scheduler, renderer, clock = self.make_scheduler(show_cost=0.001, frame_budget=0.004)
+
+        for i in range(10):
+            scheduler.spawn("impact", (i, 0, 0), 0.2)
+
+        scheduler.update()
+        assert len(renderer.shown) == 4
+        assert len(scheduler) == 6
+
+        scheduler.update()
+        scheduler.update()
+        assert len(renderer.shown) == 10
+        assert scheduler.get_stats()["deferred_frames"] == 2
+
+    def test_on_screen_cap_and_stale_effects(self):
+        """No more than max_active effects show; effects queued too long are dropped"""
+        scheduler, renderer, clock = self.make_scheduler(max_active=5, max_delay=0.5)
+
+        for i in range(8):
+            scheduler.spawn("explosion", (i, 0, 0), 1.0)
+        scheduler.spawn(DAMAGE_NUMBER, (0, 0, 0), 1.0, unit_id=1, amount=12)
+        scheduler.update()
+        assert scheduler.active_count() == 5
+
+        # By the time room frees up, the queued explosions are stale but the number is not
+        clock.now += 1.0
+        scheduler.update()
+        stats = scheduler.get_stats()
+        assert stats["dropped"] == 3
+        assert stats["peak_active"] == 5
+        assert renderer.shown[-1] == (DAMAGE_NUMBER, 1, 12)
+
+    def test_numbers_merge_only_within_a_color(self):
+        """Physical and magical hits on one unit keep separate numbers"""
+        scheduler, renderer, clock = self.make_scheduler()
+
+        scheduler.spawn(DAMAGE_NUMBER, (0, 0, 0), 1.5, color=(1, 0, 0, 1), unit_id=0, amount=10)
+        scheduler.spawn(DAMAGE_NUMBER, (0, 0, 0), 1.5, color=[0, 0, 1, 1], unit_id=0, amount=4)
+        scheduler.spawn(DAMAGE_NUMBER, (0, 0, 0), 1.5, color=(1, 0, 0, 1), unit_id=0, amount=5)
+        scheduler.update()
+        assert sorted(renderer.shown) == [(DAMAGE_NUMBER, 0, 4), (DAMAGE_NUMBER, 0, 15)]
+
+        # On screen too, a hit folds only into the number of its own color
+        clock.now += 0.05
+        scheduler.spawn(DAMAGE_NUMBER, (0, 0, 0), 1.5, color=[0, 0, 1, 1], unit_id=0, amount=6)
+        assert renderer.shown[-1] == (DAMAGE_NUMBER, 0, 10)
+        assert scheduler.active_count(DAMAGE_NUMBER) == 2
+        assert scheduler.get_stats()["merged"] == 2
+
+    def test_dropped_effects_still_finish(self):
+        """A stale or overflowed projectile is not drawn, but its impact still spawns"""
+        scheduler, renderer, clock = self.make_scheduler(max_active=1, max_pending=2, max_delay=0.5)
+        finished = []
+
+        scheduler.spawn("explosion", (0, 0, 0), 1.0)
+        scheduler.update()
+        scheduler.spawn("projectile", (0, 0, 0), 0.3, on_finish=lambda: finished.append("stale"))
+        scheduler.spawn("projectile", (0, 0, 0), 0.3, on_finish=lambda: finished.append("first"))
+        scheduler.spawn("projectile", (0, 0, 0), 0.3, on_finish=lambda: finished.append("second"))
+        assert finished == ["stale"]
+
+        clock.now += 1.0
+        scheduler.update()
+        assert finished == ["stale", "first", "second"]
+        assert scheduler.get_stats()["dropped"] == 3
+        assert [shown[0] for shown in renderer.shown] == ["explosion"]
+
+    def test_cleared_effects_still_finish(self):
+        """Clearing runs follow-ups of drawn and queued effects, and clears what they spawn"""
+        scheduler, renderer, clock = self.make_scheduler(max_active=1)
+        finished = []
+
+        def impact(label):
+            finished.append(label)
+            scheduler.spawn("impact", (0, 0, 0), 0.2, on_finish=lambda: finished.append(label + " impact"))
+
+        scheduler.spawn("projectile", (0, 0, 0), 0.3, on_finish=lambda: impact("drawn"))
+        scheduler.spawn("projectile", (0, 0, 0), 0.3, on_finish=lambda: impact("queued"))
+        scheduler.update()
+        assert scheduler.active_count() == 1 and len(scheduler) == 1
+
+        scheduler.clear()
+        assert sorted(finished) == ["drawn", "drawn impact", "queued", "queued impact"]
+        assert scheduler.active_count() == 0 and len(scheduler) == 0
+        assert [shown[0] for shown in renderer.shown] == ["projectile"]
+
+    def test_effects_reuse_pooled_objects(self):
+        """Steady combat allocates nothing once the pools are warm"""
+        scheduler, renderer, clock = self.make_scheduler()
+        finished = []
+
+        for _ in range(20):
+            for unit_id in range(6):
+                scheduler.spawn("impact", (unit_id, 0, 0), 0.2)
+                scheduler.spawn(DAMAGE_NUMBER, (unit_id, 0, 0), 0.5, unit_id=unit_id, amount=3)
+            scheduler.spawn("projectile", (0, 0, 0), 0.3, on_finish=lambda: finished.append(1))
+            scheduler.update()
+            clock.now += 1.0
+
+        assert renderer.created == 13
+        assert len(finished) == 19
+        assert scheduler.get_stats()["pools"][DAMAGE_NUMBER]["reuses"] == 114
+
+        scheduler.shutdown()
+        assert renderer.destroyed == 13
+        assert scheduler.active_count() == 0
+
+
+class StubMesh:
+    """Point mesh that records its last upload"""
+
+    def __init__(self):
+        self.vertices = []
+        self.colors = []
+        self.generated = 0
+
+    def generate(self):
+        self.generated += 1
+
+
+class StubEntity:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class StubClientApp:
+    def __init__(self):
+        self.grid_tiles = []
+        self.unit_entities = []
+
+
+class HeadlessUIBridge(ClientUIBridge):
+    """ClientUIBridge with Ursina entity creation, styling and destruction stubbed"""
+
+    def __init__(self):
+        super().__init__(client_app=StubClientApp(), ws_client=None)
+        self.destroyed = []
+        self.styled = []
+
+    def _create_tile_entity(self):
+        return StubEntity(enabled=False)
+
+    def _place_tile(self, tile_entity, tile):
+        tile_entity.x_coord, tile_entity.y_coord, tile_entity.terrain = tile.x, tile.y, tile.terrain
+
+    def _create_unit_entity(self):
+        return StubEntity(enabled=False, selection_indicator=StubEntity(enabled=False))
+
+    def _style_unit(self, unit_entity, unit):
+        self.styled.append(unit.unit_id)
+
+    def _create_particle_entity(self, emitter):
+        return StubEntity(model=StubMesh(), color=(1.0, 0.5, 0.0, 1.0))
+
+    def _ensure_particle_driver(self):
+        if self._particle_driver is None:
+            self._particle_driver = StubEntity(update=lambda: self.update_particles(0.1))
+
+    def _destroy_entity(self, entity):
+        self.destroyed.append(entity)
+
+
+class TestClientParticles:
+    """Server emitters simulated on the client"""
+
+    def emitter_data(self, elapsed: float = 0.0) -> dict:
+        params = EmitterParams(position=(1.0, 0.0, 1.0), emission_rate=20, particle_lifetime=0.5,
+                               duration=1.5, seed=3)
+        return {**params.to_wire(), "elapsed": elapsed}
+
+    def test_emitter_advances_each_frame_and_is_destroyed_when_finished(self):
+        """The frame driver advances the emitter, redraws its mesh and destroys it at the end"""
+        bridge = HeadlessUIBridge()
+        bridge.process_ui_updates({"visual_effects": [
+            {"type": "particle_emitter", "id": "burst", "emitter": self.emitter_data()}
+        ]})
+        emitter, entity = bridge.particle_emitters["burst"]
+        driver = bridge._particle_driver
+
+        driver.update()
+        assert emitter.elapsed == pytest.approx(0.1)
+        assert len(entity.model.vertices) == emitter.count > 0
+        assert len(entity.model.colors) == emitter.count
+
+        for _ in range(30):
+            driver.update()
+        assert "burst" not in bridge.particle_emitters
+        assert bridge.destroyed == [entity]
+        assert emitter.is_finished
+
+        bridge.cleanup()
+        assert bridge.destroyed == [entity, driver]
+        assert bridge._particle_driver is None
+
+    def test_repeated_emitter_updates_are_ignored(self):
+        """A resent emitter keeps its local simulation"""
+        bridge = HeadlessUIBridge()
+        bridge.start_particle_emitter("burst", self.emitter_data())
+        emitter, _ = bridge.particle_emitters["burst"]
+        bridge.update_particles(0.2)
+        bridge.start_particle_emitter("burst", self.emitter_data(elapsed=1.0))
+
+        assert bridge.particle_emitters["burst"][0] is emitter
+        assert emitter.elapsed == pytest.approx(0.2)
+
+
+def battlefield_state(units, size=(3, 3), tiles=()):
+    return {"size": size if isinstance(size, dict) else list(size), "units": units, "tiles": list(tiles)}
+
+
+class TestSceneDiff:
+    """Battlefield scene models, their diffs, and pooled entities applying them"""
+
+    def test_build_scene_model(self):
+        """Every tile gets a view, terrain comes from tile data, units key by ID"""
+        scene = build_scene_model(battlefield_state(
+            [{"id": "hero", "x": 1, "y": 2, "name": "Hero", "team": "player", "hp": 5, "max_hp": 10},
+             {"x": 0, "y": 0}],
+            size={"width": 2, "height": 3},
+            tiles=[{"position": {"x": 1, "y": 1}, "terrain_type": "forest"}]
+        ))
+
+        assert scene.size == (2, 3)
+        assert len(scene.tiles) == 6
+        assert scene.tiles[(1, 1)] == TileView(1, 1, "forest")
+        assert scene.tiles[(0, 0)].terrain == "plains"
+        assert scene.units["hero"] == UnitView("hero", 1, 2, "Hero", "player", "warrior", 5, 10)
+        assert scene.units["unit_1"].hp is None
+        assert scene.unit_data["hero"]["name"] == "Hero"
+
+    def test_diff_create_move_recolor_destroy(self):
+        """Each kind of change lands in its own list, and nothing else does"""
+        start = build_scene_model(battlefield_state([
+            {"id": "a", "x": 0, "y": 0, "hp": 10, "max_hp": 10},
+            {"id": "b", "x": 1, "y": 0},
+            {"id": "c", "x": 2, "y": 0},
+        ]))
+        end = build_scene_model(battlefield_state(
+            [{"id": "a", "x": 0, "y": 1, "hp": 4, "max_hp": 10},
+             {"id": "b", "x": 1, "y": 0},
+             {"id": "d", "x": 2, "y": 2}],
+            tiles=[{"x": 1, "y": 1, "terrain_type": "water"}]
+        ))
+
+        assert diff_scene(start, start).is_empty()
+        diff = diff_scene(start, end)
+        assert [unit.unit_id for unit in diff.units_created] == ["d"]
+        assert [unit.unit_id for unit in diff.units_moved] == ["a"]
+        assert [unit.unit_id for unit in diff.units_updated] == ["a"]
+        assert diff.units_destroyed == ["c"]
+        assert diff.tiles_recolored == [TileView(1, 1, "water")]
+        assert not diff.tiles_created and not diff.tiles_destroyed
+
+    def test_diff_size_changes(self):
+        """Growing creates only the new tiles; shrinking destroys only the cut ones"""
+        small = build_scene_model(battlefield_state([], size=(2, 2)))
+        large = build_scene_model(battlefield_state([], size=(3, 2)))
+
+        grow = diff_scene(small, large)
+        assert sorted((tile.x, tile.y) for tile in grow.tiles_created) == [(2, 0), (2, 1)]
+        assert not grow.tiles_destroyed and not grow.tiles_recolored
+        assert sorted(diff_scene(large, small).tiles_destroyed) == [(2, 0), (2, 1)]
+        assert len(diff_scene(SceneModel(), small).tiles_created) == 4
+
+    def test_bridge_reuses_pooled_entities(self):
+        """Destroyed units and tiles go back to the pool and are reused, not reallocated"""
+        bridge = HeadlessUIBridge()
+        bridge.update_battlefield_from_state({"battlefield": battlefield_state(
+            [{"id": "a", "x": 0, "y": 0}, {"id": "b", "x": 1, "y": 1}], size=(3, 3))})
+        app = bridge.client_app
+        assert len(app.grid_tiles) == 9 and len(app.unit_entities) == 2
+        removed = bridge._unit_entities["b"]
+        removed.selection_indicator.enabled = True
+
+        bridge.update_battlefield_from_state({"battlefield": battlefield_state(
+            [{"id": "a", "x": 2, "y": 0}, {"id": "c", "x": 1, "y": 2}], size=(2, 2))})
+
+        assert bridge._unit_entities["c"] is removed
+        assert not removed.selection_indicator.enabled
+        assert bridge._unit_entities["a"].x_coord == 2
+        assert bridge._unit_pool.get_stats()["allocations"] == 2
+        assert bridge._unit_pool.get_stats()["reuses"] == 1
+        assert len(app.grid_tiles) == 4 and bridge._tile_pool.get_stats()["free"] == 5
+        assert bridge.styled == ["a", "b", "c"]
+
+        # Regrowing the board takes tiles from the pool
+        bridge.update_battlefield_from_state({"battlefield": battlefield_state([], size=(3, 3))})
+        assert bridge._tile_pool.get_stats()["allocations"] == 9
+        assert len(app.grid_tiles) == 9 and app.unit_entities == []
+
+    def test_reset_scene_destroys_entities(self):
+        """reset_scene (also run by cleanup) destroys drawn and pooled entities"""
+        bridge = HeadlessUIBridge()
+        bridge.update_battlefield_from_state({"battlefield": battlefield_state(
+            [{"id": "a", "x": 0, "y": 0}], size=(2, 2))})
+        bridge.update_battlefield_from_state({"battlefield": battlefield_state([], size=(1, 2))})
+
+        bridge.cleanup()
+
+        assert len(bridge.destroyed) == 5
+        assert bridge.scene.tiles == {} and bridge._tile_pool is None
+        assert bridge.client_app.grid_tiles == [] and bridge.client_app.unit_entities == []
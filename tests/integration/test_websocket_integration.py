@@ -7,11 +7,28 @@ Tests real-time communication between clients and game engine.
 import pytest
 import asyncio
 import json
+import sys
 import websockets
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
 
 import structlog
 
+from src.api.websocket_manager import WebSocketManager as ApiWebSocketManager
+from src.core.utils.backpressure import (
+    OVERFLOW_DISCONNECT, OVERFLOW_DROP_STALE, BackpressurePolicy, InboundRateLimiter,
+    OutboundQueue, RateLimitPolicy
+)
+from src.core.utils.wire_protocol import (
+    FLAG_COMPRESSED, FLAG_HANDLES, MessageType, PROTOCOL_BINARY, PROTOCOL_JSON, ReplayBuffer,
+    WireCodec, decode_message, encode_message, negotiate_protocol, parse_resume_token
+)
+
+# The client imports its modules relative to src, as the launcher does
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+from client.websocket_game_client import ConnectionState, WebSocketGameClient
+
 logger = structlog.get_logger()
 
 
@@ -369,4 +386,388 @@ class TestWebSocketPerformance:
                 try:
                     await connection.close()
                 except:
-                    pass
\ No newline at end of file
+                    pass
+
+
+# One representative message per wire message type
+WIRE_MESSAGES = {
+    MessageType.PING: {"type": "ping", "data": {"connection_id": 3}},
+    MessageType.PONG: {"type": "pong", "timestamp": "2025-01-01T12:00:00.123456"},
+    MessageType.PROTOCOL: {"type": "protocol", "data": {"protocol": PROTOCOL_BINARY, "compression_threshold": 4096}},
+    MessageType.RESUMED: {"type": "resumed", "data": {"stream": "a1b2c3", "from_seq": 4, "to_seq": 9, "replayed": 5}},
+    MessageType.ERROR: {"type": "error", "data": {"message": "Unknown unit", "original_type": "select_unit"}},
+    MessageType.GAME_STATE: {"type": "game_state", "data": {
+        "session_id": "s1", "turn": 4, "current_unit": "unit_a",
+        "units": [{"id": "unit_a", "hp": 40, "position": [1, 2]}, {"id": "unit_b", "hp": 0.5, "position": [3, 4]}],
+        "tiles": [{"x": 1, "y": 2, "occupant": "unit_a"}, {"x": 0, "y": 0, "occupant": None}]}},
+    MessageType.UI_DATA: {"type": "ui_data", "data": {"panels": {"unit": {"visible": True}}, "selected_unit": "unit_a"}},
+    MessageType.UI_UPDATE: {"type": "ui_update", "data": {"component": "health_bar", "unit_id": "unit_b", "value": 12}},
+    MessageType.UI_UPDATE_BATCH: {"type": "ui_update_batch", "data": {"updates": [
+        {"type": "ui_update", "data": {"unit_id": "unit_a", "value": 1}},
+        {"type": "ui_update", "data": {"unit_id": "unit_c", "value": 2}}]}},
+    MessageType.NOTIFICATION: {"type": "notification", "data": {"id": "notif_1", "title": "Turn", "message": "Your turn"}},
+    MessageType.ACTION_RESULT: {"type": "action_result", "data": {
+        "action": {"type": "move", "unit_id": "unit_a", "target_position": [2, 2]},
+        "success": True, "timestamp": "2025-01-01T12:00:01"}},
+    MessageType.UNIT_MOVED: {"type": "unit_moved", "data": {"unit_id": "unit_a", "from": [1, 2], "to": [2, 2]}},
+    MessageType.UNIT_ATTACKED: {"type": "unit_attacked", "data": {"attacker_id": "unit_a", "target_id": "unit_b", "damage": 7}},
+    MessageType.UNIT_DIED: {"type": "unit_died", "data": {"unit_id": "unit_b"}},
+    MessageType.GAME_END: {"type": "game_end", "data": {"winner": "player1", "turns": 12}},
+    MessageType.SELECT_UNIT_RESULT: {"type": "select_unit_result", "data": {"unit_id": "unit_a", "success": True}},
+    MessageType.DESELECT_UNIT_RESULT: {"type": "deselect_unit_result", "data": {"success": False}},
+    MessageType.DISMISS_NOTIFICATION_RESULT: {"type": "dismiss_notification_result", "data": {"notification_id": "notif_1", "success": True}},
+    MessageType.PLAYER_ACTION: {"type": "player_action", "data": {"type": "attack", "unit_id": "unit_a", "target_id": "unit_b"}},
+    MessageType.REQUEST_GAME_STATE: {"type": "request_game_state"},
+    MessageType.REQUEST_UI_DATA: {"type": "request_ui_data", "data": {"player_id": "player1"}},
+    MessageType.SELECT_UNIT: {"type": "select_unit", "data": {"unit_id": "unit_c"}},
+    MessageType.DESELECT_UNIT: {"type": "deselect_unit", "data": {}},
+    MessageType.DISMISS_NOTIFICATION: {"type": "dismiss_notification", "data": {"notification_id": "notif_1"}},
+    MessageType.UNKNOWN: {"type": "custom_event", "data": {"entity_id": "unit_a", "values": [1, "two", None]}},
+}
+
+
+class TestWireProtocol:
+    """Round-trip tests for the JSON and binary wire protocols"""
+    
+    def test_every_message_type_has_a_sample(self):
+        assert set(WIRE_MESSAGES) == set(MessageType)
+    
+    @pytest.mark.parametrize("message_type", list(MessageType))
+    def test_json_round_trip(self, message_type):
+        message = WIRE_MESSAGES[message_type]
+        encoded = encode_message(message)
+        assert isinstance(encoded, str)
+        assert decode_message(encoded) == message
+    
+    @pytest.mark.parametrize("message_type", list(MessageType))
+    def test_binary_round_trip(self, message_type):
+        pytest.importorskip("msgpack")
+        sender, receiver = WireCodec(), WireCodec()
+        message = WIRE_MESSAGES[message_type]
+        
+        frame = sender.encode(message)
+        assert isinstance(frame, bytes)
+        assert frame[1] == message_type
+        assert decode_message(frame, receiver) == message
+    
+    def test_binary_stream_round_trip(self):
+        """Handles announced in earlier frames resolve in later ones"""
+        pytest.importorskip("msgpack")
+        sender, receiver = WireCodec(), WireCodec()
+        
+        for message in list(WIRE_MESSAGES.values()) * 2:
+            assert receiver.decode(sender.encode(message)) == message
+        assert len(receiver.incoming) == len(sender.outgoing)
+    
+    def test_known_handles_are_not_resent(self):
+        pytest.importorskip("msgpack")
+        sender = WireCodec()
+        message = WIRE_MESSAGES[MessageType.UNIT_ATTACKED]
+        
+        first, second = sender.encode(message), sender.encode(message)
+        assert first[0] & FLAG_HANDLES
+        assert not second[0] & FLAG_HANDLES
+        assert len(second) < len(json.dumps(message))
+    
+    def test_large_payload_is_compressed(self):
+        pytest.importorskip("msgpack")
+        sender, receiver = WireCodec(compression_threshold=1024), WireCodec()
+        message = {"type": "game_state", "data": {"tiles": [
+            {"x": x, "y": y, "terrain": "grass", "occupant": f"unit_{x}" if y == 0 else None}
+            for x in range(20) for y in range(20)]}}
+        
+        frame = sender.encode(message)
+        assert frame[0] & FLAG_COMPRESSED
+        assert receiver.decode(frame) == message
+    
+    def test_non_json_values_are_encoded(self):
+        pytest.importorskip("msgpack")
+        sender, receiver = WireCodec(), WireCodec()
+        sent_at = datetime(2025, 1, 1, 12, 30)
+        
+        decoded = receiver.decode(sender.encode({"type": "game_state", "data": {"last_update": sent_at, "tags": {"a"}}}))
+        assert decoded["data"] == {"last_update": sent_at.isoformat(), "tags": ["a"]}
+    
+    def test_negotiation_falls_back_to_json(self):
+        assert negotiate_protocol(None) == PROTOCOL_JSON
+        assert negotiate_protocol("unsupported") == PROTOCOL_JSON
+
+
+class DroppingServer:
+    """In-process game server that resumes from a ReplayBuffer and drops connections on demand"""
+    
+    def __init__(self, replay_buffer: ReplayBuffer):
+        self.buffer = replay_buffer
+        self.sockets = set()
+        self.snapshots = 0
+        self.resumes = 0
+    
+    async def handler(self, websocket):
+        query = parse_qs(urlparse(websocket.request.path).query)
+        token = parse_resume_token(query.get("resume", [None])[0])
+        missed = None
+        if token and token[0] == self.buffer.stream_id:
+            missed = self.buffer.since(token[1])
+        
+        if missed is None:
+            self.snapshots += 1
+            await websocket.send(json.dumps({
+                "type": "game_state", "data": {"events": self.buffer.last_seq},
+                "stream": self.buffer.stream_id, "snapshot_seq": self.buffer.last_seq
+            }))
+        else:
+            self.resumes += 1
+            await websocket.send(json.dumps({"type": "resumed", "data": {"replayed": len(missed)}}))
+            for message in missed:
+                await websocket.send(json.dumps(message))
+        
+        self.sockets.add(websocket)
+        try:
+            async for _ in websocket:
+                pass
+        finally:
+            self.sockets.discard(websocket)
+    
+    async def broadcast(self, message):
+        message = self.buffer.append(message)
+        for websocket in list(self.sockets):
+            try:
+                await websocket.send(json.dumps(message))
+            except websockets.exceptions.ConnectionClosed:
+                pass
+    
+    async def drop_all(self):
+        for websocket in list(self.sockets):
+            websocket.transport.abort()
+        self.sockets.clear()
+
+
+async def wait_until(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+class TestReconnectResume:
+    """Reconnect and missed-event replay against an in-process server"""
+    
+    async def _connected_client(self, server, moved):
+        ws_server = await websockets.serve(server.handler, "127.0.0.1", 0)
+        port = ws_server.sockets[0].getsockname()[1]
+        client = WebSocketGameClient(f"ws://127.0.0.1:{port}", binary_protocol=False,
+                                     reconnect_base_delay=0.05, reconnect_max_delay=0.2)
+        client.set_callbacks(on_unit_moved=moved.append)
+        assert await client.connect("resume_session", "player_1")
+        await wait_until(lambda: client.last_seq == 0)
+        return ws_server, client
+    
+    async def test_short_drop_replays_missed_events(self):
+        server, moved = DroppingServer(ReplayBuffer()), []
+        ws_server, client = await self._connected_client(server, moved)
+        try:
+            for step in range(3):
+                await server.broadcast({"type": "unit_moved", "data": {"unit_id": "unit_a", "step": step}})
+            await wait_until(lambda: len(moved) == 3)
+            
+            await server.drop_all()
+            for step in range(3, 6):
+                await server.broadcast({"type": "unit_moved", "data": {"unit_id": "unit_a", "step": step}})
+            await wait_until(lambda: len(moved) == 6)
+            
+            assert [event["step"] for event in moved] == list(range(6))
+            assert server.snapshots == 1
+            assert server.resumes == 1
+            assert client.reconnect_count == 1
+            assert client.last_seq == 6
+            assert client.connection_state == ConnectionState.CONNECTED
+        finally:
+            await client.disconnect()
+            ws_server.close()
+    
+    async def test_long_drop_falls_back_to_snapshot(self):
+        server, moved = DroppingServer(ReplayBuffer(max_events=2)), []
+        ws_server, client = await self._connected_client(server, moved)
+        try:
+            await server.drop_all()
+            for step in range(5):
+                await server.broadcast({"type": "unit_moved", "data": {"unit_id": "unit_a", "step": step}})
+            await wait_until(lambda: server.snapshots == 2)
+            await wait_until(lambda: client.last_seq == 5)
+            
+            assert moved == []
+            assert server.resumes == 0
+        finally:
+            await client.disconnect()
+            ws_server.close()
+    
+    async def test_duplicate_sequence_numbers_are_skipped(self):
+        client, moved = WebSocketGameClient("ws://unused", binary_protocol=False), []
+        client.set_callbacks(on_unit_moved=moved.append)
+        
+        message = json.dumps({"type": "unit_moved", "seq": 1, "data": {"unit_id": "unit_a"}})
+        await client._handle_message(message)
+        await client._handle_message(message)
+        
+        assert len(moved) == 1
+    
+    def test_replay_buffer_filters_by_player_and_window(self):
+        now = [0.0]
+        buffer = ReplayBuffer(max_events=8, max_age=10.0, clock=lambda: now[0])
+        buffer.append({"type": "unit_moved"})
+        buffer.append({"type": "action_result"}, player_id="player_2")
+        buffer.append({"type": "unit_died"})
+        
+        assert [m["seq"] for m in buffer.since(0, "player_1")] == [1, 3]
+        assert [m["seq"] for m in buffer.since(1, "player_2")] == [2, 3]
+        assert buffer.since(3) == []
+        assert buffer.since(4) is None
+        
+        now[0] = 11.0
+        assert buffer.since(0) is None
+
+
+class SlowSocket:
+    """Simulated WebSocket whose sends take ``delay`` seconds, or stall until released"""
+    
+    def __init__(self, delay: float = 0.0, stalled: bool = False):
+        self.delay = delay
+        self.sent = []
+        self.closed_with = None
+        self._released = asyncio.Event()
+        if not stalled:
+            self._released.set()
+    
+    def release(self):
+        self._released.set()
+    
+    async def accept(self):
+        pass
+    
+    async def send_json(self, data):
+        await self._released.wait()
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+    
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+class TestBackpressure:
+    """Outbound queues, overflow policies and inbound rate limits with simulated slow sockets"""
+    
+    async def test_stalled_client_does_not_delay_session_broadcast(self):
+        manager = ApiWebSocketManager(BackpressurePolicy(max_queue=8, overflow=OVERFLOW_DISCONNECT))
+        fast, stalled = SlowSocket(), SlowSocket(stalled=True)
+        await manager.connect(fast, "bp_session")
+        await manager.connect(stalled, "bp_session")
+        
+        loop, broadcast_seconds = asyncio.get_running_loop(), 0.0
+        for turn in range(20):
+            start = loop.time()
+            await manager.broadcast_to_all({"type": "turn_ended", "data": {"turn_number": turn}})
+            broadcast_seconds += loop.time() - start
+            await asyncio.sleep(0.005)  # Events arrive over time; writers run in between
+        assert broadcast_seconds < 0.05
+        
+        await wait_until(lambda: len(fast.sent) == 21)
+        await wait_until(lambda: stalled.closed_with == 1013)
+        assert manager.get_connection_count() == 1
+        await manager.disconnect_all()
+    
+    async def test_state_updates_coalesce_behind_slow_send(self):
+        socket = SlowSocket(stalled=True)
+        queue = OutboundQueue(socket.send_json).start()
+        
+        for version in range(5):
+            queue.put({"type": "game_state", "data": {"version": version}})
+            queue.put({"type": "unit_moved", "data": {"step": version}})
+        socket.release()
+        await wait_until(lambda: len(queue) == 0 and queue.sent == len(socket.sent) > 0)
+        
+        states = [message for message in socket.sent if message["type"] == "game_state"]
+        assert [m["data"]["step"] for m in socket.sent if m["type"] == "unit_moved"] == list(range(5))
+        assert len(states) <= 2
+        assert states[-1]["data"]["version"] == 4
+        assert queue.coalesced >= 3
+        queue.close()
+    
+    async def test_coalesced_entries_do_not_accumulate_behind_stalled_send(self):
+        socket = SlowSocket(stalled=True)
+        queue = OutboundQueue(socket.send_json, BackpressurePolicy(max_queue=4)).start()
+        
+        for version in range(100):
+            assert queue.put({"type": "game_state", "data": {"version": version}})
+        assert len(queue) <= 2
+        assert len(queue._entries) <= 2 * queue.policy.max_queue + 1
+        
+        socket.release()
+        await wait_until(lambda: len(queue) == 0)
+        assert socket.sent[-1]["data"]["version"] == 99
+        queue.close()
+    
+    async def test_overflow_drops_stale_state_before_disconnecting(self):
+        failures = []
+        socket = SlowSocket(stalled=True)
+        queue = OutboundQueue(socket.send_json, BackpressurePolicy(max_queue=3, overflow=OVERFLOW_DROP_STALE),
+                              on_failure=failures.append).start()
+        await asyncio.sleep(0)
+        
+        assert queue.put({"type": "ui_data", "data": {}})
+        assert queue.put({"type": "unit_moved", "data": {"step": 1}})
+        assert queue.put({"type": "unit_moved", "data": {"step": 2}})
+        assert queue.put({"type": "unit_moved", "data": {"step": 3}})
+        assert queue.dropped == 1
+        assert not queue.put({"type": "unit_moved", "data": {"step": 4}})
+        assert failures == ["overflow"]
+    
+    async def test_lagging_client_is_disconnected(self):
+        now, failures = [0.0], []
+        socket = SlowSocket(stalled=True)
+        queue = OutboundQueue(socket.send_json, BackpressurePolicy(max_lag=2.0),
+                              on_failure=failures.append, clock=lambda: now[0]).start()
+        
+        assert queue.put({"type": "unit_moved", "data": {}})
+        now[0] = 1.0
+        assert queue.put({"type": "unit_moved", "data": {}})
+        now[0] = 3.0
+        assert not queue.put({"type": "unit_moved", "data": {}})
+        assert failures == ["lag"]
+    
+    async def test_stalled_send_times_out(self):
+        failures = []
+        socket = SlowSocket(stalled=True)
+        queue = OutboundQueue(socket.send_json, BackpressurePolicy(send_timeout=0.05),
+                              on_failure=failures.append).start()
+        
+        queue.put({"type": "unit_moved", "data": {}})
+        await wait_until(lambda: failures == ["send_timeout"])
+    
+    async def test_rate_limited_client_gets_one_error_per_streak(self):
+        manager = ApiWebSocketManager(rate_limits=RateLimitPolicy(actions_per_second=0.001, action_burst=2))
+        socket = SlowSocket()
+        await manager.connect(socket, "rl_session")
+        
+        results = [manager.allow_message(socket, "player_action") for _ in range(5)]
+        assert results == [True, True, False, False, False]
+        assert manager.allow_message(socket, "ping")
+        assert not manager.allow_message(socket, "player_action")
+        
+        errors = lambda: [m for m in socket.sent if m["type"] == "error"]
+        await wait_until(lambda: len(errors()) == 2)
+        assert errors()[0]["data"] == {"message": "Rate limit exceeded", "original_type": "player_action"}
+        await manager.disconnect_all()
+    
+    def test_action_flood_is_rate_limited(self):
+        now = [0.0]
+        limiter = InboundRateLimiter(RateLimitPolicy(actions_per_second=2.0, action_burst=3),
+                                     clock=lambda: now[0])
+        
+        results = [limiter.allow("player_action") for _ in range(5)]
+        assert results == [True, True, True, False, False]
+        assert limiter.allow("ping")
+        assert limiter.consecutive_rejections == 0
+        
+        now[0] = 1.0
+        assert limiter.allow("player_action")
+        assert limiter.rejected == 2